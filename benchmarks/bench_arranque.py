@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque en frío de 'crx help' y 'crx status'
+Cada medición lanza un proceso nuevo; falla (código 1) si la mediana
+supera el presupuesto de tiempo. 'status (serve)' mide el mismo comando
+con 'crx serve' en marcha: el cliente solo reenvía la petición al socket
+
+Uso:
+    python benchmarks/bench_arranque.py
+    python benchmarks/bench_arranque.py --crx "python3 dist/crx.pyz" --presupuesto-status 60
+"""
+
+import os
+import sys
+import time
+import shlex
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def medir(comando, directorio, repeticiones):
+    """Mediana en milisegundos de ejecutar el comando en un proceso nuevo"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=directorio, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def medir_con_servidor(crx, directorio, repeticiones):
+    """Mediana de 'crx status' con 'crx serve' en marcha en el proyecto"""
+    socket = Path(directorio) / ".cronux" / "crx.sock"
+    servidor = subprocess.Popen(crx + ["serve"], cwd=directorio,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(200):
+            if socket.exists():
+                break
+            time.sleep(0.05)
+        else:
+            raise RuntimeError("crx serve no creó su socket")
+        return medir(crx + ["status"], directorio, repeticiones)
+    finally:
+        subprocess.run(crx + ["serve", "--stop"], cwd=directorio,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        servidor.wait(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío del CLI")
+    parser.add_argument("--crx", default=None,
+                        help="Comando crx a medir (por defecto python cli/cronux_cli.py)")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--presupuesto-help", type=float, default=50.0,
+                        help="Mediana máxima de 'crx help' en ms")
+    parser.add_argument("--presupuesto-status", type=float, default=70.0,
+                        help="Mediana máxima de 'crx status' en ms")
+    parser.add_argument("--presupuesto-serve", type=float, default=45.0,
+                        help="Mediana máxima de 'crx status' con 'crx serve' en marcha, en ms")
+    args = parser.parse_args()
+
+    if args.crx:
+        crx = shlex.split(args.crx)
+    else:
+        crx = [sys.executable, str(RAIZ / "cli" / "cronux_cli.py")]
+
+    with tempfile.TemporaryDirectory() as proyecto:
+        subprocess.run(crx + ["new", "arranque"], cwd=proyecto,
+                       stdout=subprocess.DEVNULL, check=True)
+
+        # Referencia: el coste del propio intérprete
+        base = medir([sys.executable, "-c", "pass"], proyecto, args.repeticiones)
+        resultados = [
+            ("help", medir(crx + ["help"], proyecto, args.repeticiones), args.presupuesto_help),
+            ("status", medir(crx + ["status"], proyecto, args.repeticiones), args.presupuesto_status),
+        ]
+        if hasattr(os, "fork"):
+            # Sockets Unix: el servidor no existe en Windows
+            resultados.append(("status (serve)", medir_con_servidor(crx, proyecto, args.repeticiones),
+                               args.presupuesto_serve))
+
+    print(f"Intérprete vacío: {base:.1f} ms")
+    print(f"{'Comando':<18} {'Mediana (ms)':>13} {'Presupuesto':>12}")
+    print("-" * 46)
+    fuera = []
+    for nombre, mediana, presupuesto in resultados:
+        marca = "" if mediana <= presupuesto else "  EXCEDIDO"
+        if marca:
+            fuera.append(nombre)
+        print(f"crx {nombre:<14} {mediana:>13.1f} {presupuesto:>12.1f}{marca}")
+
+    if fuera:
+        print(f"\n❌ Presupuesto excedido: {', '.join(fuera)}")
+        sys.exit(1)
+    print("\n✅ Arranque dentro del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque en frío y en caliente del CLI congelado, por perfil
+En frío, antes de cada ejecución se sacan los archivos del binario de la
+caché de páginas (posix_fadvise; con --vaciar-cache y root, toda la
+caché). En caliente se mide tras una ejecución de calentamiento. Como
+referencia se mide también el CLI desde las fuentes.
+
+Uso:
+    python compilar_optimizado.py --only cli_deb --perfil-cli portable
+    python compilar_optimizado.py --only cli_deb --perfil-cli rapido
+    python benchmarks/bench_arranque_binario.py
+    python benchmarks/bench_arranque_binario.py rapido=/opt/cronux-crx/cli/crx --comando help
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def binarios_compilados():
+    """{perfil: ejecutable} de lo que compilar_optimizado.py dejó en dist/crx-<perfil>/"""
+    encontrados = {}
+    for carpeta in sorted((RAIZ / "dist").glob("crx-*")):
+        ejecutable = carpeta / "crx"
+        # onedir: dist/crx-<perfil>/crx/crx
+        if ejecutable.is_dir():
+            ejecutable = ejecutable / "crx"
+        if ejecutable.is_file():
+            encontrados[carpeta.name[len("crx-"):]] = ejecutable
+    return encontrados
+
+
+def archivos_de(ejecutable):
+    """Archivos que lee el arranque: el onefile, o toda la carpeta del onedir"""
+    if (ejecutable.parent / "_internal").is_dir():
+        return [f for f in ejecutable.parent.rglob("*") if f.is_file()]
+    return [ejecutable]
+
+
+def expulsar(archivos, vaciar_todo):
+    """Saca los archivos de la caché de páginas para la siguiente ejecución"""
+    if vaciar_todo:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return
+    for ruta in archivos:
+        descriptor = os.open(ruta, os.O_RDONLY)
+        try:
+            os.posix_fadvise(descriptor, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(descriptor)
+
+
+def ejecutar(comando, directorio):
+    """Milisegundos de una ejecución en un proceso nuevo"""
+    inicio = time.perf_counter()
+    subprocess.run(comando, cwd=directorio, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def medir(comando, archivos, directorio, repeticiones, vaciar_todo):
+    """(mediana en frío, mediana en caliente) en milisegundos"""
+    frio = []
+    for _ in range(repeticiones):
+        expulsar(archivos, vaciar_todo)
+        frio.append(ejecutar(comando, directorio))
+    ejecutar(comando, directorio)
+    caliente = [ejecutar(comando, directorio) for _ in range(repeticiones)]
+    return statistics.median(frio), statistics.median(caliente)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arranque en frío y en caliente del CLI por perfil")
+    parser.add_argument("binarios", nargs="*",
+                        help="perfil=ruta del ejecutable (por defecto los de dist/crx-*/)")
+    parser.add_argument("--comando", default="status", help="Comando de crx a medir")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--vaciar-cache", action="store_true",
+                        help="Vacía toda la caché de páginas antes de cada ejecución en frío (root)")
+    args = parser.parse_args()
+
+    if not args.vaciar_cache and not hasattr(os, "posix_fadvise"):
+        print("❌ Este sistema no tiene posix_fadvise: usa --vaciar-cache (Linux, root)")
+        sys.exit(1)
+
+    if args.binarios:
+        binarios = {}
+        for valor in args.binarios:
+            perfil, _, ruta = valor.rpartition("=")
+            binarios[perfil or Path(ruta).name] = Path(ruta)
+    else:
+        binarios = binarios_compilados()
+        if not binarios:
+            print("INFO: No hay binarios en dist/crx-*/; solo se mide el CLI desde las fuentes")
+
+    fuentes = RAIZ / "cli"
+    casos = [("fuentes", [sys.executable, str(fuentes / "cronux_cli.py")],
+              [f for f in fuentes.rglob("*") if f.is_file()])]
+    for perfil, ejecutable in binarios.items():
+        casos.append((perfil, [str(ejecutable.resolve())], archivos_de(ejecutable)))
+
+    with tempfile.TemporaryDirectory() as proyecto:
+        subprocess.run(casos[0][1] + ["new", "arranque"], cwd=proyecto,
+                       stdout=subprocess.DEVNULL, check=True)
+
+        print(f"crx {args.comando}, {args.repeticiones} repeticiones")
+        print(f"{'Perfil':<12} {'Tamaño (MB)':>12} {'Frío (ms)':>10} {'Caliente (ms)':>14}")
+        print("-" * 52)
+        for perfil, comando, archivos in casos:
+            tamano = sum(f.stat().st_size for f in archivos) / 1024 / 1024
+            frio, caliente = medir(comando + [args.comando], archivos, proyecto,
+                                   args.repeticiones, args.vaciar_cache)
+            print(f"{perfil:<12} {tamano:>12.1f} {frio:>10.1f} {caliente:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
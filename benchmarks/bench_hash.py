@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los algoritmos de hash y del hash en árbol paralelo
+Uso: python benchmarks/bench_hash.py [--tamano 512] [--repeticiones 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cli"))
+
+import archivos
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana en segundos de ejecutar la función"""
+    funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara algoritmos de hash")
+    parser.add_argument("--tamano", type=int, default=512, help="Tamaño del archivo en MB")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--directorio", default=None)
+    args = parser.parse_args()
+
+    print(f"Archivo de {args.tamano} MB, {os.cpu_count()} CPUs, "
+          f"hojas de {archivos.TAMANO_HOJA // 1024 // 1024} MB")
+    print(f"{'Algoritmo':>10} {'Secuencial (MB/s)':>18} {'Árbol (MB/s)':>14} {'Ganancia':>10}")
+    print("-" * 56)
+
+    with tempfile.TemporaryDirectory(dir=args.directorio) as carpeta:
+        ruta = Path(carpeta) / "datos.bin"
+        bloque = os.urandom(archivos.TAMANO_BLOQUE)
+        with open(ruta, "wb") as f:
+            for _ in range(args.tamano):
+                f.write(bloque)
+
+        umbral_original = archivos.UMBRAL_ARBOL
+        for algoritmo in archivos.ALGORITMOS_HASH:
+            # Secuencial: el árbol se desactiva subiendo el umbral
+            archivos.UMBRAL_ARBOL = float("inf")
+            t_secuencial = medir(lambda: archivos.hashear_archivo(ruta, algoritmo), args.repeticiones)
+            archivos.UMBRAL_ARBOL = 0
+            t_arbol = medir(lambda: archivos.hashear_archivo(ruta, algoritmo), args.repeticiones)
+            archivos.UMBRAL_ARBOL = umbral_original
+
+            print(f"{algoritmo:>10} {args.tamano / t_secuencial:>18.1f} "
+                  f"{args.tamano / t_arbol:>14.1f} {t_secuencial / t_arbol:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
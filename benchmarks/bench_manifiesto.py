@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: manifiesto JSON frente a manifiesto binario (manifiesto.py)
+Mide en procesos nuevos el tiempo y la memoria (pico de RSS) de abrir el
+manifiesto y consultar una ruta, y de recorrerlo entero
+Uso: python benchmarks/bench_manifiesto.py [--entradas 1000000] [--repeticiones 3]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+CLI = Path(__file__).resolve().parent.parent / "cli"
+sys.path.insert(0, str(CLI))
+
+import manifiesto
+
+# Se ejecuta en un proceso nuevo: imprime "<segundos> <aumento del pico de RSS en KB>"
+MEDICION = """
+import sys, time, json, resource
+sys.path.insert(0, {cli!r})
+import manifiesto
+
+def pico_kb():
+    # VmHWM se actualiza al momento; ru_maxrss (bytes en macOS) es la alternativa
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico
+
+carpeta, formato, operacion, ruta = sys.argv[1:5]
+base = pico_kb()
+inicio = time.perf_counter()
+if formato == "json":
+    with open(carpeta + "/" + manifiesto.NOMBRE_JSON) as f:
+        archivos = json.load(f)["archivos"]
+else:
+    archivos = manifiesto.leer(carpeta)["archivos"]
+if operacion == "consulta":
+    assert archivos[ruta]["tamano"] >= 0
+else:
+    total = sum(e["tamano"] for _, e in archivos.items())
+transcurrido = time.perf_counter() - inicio
+print(transcurrido, pico_kb() - base)
+"""
+
+
+def generar(entradas, semilla):
+    """Archivos sintéticos con carpetas anidadas, como los de un proyecto grande"""
+    aleatorio = random.Random(semilla)
+    archivos = {}
+    for i in range(entradas):
+        ruta = f"src/modulo{i % 97}/sub{i % 13}/archivo_{i}.py"
+        archivos[ruta] = {
+            "hash": "%064x" % aleatorio.getrandbits(256),
+            "tamano": aleatorio.randrange(1 << 20),
+            "modo": 0o644,
+            "mtime": 1_700_000_000_000_000_000 + i
+        }
+    return archivos
+
+
+def medir(carpeta, formato, operacion, ruta, repeticiones):
+    """Medianas (segundos, KB) de varias ejecuciones en procesos nuevos"""
+    tiempos, memoria = [], []
+    codigo = MEDICION.format(cli=str(CLI))
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", codigo, carpeta, formato, operacion, ruta],
+                                capture_output=True, text=True, check=True).stdout.split()
+        tiempos.append(float(salida[0]))
+        memoria.append(int(salida[1]))
+    return statistics.median(tiempos), statistics.median(memoria)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara manifiestos JSON y binarios")
+    parser.add_argument("--entradas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--directorio", default=None,
+                        help="Directorio del disco a medir (por defecto el temporal)")
+    args = parser.parse_args()
+
+    archivos = generar(args.entradas, args.semilla)
+    ruta = random.Random(args.semilla).choice(list(archivos))
+    datos = {"algoritmo": "sha256", "almacen": "objetos", "archivos": archivos}
+
+    with tempfile.TemporaryDirectory(dir=args.directorio) as carpeta:
+        with open(os.path.join(carpeta, manifiesto.NOMBRE_JSON), "w") as f:
+            json.dump(datos, f)
+        manifiesto.escribir(carpeta, datos)
+        del archivos, datos
+
+        tamano_json = os.path.getsize(os.path.join(carpeta, manifiesto.NOMBRE_JSON))
+        tamano_binario = os.path.getsize(os.path.join(carpeta, manifiesto.NOMBRE_BINARIO))
+        print(f"Entradas: {args.entradas}")
+        print(f"Tamaño: JSON {tamano_json / 1024 / 1024:.1f} MB, "
+              f"binario {tamano_binario / 1024 / 1024:.1f} MB")
+        print(f"{'Operación':<12} {'Formato':<8} {'Tiempo (ms)':>12} {'RSS (MB)':>10}")
+        print("-" * 46)
+        for operacion in ("consulta", "recorrido"):
+            for formato in ("json", "binario"):
+                tiempo, memoria = medir(carpeta, formato, operacion, ruta, args.repeticiones)
+                print(f"{operacion:<12} {formato:<8} {tiempo * 1000:>12.1f} {memoria / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
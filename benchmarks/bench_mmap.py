@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: hash con lecturas con buffer frente a mmap
+Desde UMBRAL_ARBOL las dos columnas usan el hash en árbol: las hojas se
+leen con pread o se mapean (marcadas con "árbol")
+Uso: python benchmarks/bench_mmap.py [--tamanos 1,8,64,256] [--repeticiones 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cli"))
+
+import archivos
+
+
+def crear_archivo(carpeta, tamano_mb):
+    """Crea un archivo de prueba con contenido pseudoaleatorio"""
+    ruta = Path(carpeta) / f"datos_{tamano_mb}mb.bin"
+    bloque = os.urandom(archivos.TAMANO_BLOQUE)
+    with open(ruta, "wb") as f:
+        for _ in range(tamano_mb):
+            f.write(bloque)
+    return ruta
+
+
+def medir(ruta, usar_mmap, repeticiones):
+    """Devuelve la mediana en segundos de hashear el archivo"""
+    tiempos = []
+    # Una pasada previa deja el archivo en la caché de páginas
+    archivos.hashear_archivo(ruta, usar_mmap=usar_mmap)
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        archivos.hashear_archivo(ruta, usar_mmap=usar_mmap)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara hash con buffer y con mmap")
+    parser.add_argument("--tamanos", default="1,8,64,256",
+                        help="Tamaños de archivo en MB separados por comas")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--directorio", default=None,
+                        help="Directorio del disco a medir (por defecto el temporal)")
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(",") if t.strip()]
+
+    print(f"Umbral mmap actual: {archivos.UMBRAL_MMAP / 1024 / 1024:.1f} MB")
+    print(f"{'Tamaño':>10} {'Buffer (MB/s)':>15} {'mmap (MB/s)':>15} {'Ganancia':>10}")
+    print("-" * 61)
+
+    with tempfile.TemporaryDirectory(dir=args.directorio) as carpeta:
+        for tamano_mb in tamanos:
+            ruta = crear_archivo(carpeta, tamano_mb)
+            t_buffer = medir(ruta, False, args.repeticiones)
+            t_mmap = medir(ruta, True, args.repeticiones)
+            arbol = "  árbol" if tamano_mb * 1024 * 1024 >= archivos.UMBRAL_ARBOL else ""
+            print(f"{tamano_mb:>8} MB {tamano_mb / t_buffer:>15.1f} "
+                  f"{tamano_mb / t_mmap:>15.1f} {t_buffer / t_mmap:>9.2f}x{arbol}")
+            ruta.unlink()
+
+
+if __name__ == "__main__":
+    main()
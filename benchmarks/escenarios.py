@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks reproducibles de Cronux-CRX
+Mide save, restore, log y status sobre árboles sintéticos deterministas,
+escribe los resultados en JSON y los compara con una línea base
+
+Uso:
+    python benchmarks/escenarios.py -o resultados.json
+    python benchmarks/escenarios.py --guardar-base benchmarks/base.json
+    python benchmarks/escenarios.py --comparar benchmarks/base.json --tolerancia 0.15
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ / "cli"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generar_arbol import generar_arbol, editar_archivo_pequeno
+
+FORMATO_RESULTADOS = 1
+
+ESCENARIOS = [
+    "primer_guardado",
+    "guardado_sin_cambios",
+    "guardado_edicion_pequena",
+    "restaurar_adyacente",
+    "restaurar_lejana",
+    "log_muchas_versiones",
+    "log_grep_muchas_versiones",
+    "log_ruta_muchas_versiones",
+    "status_muchas_versiones",
+]
+
+
+class Contexto:
+    """Parámetros compartidos por todos los escenarios"""
+
+    def __init__(self, args, trabajo):
+        self.args = args
+        self.trabajo = Path(trabajo)
+        if args.crx:
+            self.comando = [args.crx]
+        else:
+            self.comando = [sys.executable, str(RAIZ / "cli" / "cronux_cli.py")]
+
+    def crx(self, directorio, *argumentos, entrada=None):
+        """Ejecuta el CLI en un directorio y devuelve el tiempo de pared"""
+        inicio = time.perf_counter()
+        resultado = subprocess.run(
+            self.comando + list(argumentos), cwd=directorio, input=entrada,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        transcurrido = time.perf_counter() - inicio
+        if resultado.returncode != 0:
+            raise RuntimeError(f"crx {' '.join(argumentos)} falló: {resultado.stderr.strip()}")
+        return transcurrido
+
+    def arbol(self, nombre):
+        """Genera un árbol sintético nuevo con la semilla y escala de la suite"""
+        destino = self.trabajo / nombre
+        if destino.exists():
+            shutil.rmtree(destino)
+        generar_arbol(destino, self.args.semilla, self.args.escala)
+        return destino
+
+    def proyecto(self, nombre):
+        """Genera un árbol y lo inicializa como proyecto con una primera versión"""
+        destino = self.arbol(nombre)
+        self.crx(destino, "new", nombre)
+        self.crx(destino, "save", "-m", "inicial")
+        return destino
+
+
+def escenario_primer_guardado(ctx):
+    destino = ctx.arbol("primer_guardado")
+    muestras = []
+    for _ in range(ctx.args.repeticiones):
+        shutil.rmtree(destino / ".cronux", ignore_errors=True)
+        ctx.crx(destino, "new", "bench")
+        muestras.append(ctx.crx(destino, "save", "-m", "primera"))
+    return muestras
+
+
+def escenario_guardado_sin_cambios(ctx):
+    destino = ctx.proyecto("sin_cambios")
+    return [ctx.crx(destino, "save", "-m", "sin cambios") for _ in range(ctx.args.repeticiones)]
+
+
+def escenario_guardado_edicion_pequena(ctx):
+    destino = ctx.proyecto("edicion_pequena")
+    muestras = []
+    for i in range(ctx.args.repeticiones):
+        editar_archivo_pequeno(destino, i)
+        muestras.append(ctx.crx(destino, "save", "-m", f"edicion {i}"))
+    return muestras
+
+
+def _proyecto_con_historial(ctx):
+    """Proyecto con varias versiones que difieren en ediciones pequeñas"""
+    destino = ctx.trabajo / "historial"
+    if not destino.exists():
+        destino = ctx.proyecto("historial")
+        for i in range(ctx.args.historial - 1):
+            editar_archivo_pequeno(destino, i)
+            ctx.crx(destino, "save", "-m", f"edicion {i}")
+    return destino
+
+
+def escenario_restaurar_adyacente(ctx):
+    destino = _proyecto_con_historial(ctx)
+    version = f"1.{ctx.args.historial - 2}"
+    return [ctx.crx(destino, "restore", version, entrada="s\n") for _ in range(ctx.args.repeticiones)]
+
+
+def escenario_restaurar_lejana(ctx):
+    destino = _proyecto_con_historial(ctx)
+    return [ctx.crx(destino, "restore", "1.0", entrada="s\n") for _ in range(ctx.args.repeticiones)]
+
+
+def _proyecto_con_muchas_versiones(ctx):
+    """Proyecto diminuto con muchas versiones, creadas en proceso por rapidez"""
+    destino = ctx.trabajo / "muchas_versiones"
+    if destino.exists():
+        return destino
+
+    destino.mkdir(parents=True)
+    (destino / "leeme.txt").write_text("benchmark\n")
+
+    from crear_proyecto import crear_proyecto_cli
+    from guardar_version import guardar_version_cli
+
+    anterior = os.getcwd()
+    os.chdir(destino)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            crear_proyecto_cli("muchas_versiones")
+            for i in range(ctx.args.versiones):
+                guardar_version_cli(f"version sintetica {i}")
+    finally:
+        os.chdir(anterior)
+    return destino
+
+
+def escenario_log_muchas_versiones(ctx):
+    destino = _proyecto_con_muchas_versiones(ctx)
+    return [ctx.crx(destino, "log") for _ in range(ctx.args.repeticiones)]
+
+
+def escenario_log_grep_muchas_versiones(ctx):
+    destino = _proyecto_con_muchas_versiones(ctx)
+    # La primera búsqueda completa el índice si hiciera falta; no se mide
+    ctx.crx(destino, "log", "--grep", "sintetica")
+    termino = str(ctx.args.versiones // 2)
+    return [ctx.crx(destino, "log", "--grep", "sintetica", termino)
+            for _ in range(ctx.args.repeticiones)]
+
+
+def escenario_log_ruta_muchas_versiones(ctx):
+    destino = _proyecto_con_muchas_versiones(ctx)
+    ctx.crx(destino, "log", "--", "leeme.txt")
+    return [ctx.crx(destino, "log", "--", "leeme.txt") for _ in range(ctx.args.repeticiones)]
+
+
+def escenario_status_muchas_versiones(ctx):
+    destino = _proyecto_con_muchas_versiones(ctx)
+    return [ctx.crx(destino, "status") for _ in range(ctx.args.repeticiones)]
+
+
+def resumir(muestras):
+    """Estadísticos de una lista de tiempos en segundos"""
+    return {
+        "mediana": statistics.median(muestras),
+        "minimo": min(muestras),
+        "maximo": max(muestras),
+        "muestras": muestras
+    }
+
+
+def ejecutar(args):
+    """Ejecuta los escenarios seleccionados y devuelve el documento de resultados"""
+    seleccion = args.escenarios.split(",") if args.escenarios else ESCENARIOS
+    desconocidos = [e for e in seleccion if e not in ESCENARIOS]
+    if desconocidos:
+        raise SystemExit(f"Escenarios desconocidos: {', '.join(desconocidos)}")
+
+    resultados = {}
+    with tempfile.TemporaryDirectory(dir=args.directorio) as trabajo:
+        ctx = Contexto(args, trabajo)
+        for nombre in seleccion:
+            print(f"▶ {nombre}...", file=sys.stderr)
+            muestras = globals()[f"escenario_{nombre}"](ctx)
+            resultados[nombre] = resumir(muestras)
+            print(f"  mediana {resultados[nombre]['mediana'] * 1000:.1f} ms", file=sys.stderr)
+
+    return {
+        "formato": FORMATO_RESULTADOS,
+        "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count()
+        },
+        "parametros": {
+            "semilla": args.semilla,
+            "escala": args.escala,
+            "repeticiones": args.repeticiones,
+            "historial": args.historial,
+            "versiones": args.versiones,
+            "crx": args.crx
+        },
+        "escenarios": resultados
+    }
+
+
+def comparar(actual, base, tolerancia):
+    """Compara medianas con la línea base y devuelve la lista de regresiones"""
+    if base.get("parametros", {}).get("escala") != actual["parametros"]["escala"]:
+        print("⚠️  La línea base se generó con otra escala; la comparación no es fiable")
+
+    regresiones = []
+    print(f"{'Escenario':<28} {'Base (ms)':>10} {'Actual (ms)':>12} {'Cambio':>9}")
+    print("-" * 62)
+    for nombre, datos in actual["escenarios"].items():
+        if nombre not in base.get("escenarios", {}):
+            print(f"{nombre:<28} {'-':>10} {datos['mediana'] * 1000:>12.1f} {'nuevo':>9}")
+            continue
+        t_base = base["escenarios"][nombre]["mediana"]
+        cambio = datos["mediana"] / t_base - 1 if t_base else 0.0
+        marca = ""
+        if cambio > tolerancia:
+            marca = "  REGRESIÓN"
+            regresiones.append(nombre)
+        print(f"{nombre:<28} {t_base * 1000:>10.1f} {datos['mediana'] * 1000:>12.1f} "
+              f"{cambio:>+8.0%}{marca}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks reproducibles de Cronux-CRX")
+    parser.add_argument("--escenarios", default=None,
+                        help=f"Lista separada por comas (por defecto todos: {', '.join(ESCENARIOS)})")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help="Factor de tamaño del árbol sintético")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--historial", type=int, default=20,
+                        help="Versiones del proyecto usado para restore")
+    parser.add_argument("--versiones", type=int, default=10000,
+                        help="Versiones del proyecto usado para log/status")
+    parser.add_argument("--crx", default=None,
+                        help="Ejecutable crx a medir (por defecto cli/cronux_cli.py)")
+    parser.add_argument("--directorio", default=None,
+                        help="Directorio de trabajo (por defecto el temporal)")
+    parser.add_argument("-o", "--salida", default=None, help="Archivo JSON de resultados")
+    parser.add_argument("--guardar-base", default=None, help="Guarda los resultados como línea base")
+    parser.add_argument("--comparar", default=None, help="Línea base con la que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Empeoramiento relativo de la mediana tolerado (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    resultados = ejecutar(args)
+    documento = json.dumps(resultados, indent=2)
+
+    if args.salida:
+        Path(args.salida).write_text(documento)
+    if args.guardar_base:
+        Path(args.guardar_base).write_text(documento)
+    if not args.salida and not args.guardar_base and not args.comparar:
+        print(documento)
+
+    if args.comparar:
+        with open(args.comparar, "r") as f:
+            base = json.load(f)
+        regresiones = comparar(resultados, base, args.tolerancia)
+        if regresiones:
+            print(f"\n❌ Regresiones: {', '.join(regresiones)}")
+            sys.exit(1)
+        print("\n✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Generador determinista de árboles de prueba para los benchmarks
+La misma semilla y escala producen siempre los mismos archivos
+Uso: python benchmarks/generar_arbol.py <destino> [--semilla 42] [--escala 1.0]
+"""
+
+import random
+import argparse
+from pathlib import Path
+
+PALABRAS = (
+    "version proyecto archivo cambio guardar restaurar historial mensaje "
+    "config datos modulo prueba funcion clase valor lista texto binario"
+).split()
+
+
+def _texto(rnd, tamano):
+    """Genera texto pseudoaleatorio de aproximadamente el tamaño indicado"""
+    lineas = []
+    total = 0
+    while total < tamano:
+        linea = " ".join(rnd.choice(PALABRAS) for _ in range(rnd.randint(4, 12)))
+        lineas.append(linea)
+        total += len(linea) + 1
+    return ("\n".join(lineas) + "\n").encode()
+
+
+def _binario(rnd, tamano):
+    """Genera bytes pseudoaleatorios (no comprimibles)"""
+    return rnd.randbytes(tamano)
+
+
+def _escribir_grande(rnd, ruta, tamano):
+    """Escribe un archivo grande por bloques para no tenerlo entero en memoria"""
+    bloque = 1024 * 1024
+    with open(ruta, "wb") as f:
+        restante = tamano
+        while restante > 0:
+            n = min(bloque, restante)
+            f.write(rnd.randbytes(n))
+            restante -= n
+
+
+def generar_arbol(destino, semilla=42, escala=1.0):
+    """Genera el árbol sintético y devuelve un resumen (archivos y bytes)"""
+    rnd = random.Random(semilla)
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    resumen = {"archivos": 0, "bytes": 0}
+
+    def escribir(ruta, datos):
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_bytes(datos)
+        resumen["archivos"] += 1
+        resumen["bytes"] += len(datos)
+
+    # Muchos archivos diminutos repartidos en pocos directorios
+    for i in range(int(2000 * escala)):
+        ruta = destino / "diminutos" / f"grupo_{i % 20:02d}" / f"archivo_{i:05d}.txt"
+        escribir(ruta, _texto(rnd, rnd.randint(16, 512)))
+
+    # Pocos archivos enormes
+    for i in range(2):
+        ruta = destino / "grandes" / f"blob_{i}.bin"
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        tamano = int(64 * 1024 * 1024 * escala)
+        _escribir_grande(rnd, ruta, tamano)
+        resumen["archivos"] += 1
+        resumen["bytes"] += tamano
+
+    # Anidamiento profundo
+    profundo = destino / "profundo"
+    for nivel in range(int(12 * max(escala, 0.25))):
+        profundo = profundo / f"nivel_{nivel:02d}"
+        for j in range(3):
+            escribir(profundo / f"nota_{j}.txt", _texto(rnd, rnd.randint(256, 2048)))
+
+    # Mezcla de texto y binario de tamaños intermedios
+    for i in range(int(200 * escala)):
+        if rnd.random() < 0.5:
+            escribir(destino / "mixto" / f"doc_{i:04d}.md", _texto(rnd, rnd.randint(1024, 64 * 1024)))
+        else:
+            escribir(destino / "mixto" / f"dat_{i:04d}.bin", _binario(rnd, rnd.randint(1024, 256 * 1024)))
+
+    return resumen
+
+
+def editar_archivo_pequeno(destino, iteracion):
+    """Modifica un archivo diminuto de forma determinista (edición pequeña)"""
+    ruta = Path(destino) / "diminutos" / "grupo_00" / "archivo_00000.txt"
+    with open(ruta, "ab") as f:
+        f.write(f"edicion {iteracion}\n".encode())
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un árbol de prueba determinista")
+    parser.add_argument("destino")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--escala", type=float, default=1.0)
+    args = parser.parse_args()
+
+    resumen = generar_arbol(args.destino, args.semilla, args.escala)
+    print(f"Archivos: {resumen['archivos']}")
+    print(f"Bytes: {resumen['bytes']}")
+
+
+if __name__ == "__main__":
+    main()
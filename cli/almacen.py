@@ -0,0 +1,283 @@
+"""
+Almacén de objetos por contenido de Cronux-CRX
+Cada contenido distinto se guarda una sola vez en .cronux/objetos/ab/cdef...
+con su hash como nombre. Una versión solo guarda su manifiesto
+(ruta -> hash), así lo que no cambia entre versiones no ocupa espacio de
+nuevo. Los objetos se escriben en objetos/tmp y se mueven a su sitio con
+un rename atómico: un objeto a medias nunca tiene nombre definitivo.
+
+Varios proyectos pueden compartir un almacén de la máquina
+(~/.cronux-store). Cada uno anota en refs/<id>/ los objetos de cada
+versión, y la poda solo borra lo que ningún proyecto referencia.
+"""
+
+import os
+import itertools
+
+from archivos import copiar_archivo, hashear_archivo, nuevo_hash_contenido, TAMANO_BLOQUE
+import perfil
+
+CARPETA_OBJETOS = "objetos"
+CARPETA_REFERENCIAS = "refs"
+ALMACEN_COMPARTIDO_POR_DEFECTO = os.path.join("~", ".cronux-store")
+
+# Contenidos de flujos (tar, git) hasta este tamaño se hashean en memoria
+# antes de escribirlos: si el objeto ya existe no se escribe nada
+MAXIMO_EN_MEMORIA = 8 * 1024 * 1024
+
+_contador = itertools.count()
+
+
+def ruta_almacen_compartido(ruta=None):
+    """Ruta del almacén compartido: la indicada, CRONUX_STORE o ~/.cronux-store"""
+    ruta = ruta or os.environ.get("CRONUX_STORE") or ALMACEN_COMPARTIDO_POR_DEFECTO
+    return os.path.abspath(os.path.expanduser(ruta))
+
+
+def leer_exacto(flujo, tamano):
+    """Lee exactamente 'tamano' bytes (una tubería puede devolver menos por llamada)"""
+    partes = []
+    while tamano:
+        datos = flujo.read(min(tamano, TAMANO_BLOQUE * 8))
+        if not datos:
+            raise EOFError("El flujo terminó antes de lo esperado")
+        partes.append(datos)
+        tamano -= len(datos)
+    return b"".join(partes)
+
+
+class Almacen:
+    """Objetos de un proyecto, nombrados por su hash ('algoritmo', siempre criptográfico)
+
+    'base' es la carpeta .cronux del proyecto o la del almacén compartido
+    """
+
+    def __init__(self, base, algoritmo, compartido=False):
+        self.base = str(base)
+        self.carpeta = os.path.join(self.base, CARPETA_OBJETOS)
+        self.algoritmo = algoritmo
+        self.compartido = compartido
+        self._conocidos = set()
+        # Totales de la vida del almacén (para informes de import)
+        self.leidos = 0
+        self.escritos = 0
+
+    def ruta(self, valor):
+        """Ruta del objeto con ese hash"""
+        return os.path.join(self.carpeta, valor[:2], valor[2:])
+
+    def existe(self, valor):
+        """Comprueba si el objeto existe; los positivos se recuerdan"""
+        if valor in self._conocidos:
+            return True
+        if os.path.exists(self.ruta(valor)):
+            self._conocidos.add(valor)
+            return True
+        return False
+
+    def ids(self):
+        """Conjunto de hashes de todos los objetos guardados"""
+        valores = set()
+        try:
+            carpetas = os.scandir(self.carpeta)
+        except FileNotFoundError:
+            return valores
+        with carpetas:
+            for carpeta in carpetas:
+                # objetos/ab/cdef...; 'tmp' y cualquier otra cosa no son objetos
+                if len(carpeta.name) != 2 or not carpeta.is_dir():
+                    continue
+                with os.scandir(carpeta.path) as objetos:
+                    valores.update(carpeta.name + objeto.name for objeto in objetos)
+        self._conocidos.update(valores)
+        return valores
+
+    def _temporal(self):
+        carpeta = os.path.join(self.carpeta, "tmp")
+        os.makedirs(carpeta, exist_ok=True)
+        return os.path.join(carpeta, f"{os.getpid()}-{next(_contador)}")
+
+    def _reutilizar(self, valor):
+        """Anota que un objeto existente vuelve a usarse
+
+        En un almacén compartido se actualiza su fecha: la poda de otro
+        proyecto no borra objetos recientes que aún no tienen referencia
+        """
+        if self.compartido:
+            try:
+                os.utime(self.ruta(valor))
+            except OSError:
+                pass
+
+    def _colocar(self, temporal, valor, tamano):
+        """Da nombre definitivo a un temporal, o lo descarta si el contenido ya estaba"""
+        if self.existe(valor):
+            self._reutilizar(valor)
+            os.unlink(temporal)
+            # El temporal no llega al repositorio: no cuenta como escrito
+            perfil.contar("bytes_escritos", -tamano)
+            return False
+        destino = self.ruta(valor)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.replace(temporal, destino)
+        self._conocidos.add(valor)
+        self.escritos += tamano
+        return True
+
+    def guardar_archivo(self, ruta, tamano, probablemente_nuevo=True):
+        """Guarda un archivo del disco; devuelve (hash, si se escribió)
+
+        Un contenido probablemente nuevo se copia mientras se hashea (una
+        lectura). Si probablemente ya existe, primero solo se hashea y se
+        copia únicamente si falta, así no se escribe nada en balde.
+        """
+        if not probablemente_nuevo:
+            with perfil.fase("hash"):
+                valor = hashear_archivo(ruta, self.algoritmo)
+            perfil.contar("bytes", tamano)
+            self.leidos += tamano
+            if self.existe(valor):
+                self._reutilizar(valor)
+                return valor, False
+
+        temporal = self._temporal()
+        try:
+            # copiar_archivo vuelve a hashear lo que copia: el nombre del objeto
+            # siempre corresponde a lo escrito aunque el archivo cambie entretanto
+            valor = copiar_archivo(ruta, temporal, self.algoritmo)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.unlink(temporal)
+            raise
+        self.leidos += tamano
+        return valor, self._colocar(temporal, valor, tamano)
+
+    def guardar_flujo(self, flujo, tamano):
+        """Guarda los siguientes 'tamano' bytes de un flujo; devuelve (hash, si se escribió)"""
+        h = nuevo_hash_contenido(self.algoritmo, tamano)
+        self.leidos += tamano
+        perfil.contar("bytes", tamano)
+
+        if tamano <= MAXIMO_EN_MEMORIA:
+            datos = leer_exacto(flujo, tamano)
+            with perfil.fase("hash"):
+                h.update(datos)
+            valor = h.hexdigest()
+            if self.existe(valor):
+                self._reutilizar(valor)
+                return valor, False
+            temporal = self._temporal()
+            with open(temporal, "wb") as f, perfil.fase("write"):
+                f.write(datos)
+            perfil.contar("bytes_escritos", tamano)
+            return valor, self._colocar(temporal, valor, tamano)
+
+        temporal = self._temporal()
+        try:
+            with open(temporal, "wb") as f:
+                restante = tamano
+                while restante:
+                    datos = flujo.read(min(restante, TAMANO_BLOQUE * 8))
+                    if not datos:
+                        raise EOFError("El flujo terminó antes de lo esperado")
+                    with perfil.fase("hash"):
+                        h.update(datos)
+                    with perfil.fase("write"):
+                        f.write(datos)
+                    restante -= len(datos)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+        perfil.contar("bytes_escritos", tamano)
+        return h.hexdigest(), self._colocar(temporal, h.hexdigest(), tamano)
+
+    # Referencias y poda
+
+    def _carpeta_referencias(self, proyecto):
+        return os.path.join(self.base, CARPETA_REFERENCIAS, proyecto)
+
+    def registrar_proyecto(self, proyecto, datos):
+        """Da de alta un proyecto en el almacén compartido"""
+        import json
+        carpeta = self._carpeta_referencias(proyecto)
+        os.makedirs(carpeta, exist_ok=True)
+        with open(os.path.join(carpeta, "proyecto.json"), "w") as f:
+            json.dump(datos, f, indent=2)
+
+    def registrar_version(self, proyecto, numero, valores):
+        """Anota los objetos que usa una versión de un proyecto"""
+        carpeta = self._carpeta_referencias(proyecto)
+        os.makedirs(carpeta, exist_ok=True)
+        destino = os.path.join(carpeta, f"version_{numero}")
+        temporal = f"{destino}.{os.getpid()}.tmp"
+        with open(temporal, "w") as f:
+            f.writelines(f"{valor}\n" for valor in sorted(set(valores)))
+        os.replace(temporal, destino)
+
+    def versiones_registradas(self, proyecto):
+        """Números de las versiones de un proyecto con referencias anotadas"""
+        try:
+            nombres = os.listdir(self._carpeta_referencias(proyecto))
+        except FileNotFoundError:
+            return set()
+        return {n[len("version_"):] for n in nombres
+                if n.startswith("version_") and not n.endswith(".tmp")}
+
+    def olvidar_version(self, proyecto, numero):
+        """Quita las referencias de una versión que ya no existe"""
+        try:
+            os.unlink(os.path.join(self._carpeta_referencias(proyecto), f"version_{numero}"))
+        except FileNotFoundError:
+            pass
+
+    def referenciados(self):
+        """Objetos que usa alguna versión de algún proyecto del almacén"""
+        vivos = set()
+        raiz = os.path.join(self.base, CARPETA_REFERENCIAS)
+        try:
+            proyectos = os.listdir(raiz)
+        except FileNotFoundError:
+            return vivos
+        for proyecto in proyectos:
+            carpeta = os.path.join(raiz, proyecto)
+            for nombre in os.listdir(carpeta):
+                if nombre.startswith("version_") and not nombre.endswith(".tmp"):
+                    with open(os.path.join(carpeta, nombre), "r") as f:
+                        vivos.update(f.read().split())
+        return vivos
+
+    def podar(self, vivos, margen_s):
+        """Borra los objetos fuera de 'vivos' sin usar desde hace más de 'margen_s' segundos
+
+        El margen protege los objetos que un save o import en marcha acaba
+        de escribir y todavía no referencia ninguna versión.
+        Devuelve (objetos borrados, bytes liberados).
+        """
+        import time
+        limite = time.time() - margen_s
+        borrados = liberados = 0
+        for valor in self.ids() - vivos:
+            ruta = self.ruta(valor)
+            try:
+                st = os.stat(ruta)
+                if st.st_mtime >= limite:
+                    continue
+                os.unlink(ruta)
+            except FileNotFoundError:
+                continue
+            self._conocidos.discard(valor)
+            borrados += 1
+            liberados += st.st_size
+
+        # Temporales de escrituras interrumpidas
+        try:
+            temporales = os.scandir(os.path.join(self.carpeta, "tmp"))
+        except FileNotFoundError:
+            return borrados, liberados
+        with temporales:
+            for temporal in temporales:
+                st = temporal.stat()
+                if st.st_mtime < limite:
+                    os.unlink(temporal.path)
+                    liberados += st.st_size
+        return borrados, liberados
@@ -0,0 +1,446 @@
+"""
+Lectura, hash y copia de archivos para Cronux-CRX
+Los archivos grandes se procesan con mmap para no pasar los datos
+por varios buffers intermedios de Python
+"""
+
+import os
+import mmap
+import errno
+import zlib
+import shutil
+import hashlib
+
+import perfil
+
+# xxhash es opcional: solo se usa si está instalado
+try:
+    import xxhash
+    XXHASH_DISPONIBLE = True
+except ImportError:
+    XXHASH_DISPONIBLE = False
+
+# Tamaño del bloque para la ruta con buffer (archivos pequeños)
+TAMANO_BLOQUE = 1024 * 1024
+
+# Algoritmo por defecto (y el usado antes de que fuera configurable):
+# con SHA-NI/ARMv8 sha256 supera a blake2b, ver benchmarks/bench_hash.py
+ALGORITMO_POR_DEFECTO = "sha256"
+
+# Hash en árbol: los archivos enormes se dividen en hojas de tamaño fijo
+# que se hashean en paralelo y luego se combinan en un hash raíz
+TAMANO_HOJA = 16 * 1024 * 1024
+UMBRAL_ARBOL = 256 * 1024 * 1024
+
+
+def _calcular_umbral_mmap():
+    """Calcula el tamaño a partir del cual compensa usar mmap"""
+    valor = os.environ.get("CRONUX_UMBRAL_MMAP")
+    if valor:
+        try:
+            return max(int(valor), 1)
+        except ValueError:
+            pass
+
+    # mmap tiene un coste fijo (mmap/munmap, fallos de página, madvise) que
+    # solo se amortiza cuando el archivo ocupa muchas veces el bloque de lectura;
+    # benchmarks/bench_mmap.py muestra el punto de cruce en el disco local
+    granularidad = max(mmap.ALLOCATIONGRANULARITY, mmap.PAGESIZE)
+    umbral = 64 * TAMANO_BLOQUE
+    return (umbral + granularidad - 1) // granularidad * granularidad
+
+
+UMBRAL_MMAP = _calcular_umbral_mmap()
+
+
+def _aconsejar_lectura(fd, tamano):
+    """Indica al kernel que el archivo se leerá de forma secuencial"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, tamano, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _liberar_cache(fd, tamano):
+    """Evita que un archivo grande leído una sola vez desplace la caché de páginas"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, tamano, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _mapear(f, tamano):
+    """Mapea un archivo abierto en solo lectura con acceso secuencial"""
+    mapa = mmap.mmap(f.fileno(), tamano, access=mmap.ACCESS_READ)
+    if hasattr(mapa, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+        try:
+            mapa.madvise(mmap.MADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return mapa
+
+
+class _HashCrc32:
+    """Hash no criptográfico de zlib, solo para detectar cambios"""
+
+    def __init__(self):
+        self.valor = 0
+
+    def update(self, datos):
+        self.valor = zlib.crc32(datos, self.valor)
+
+    def digest(self):
+        return self.valor.to_bytes(4, "big")
+
+    def hexdigest(self):
+        return f"{self.valor:08x}"
+
+
+# Algoritmos disponibles: nombre -> (constructor, es criptográfico)
+ALGORITMOS_HASH = {
+    "blake2b": (lambda: hashlib.blake2b(digest_size=32), True),
+    "sha256": (hashlib.sha256, True),
+    "crc32": (_HashCrc32, False),
+}
+
+if XXHASH_DISPONIBLE:
+    ALGORITMOS_HASH["xxh3"] = (xxhash.xxh3_128, False)
+
+
+def nuevo_hash(algoritmo=ALGORITMO_POR_DEFECTO):
+    """Crea un objeto hash del algoritmo indicado"""
+    if algoritmo not in ALGORITMOS_HASH:
+        raise ValueError(
+            f"Algoritmo de hash desconocido '{algoritmo}' "
+            f"(disponibles: {', '.join(ALGORITMOS_HASH)})"
+        )
+    return ALGORITMOS_HASH[algoritmo][0]()
+
+
+def algoritmo_objetos(algoritmo):
+    """Algoritmo con el que se nombran los objetos de un proyecto con 'algoritmo'
+
+    Un hash no criptográfico colisiona con facilidad y dos contenidos
+    distintos acabarían en el mismo objeto; esos proyectos nombran sus
+    objetos con ALGORITMO_POR_DEFECTO
+    """
+    if ALGORITMOS_HASH.get(algoritmo, (None, False))[1]:
+        return algoritmo
+    return ALGORITMO_POR_DEFECTO
+
+
+def _hashear_hoja(algoritmo, datos):
+    """Hashea una hoja del árbol (los hash de hashlib liberan el GIL)"""
+    h = nuevo_hash(algoritmo)
+    with datos:
+        h.update(datos)
+    return h.digest()
+
+
+def _combinar_hojas(algoritmo, digests):
+    """Combina los hash de las hojas en el hash raíz del árbol"""
+    raiz = nuevo_hash(algoritmo)
+    raiz.update(f"cronux-arbol:{TAMANO_HOJA}:{len(digests)}:".encode())
+    for digest in digests:
+        raiz.update(digest)
+    return raiz.hexdigest()
+
+
+def _hojas_en_paralelo(algoritmo, vista, tamano):
+    """Lanza el hash de todas las hojas en un pool de hilos"""
+    from concurrent.futures import ThreadPoolExecutor
+    hilos = os.cpu_count() or 1
+    pool = ThreadPoolExecutor(max_workers=hilos)
+    futuros = [
+        pool.submit(_hashear_hoja, algoritmo, vista[inicio:inicio + TAMANO_HOJA])
+        for inicio in range(0, tamano, TAMANO_HOJA)
+    ]
+    return pool, futuros
+
+
+def _hashear_hoja_leida(algoritmo, fd, inicio):
+    """Hashea una hoja leída con pread (cada hilo con su propio buffer)"""
+    h = nuevo_hash(algoritmo)
+    h.update(os.pread(fd, TAMANO_HOJA, inicio))
+    return h.digest()
+
+
+def _hojas_con_lecturas(algoritmo, f, tamano):
+    """Hash de las hojas sin mmap: con pread en paralelo, o en orden si no hay pread"""
+    if hasattr(os, "pread"):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            futuros = [pool.submit(_hashear_hoja_leida, algoritmo, f.fileno(), inicio)
+                       for inicio in range(0, tamano, TAMANO_HOJA)]
+            return [futuro.result() for futuro in futuros]
+    digests = []
+    while True:
+        datos = f.read(TAMANO_HOJA)
+        if not datos:
+            return digests
+        h = nuevo_hash(algoritmo)
+        h.update(datos)
+        digests.append(h.digest())
+
+
+class _HashArbol:
+    """Hash en árbol calculado de forma secuencial sobre un flujo
+
+    Da el mismo resultado que las hojas en paralelo de hashear_archivo,
+    para contenidos que llegan por una tubería o desde un tar
+    """
+
+    def __init__(self, algoritmo):
+        self.algoritmo = algoritmo
+        self.hoja = nuevo_hash(algoritmo)
+        self.en_hoja = 0
+        self.digests = []
+
+    def update(self, datos):
+        vista = memoryview(datos)
+        while len(vista):
+            n = min(len(vista), TAMANO_HOJA - self.en_hoja)
+            self.hoja.update(vista[:n])
+            self.en_hoja += n
+            vista = vista[n:]
+            if self.en_hoja == TAMANO_HOJA:
+                self.digests.append(self.hoja.digest())
+                self.hoja = nuevo_hash(self.algoritmo)
+                self.en_hoja = 0
+
+    def hexdigest(self):
+        digests = self.digests + ([self.hoja.digest()] if self.en_hoja else [])
+        return _combinar_hojas(self.algoritmo, digests)
+
+
+def nuevo_hash_contenido(algoritmo, tamano):
+    """Hash para un contenido de tamaño conocido, igual al de hashear_archivo"""
+    if tamano >= UMBRAL_ARBOL and tamano > 0:
+        return _HashArbol(algoritmo)
+    return nuevo_hash(algoritmo)
+
+
+def hashear_archivo(ruta, algoritmo=ALGORITMO_POR_DEFECTO, usar_mmap=None):
+    """Calcula el hash de un archivo y lo devuelve en hexadecimal
+
+    'usar_mmap' elige cómo se lee (por defecto, mmap desde UMBRAL_MMAP);
+    el valor del hash no depende de ello
+    """
+    h = nuevo_hash(algoritmo)
+    with open(ruta, "rb") as f:
+        tamano = os.fstat(f.fileno()).st_size
+        if usar_mmap is None:
+            usar_mmap = tamano >= UMBRAL_MMAP
+
+        if tamano >= UMBRAL_ARBOL and tamano > 0:
+            _aconsejar_lectura(f.fileno(), tamano)
+            if usar_mmap:
+                with _mapear(f, tamano) as mapa:
+                    vista = memoryview(mapa)
+                    pool, futuros = _hojas_en_paralelo(algoritmo, vista, tamano)
+                    with pool:
+                        digests = [futuro.result() for futuro in futuros]
+                    vista.release()
+            else:
+                digests = _hojas_con_lecturas(algoritmo, f, tamano)
+            _liberar_cache(f.fileno(), tamano)
+            return _combinar_hojas(algoritmo, digests)
+
+        if usar_mmap and tamano > 0:
+            _aconsejar_lectura(f.fileno(), tamano)
+            with _mapear(f, tamano) as mapa:
+                h.update(mapa)
+            _liberar_cache(f.fileno(), tamano)
+        else:
+            buffer = bytearray(TAMANO_BLOQUE)
+            vista = memoryview(buffer)
+            while True:
+                leidos = f.readinto(buffer)
+                if not leidos:
+                    break
+                h.update(vista[:leidos])
+    return h.hexdigest()
+
+
+def copiar_archivo(origen, destino, algoritmo=ALGORITMO_POR_DEFECTO):
+    """Copia un archivo (como shutil.copy2) y devuelve el hash de su contenido"""
+    h = nuevo_hash(algoritmo)
+    with open(origen, "rb") as fo, open(destino, "wb") as fd:
+        tamano = os.fstat(fo.fileno()).st_size
+
+        if tamano >= UMBRAL_ARBOL and tamano > 0:
+            # Ruta enorme: las hojas se hashean en paralelo mientras se escribe
+            _aconsejar_lectura(fo.fileno(), tamano)
+            with _mapear(fo, tamano) as mapa:
+                vista = memoryview(mapa)
+                pool, futuros = _hojas_en_paralelo(algoritmo, vista, tamano)
+                with pool:
+                    for inicio in range(0, tamano, TAMANO_BLOQUE * 8):
+                        with vista[inicio:inicio + TAMANO_BLOQUE * 8] as trozo, perfil.fase("write"):
+                            fd.write(trozo)
+                    with perfil.fase("hash"):
+                        digests = [futuro.result() for futuro in futuros]
+                vista.release()
+            _liberar_cache(fo.fileno(), tamano)
+            perfil.contar("bytes", tamano)
+            perfil.contar("bytes_escritos", tamano)
+            with perfil.fase("write"):
+                shutil.copystat(origen, destino)
+            return _combinar_hojas(algoritmo, digests)
+
+        if tamano >= UMBRAL_MMAP:
+            # Ruta grande: los datos se leen una sola vez desde las páginas mapeadas
+            _aconsejar_lectura(fo.fileno(), tamano)
+            with _mapear(fo, tamano) as mapa:
+                vista = memoryview(mapa)
+                try:
+                    for inicio in range(0, tamano, TAMANO_BLOQUE * 8):
+                        with vista[inicio:inicio + TAMANO_BLOQUE * 8] as trozo:
+                            with perfil.fase("hash"):
+                                h.update(trozo)
+                            with perfil.fase("write"):
+                                fd.write(trozo)
+                finally:
+                    vista.release()
+            _liberar_cache(fo.fileno(), tamano)
+        else:
+            # Ruta pequeña: un único buffer reutilizado
+            buffer = bytearray(min(max(tamano, 1), TAMANO_BLOQUE))
+            vista = memoryview(buffer)
+            while True:
+                with perfil.fase("read"):
+                    leidos = fo.readinto(buffer)
+                if not leidos:
+                    break
+                with perfil.fase("hash"):
+                    h.update(vista[:leidos])
+                with perfil.fase("write"):
+                    fd.write(vista[:leidos])
+
+    perfil.contar("bytes", tamano)
+    perfil.contar("bytes_escritos", tamano)
+    with perfil.fase("write"):
+        shutil.copystat(origen, destino)
+    return h.hexdigest()
+
+
+def recorrer(raiz, ignorar=(), avisos=None, vacias=None):
+    """Genera (ruta relativa, ruta, stat) de cada archivo bajo 'raiz'
+
+    Las rutas relativas usan '/'. En el primer nivel se omiten los ocultos
+    (.cronux, .git...) y los nombres de 'ignorar'. Si se pasa 'avisos', las
+    carpetas que no se pueden leer se anotan ahí en lugar de cortar el recorrido.
+    Si se pasa 'vacias', se añaden a esa lista las carpetas sin nada dentro.
+    """
+    pendientes = [(str(raiz), "")]
+    while pendientes:
+        directorio, prefijo = pendientes.pop()
+        try:
+            with os.scandir(directorio) as iterador:
+                entradas = list(iterador)
+        except OSError as e:
+            if avisos is None:
+                raise
+            avisos.append(f"No se pudo leer {prefijo or directorio}: {e}")
+            continue
+        if not entradas and prefijo and vacias is not None:
+            vacias.append(prefijo[:-1])
+        for entrada in entradas:
+            if not prefijo and (entrada.name.startswith(".") or entrada.name in ignorar):
+                continue
+            relativa = prefijo + entrada.name
+            # scandir conoce el tipo por d_type: is_dir()/is_file() no hacen stat
+            if entrada.is_dir():
+                pendientes.append((entrada.path, relativa + "/"))
+            elif entrada.is_file():
+                yield relativa, entrada.path, entrada.stat()
+
+
+def _esperar_escritura(fd):
+    """Espera a que un descriptor no bloqueante admita más datos"""
+    import select
+    select.select([], [fd], [])
+
+
+def volcar(origen, destino, inicio=0, longitud=None):
+    """Copia un rango de un archivo abierto en 'destino' con memoria constante
+
+    'destino' puede ser un descriptor o un objeto archivo binario. Si tiene
+    descriptor se usa sendfile (el kernel copia sin pasar por Python);
+    si no, un único buffer reutilizado. Devuelve los bytes escritos.
+    """
+    tamano = os.fstat(origen.fileno()).st_size
+    fin = tamano if longitud is None else min(tamano, inicio + longitud)
+    restante = max(fin - inicio, 0)
+    escritos = 0
+    if not restante:
+        return 0
+
+    try:
+        fd_destino = destino if isinstance(destino, int) else destino.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd_destino = None
+
+    if fd_destino is not None and hasattr(os, "sendfile"):
+        if not isinstance(destino, int):
+            destino.flush()
+        _aconsejar_lectura(origen.fileno(), tamano)
+        try:
+            while restante:
+                try:
+                    enviados = os.sendfile(fd_destino, origen.fileno(), inicio, min(restante, 1 << 30))
+                except BlockingIOError:
+                    _esperar_escritura(fd_destino)
+                    continue
+                if not enviados:
+                    break
+                inicio += enviados
+                restante -= enviados
+                escritos += enviados
+        except OSError as e:
+            # Destinos que sendfile no admite (algunos terminales): seguir con buffer
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+        if not restante:
+            perfil.contar("bytes", escritos)
+            return escritos
+
+    escribir = (lambda datos: os.write(fd_destino, datos)) if isinstance(destino, int) else destino.write
+    origen.seek(inicio)
+    buffer = bytearray(min(restante, TAMANO_BLOQUE))
+    vista = memoryview(buffer)
+    while restante:
+        leidos = origen.readinto(vista[:min(restante, len(buffer))])
+        if not leidos:
+            break
+        pendiente = vista[:leidos]
+        while pendiente:
+            # os.write puede escribir menos de lo pedido en una tubería; un
+            # destino no bloqueante lleno devuelve None o lanza BlockingIOError
+            try:
+                escrito = escribir(pendiente)
+            except BlockingIOError as e:
+                escrito = e.characters_written or None
+            if not escrito:
+                if fd_destino is None:
+                    raise BlockingIOError(errno.EAGAIN, "El destino no admite más datos por ahora")
+                if escrito is None:
+                    _esperar_escritura(fd_destino)
+                    continue
+                raise OSError(errno.EIO, "El destino no admitió ningún byte")
+            pendiente = pendiente[escrito:]
+        restante -= leidos
+        escritos += leidos
+    perfil.contar("bytes", escritos)
+    return escritos
+
+
+def cabecera_manifiesto(algoritmo):
+    """Parámetros necesarios para reproducir los hash de un manifiesto"""
+    return {
+        "algoritmo": algoritmo,
+        "hoja_arbol": TAMANO_HOJA,
+        "umbral_arbol": UMBRAL_ARBOL
+    }
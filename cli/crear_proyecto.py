@@ -1,35 +1,43 @@
-from pathlib import Path
-import json
-from datetime import datetime
-from funcion_verficar import verificarCronux
+from cronux import Repository
+from ubicacion import es_proyecto
+from funcion_verficar import obtener_carpeta_actual
+from archivos import ALGORITMOS_HASH, ALGORITMO_POR_DEFECTO
 
-def crear_proyecto_cli(nombre_proyecto):
-    """Versión CLI que recibe el nombre como parámetro"""
+def crear_proyecto_cli(nombre_proyecto, algoritmo_hash=None, almacen_compartido=None):
+    """Versión CLI que recibe el nombre como parámetro
+
+    'almacen_compartido' es True (almacén por defecto) o la ruta del almacén
+    """
     
-    # Verificar si ya existe un proyecto
-    if verificarCronux():
+    carpeta = obtener_carpeta_actual()
+    # Verificar si ya existe un proyecto aquí (no en las carpetas padre)
+    if es_proyecto(carpeta):
         print("ERROR: Ya existe un proyecto Cronux-CRX en esta ubicacion")
         return False
     
-    # Crear carpeta .cronux
-    carpeta_cronux = Path.cwd() / ".cronux"
-    carpeta_cronux.mkdir(exist_ok=True)
+    algoritmo_hash = algoritmo_hash or ALGORITMO_POR_DEFECTO
+    if algoritmo_hash not in ALGORITMOS_HASH:
+        print(f"ERROR: Algoritmo de hash desconocido '{algoritmo_hash}'")
+        print(f"Disponibles: {', '.join(ALGORITMOS_HASH)}")
+        return False
     
-    # Crear datos del proyecto
-    datos_proyecto = {
-        "nombre": nombre_proyecto,
-        "fecha_creacion": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "autor": "usuario"
-    }
+    if not ALGORITMOS_HASH[algoritmo_hash][1]:
+        print(f"Aviso: {algoritmo_hash} no es criptografico, solo sirve para detectar cambios")
     
-    # Guardar JSON
-    archivo_proyecto = carpeta_cronux / "proyecto.json"
-    with open(archivo_proyecto, "w") as f:
-        json.dump(datos_proyecto, f, indent=2)
+    try:
+        repositorio = Repository.init(carpeta, nombre_proyecto, algoritmo_hash,
+                                      shared_store=almacen_compartido)
+    except OSError as e:
+        print(f"ERROR: No se pudo preparar el almacén compartido: {e}")
+        return False
     
     print("EXITO: Proyecto inicializado")
     print(f"Nombre: {nombre_proyecto}")
-    print(f"Ubicación: {Path.cwd()}")
+    print(f"Ubicación: {carpeta}")
+    print(f"Hash: {algoritmo_hash}")
+    estado = repositorio.status()
+    if estado.object_store:
+        print(f"Almacén compartido: {estado.object_store}")
     print("\nComandos disponibles:")
     print("  crx save -m 'mensaje'  # Guardar versión")
     print("  crx log                # Ver historial")
@@ -0,0 +1,1489 @@
+"""
+API de Python de Cronux-CRX
+Permite usar Cronux-CRX desde scripts sin lanzar 'crx' como subproceso:
+las operaciones devuelven resultados tipados en lugar de imprimir y el
+objeto Repository conserva sus cachés (catálogo, metadatos, manifiestos
+y stat de los archivos) entre llamadas.
+
+    from cronux import Repository
+
+    repo = Repository("ruta/al/proyecto")
+    guardado = repo.save("Primera version")
+    for version in repo.log():
+        print(version.number, version.message)
+    cambios = repo.diff()
+    if not cambios.clean:
+        repo.restore(guardado.version)
+
+Los comandos del CLI son envoltorios finos sobre este módulo. abrir()
+sin argumentos encuentra el proyecto desde cualquier subcarpeta.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import perfil
+import ubicacion
+from ubicacion import CARPETA_CRONUX
+
+# Un archivo modificado hace menos de esto podría volver a cambiar sin que
+# cambie su mtime (granularidad del sistema de archivos): no se cachea su hash
+MARGEN_CACHE_STAT_NS = 2 * 10**9
+
+# prune no borra objetos escritos o reutilizados hace menos de esto: un save
+# en marcha (de este u otro proyecto del almacén compartido) aún no los referencia
+MARGEN_PODA_S = 3600
+
+
+class CronuxError(Exception):
+    """Error base de la API de Cronux-CRX"""
+
+
+class NotARepositoryError(CronuxError):
+    """La ruta no contiene un proyecto Cronux-CRX"""
+
+
+class RepositoryExistsError(CronuxError):
+    """Ya hay un proyecto Cronux-CRX en la ruta"""
+
+
+class VersionNotFoundError(CronuxError):
+    """La versión pedida no existe"""
+
+
+class PathNotFoundError(CronuxError):
+    """Ninguna ruta de la versión coincide con las pedidas"""
+
+
+class VersionInfo(NamedTuple):
+    """Una versión guardada; los campos de metadatos son None si no hay metadatos.json"""
+    number: str
+    path: Path
+    date: str | None = None
+    message: str | None = None
+    files: int | None = None
+    error: str | None = None
+
+
+class SaveResult(NamedTuple):
+    """Resultado de Repository.save()"""
+    version: str
+    date: str
+    message: str
+    files: int
+    warnings: list[str]
+
+
+class RestoreResult(NamedTuple):
+    """Resultado de Repository.restore()"""
+    version: str
+    deleted: int
+    restored: int
+    warnings: list[str]
+
+
+class ExportResult(NamedTuple):
+    """Resultado de Repository.export()"""
+    version: str
+    format: str
+    files: int
+    bytes_read: int
+    shared: int
+
+
+class ImportResult(NamedTuple):
+    """Resultado de Repository.import_paths(), import_git() e import_fast_export()"""
+    versions: list[str]
+    files: int
+    bytes_read: int
+    bytes_written: int
+    warnings: list[str]
+
+
+class SyncResult(NamedTuple):
+    """Resultado de Repository.push() y pull()"""
+    versions: list[str]
+    objects: int
+    bytes: int
+    recovered: int
+    warnings: list[str]
+
+
+class PruneResult(NamedTuple):
+    """Resultado de Repository.prune()"""
+    objects: int
+    bytes: int
+    shared: bool
+
+
+class StatusResult(NamedTuple):
+    """Resultado de Repository.status()"""
+    name: str | None
+    created: str | None
+    author: str | None
+    hash_algorithm: str
+    path: Path
+    versions: int
+    last_version: str | None
+    object_store: Path | None = None
+
+
+class DiffResult(NamedTuple):
+    """Diferencias entre una versión y el directorio de trabajo u otra versión
+
+    target es None cuando se compara con el directorio de trabajo
+    """
+    base: str | None
+    target: str | None
+    added: list[str]
+    modified: list[str]
+    deleted: list[str]
+
+    @property
+    def clean(self):
+        return not (self.added or self.modified or self.deleted)
+
+
+def numero_de_carpeta(nombre):
+    """Convierte 'version_1.2' en (1, 2); None si el nombre no es válido"""
+    if not nombre.startswith("version_"):
+        return None
+    numero = nombre[len("version_"):]
+    try:
+        if "." in numero:
+            mayor, menor = numero.split(".")
+            return int(mayor), int(menor)
+        return int(numero), 0
+    except ValueError:
+        return None
+
+
+def normalizar_version(version):
+    """Acepta '1.2' o 'v1.2'"""
+    version = str(version)
+    return version[1:] if version.startswith("v") else version
+
+
+def normalizar_ruta(ruta, raiz):
+    """Convierte una ruta o patrón del usuario en una ruta relativa con '/'"""
+    if os.path.isabs(ruta):
+        ruta = os.path.relpath(ruta, raiz)
+    ruta = ruta.replace(os.sep, "/")
+    while ruta.startswith("./"):
+        ruta = ruta[2:]
+    return ruta.rstrip("/")
+
+
+def coincide(relativa, patron):
+    """Indica si una ruta de la versión entra en un patrón
+
+    El patrón puede ser la ruta exacta, una carpeta (incluye todo su
+    contenido) o un glob al estilo fnmatch ('*.json', 'config/*.y?ml');
+    los comodines también pueden cruzar carpetas
+    """
+    from fnmatch import fnmatchcase
+    if relativa == patron or relativa.startswith(patron + "/"):
+        return True
+    if fnmatchcase(relativa, patron):
+        return True
+    # Un glob que nombra una carpeta ('src/mod*') incluye su contenido
+    partes = relativa.split("/")
+    return any(fnmatchcase("/".join(partes[:i]), patron) for i in range(1, len(partes)))
+
+
+def palabras(texto):
+    """Palabras de un texto como las separa el índice (unicode61 remove_diacritics)
+
+    Sin mayúsculas ni acentos; todo lo que no es letra o número separa
+    """
+    import re
+    import unicodedata
+    texto = "".join(c for c in unicodedata.normalize("NFKD", texto)
+                    if not unicodedata.combining(c))
+    return re.findall(r"[^\W_]+", texto.casefold())
+
+
+def mensaje_contiene(mensaje, texto):
+    """Búsqueda de 'crx log --grep' sin índice, con el mismo resultado que indice.consulta
+
+    Cada término es una frase: sus palabras seguidas en el mensaje; 'term*'
+    busca la última por prefijo. Un término sin palabras no filtra nada, y
+    si ninguno tiene palabras no hay resultados.
+    """
+    frases = []
+    for termino in texto.split():
+        prefijo = termino.endswith("*")
+        partes = palabras(termino.rstrip("*"))
+        if partes:
+            frases.append((partes, prefijo))
+    if not frases or mensaje is None:
+        return False
+    escritas = palabras(mensaje)
+
+    def aparece(partes, prefijo):
+        n = len(partes)
+        for i in range(len(escritas) - n + 1):
+            if (escritas[i:i + n - 1] == partes[:-1]
+                    and (escritas[i + n - 1].startswith(partes[-1]) if prefijo
+                         else escritas[i + n - 1] == partes[-1])):
+                return True
+        return False
+
+    return all(aparece(partes, prefijo) for partes, prefijo in frases)
+
+
+def rutas_cambiadas(anterior, actual):
+    """Rutas añadidas, modificadas o borradas entre dos manifiestos (ruta -> entrada)
+
+    Una entrada sin hash (versión sin manifiesto) cuenta siempre como cambiada
+    """
+    from manifiesto import como_dict
+
+    # Dos manifiestos binarios se recorren juntos en orden de ruta; si uno
+    # es un dict (en otro orden), el otro se decodifica entero
+    if isinstance(anterior, dict) or isinstance(actual, dict):
+        anterior, actual = como_dict(anterior), como_dict(actual)
+    cambiadas = [relativa for relativa, entrada in actual.items()
+                 if entrada.get("hash") is None
+                 or anterior.get(relativa, {}).get("hash") != entrada["hash"]]
+    cambiadas.extend(relativa for relativa in anterior if relativa not in actual)
+    return cambiadas
+
+
+class Repository:
+    """Proyecto Cronux-CRX en una ruta
+
+    La lista de versiones se revalida con un único stat de la carpeta
+    versiones. Los metadatos y manifiestos no cambian una vez guardados,
+    así que se conservan mientras la versión siga existiendo.
+    """
+
+    def __init__(self, path="."):
+        self.root = Path(os.path.abspath(path))
+        self.cronux_dir = self.root / CARPETA_CRONUX
+        if not (self.cronux_dir / "proyecto.json").exists():
+            raise NotARepositoryError(f"No hay un proyecto Cronux-CRX en {self.root}")
+
+        self._versiones_dir = self.cronux_dir / "versiones"
+        self._catalogo = {"clave": None, "versiones": []}
+        self._metadatos = {}
+        self._manifiestos = {}
+        self._proyecto = {"clave": None, "datos": None}
+        # Caché de stat: ruta relativa -> (tamaño, mtime_ns, inodo, algoritmo, hash);
+        # el inodo es None si la entrada sale de un manifiesto
+        self._estados = {}
+        self._sembrados = set()
+        self._objetos = None
+        # Índice de mensajes (indice.py) y versiones escritas aún sin indexar
+        self._indice = None
+        self._por_indexar = []
+        self._clave_sin_indexar = None
+
+    def __repr__(self):
+        return f"Repository({str(self.root)!r})"
+
+    @classmethod
+    def init(cls, path, name, hash_algorithm=None, author="usuario", shared_store=None):
+        """Crea un proyecto nuevo en la ruta (y sus carpetas si faltan) y lo devuelve abierto
+
+        Con 'shared_store' (una ruta, o True para CRONUX_STORE o
+        ~/.cronux-store) el contenido se guarda en ese almacén compartido
+        """
+        from datetime import datetime
+        from archivos import ALGORITMOS_HASH, ALGORITMO_POR_DEFECTO
+
+        raiz = Path(os.path.abspath(path))
+        carpeta_cronux = raiz / CARPETA_CRONUX
+        if (carpeta_cronux / "proyecto.json").exists():
+            raise RepositoryExistsError(f"Ya existe un proyecto Cronux-CRX en {raiz}")
+
+        hash_algorithm = hash_algorithm or ALGORITMO_POR_DEFECTO
+        if hash_algorithm not in ALGORITMOS_HASH:
+            raise ValueError(
+                f"Algoritmo de hash desconocido '{hash_algorithm}' "
+                f"(disponibles: {', '.join(ALGORITMOS_HASH)})"
+            )
+
+        carpeta_cronux.mkdir(parents=True, exist_ok=True)
+        datos_proyecto = {
+            "nombre": name,
+            "fecha_creacion": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "autor": author,
+            "hash": hash_algorithm
+        }
+        if shared_store:
+            import uuid
+            from archivos import algoritmo_objetos
+            from almacen import Almacen, ruta_almacen_compartido
+            ruta = ruta_almacen_compartido(shared_store if shared_store is not True else None)
+            datos_proyecto["almacen"] = ruta
+            datos_proyecto["id"] = uuid.uuid4().hex
+            Almacen(ruta, algoritmo_objetos(hash_algorithm), compartido=True).registrar_proyecto(
+                datos_proyecto["id"], {"nombre": name, "ruta": str(raiz)})
+        with open(carpeta_cronux / "proyecto.json", "w") as f:
+            json.dump(datos_proyecto, f, indent=2)
+        # Las carpetas de debajo ahora pertenecen a este proyecto
+        ubicacion.olvidar()
+        return cls(raiz)
+
+    # Datos del proyecto y catálogo de versiones
+
+    def _datos_proyecto(self):
+        """Contenido de proyecto.json, releído solo si el archivo cambia"""
+        ruta = self.cronux_dir / "proyecto.json"
+        st = os.stat(ruta)
+        clave = (st.st_mtime_ns, st.st_size)
+        if self._proyecto["clave"] != clave:
+            with open(ruta, "r") as f:
+                self._proyecto["datos"] = json.load(f)
+            self._proyecto["clave"] = clave
+        return self._proyecto["datos"]
+
+    @property
+    def hash_algorithm(self):
+        """Algoritmo de hash del proyecto"""
+        try:
+            algoritmo = self._datos_proyecto().get("hash")
+        except (OSError, ValueError):
+            algoritmo = None
+        if algoritmo:
+            return algoritmo
+        # archivos (hashlib, mmap...) solo se importa si hace falta el valor por defecto
+        from archivos import ALGORITMO_POR_DEFECTO
+        return ALGORITMO_POR_DEFECTO
+
+    def _clave_catalogo(self):
+        """Clave que cambia al crear o borrar una versión (None si aún no hay carpeta versiones)"""
+        try:
+            st = os.stat(self._versiones_dir)
+        except FileNotFoundError:
+            return None
+        # Crear o borrar una versión cambia el mtime y el número de enlaces de la carpeta
+        return (st.st_ino, st.st_mtime_ns, st.st_nlink)
+
+    def _listar_versiones(self):
+        """Devuelve [(mayor, menor, numero, carpeta)] de la versión más antigua a la más nueva"""
+        clave = self._clave_catalogo()
+        if clave is None:
+            return []
+
+        if self._catalogo["clave"] != clave:
+            versiones = []
+            with os.scandir(self._versiones_dir) as entradas:
+                for entrada in entradas:
+                    numero = numero_de_carpeta(entrada.name)
+                    if numero is not None and entrada.is_dir():
+                        texto = entrada.name[len("version_"):]
+                        versiones.append((numero[0], numero[1], texto,
+                                          self._versiones_dir / entrada.name))
+            versiones.sort()
+
+            # Olvidar lo que ya no existe
+            vigentes = {str(v[3]) for v in versiones}
+            for cache in (self._metadatos, self._manifiestos):
+                for ruta in [r for r in cache if r not in vigentes]:
+                    del cache[ruta]
+
+            self._catalogo["clave"] = clave
+            self._catalogo["versiones"] = versiones
+
+        return self._catalogo["versiones"]
+
+    def _carpeta_version(self, version):
+        """Carpeta de una versión; VersionNotFoundError si no existe"""
+        version = normalizar_version(version)
+        carpeta = self._versiones_dir / f"version_{version}"
+        if not carpeta.is_dir():
+            raise VersionNotFoundError(f"La version '{version}' no existe")
+        return version, carpeta
+
+    def _leer_metadatos(self, carpeta):
+        """Metadatos de una versión (None si no tiene metadatos.json)"""
+        clave = str(carpeta)
+        if clave not in self._metadatos:
+            try:
+                with open(os.path.join(clave, "metadatos.json"), "r") as f:
+                    self._metadatos[clave] = json.load(f)
+            except FileNotFoundError:
+                return None
+        return self._metadatos[clave]
+
+    def _leer_manifiesto(self, carpeta, cachear=True):
+        """Manifiesto de una versión
+
+        Los binarios se abren sin decodificar sus entradas (manifiesto.py).
+        Las versiones guardadas antes de los manifiestos se hashean una vez
+        y el resultado queda en memoria. Con cachear=False (recorridos de
+        todas las versiones) no se guarda nada nuevo en la caché.
+        """
+        from manifiesto import leer
+
+        clave = str(carpeta)
+        if clave in self._manifiestos:
+            return self._manifiestos[clave]
+        try:
+            manifiesto = leer(clave)
+        except FileNotFoundError:
+            manifiesto = self._manifiesto_de_carpeta(carpeta)
+        if cachear:
+            self._manifiestos[clave] = manifiesto
+        return manifiesto
+
+    def _manifiesto_de_carpeta(self, carpeta):
+        """Calcula el manifiesto de una versión que no lo guardó"""
+        from archivos import hashear_archivo, cabecera_manifiesto, recorrer
+        algoritmo = self.hash_algorithm
+        archivos = {}
+        for relativa, ruta, st in recorrer(carpeta, ignorar={"metadatos.json"}):
+            archivos[relativa] = {"hash": hashear_archivo(ruta, algoritmo), "tamano": st.st_size}
+        return {**cabecera_manifiesto(algoritmo), "archivos": archivos}
+
+    def _tiene_manifiesto(self, carpeta):
+        from manifiesto import existe
+        return str(carpeta) in self._manifiestos or existe(carpeta)
+
+    def _en_almacen(self, carpeta):
+        """Indica si la versión guarda su contenido en el almacén de objetos
+
+        Las versiones anteriores al almacén son copias completas en su carpeta
+        """
+        return (self._tiene_manifiesto(carpeta)
+                and self._leer_manifiesto(carpeta).get("almacen") == "objetos")
+
+    def _manifiesto_en_almacen(self, carpeta):
+        """Manifiesto de una versión del almacén de objetos, sin dejarlo en caché; None si es una copia"""
+        if not self._tiene_manifiesto(carpeta):
+            return None
+        manifiesto = self._leer_manifiesto(carpeta, cachear=False)
+        return manifiesto if manifiesto.get("almacen") == "objetos" else None
+
+    def _almacen(self):
+        """Almacén de objetos del proyecto (uno por Repository, con su caché)
+
+        Con crc32 o xxh3 los objetos se nombran con un hash criptográfico
+        (archivos.algoritmo_objetos)
+        """
+        if self._objetos is None:
+            from archivos import algoritmo_objetos
+            from almacen import Almacen
+            compartido = self._datos_proyecto().get("almacen")
+            algoritmo = algoritmo_objetos(self.hash_algorithm)
+            if compartido:
+                self._objetos = Almacen(compartido, algoritmo, compartido=True)
+            else:
+                self._objetos = Almacen(self.cronux_dir, algoritmo)
+        return self._objetos
+
+    def _ruta_en_version(self, carpeta, relativa):
+        """Ruta donde está guardado el contenido de un archivo de la versión
+
+        Es el único sitio que sabe dónde vive el contenido; None si la
+        versión no tiene ese archivo (solo se sabe en el almacén de objetos)
+        """
+        if self._en_almacen(carpeta):
+            entrada = self._leer_manifiesto(carpeta)["archivos"].get(relativa)
+            return Path(self._almacen().ruta(entrada["hash"])) if entrada else None
+        return carpeta.joinpath(*relativa.split("/"))
+
+    def open_file(self, version, path):
+        """Abre en binario (solo lectura) un archivo guardado en una versión"""
+        version, carpeta = self._carpeta_version(version)
+        relativa = normalizar_ruta(path, self.root)
+        primera = relativa.split("/")[0]
+        # metadatos.json y los ocultos de la versión no son archivos del proyecto
+        ruta = None
+        if primera and not primera.startswith(".") and relativa != "metadatos.json":
+            ruta = self._ruta_en_version(carpeta, relativa)
+        if ruta is None or not ruta.is_file():
+            raise PathNotFoundError(f"'{relativa}' no existe en la version '{version}'")
+        return open(ruta, "rb")
+
+    def cat(self, version, path, output, offset=0, length=None):
+        """Escribe un archivo de una versión (o el rango offset/length) en 'output'
+
+        'output' es un objeto archivo binario o un descriptor; la memoria
+        usada no depende del tamaño. Devuelve los bytes escritos.
+        """
+        from archivos import volcar
+        with self.open_file(version, path) as f:
+            return volcar(f, output, offset, length)
+
+    def export(self, version, output, format="tar"):
+        """Escribe una versión como tar, tar.gz o zip en 'output' en una sola pasada
+
+        'output' es un objeto archivo binario; no hace falta que admita seek,
+        así que puede ser stdout. Los archivos con el mismo hash se leen una
+        sola vez (en tar se exportan como enlaces duros).
+        """
+        from exportar import escribir_archivo
+
+        version, carpeta = self._carpeta_version(version)
+        with perfil.fase("walk"):
+            if self._tiene_manifiesto(carpeta):
+                manifiesto = self._leer_manifiesto(carpeta)["archivos"]
+                relativas = list(manifiesto)
+            else:
+                # Sin manifiesto no se conoce el hash: cada archivo se exporta tal cual
+                manifiesto = {}
+                relativas = self._archivos_version(carpeta)
+
+        # Las carpetas vacías van en orden entre los archivos, sin ruta de contenido
+        vacias = set(self._carpetas_vacias(carpeta))
+        entradas = (
+            (relativa, None, None, None) if relativa in vacias else
+            (relativa, self._ruta_en_version(carpeta, relativa),
+             manifiesto[relativa]["hash"] if relativa in manifiesto else None,
+             manifiesto[relativa].get("modo") if relativa in manifiesto else None)
+            for relativa in sorted(relativas + list(vacias))
+        )
+        archivos, leidos, compartidas = escribir_archivo(output, format, entradas)
+        return ExportResult(version, format, archivos, leidos, compartidas)
+
+    def _archivos_version(self, carpeta):
+        """Rutas relativas de los archivos de una versión
+
+        Sale del manifiesto; solo las versiones sin manifiesto se recorren
+        """
+        if self._tiene_manifiesto(carpeta):
+            return list(self._leer_manifiesto(carpeta)["archivos"])
+        from archivos import recorrer
+        return [relativa for relativa, _, _ in recorrer(carpeta, ignorar={"metadatos.json"})]
+
+    def files(self, version, paths=None):
+        """Archivos de una versión, opcionalmente filtrados por rutas o patrones"""
+        _, carpeta = self._carpeta_version(version)
+        archivos = self._archivos_version(carpeta)
+        if paths is not None:
+            patrones = [normalizar_ruta(p, self.root) for p in paths]
+            archivos = [a for a in archivos if any(coincide(a, p) for p in patrones)]
+        return sorted(archivos)
+
+    def _info(self, numero, carpeta):
+        """VersionInfo a partir de los metadatos de la carpeta"""
+        try:
+            with perfil.fase("metadata"):
+                metadatos = self._leer_metadatos(carpeta)
+            if metadatos is None:
+                return VersionInfo(numero, carpeta)
+            return VersionInfo(numero, carpeta, metadatos["fecha"], metadatos["mensaje"],
+                               metadatos.get("archivos_guardados"))
+        except (OSError, ValueError, KeyError) as e:
+            return VersionInfo(numero, carpeta, error=str(e))
+
+    def next_version(self):
+        """Número que recibirá la próxima versión guardada"""
+        versiones = self._listar_versiones()
+        if not versiones:
+            return "1.0"
+        # Incrementar versión menor de la versión más alta
+        ultimo_mayor, ultimo_menor = versiones[-1][0], versiones[-1][1]
+        return f"{ultimo_mayor}.{ultimo_menor + 1}"
+
+    def version(self, version):
+        """Información de una versión concreta"""
+        numero, carpeta = self._carpeta_version(version)
+        return self._info(numero, carpeta)
+
+    def log(self, grep=None, paths=None):
+        """Versiones guardadas, de la más reciente a la más antigua
+
+        Con 'grep', solo las que tienen en el mensaje todos esos términos
+        (sin distinguir mayúsculas ni acentos; 'term*' busca por prefijo).
+        Con 'paths', solo las que cambiaron alguna de esas rutas, carpetas
+        o patrones (añadir, modificar o borrar un archivo cuenta)
+        """
+        if grep is not None or paths is not None:
+            return self._buscar(grep, paths)
+        with perfil.fase("walk"):
+            versiones = self._listar_versiones()
+        return [self._info(numero, carpeta) for _, _, numero, carpeta in reversed(versiones)]
+
+    # Índice de búsqueda
+
+    def _abrir_indice(self):
+        """Índice del proyecto, o None si este Python no tiene sqlite3 con FTS5"""
+        if self._indice is None:
+            try:
+                import indice
+            except ImportError:
+                return None
+            if not indice.disponible():
+                return None
+            self._indice = indice.Indice(self.cronux_dir / indice.NOMBRE_INDICE)
+        return self._indice
+
+    def _entradas_de(self, carpeta):
+        """Archivos de una versión (ruta -> entrada) sin dejar el manifiesto en caché
+
+        Las versiones sin manifiesto dan entradas sin hash, que cuentan
+        siempre como cambiadas
+        """
+        from manifiesto import leer
+
+        clave = str(carpeta)
+        if clave in self._manifiestos:
+            return self._manifiestos[clave]["archivos"]
+        try:
+            return leer(clave)["archivos"]
+        except FileNotFoundError:
+            return dict.fromkeys(self._archivos_version(carpeta), {})
+
+    def _indexar(self):
+        """Añade al índice las versiones escritas desde la última llamada
+
+        Si el índice estaba al día antes de escribirlas, lo sigue estando y
+        se anota la clave nueva del catálogo; si no, la próxima búsqueda lo
+        completa. Un fallo del índice nunca hace fallar lo ya guardado.
+        """
+        pendientes, self._por_indexar = self._por_indexar, []
+        if not pendientes:
+            return
+        try:
+            from indice import ErrorIndice, fila, filas_cambios, texto_clave
+        except ImportError:
+            return
+        try:
+            indice = self._abrir_indice()
+            if indice is None:
+                return
+            clave = None
+            if indice.clave() == texto_clave(self._clave_sin_indexar):
+                clave = texto_clave(self._clave_catalogo())
+            indice.actualizar([fila(numero, metadatos) for numero, metadatos, _ in pendientes],
+                              [c for numero, _, rutas in pendientes
+                               for c in filas_cambios(numero, rutas)],
+                              clave=clave)
+        except ErrorIndice:
+            pass
+
+    def _sincronizar_indice(self, indice):
+        """Pone el índice al día si el catálogo cambió sin pasar por _indexar
+
+        Las versiones que siguen a una borrada se reindexan: sus cambios se
+        cuentan ahora respecto a otra versión
+        """
+        from indice import fila, filas_cambios, texto_clave
+
+        clave = texto_clave(self._clave_catalogo())
+        if indice.clave() == clave:
+            return
+        versiones = self._listar_versiones()
+        vigentes = {numero for _, _, numero, _ in versiones}
+        indexadas = indice.versiones()
+        quitadas = indexadas - vigentes
+        pendientes = vigentes - indexadas
+        if quitadas:
+            from bisect import bisect
+            orden = [(mayor, menor) for mayor, menor, _, _ in versiones]
+            for numero in quitadas:
+                posicion = bisect(orden, numero_de_carpeta(f"version_{numero}"))
+                if posicion < len(versiones):
+                    pendientes.add(versiones[posicion][2])
+
+        nuevas, cambios = [], []
+        previa = (None, {})
+        for i, (_, _, numero, carpeta) in enumerate(versiones):
+            if numero not in pendientes:
+                continue
+            anterior = {}
+            if i > 0:
+                if previa[0] != versiones[i - 1][2]:
+                    previa = (versiones[i - 1][2], self._entradas_de(versiones[i - 1][3]))
+                anterior = previa[1]
+            try:
+                metadatos = self._leer_metadatos(carpeta)
+            except (OSError, ValueError):
+                metadatos = None
+            entradas = self._entradas_de(carpeta)
+            nuevas.append(fila(numero, metadatos))
+            cambios.extend(filas_cambios(numero, rutas_cambiadas(anterior, entradas)))
+            previa = (numero, entradas)
+        # Las reindexadas se quitan antes de volver a añadirse
+        indice.actualizar(nuevas, cambios, quitadas | (pendientes & indexadas), clave)
+
+    def _buscar(self, texto, paths):
+        """Versiones filtradas por mensaje y por rutas cambiadas, de la más reciente a la más antigua"""
+        patrones = None
+        if paths is not None:
+            patrones = [normalizar_ruta(p, self.root) for p in paths]
+            patrones = ["" if p == "." else p for p in patrones]
+
+        try:
+            from indice import ErrorIndice
+        except ImportError:
+            ErrorIndice = None
+        if ErrorIndice is not None:
+            try:
+                indice = self._abrir_indice()
+                if indice is not None:
+                    with perfil.fase("metadata"):
+                        self._sincronizar_indice(indice)
+                        prefijos = exactas = None
+                        if patrones is not None:
+                            prefijos = [p for p in patrones if not any(c in p for c in "*?[")]
+                            globs = [p for p in patrones if p not in prefijos]
+                            if globs:
+                                exactas = [r for r in indice.rutas()
+                                           if any(coincide(r, g) for g in globs)]
+                        filas = indice.buscar(texto, prefijos, exactas)
+                    return [VersionInfo(numero, self._versiones_dir / f"version_{numero}",
+                                        fecha, mensaje, archivos)
+                            for numero, fecha, mensaje, archivos in filas]
+            except ErrorIndice:
+                pass
+
+        # Sin índice (sqlite3 sin FTS5, proyecto de solo lectura...): se leen
+        # los metadatos y, si hay rutas, los manifiestos uno a uno
+        versiones = self.log()
+        if texto is not None:
+            versiones = [v for v in versiones if mensaje_contiene(v.message, texto)]
+        if patrones is not None:
+            tocadas = set()
+            anterior = {}
+            for _, _, numero, carpeta in self._listar_versiones():
+                entradas = self._entradas_de(carpeta)
+                if any(coincide(r, p) or not p for r in rutas_cambiadas(anterior, entradas)
+                       for p in patrones):
+                    tocadas.add(numero)
+                anterior = entradas
+            versiones = [v for v in versiones if v.number in tocadas]
+        return versiones
+
+    def status(self):
+        """Datos del proyecto y de sus versiones (sin recorrer el directorio de trabajo)"""
+        datos = self._datos_proyecto()
+        with perfil.fase("walk"):
+            versiones = self._listar_versiones()
+        return StatusResult(
+            name=datos.get("nombre"),
+            created=datos.get("fecha_creacion"),
+            author=datos.get("autor"),
+            hash_algorithm=datos.get("hash") or self.hash_algorithm,
+            path=self.root,
+            versions=len(versiones),
+            last_version=versiones[-1][2] if versiones else None,
+            object_store=Path(datos["almacen"]) if datos.get("almacen") else None
+        )
+
+    # Directorio de trabajo
+
+    def _recordar_hash(self, relativa, st, algoritmo, valor, ahora=None):
+        """Guarda un hash en la caché de stat si el archivo no es demasiado reciente"""
+        ahora = ahora or time.time_ns()
+        if ahora - st.st_mtime_ns > MARGEN_CACHE_STAT_NS:
+            self._estados[relativa] = (st.st_size, st.st_mtime_ns, st.st_ino, algoritmo, valor)
+
+    def _sembrar_estados(self, carpeta):
+        """Llena la caché de stat con el tamaño y mtime que guardó el manifiesto
+
+        Así, en un proceso nuevo, diff y save no releen los archivos que no
+        han cambiado desde esa versión. Solo valen las entradas que ya eran
+        antiguas al guardarla; el inodo no se conoce y queda como None.
+        """
+        clave = str(carpeta)
+        if clave in self._sembrados or not self._en_almacen(carpeta):
+            return
+        self._sembrados.add(clave)
+        manifiesto = self._leer_manifiesto(carpeta)
+        guardado = manifiesto.get("guardado_ns")
+        if guardado is None:
+            return
+        algoritmo = manifiesto["algoritmo"]
+        for relativa, entrada in manifiesto["archivos"].items():
+            if relativa not in self._estados and guardado - entrada["mtime"] > MARGEN_CACHE_STAT_NS:
+                self._estados[relativa] = (entrada["tamano"], entrada["mtime"], None,
+                                           algoritmo, entrada["hash"])
+
+    def _hash_en_cache(self, relativa, st, algoritmo):
+        """Hash de la caché de stat si el archivo no ha cambiado; None si no se sabe"""
+        cache = self._estados.get(relativa)
+        if (cache is not None and cache[0] == st.st_size and cache[1] == st.st_mtime_ns
+                and cache[2] in (None, st.st_ino) and cache[3] == algoritmo):
+            perfil.contar("cache_stat")
+            return cache[4]
+        return None
+
+    def _hash_actual(self, relativa, ruta, st, algoritmo):
+        """Hash de un archivo de trabajo, sin leerlo si su stat no ha cambiado"""
+        valor = self._hash_en_cache(relativa, st, algoritmo)
+        if valor is not None:
+            return valor
+        from archivos import hashear_archivo
+        with perfil.fase("hash"):
+            valor = hashear_archivo(ruta, algoritmo)
+        perfil.contar("bytes", st.st_size)
+        self._recordar_hash(relativa, st, algoritmo, valor)
+        return valor
+
+    def diff(self, version=None, other=None):
+        """Compara una versión (por defecto la última) con el directorio de trabajo
+
+        Con 'other' compara dos versiones guardadas. Los archivos de trabajo
+        solo se leen si su tamaño coincide y su stat no está en la caché.
+        """
+        if version is None:
+            versiones = self._listar_versiones()
+            version = versiones[-1][2] if versiones else None
+
+        if version is None:
+            base = {}
+            algoritmo = self.hash_algorithm
+        else:
+            version, carpeta = self._carpeta_version(version)
+            manifiesto = self._leer_manifiesto(carpeta)
+            base = manifiesto["archivos"]
+            algoritmo = manifiesto.get("algoritmo", self.hash_algorithm)
+
+        nuevos, modificados = [], []
+        if other is not None:
+            other, carpeta_otra = self._carpeta_version(other)
+            destino = self._leer_manifiesto(carpeta_otra)["archivos"]
+            for relativa, entrada in destino.items():
+                anterior = base.get(relativa)
+                if anterior is None:
+                    nuevos.append(relativa)
+                elif anterior["hash"] != entrada["hash"]:
+                    modificados.append(relativa)
+            vistos = destino
+        else:
+            from archivos import recorrer
+            from manifiesto import como_dict
+            if version is not None:
+                self._sembrar_estados(carpeta)
+            # El disco se recorre en cualquier orden
+            base = como_dict(base)
+            vistos = set()
+            with perfil.fase("walk"):
+                archivos = list(recorrer(self.root))
+            for relativa, ruta, st in archivos:
+                perfil.contar("archivos")
+                vistos.add(relativa)
+                anterior = base.get(relativa)
+                if anterior is None:
+                    nuevos.append(relativa)
+                elif (anterior["tamano"] != st.st_size
+                        or self._hash_actual(relativa, ruta, st, algoritmo) != anterior["hash"]):
+                    modificados.append(relativa)
+
+        eliminados = [r for r in base if r not in vistos]
+        return DiffResult(version, other, sorted(nuevos), sorted(modificados), sorted(eliminados))
+
+    # Operaciones que escriben
+
+    def _escribir_version(self, numero, metadatos, manifiesto, anterior, cachear=True):
+        """Crea la carpeta de una versión con sus metadatos y su manifiesto
+
+        Se escribe en una carpeta oculta y se renombra al final: una versión
+        interrumpida nunca aparece en el catálogo. 'anterior' son los archivos
+        de la versión previa, para anotar en el índice qué rutas cambiaron.
+        """
+        if not self._por_indexar:
+            self._clave_sin_indexar = self._clave_catalogo()
+        self._versiones_dir.mkdir(exist_ok=True)
+        carpeta = self._versiones_dir / f"version_{numero}"
+        temporal = self._versiones_dir / f".version_{numero}.crx-tmp"
+        temporal.mkdir(exist_ok=True)
+
+        with perfil.fase("metadata"):
+            with open(temporal / "metadatos.json", "w") as f:
+                json.dump(metadatos, f, indent=2)
+
+            # Manifiesto con el hash de cada archivo (oculto para no chocar
+            # con archivos del proyecto, que nunca empiezan por '.')
+            from manifiesto import escribir
+            escribir(temporal, manifiesto)
+            os.rename(temporal, carpeta)
+
+            almacen = self._almacen()
+            if almacen.compartido:
+                almacen.registrar_version(self._datos_proyecto()["id"], numero,
+                                          (e["hash"] for e in manifiesto["archivos"].values()))
+
+        self._por_indexar.append((numero, metadatos,
+                                  rutas_cambiadas(anterior, manifiesto["archivos"])))
+        # Lo recién escrito ya está en memoria: la siguiente consulta no relee nada
+        self._metadatos[str(carpeta)] = metadatos
+        if cachear:
+            self._manifiestos[str(carpeta)] = manifiesto
+        return carpeta
+
+    def save(self, message=None):
+        """Guarda el directorio de trabajo como una versión nueva
+
+        El contenido va al almacén de objetos; los archivos que no cambiaron
+        desde la versión anterior ni se copian ni, si su stat es el mismo, se leen
+        """
+        import stat
+        from datetime import datetime
+        from archivos import recorrer, cabecera_manifiesto
+
+        with perfil.fase("metadata"):
+            numero_version = self.next_version()
+            versiones = self._listar_versiones()
+            anterior = {}
+            if versiones and self._tiene_manifiesto(versiones[-1][3]):
+                from manifiesto import como_dict
+                anterior = como_dict(self._leer_manifiesto(versiones[-1][3])["archivos"])
+                self._sembrar_estados(versiones[-1][3])
+
+        almacen = self._almacen()
+        # El manifiesto lleva los nombres de los objetos: su algoritmo es el del almacén
+        algoritmo = almacen.algoritmo
+        manifiesto = {}
+        principales = set()
+        avisos = []
+        # Antes del recorrido: lo modificado después no se da por estable
+        guardado = time.time_ns()
+        vacias = []
+        with perfil.fase("walk"):
+            archivos = list(recorrer(self.root, avisos=avisos, vacias=vacias))
+
+        for relativa, ruta, st in archivos:
+            perfil.contar("archivos")
+            try:
+                valor = self._hash_en_cache(relativa, st, algoritmo)
+                if valor is None or not almacen.existe(valor):
+                    previa = anterior.get(relativa)
+                    valor, _ = almacen.guardar_archivo(
+                        ruta, st.st_size,
+                        probablemente_nuevo=previa is None or previa["tamano"] != st.st_size)
+                    self._recordar_hash(relativa, st, algoritmo, valor, guardado)
+            except OSError as e:
+                avisos.append(f"No se pudo copiar {relativa}: {e}")
+                continue
+            manifiesto[relativa] = {
+                "hash": valor,
+                "tamano": st.st_size,
+                "modo": stat.S_IMODE(st.st_mode),
+                "mtime": st.st_mtime_ns
+            }
+            principales.add(relativa.split("/")[0])
+        principales.update(relativa.split("/")[0] for relativa in vacias)
+
+        metadatos = {
+            "version": numero_version,
+            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "mensaje": message or "Sin mensaje",
+            "archivos_guardados": len(principales)
+        }
+        contenido_manifiesto = {**cabecera_manifiesto(algoritmo), "almacen": "objetos",
+                                "guardado_ns": guardado, "archivos": manifiesto}
+        if vacias:
+            # Las carpetas vacías no tienen objeto: van en la cabecera
+            contenido_manifiesto["carpetas_vacias"] = sorted(vacias)
+        carpeta = self._escribir_version(numero_version, metadatos, contenido_manifiesto, anterior)
+        self._sembrados.add(str(carpeta))
+        self._indexar()
+
+        return SaveResult(numero_version, metadatos["fecha"], metadatos["mensaje"],
+                          len(principales), avisos)
+
+    def _limpiar_trabajo(self, avisos):
+        """Borra el directorio de trabajo (excepto .cronux y ocultos); devuelve lo borrado"""
+        import shutil
+
+        archivos_eliminados = 0
+        with perfil.fase("walk"):
+            items = list(self.root.iterdir())
+
+        for item in items:
+            if item.name != CARPETA_CRONUX and not item.name.startswith('.'):
+                try:
+                    with perfil.fase("delete"):
+                        if item.is_file():
+                            item.unlink()
+                            archivos_eliminados += 1
+                        elif item.is_dir():
+                            shutil.rmtree(item)
+                            archivos_eliminados += 1
+                except Exception as e:
+                    avisos.append(f"No se pudo eliminar {item.name}: {e}")
+        return archivos_eliminados
+
+    def _escribir_desde_version(self, carpeta, relativa, entrada, algoritmo=None, raiz=None):
+        """Escribe un archivo de la versión en el directorio de trabajo (o en 'raiz')
+
+        Se copia a un temporal junto al destino y se renombra encima. Con
+        'algoritmo' se hashea mientras se copia y se devuelve el hash.
+        Los permisos y la fecha salen del manifiesto si los guardó.
+        """
+        import shutil
+        from archivos import copiar_archivo
+
+        origen = self._ruta_en_version(carpeta, relativa)
+        destino = (raiz or self.root).joinpath(*relativa.split("/"))
+        temporal = destino.with_name(f".{destino.name}.crx-tmp")
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        valor = None
+        try:
+            if algoritmo:
+                # copiar_archivo ya mide sus fases (read, hash y write)
+                valor = copiar_archivo(origen, temporal, algoritmo)
+            else:
+                with perfil.fase("write"):
+                    shutil.copy2(origen, temporal)
+            with perfil.fase("metadata"):
+                if entrada is not None and "modo" in entrada:
+                    os.chmod(temporal, entrada["modo"])
+                    os.utime(temporal, ns=(entrada["mtime"], entrada["mtime"]))
+                os.replace(temporal, destino)
+        except BaseException:
+            if os.path.lexists(temporal):
+                os.unlink(temporal)
+            raise
+        return destino, valor
+
+    def restore(self, version, paths=None, into=None):
+        """Sustituye el directorio de trabajo por el contenido de una versión
+
+        Con 'paths' solo se escriben los archivos que coinciden con esas
+        rutas o patrones; el resto del directorio de trabajo no se toca.
+        Con 'into' los archivos se escriben en esa carpeta y el directorio de
+        trabajo queda intacto; allí no se borra nada.
+        """
+        version, carpeta_version = self._carpeta_version(version)
+        if into is not None:
+            raiz = Path(os.path.abspath(into))
+            if raiz == self.root or raiz == self.cronux_dir or self.cronux_dir in raiz.parents:
+                raise ValueError(f"--into no puede ser el proyecto ni estar dentro de {CARPETA_CRONUX}")
+            return self._restaurar_rutas(version, carpeta_version, paths, raiz)
+        if paths is not None:
+            return self._restaurar_rutas(version, carpeta_version, paths)
+        if not self._en_almacen(carpeta_version):
+            return self._restaurar_copia(version, carpeta_version)
+
+        avisos = []
+        archivos_eliminados = self._limpiar_trabajo(avisos)
+
+        entradas = self._leer_manifiesto(carpeta_version)["archivos"]
+        principales = set()
+        fallidos = set()
+        for relativa in sorted(entradas):
+            principal = relativa.split("/")[0]
+            try:
+                self._escribir_desde_version(carpeta_version, relativa, entradas[relativa])
+            except Exception as e:
+                avisos.append(f"Error restaurando {relativa}: {e}")
+                fallidos.add(principal)
+                continue
+            principales.add(principal)
+        principales.update(self._crear_carpetas_vacias(
+            self._carpetas_vacias(carpeta_version), self.root, avisos))
+
+        # Los archivos de trabajo son otros: sus stat ya no valen. Conservan la
+        # fecha del manifiesto, así que la siguiente consulta siembra la caché de él
+        self._estados.clear()
+        self._sembrados.clear()
+
+        perfil.contar("archivos", len(entradas))
+        perfil.contar("bytes_escritos", sum(e["tamano"] for e in entradas.values()))
+        return RestoreResult(version, archivos_eliminados, len(principales - fallidos), avisos)
+
+    def _restaurar_copia(self, version, carpeta_version):
+        """Restauración completa de una versión guardada como copia en su carpeta"""
+        import shutil
+
+        avisos = []
+        archivos_eliminados = self._limpiar_trabajo(avisos)
+
+        # Restaurar archivos de la versión
+        archivos_restaurados = 0
+        with perfil.fase("walk"):
+            items = list(carpeta_version.iterdir())
+
+        for item in items:
+            if item.name != "metadatos.json" and not item.name.startswith('.'):
+                destino = self.root / item.name
+                try:
+                    with perfil.fase("write"):
+                        if item.is_file():
+                            shutil.copy2(item, destino)
+                            archivos_restaurados += 1
+                        elif item.is_dir():
+                            shutil.copytree(item, destino)
+                            archivos_restaurados += 1
+                except Exception as e:
+                    avisos.append(f"Error restaurando {item.name}: {e}")
+
+        # Los archivos de trabajo son otros: sus stat ya no valen
+        self._estados.clear()
+        self._sembrados.clear()
+
+        if perfil.ACTIVO and self._tiene_manifiesto(carpeta_version):
+            # Los contadores salen del manifiesto para no recorrer de nuevo el árbol
+            entradas = self._leer_manifiesto(carpeta_version)["archivos"]
+            perfil.contar("archivos", len(entradas))
+            perfil.contar("bytes_escritos", sum(e["tamano"] for e in entradas.values()))
+
+        return RestoreResult(version, archivos_eliminados, archivos_restaurados, avisos)
+
+    def _restaurar_rutas(self, version, carpeta_version, paths, raiz=None):
+        """Restaura solo los archivos pedidos, cada uno con un reemplazo atómico
+
+        Solo se leen los objetos de los archivos elegidos. Con 'raiz' se
+        escriben en otra carpeta (todos si 'paths' es None).
+        """
+        with perfil.fase("walk"):
+            archivos = self._archivos_version(carpeta_version)
+        carpetas = self._carpetas_vacias(carpeta_version)
+        avisos = []
+        if paths is None:
+            elegidos = sorted(archivos)
+        else:
+            patrones = [normalizar_ruta(p, self.root) for p in paths]
+            elegidos = sorted(a for a in archivos if any(coincide(a, p) for p in patrones))
+            carpetas = [c for c in carpetas if any(coincide(c, p) for p in patrones)]
+            if not elegidos and not carpetas:
+                raise PathNotFoundError(
+                    f"Ninguna ruta de la version '{version}' coincide con: {', '.join(paths)}")
+            avisos = [f"Ninguna ruta coincide con '{p}'" for p in patrones
+                      if not any(coincide(a, p) for a in elegidos + carpetas)]
+        manifiesto = {}
+        if self._tiene_manifiesto(carpeta_version):
+            manifiesto = self._leer_manifiesto(carpeta_version)["archivos"]
+            algoritmo = self._leer_manifiesto(carpeta_version).get("algoritmo", self.hash_algorithm)
+        else:
+            algoritmo = self.hash_algorithm
+
+        archivos_restaurados = 0
+        ahora = time.time_ns()
+        for relativa in elegidos:
+            esperado = manifiesto.get(relativa)
+            try:
+                perfil.contar("archivos")
+                destino, valor = self._escribir_desde_version(carpeta_version, relativa,
+                                                              esperado, algoritmo, raiz)
+            except Exception as e:
+                avisos.append(f"Error restaurando {relativa}: {e}")
+                continue
+            archivos_restaurados += 1
+
+            if esperado is not None and esperado["hash"] != valor:
+                avisos.append(f"{relativa} no coincide con el hash del manifiesto")
+            elif raiz is None:
+                # Lo recién escrito ya tiene hash conocido
+                self._recordar_hash(relativa, os.stat(destino), algoritmo, valor, ahora)
+        self._crear_carpetas_vacias(carpetas, raiz or self.root, avisos)
+
+        return RestoreResult(version, 0, archivos_restaurados, avisos)
+
+    def _carpetas_vacias(self, carpeta):
+        """Carpetas vacías que guardó una versión (las copias completas no las anotan)"""
+        if not self._tiene_manifiesto(carpeta):
+            return []
+        return self._leer_manifiesto(carpeta).get("carpetas_vacias", [])
+
+    def _crear_carpetas_vacias(self, carpetas, raiz, avisos):
+        """Vuelve a crear las carpetas vacías bajo 'raiz'; devuelve sus carpetas principales"""
+        principales = set()
+        for relativa in carpetas:
+            try:
+                with perfil.fase("write"):
+                    os.makedirs(raiz / relativa, exist_ok=True)
+            except OSError as e:
+                avisos.append(f"Error restaurando {relativa}: {e}")
+                continue
+            principales.add(relativa.split("/")[0])
+        return principales
+
+    # Importación de historial
+
+    def _importar(self, fuentes, avisos, progress=None):
+        """Escribe como versiones nuevas las que producen las fuentes de importar.py
+
+        El número de versión se calcula una vez y luego se incrementa en
+        memoria; los manifiestos no se quedan en caché para que importar
+        miles de versiones no dispare la memoria.
+        """
+        from archivos import cabecera_manifiesto
+
+        almacen = self._almacen()
+        cabecera = {**cabecera_manifiesto(almacen.algoritmo), "almacen": "objetos"}
+        leidos, escritos = almacen.leidos, almacen.escritos
+        with perfil.fase("metadata"):
+            mayor, menor = (int(n) for n in self.next_version().split("."))
+            versiones = self._listar_versiones()
+            anterior = self._entradas_de(versiones[-1][3]) if versiones else {}
+
+        numeros = []
+        archivos = 0
+        carpeta = None
+        try:
+            while True:
+                origen, fecha, mensaje, contenido = fuentes.send(carpeta)
+                numero = f"{mayor}.{menor + len(numeros)}"
+                metadatos = {
+                    "version": numero,
+                    "fecha": fecha,
+                    "mensaje": mensaje,
+                    "archivos_guardados": len({r.split("/")[0] for r in contenido}),
+                    "origen": origen
+                }
+                carpeta = self._escribir_version(numero, metadatos,
+                                                 {**cabecera, "archivos": contenido},
+                                                 anterior, cachear=False)
+                # Copia: las fuentes de git cambian el árbol en el sitio para el siguiente commit
+                anterior = dict(contenido)
+                numeros.append(numero)
+                archivos += len(contenido)
+                perfil.contar("archivos", len(contenido))
+                if progress is not None:
+                    progress(numero, mensaje)
+        except StopIteration:
+            pass
+        finally:
+            self._indexar()
+
+        return ImportResult(numeros, archivos, almacen.leidos - leidos,
+                            almacen.escritos - escritos, avisos)
+
+    def import_paths(self, paths, progress=None):
+        """Importa carpetas o tarballs (.tar, .tar.gz...), una versión por ruta y en orden
+
+        'progress', si se pasa, se llama con (número, mensaje) tras cada versión
+        """
+        from importar import desde_carpeta, desde_tar, es_tar
+
+        # Todo se valida antes de escribir la primera versión
+        for ruta in paths:
+            if not os.path.exists(ruta):
+                raise FileNotFoundError(f"No existe '{ruta}'")
+            if not os.path.isdir(ruta) and not es_tar(ruta):
+                raise ValueError(f"'{ruta}' no es una carpeta ni un archivo tar")
+
+        almacen = self._almacen()
+        avisos = []
+
+        def fuentes():
+            for ruta in paths:
+                if os.path.isdir(ruta):
+                    yield from desde_carpeta(ruta, almacen, avisos)
+                else:
+                    yield from desde_tar(ruta, almacen, avisos)
+
+        return self._importar(fuentes(), avisos, progress)
+
+    def import_git(self, path, ref="HEAD", progress=None):
+        """Importa el historial de un repositorio git: una versión por commit, de más antiguo a más nuevo"""
+        from importar import desde_git
+
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"No existe la carpeta '{path}'")
+        avisos = []
+        return self._importar(desde_git(path, ref, self._almacen(), avisos), avisos, progress)
+
+    def import_fast_export(self, stream, progress=None):
+        """Importa un flujo de git fast-export ya generado (objeto binario con peek(), como stdin.buffer)"""
+        from importar import desde_fast_export
+
+        avisos = []
+        return self._importar(desde_fast_export(stream, self._almacen(), avisos), avisos, progress)
+
+    # Sincronización con otro almacén
+
+    def _entradas_para_copia(self, carpeta):
+        """Manifiesto de una versión en el formato del almacén de objetos
+
+        Las versiones guardadas como copia completa se convierten: sus
+        archivos viajan como objetos y en el destino ya no ocupan una carpeta.
+        Las hasheadas con crc32 o xxh3 (anteriores a archivos.algoritmo_objetos)
+        se vuelven a hashear para nombrar sus objetos sin colisiones.
+        """
+        import stat
+        from archivos import algoritmo_objetos, cabecera_manifiesto, hashear_archivo
+
+        manifiesto = self._leer_manifiesto(carpeta, cachear=False)
+        en_almacen = manifiesto.get("almacen") == "objetos"
+        algoritmo = algoritmo_objetos(manifiesto["algoritmo"])
+        if en_almacen and algoritmo == manifiesto["algoritmo"]:
+            return manifiesto
+        archivos = {}
+        for relativa, entrada in manifiesto["archivos"].items():
+            ruta = self._ruta_en_version(carpeta, relativa)
+            entrada = dict(entrada)
+            if not en_almacen:
+                st = os.stat(ruta)
+                entrada.update(modo=stat.S_IMODE(st.st_mode), mtime=st.st_mtime_ns)
+            if algoritmo != manifiesto["algoritmo"]:
+                entrada["hash"] = hashear_archivo(ruta, algoritmo)
+            archivos[relativa] = entrada
+        return {**manifiesto, **cabecera_manifiesto(algoritmo), "almacen": "objetos",
+                "archivos": archivos}
+
+    def _enviar_a(self, destino):
+        """Copia en 'destino' las versiones que le faltan, con sus objetos
+
+        Primero se comparan los conjuntos de objetos; solo los que faltan
+        viajan, cada uno copiado una vez directamente al almacén del destino
+        (una carpeta de red se cruza una sola vez). Las versiones se escriben
+        al final, cuando todos sus objetos ya están: un envío interrumpido no
+        deja versiones a medias y el siguiente retoma donde se quedó.
+        """
+        from paquetes import CARPETA_PAQUETES, recuperar
+
+        if destino.hash_algorithm != self.hash_algorithm:
+            raise CronuxError(
+                f"{destino.root} usa el hash {destino.hash_algorithm} y este proyecto "
+                f"{self.hash_algorithm}: no pueden compartir objetos")
+
+        avisos = []
+        almacen = destino._almacen()
+        carpeta_paquetes = destino.cronux_dir / CARPETA_PAQUETES
+        with perfil.fase("metadata"):
+            # Paquetes completos de un envío interrumpido de versiones anteriores
+            recuperados = recuperar(carpeta_paquetes, almacen, avisos)
+            if recuperados:
+                avisos.append(f"Se recuperaron {recuperados} objetos de un envío "
+                              f"interrumpido en {destino.root}")
+
+            existentes = {numero: carpeta for _, _, numero, carpeta in destino._listar_versiones()}
+            pendientes = []
+            comun = None
+            for _, _, numero, carpeta in self._listar_versiones():
+                if numero in existentes:
+                    comun = (numero, carpeta, existentes[numero])
+                else:
+                    pendientes.append((numero, carpeta))
+
+            # Basta mirar la última versión común: si las historias se separaron
+            # antes, también difiere
+            if comun is not None and self._leer_metadatos(comun[1]) != destino._leer_metadatos(comun[2]):
+                raise CronuxError(f"La version {comun[0]} es distinta en {destino.root}: "
+                                  "los historiales se han separado")
+
+        with perfil.fase("walk"):
+            presentes = almacen.ids()
+            faltan = {}
+            for numero, carpeta in pendientes:
+                archivos = self._entradas_para_copia(carpeta)["archivos"]
+                for relativa, entrada in archivos.items():
+                    valor = entrada["hash"]
+                    if valor not in presentes and valor not in faltan:
+                        faltan[valor] = (self._ruta_en_version(carpeta, relativa), entrada["tamano"])
+
+        objetos = escritos = 0
+        for valor, (ruta, tamano) in faltan.items():
+            # Se copia mientras se hashea: lo que no coincide no ocupa el nombre esperado
+            recibido, escrito = almacen.guardar_archivo(ruta, tamano)
+            if recibido != valor:
+                avisos.append(f"El objeto {valor} no coincide con su contenido")
+                continue
+            if escrito:
+                objetos += 1
+                escritos += tamano
+
+        perdidos = [valor for valor in faltan if not almacen.existe(valor)]
+        if perdidos:
+            raise CronuxError(f"{len(perdidos)} objetos no llegaron completos; vuelve a intentarlo")
+
+        enviadas = []
+        versiones_destino = destino._listar_versiones()
+        anterior = destino._entradas_de(versiones_destino[-1][3]) if versiones_destino else {}
+        try:
+            for numero, carpeta in pendientes:
+                metadatos = self._leer_metadatos(carpeta) or {"version": numero}
+                manifiesto = self._entradas_para_copia(carpeta)
+                destino._escribir_version(numero, metadatos, manifiesto, anterior, cachear=False)
+                anterior = manifiesto["archivos"]
+                enviadas.append(numero)
+        finally:
+            destino._indexar()
+
+        return SyncResult(enviadas, objetos, escritos, recuperados, avisos)
+
+    def push(self, destination):
+        """Envía a otro almacén (una ruta local o montada) las versiones que le faltan
+
+        Si la ruta no existe o está vacía, se crea en ella un espejo sin
+        directorio de trabajo
+        """
+        destino = os.path.abspath(destination)
+        proyecto = os.path.join(destino, CARPETA_CRONUX, "proyecto.json")
+        if not os.path.exists(proyecto):
+            if os.path.isdir(destino) and os.listdir(destino):
+                raise NotARepositoryError(
+                    f"{destino} no es un proyecto Cronux-CRX ni una carpeta vacía")
+            os.makedirs(os.path.dirname(proyecto), exist_ok=True)
+            # El espejo guarda sus propios objetos aunque este proyecto use
+            # el almacén compartido
+            datos = {k: v for k, v in self._datos_proyecto().items() if k not in ("almacen", "id")}
+            with open(proyecto, "w") as f:
+                json.dump(datos, f, indent=2)
+            ubicacion.olvidar()
+        return self._enviar_a(Repository(destino))
+
+    def pull(self, source):
+        """Trae de otro almacén las versiones que faltan aquí (el directorio de trabajo no se toca)"""
+        return Repository(source)._enviar_a(self)
+
+    # Poda
+
+    def prune(self, grace=MARGEN_PODA_S):
+        """Borra los objetos que ya no usa ninguna versión
+
+        En un almacén compartido cuentan las referencias de todos los
+        proyectos, así que podar uno nunca rompe otro. Solo se borran los
+        objetos sin usar desde hace más de 'grace' segundos.
+        """
+        almacen = self._almacen()
+        with perfil.fase("walk"):
+            versiones = {numero: carpeta for _, _, numero, carpeta in self._listar_versiones()}
+            if almacen.compartido:
+                # Poner al día las referencias propias con las versiones que existen
+                proyecto = self._datos_proyecto()["id"]
+                registradas = almacen.versiones_registradas(proyecto)
+                for numero in registradas - versiones.keys():
+                    almacen.olvidar_version(proyecto, numero)
+                for numero in versiones.keys() - registradas:
+                    manifiesto = self._manifiesto_en_almacen(versiones[numero])
+                    if manifiesto is not None:
+                        almacen.registrar_version(proyecto, numero,
+                                                  (e["hash"] for e in manifiesto["archivos"].values()))
+                vivos = almacen.referenciados()
+            else:
+                vivos = set()
+                for carpeta in versiones.values():
+                    manifiesto = self._manifiesto_en_almacen(carpeta)
+                    if manifiesto is not None:
+                        vivos.update(e["hash"] for e in manifiesto["archivos"].values())
+
+        with perfil.fase("delete"):
+            borrados, liberados = almacen.podar(vivos, grace)
+        return PruneResult(borrados, liberados, almacen.compartido)
+
+def buscar_raiz(desde=None):
+    """Raíz del proyecto que contiene 'desde' (por defecto la carpeta actual); None si no hay
+
+    Sube por las carpetas padre hasta la primera con .cronux/proyecto.json.
+    La variable CRONUX_DIR fija el proyecto sin buscar (su raíz o su carpeta
+    .cronux). La respuesta se recuerda por inodo de la carpeta de partida,
+    en el proceso y entre ejecuciones (ver ubicacion), así solo se sube por
+    el árbol la primera vez que se trabaja desde una carpeta.
+    """
+    raiz = ubicacion.buscar(desde)
+    return Path(raiz) if raiz is not None else None
+
+
+_abiertos = {}
+
+
+def abrir(path=None):
+    """Devuelve el Repository de la ruta, reutilizando el ya abierto y sus cachés
+
+    Sin ruta se usa el proyecto que contiene la carpeta actual (buscar_raiz)
+    """
+    if path is None:
+        path = buscar_raiz()
+        if path is None:
+            raise NotARepositoryError(
+                f"No hay un proyecto Cronux-CRX en {os.getcwd()} ni en sus carpetas padre")
+    clave = os.path.abspath(path)
+    repositorio = _abiertos.get(clave)
+    if repositorio is None:
+        repositorio = _abiertos[clave] = Repository(clave)
+    return repositorio
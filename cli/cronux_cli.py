@@ -1,141 +1,78 @@
 #!/usr/bin/env python3
 """
 Cronux-CRX CLI - Sistema de control de versiones local
-Archivo principal que integra todos los comandos
+Punto de entrada: procesa las opciones globales y delega en el despachador
 """
 
 import sys
 import os
-from pathlib import Path
 
-# Agregar el directorio cli al path para importar módulos
-sys.path.insert(0, str(Path(__file__).parent))
 
-# Importar funciones de los módulos
-try:
-    from crear_proyecto import crear_proyecto_cli
-    from guardar_version import guardar_version_cli
-    from ver_historial import ver_historial_cli
-    from restaurar_versiones import restaurar_version_cli
-    from info_proyecto import info_proyecto
-    from funcion_verficar import verificarCronux
-except ImportError as e:
-    print(f"Error al importar módulos: {e}")
-    sys.exit(1)
-
-
-def mostrar_ayuda():
-    """Muestra la ayuda del CLI"""
-    print("""
-Cronux-CRX - Control de versiones local simple
-
-USO:
-    crx <comando> [argumentos]
-
-COMANDOS:
-    new <nombre>           Crear un nuevo proyecto con control de versiones
-    save [opciones]        Guardar una nueva version del proyecto
-    log                    Ver el historial de versiones
-    restore <version>      Restaurar una version especifica
-    status                 Ver el estado actual del proyecto
-    help                   Mostrar esta ayuda
-
-OPCIONES PARA SAVE:
-    -m, --message <msg>    Mensaje descriptivo de la version
-
-EJEMPLOS:
-    crx new mi-proyecto
-    crx save -m "Primera version"
-    crx log
-    crx restore 1.0
-    crx status
-
-Para mas informacion, visita: https://github.com/cronux-crx
-""")
+def extraer_opciones_globales():
+    """Quita de sys.argv las opciones globales que preceden al comando"""
+    opciones = {}
+    i = 1
+    rutas = {
+        '--profile-out': 'ruta_prof',
+        '--profile-trace': 'ruta_traza',
+        '--metrics': 'metricas',
+        '--metrics-textfile': 'metricas_textfile',
+    }
+    while i < len(sys.argv) and sys.argv[i].startswith('--'):
+        opcion = sys.argv[i]
+        if opcion == '--profile':
+            opciones['perfil'] = True
+            i += 1
+        elif opcion in rutas:
+            if i + 1 >= len(sys.argv):
+                print(f"Error: Se requiere una ruta después de {opcion}")
+                sys.exit(1)
+            opciones[rutas[opcion]] = sys.argv[i + 1]
+            if opcion.startswith('--profile'):
+                opciones['perfil'] = True
+            i += 2
+        else:
+            break
+    sys.argv = [sys.argv[0]] + sys.argv[i:]
+    return opciones
 
 
 def main():
     """Función principal del CLI"""
-    if len(sys.argv) < 2:
-        mostrar_ayuda()
-        sys.exit(0)
+    opciones = extraer_opciones_globales()
     
-    comando = sys.argv[1].lower()
+    # Perfil y métricas solo se importan si se piden
+    medir = (opciones.get('perfil') or opciones.get('metricas') or opciones.get('metricas_textfile')
+             or os.environ.get('CRONUX_METRICS') or os.environ.get('CRONUX_METRICS_TEXTFILE'))
+    if not medir:
+        # Con 'crx serve' en marcha, log/status se responden desde el servidor
+        # sin importar el despachador ni cronux
+        from demonio import reenviar
+        codigo = reenviar(sys.argv[1:])
+        if codigo is not None:
+            sys.exit(codigo)
+        from despachador import despachar
+        despachar(sys.argv[1:])
+        return
     
-    try:
-        if comando in ['help', '--help', '-h']:
-            mostrar_ayuda()
-        
-        elif comando == 'new':
-            if len(sys.argv) < 3:
-                print("Error: Se requiere el nombre del proyecto")
-                print("Uso: crx new <nombre-proyecto>")
-                sys.exit(1)
-            nombre_proyecto = sys.argv[2]
-            crear_proyecto_cli(nombre_proyecto)
-        
-        elif comando == 'save':
-            # Verificar que estamos en un proyecto Cronux
-            if not verificarCronux():
-                print("Error: No estás en un proyecto Cronux-CRX")
-                print("Usa 'crx new <nombre>' para crear un proyecto")
-                sys.exit(1)
-            
-            # Procesar argumentos opcionales
-            mensaje = None
-            i = 2
-            while i < len(sys.argv):
-                if sys.argv[i] in ['-m', '--message']:
-                    if i + 1 < len(sys.argv):
-                        mensaje = sys.argv[i + 1]
-                        i += 2
-                    else:
-                        print("Error: Se requiere un mensaje después de -m/--message")
-                        sys.exit(1)
-                else:
-                    print(f"Error: Argumento desconocido '{sys.argv[i]}'")
-                    sys.exit(1)
-            
-            guardar_version_cli(mensaje)
-        
-        elif comando == 'log':
-            if not verificarCronux():
-                print("Error: No estás en un proyecto Cronux-CRX")
-                sys.exit(1)
-            ver_historial_cli()
-        
-        elif comando == 'restore':
-            if not verificarCronux():
-                print("Error: No estás en un proyecto Cronux-CRX")
-                sys.exit(1)
-            
-            if len(sys.argv) < 3:
-                print("Error: Se requiere el número de versión")
-                print("Uso: crx restore <version>")
-                print("Ejemplo: crx restore 1.0")
-                sys.exit(1)
-            
-            version = sys.argv[2]
-            restaurar_version_cli(version)
-        
-        elif comando == 'status':
-            if not verificarCronux():
-                print("Error: No estás en un proyecto Cronux-CRX")
-                sys.exit(1)
-            info_proyecto()
-        
-        else:
-            print(f"Error: Comando desconocido '{comando}'")
-            print("Usa 'crx help' para ver los comandos disponibles")
-            sys.exit(1)
+    import perfil
+    import metricas
+    metricas.configurar(opciones.get('metricas'), opciones.get('metricas_textfile'))
+    perfil.iniciar(opciones.get('ruta_prof'), opciones.get('ruta_traza'),
+                   mostrar=opciones.get('perfil', False))
     
-    except KeyboardInterrupt:
-        print("\nOperación cancelada por el usuario")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error inesperado: {e}")
-        sys.exit(1)
+    from despachador import despachar
+    comando = sys.argv[1].lower() if len(sys.argv) > 1 else 'help'
+    codigo_salida = 0
+    try:
+        despachar(sys.argv[1:])
+    except SystemExit as e:
+        codigo_salida = e.code if isinstance(e.code, int) else 1
+        raise
+    finally:
+        datos = perfil.finalizar()
+        metricas.escribir(comando, codigo_salida, datos)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
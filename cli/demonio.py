@@ -0,0 +1,231 @@
+"""
+Servidor persistente de Cronux-CRX (crx serve) y su cliente ligero
+El servidor mantiene en memoria el catálogo, los metadatos y los
+manifiestos del proyecto y responde por un socket Unix en
+.cronux/crx.sock. El CLI reenvía los comandos de solo lectura al
+servidor si está en marcha y, si no, los ejecuta en el propio proceso.
+Hasta tener la respuesta, el cliente solo importa os, socket y json.
+"""
+
+import os
+import sys
+
+# Relativa a la raíz del proyecto
+RUTA_SOCKET = os.path.join(".cronux", "crx.sock")
+
+# Comandos que se pueden responder desde el servidor
+COMANDOS_SOLO_LECTURA = {"log", "status"}
+
+TAMANO_MAXIMO_PETICION = 1024 * 1024
+
+
+def _recibir_linea(conexion, limite=None):
+    """Lee un mensaje terminado en salto de línea"""
+    partes = []
+    total = 0
+    while True:
+        datos = conexion.recv(65536)
+        if not datos:
+            break
+        partes.append(datos)
+        total += len(datos)
+        if datos.endswith(b"\n") or (limite and total > limite):
+            break
+    return b"".join(partes)
+
+
+def _socket_del_proyecto():
+    """(raíz, ruta del socket relativa a la carpeta actual), o None fuera de un proyecto
+
+    La ruta relativa evita el límite de 108 bytes de sun_path
+    """
+    from ubicacion import buscar
+    raiz = buscar()
+    if raiz is None:
+        return None
+    return raiz, os.path.relpath(os.path.join(raiz, RUTA_SOCKET))
+
+
+def reenviar(argv):
+    """Intenta ejecutar el comando en el servidor
+
+    Devuelve el código de salida, o None si hay que ejecutarlo en el proceso
+    """
+    if not argv or argv[0].lower() not in COMANDOS_SOLO_LECTURA:
+        return None
+    proyecto = _socket_del_proyecto()
+    # Sin socket no hay servidor: ninguna importación extra
+    if proyecto is None or not os.path.exists(proyecto[1]):
+        return None
+    raiz, ruta_socket = proyecto
+    if "--" in argv:
+        # El servidor trabaja en la raíz: las rutas de 'log -- <ruta>' viajan absolutas
+        separador = argv.index("--") + 1
+        argv = argv[:separador] + [os.path.abspath(ruta) for ruta in argv[separador:]]
+
+    import json
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexion:
+            conexion.settimeout(5)
+            conexion.connect(ruta_socket)
+            peticion = {"argv": argv, "raiz": raiz}
+            conexion.sendall((json.dumps(peticion) + "\n").encode("utf-8"))
+            respuesta = json.loads(_recibir_linea(conexion).decode("utf-8"))
+    except (OSError, ValueError, AttributeError):
+        # Socket huérfano, servidor ocupado o plataforma sin AF_UNIX
+        return None
+
+    if respuesta.get("reintentar_local"):
+        return None
+    sys.stdout.write(respuesta.get("salida", ""))
+    sys.stdout.flush()
+    return respuesta.get("codigo", 0)
+
+
+def _ejecutar(argv):
+    """Ejecuta un comando capturando su salida"""
+    import io
+    import contextlib
+    from despachador import despachar
+
+    salida = io.StringIO()
+    codigo = 0
+    with contextlib.redirect_stdout(salida):
+        try:
+            despachar(argv)
+        except SystemExit as e:
+            codigo = e.code if isinstance(e.code, int) else 1
+    return salida.getvalue(), codigo
+
+
+def _atender(conexion, raiz):
+    """Atiende una petición del cliente"""
+    import json
+
+    linea = _recibir_linea(conexion, TAMANO_MAXIMO_PETICION)
+    if not linea:
+        # Conexión de comprobación (otro 'crx serve' mirando si estamos vivos)
+        return True
+    peticion = json.loads(linea.decode("utf-8"))
+    # JSON válido no basta: cualquier otra forma se devuelve al cliente
+    # sin tocar el servidor, que atiende a todos
+    if not isinstance(peticion, dict):
+        peticion = {}
+    if peticion.get("detener") is True:
+        conexion.sendall(b'{"detenido": true}\n')
+        return False
+
+    argv = peticion.get("argv")
+    if (peticion.get("raiz") != raiz or not isinstance(argv, list) or not argv
+            or not all(isinstance(argumento, str) for argumento in argv)
+            or argv[0].lower() not in COMANDOS_SOLO_LECTURA):
+        respuesta = {"reintentar_local": True}
+    else:
+        salida, codigo = _ejecutar(argv)
+        respuesta = {"salida": salida, "codigo": codigo}
+
+    conexion.sendall((json.dumps(respuesta) + "\n").encode("utf-8"))
+    return True
+
+
+def _servidor_activo():
+    """Comprueba si ya hay un servidor escuchando en el socket"""
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as prueba:
+            prueba.connect(RUTA_SOCKET)
+        return True
+    except OSError:
+        return False
+
+
+def servir_cli():
+    """Arranca el servidor del proyecto actual en primer plano"""
+    import socket
+    from funcion_verficar import verificarCronux
+
+    proyecto = _socket_del_proyecto()
+    if proyecto is None:
+        print("ERROR: No estas en un proyecto Cronux")
+        return False
+    # El servidor trabaja desde la raíz: el socket y los comandos son relativos a ella
+    raiz = proyecto[0]
+    os.chdir(raiz)
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("ERROR: Este sistema no soporta sockets Unix")
+        return False
+
+    if os.path.exists(RUTA_SOCKET):
+        if _servidor_activo():
+            print("ERROR: Ya hay un servidor en marcha para este proyecto")
+            return False
+        # Socket huérfano de un servidor anterior
+        os.unlink(RUTA_SOCKET)
+
+    servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # El socket nace ya con permisos 0600: con un chmod después del bind,
+    # otro usuario podría conectarse entre las dos llamadas
+    mascara = os.umask(0o177)
+    try:
+        servidor.bind(RUTA_SOCKET)
+    finally:
+        os.umask(mascara)
+    servidor.listen(16)
+
+    # Precargar las cachés para que la primera respuesta ya sea rápida
+    _ejecutar(["status"])
+    _ejecutar(["log"])
+
+    print(f"Servidor Cronux-CRX escuchando en {os.path.join(raiz, RUTA_SOCKET)}")
+    print("Ctrl+C o 'crx serve --stop' para detenerlo")
+    sys.stdout.flush()
+
+    try:
+        continuar = True
+        while continuar:
+            conexion, _ = servidor.accept()
+            with conexion:
+                try:
+                    conexion.settimeout(5)
+                    continuar = _atender(conexion, raiz)
+                except (OSError, ValueError) as e:
+                    print(f"Advertencia: Petición descartada: {e}", file=sys.stderr)
+            if not verificarCronux():
+                print("El proyecto ya no existe, deteniendo el servidor")
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.close()
+        if os.path.exists(RUTA_SOCKET):
+            os.unlink(RUTA_SOCKET)
+
+    print("Servidor detenido")
+    return True
+
+
+def detener_cli():
+    """Pide al servidor del proyecto actual que se detenga"""
+    import json
+    import socket
+
+    proyecto = _socket_del_proyecto()
+    if proyecto is None or not os.path.exists(proyecto[1]):
+        print("INFO: No hay ningún servidor en marcha")
+        return False
+    ruta_socket = proyecto[1]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexion:
+            conexion.settimeout(5)
+            conexion.connect(ruta_socket)
+            conexion.sendall((json.dumps({"detener": True}) + "\n").encode("utf-8"))
+            _recibir_linea(conexion)
+    except OSError:
+        os.unlink(ruta_socket)
+        print("INFO: El servidor no respondía; socket huérfano eliminado")
+        return False
+    print("EXITO: Servidor detenido")
+    return True
@@ -0,0 +1,511 @@
+"""
+Despachador de comandos de Cronux-CRX
+Cada comando importa sus módulos solo cuando se ejecuta, así 'crx help'
+o 'crx status' no pagan la carga de shutil, hashlib, datetime, etc.
+"""
+
+import sys
+
+
+def mostrar_ayuda():
+    """Muestra la ayuda del CLI"""
+    print("""
+Cronux-CRX - Control de versiones local simple
+
+USO:
+    crx [opciones globales] <comando> [argumentos]
+
+COMANDOS:
+    new <nombre> [opciones]  Crear un nuevo proyecto con control de versiones
+    save [opciones]          Guardar una nueva version del proyecto
+    log [--grep <terminos>] [-- <ruta>...]
+                             Ver el historial de versiones, o solo las que
+                             mencionan unos terminos o cambiaron unas rutas
+    restore <version> [-- <ruta>...]
+                             Restaurar una version completa o solo algunas rutas,
+                             en el proyecto o en otra carpeta (--into)
+    status                   Ver el estado actual del proyecto
+    diff [version] [otra]    Cambios respecto a una version (por defecto la ultima)
+    cat <version> <ruta>     Escribir en stdout un archivo de una version
+    export <version>         Exportar una version a tar, tar.gz o zip
+    import <ruta>...         Importar carpetas, tarballs o historial de git como versiones
+    push <destino>           Enviar a otro almacen (ruta local o montada) las versiones que le faltan
+    pull <origen>            Traer de otro almacen las versiones que faltan aqui
+    prune [--now]            Borrar los objetos que ya no usa ninguna version
+    batch [-j <hilos>]       Ejecutar comandos JSON lines de stdin en un solo proceso
+    serve [--stop]           Servidor en memoria para responder log/status al instante
+    help                     Mostrar esta ayuda
+
+OPCIONES GLOBALES:
+    --profile              Muestra tiempos por fase y contadores al terminar
+    --profile-out <.prof>  Guarda ademas un perfil de cProfile
+    --profile-trace <.json>
+                           Guarda ademas una traza JSON (chrome://tracing, speedscope)
+    --metrics <.jsonl>     Añade un registro JSON por ejecucion (o CRONUX_METRICS)
+    --metrics-textfile <.prom>
+                           Actualiza un textfile OpenMetrics para node_exporter
+                           (o CRONUX_METRICS_TEXTFILE)
+
+OPCIONES PARA NEW:
+    --hash <algoritmo>     sha256 (por defecto), blake2b, crc32 o xxh3
+                           crc32/xxh3 solo detectan cambios (no criptograficos);
+                           xxh3 requiere el paquete xxhash
+    --shared-store [ruta]  Guardar el contenido en un almacen compartido por
+                           varios proyectos (por defecto CRONUX_STORE o
+                           ~/.cronux-store); lo repetido se guarda una vez
+
+OPCIONES PARA SAVE:
+    -m, --message <msg>    Mensaje descriptivo de la version
+
+OPCIONES PARA LOG:
+    --grep <terminos>...   Solo las versiones con todos esos terminos en el
+                           mensaje, sin distinguir mayusculas ni acentos;
+                           'term*' busca por prefijo
+    -- <ruta>...           Solo las versiones en las que cambio (se añadio,
+                           modifico o borro) alguno de esos archivos; admite
+                           carpetas y patrones ('*.json', 'config/*')
+    Ambas usan un indice en .cronux/indice.db que se actualiza en cada save
+
+OPCIONES PARA RESTORE:
+    -y, --yes              No pedir confirmacion
+    -- <ruta>...           Restaurar solo esas rutas sin tocar el resto; admite
+                           carpetas y patrones ('*.json', 'config/*')
+    --sparse <patron>...   Igual que --, pero se puede combinar con otras opciones
+    --into <carpeta>       Escribir en esa carpeta en lugar del directorio de
+                           trabajo, que no se toca; solo se leen los archivos
+                           elegidos de la version
+
+OPCIONES PARA CAT:
+    --range <offset:len>   Solo ese rango de bytes ('100:' hasta el final)
+
+OPCIONES PARA EXPORT:
+    --format <formato>     tar (por defecto), tar.gz o zip; si no se indica,
+                           se deduce de la extension de -o
+    -o, --output <archivo> Archivo de salida, o '-' para stdout (por defecto)
+                           La salida es determinista: mismo contenido, mismo hash
+
+OPCIONES PARA IMPORT:
+    <ruta>...              Carpetas o archivos .tar/.tar.gz/.tgz, una version por
+                           ruta y en el orden dado
+    --git <repo>           Una version por commit del repositorio git
+    --ref <ref>            Rama, etiqueta o commit a importar (por defecto HEAD)
+    --fast-export <archivo>
+                           Leer un flujo de 'git fast-export' ('-' para stdin)
+                           El contenido repetido entre versiones se guarda una vez
+
+PUSH Y PULL:
+    Solo viajan los objetos que faltan en el otro lado, cada uno una vez.
+    Si se interrumpe, el siguiente push/pull retoma donde se quedo.
+    Un push a una carpeta vacia o inexistente crea un espejo del proyecto.
+
+OPCIONES PARA PRUNE:
+    --now                  Borrar tambien lo escrito en la ultima hora (solo si
+                           no hay otro crx guardando en el mismo almacen)
+    En un almacen compartido solo se borra lo que no usa ningun proyecto
+
+BATCH:
+    Una linea JSON por comando; los de repositorios distintos van en paralelo
+    {"id": 1, "repo": "ruta", "command": "save", "args": {"message": "msg"}}
+    Comandos: init (name, hash_algorithm, shared_store), save (message), log (grep, paths), status,
+              diff (version, other), restore (version, paths, into),
+              import (paths | git, ref), push (destination), pull (source),
+              prune (grace)
+    Cada resultado se escribe en stdout como una linea JSON
+
+EJEMPLOS:
+    crx new mi-proyecto
+    crx new servicio-pagos --shared-store
+    crx save -m "Primera version"
+    crx log
+    crx log --grep pagos config*
+    crx log -- src/pagos
+    crx restore 1.0
+    crx restore 1.0 --yes -- config.json "docs/*.md"
+    crx restore 1.0 --sparse src --into /tmp/build
+    crx status
+    crx diff 1.0
+    crx cat 1.0 config.json --range 0:512
+    crx export 1.0 --format tar.gz -o - | ssh servidor tar xzf -
+    crx import ../entregas/v1 ../entregas/v2.tar.gz
+    crx import --git ../proyecto-git --ref main
+    crx push /mnt/copias/mi-proyecto
+
+Para mas informacion, visita: https://github.com/cronux-crx
+""")
+
+
+def requerir_proyecto(sugerir_new=False):
+    """Termina con error si no estamos en un proyecto Cronux"""
+    from funcion_verficar import verificarCronux
+    if not verificarCronux():
+        print("Error: No estás en un proyecto Cronux-CRX")
+        if sugerir_new:
+            print("Usa 'crx new <nombre>' para crear un proyecto")
+        sys.exit(1)
+
+
+def comando_new(argumentos):
+    if len(argumentos) < 1:
+        print("Error: Se requiere el nombre del proyecto")
+        print("Uso: crx new <nombre-proyecto>")
+        sys.exit(1)
+    nombre_proyecto = argumentos[0]
+    
+    algoritmo_hash = None
+    almacen_compartido = None
+    i = 1
+    while i < len(argumentos):
+        if argumentos[i] == '--shared-store':
+            # La ruta es opcional: sin ella se usa CRONUX_STORE o ~/.cronux-store
+            if i + 1 < len(argumentos) and not argumentos[i + 1].startswith('-'):
+                almacen_compartido = argumentos[i + 1]
+                i += 2
+            else:
+                almacen_compartido = True
+                i += 1
+        elif argumentos[i] == '--hash':
+            if i + 1 < len(argumentos):
+                algoritmo_hash = argumentos[i + 1].lower()
+                i += 2
+            else:
+                print("Error: Se requiere un algoritmo después de --hash")
+                sys.exit(1)
+        else:
+            print(f"Error: Argumento desconocido '{argumentos[i]}'")
+            sys.exit(1)
+    
+    from crear_proyecto import crear_proyecto_cli
+    crear_proyecto_cli(nombre_proyecto, algoritmo_hash, almacen_compartido)
+
+
+def comando_save(argumentos):
+    # Verificar que estamos en un proyecto Cronux
+    requerir_proyecto(sugerir_new=True)
+    
+    # Procesar argumentos opcionales
+    mensaje = None
+    i = 0
+    while i < len(argumentos):
+        if argumentos[i] in ['-m', '--message']:
+            if i + 1 < len(argumentos):
+                mensaje = argumentos[i + 1]
+                i += 2
+            else:
+                print("Error: Se requiere un mensaje después de -m/--message")
+                sys.exit(1)
+        else:
+            print(f"Error: Argumento desconocido '{argumentos[i]}'")
+            sys.exit(1)
+    
+    from guardar_version import guardar_version_cli
+    guardar_version_cli(mensaje)
+
+
+def comando_log(argumentos):
+    requerir_proyecto()
+    
+    buscar = None
+    rutas = None
+    i = 0
+    while i < len(argumentos):
+        if argumentos[i] == '--grep':
+            # Los términos llegan hasta la siguiente opción
+            i += 1
+            terminos = []
+            while i < len(argumentos) and not argumentos[i].startswith('-'):
+                terminos.append(argumentos[i])
+                i += 1
+            if not terminos:
+                print("Error: Se requiere al menos un término después de --grep")
+                sys.exit(1)
+            buscar = " ".join(terminos)
+        elif argumentos[i] == '--':
+            rutas = argumentos[i + 1:]
+            if not rutas:
+                print("Error: Se requiere al menos una ruta después de --")
+                sys.exit(1)
+            break
+        else:
+            print(f"Error: Argumento desconocido '{argumentos[i]}'")
+            print("Uso: crx log [--grep <terminos>...] [-- <ruta>...]")
+            sys.exit(1)
+    
+    from ver_historial import ver_historial_cli
+    ver_historial_cli(buscar, rutas)
+
+
+def comando_restore(argumentos):
+    requerir_proyecto()
+    
+    if len(argumentos) < 1 or argumentos[0].startswith('-'):
+        print("Error: Se requiere el número de versión")
+        print("Uso: crx restore <version> [--yes] [--into <carpeta>] [--sparse <patron>...] [-- <ruta>...]")
+        print("Ejemplo: crx restore 1.0")
+        sys.exit(1)
+    
+    version = argumentos[0]
+    confirmar = True
+    rutas = None
+    destino = None
+    i = 1
+    while i < len(argumentos):
+        if argumentos[i] in ['-y', '--yes']:
+            confirmar = False
+            i += 1
+        elif argumentos[i] == '--into':
+            if i + 1 >= len(argumentos):
+                print("Error: Se requiere una carpeta después de --into")
+                sys.exit(1)
+            destino = argumentos[i + 1]
+            i += 2
+        elif argumentos[i] == '--sparse':
+            # Los patrones llegan hasta la siguiente opción
+            i += 1
+            rutas = rutas or []
+            while i < len(argumentos) and not argumentos[i].startswith('-'):
+                rutas.append(argumentos[i])
+                i += 1
+            if not rutas:
+                print("Error: Se requiere al menos un patrón después de --sparse")
+                sys.exit(1)
+        elif argumentos[i] == '--':
+            rutas = (rutas or []) + argumentos[i + 1:]
+            if not rutas:
+                print("Error: Se requiere al menos una ruta después de --")
+                sys.exit(1)
+            break
+        else:
+            print(f"Error: Argumento desconocido '{argumentos[i]}'")
+            print("Las rutas a restaurar van después de --: crx restore 1.0 -- config.json")
+            sys.exit(1)
+    
+    from restaurar_versiones import restaurar_version_cli
+    if not restaurar_version_cli(version, rutas, confirmar, destino):
+        sys.exit(1)
+
+
+def comando_status(argumentos):
+    requerir_proyecto()
+    from info_proyecto import info_proyecto
+    info_proyecto()
+
+
+def comando_diff(argumentos):
+    requerir_proyecto()
+    
+    if len(argumentos) > 2:
+        print("Error: Demasiados argumentos")
+        print("Uso: crx diff [version] [otra-version]")
+        sys.exit(1)
+    
+    from ver_diferencias import ver_diferencias_cli
+    ver_diferencias_cli(*argumentos)
+
+
+def comando_cat(argumentos):
+    requerir_proyecto()
+    
+    posicionales = []
+    rango = None
+    i = 0
+    while i < len(argumentos):
+        if argumentos[i] == '--range':
+            if i + 1 < len(argumentos):
+                rango = argumentos[i + 1]
+                i += 2
+            else:
+                print("Error: Se requiere un rango offset:len después de --range")
+                sys.exit(1)
+        else:
+            posicionales.append(argumentos[i])
+            i += 1
+    
+    if len(posicionales) != 2:
+        print("Error: Se requieren la versión y la ruta del archivo")
+        print("Uso: crx cat <version> <ruta> [--range offset:len]")
+        sys.exit(1)
+    
+    from ver_archivo import ver_archivo_cli
+    if not ver_archivo_cli(posicionales[0], posicionales[1], rango):
+        sys.exit(1)
+
+
+def comando_export(argumentos):
+    requerir_proyecto()
+    
+    version = None
+    formato = None
+    salida = "-"
+    i = 0
+    while i < len(argumentos):
+        if argumentos[i] in ['-o', '--output', '--format']:
+            if i + 1 >= len(argumentos):
+                print(f"Error: Se requiere un valor después de {argumentos[i]}")
+                sys.exit(1)
+            if argumentos[i] == '--format':
+                formato = argumentos[i + 1].lower()
+            else:
+                salida = argumentos[i + 1]
+            i += 2
+        elif version is None and not argumentos[i].startswith('-'):
+            version = argumentos[i]
+            i += 1
+        else:
+            print(f"Error: Argumento desconocido '{argumentos[i]}'")
+            sys.exit(1)
+    
+    if version is None:
+        print("Error: Se requiere el número de versión")
+        print("Uso: crx export <version> [--format tar|tar.gz|zip] [-o <archivo>|-]")
+        sys.exit(1)
+    
+    from exportar_version import exportar_version_cli
+    if not exportar_version_cli(version, formato, salida):
+        sys.exit(1)
+
+
+def comando_import(argumentos):
+    requerir_proyecto(sugerir_new=True)
+    
+    rutas = []
+    opciones = {'--git': None, '--ref': "HEAD", '--fast-export': None}
+    i = 0
+    while i < len(argumentos):
+        if argumentos[i] in opciones:
+            if i + 1 >= len(argumentos):
+                print(f"Error: Se requiere un valor después de {argumentos[i]}")
+                sys.exit(1)
+            opciones[argumentos[i]] = argumentos[i + 1]
+            i += 2
+        elif not argumentos[i].startswith('-'):
+            rutas.append(argumentos[i])
+            i += 1
+        else:
+            print(f"Error: Argumento desconocido '{argumentos[i]}'")
+            sys.exit(1)
+    
+    fuentes = bool(rutas) + (opciones['--git'] is not None) + (opciones['--fast-export'] is not None)
+    if fuentes != 1:
+        print("Error: Indica rutas, --git o --fast-export (solo una de las tres)")
+        print("Uso: crx import <carpeta|tar>... | --git <repo> [--ref <ref>] | --fast-export <archivo|->")
+        sys.exit(1)
+    
+    from importar_historial import importar_historial_cli
+    if not importar_historial_cli(rutas, opciones['--git'], opciones['--ref'],
+                                  opciones['--fast-export']):
+        sys.exit(1)
+
+
+def comando_push(argumentos):
+    requerir_proyecto()
+    if len(argumentos) != 1 or argumentos[0].startswith('-'):
+        print("Error: Se requiere la ruta del almacén de destino")
+        print("Uso: crx push <destino>")
+        sys.exit(1)
+    from sincronizar_espejo import enviar_cli
+    if not enviar_cli(argumentos[0]):
+        sys.exit(1)
+
+
+def comando_pull(argumentos):
+    requerir_proyecto()
+    if len(argumentos) != 1 or argumentos[0].startswith('-'):
+        print("Error: Se requiere la ruta del almacén de origen")
+        print("Uso: crx pull <origen>")
+        sys.exit(1)
+    from sincronizar_espejo import traer_cli
+    if not traer_cli(argumentos[0]):
+        sys.exit(1)
+
+
+def comando_prune(argumentos):
+    requerir_proyecto()
+    if argumentos and argumentos != ['--now']:
+        print(f"Error: Argumento desconocido '{argumentos[0]}'")
+        print("Uso: crx prune [--now]")
+        sys.exit(1)
+    from podar_almacen import podar_cli
+    if not podar_cli(inmediato=bool(argumentos)):
+        sys.exit(1)
+
+
+def comando_batch(argumentos):
+    hilos = None
+    i = 0
+    while i < len(argumentos):
+        if argumentos[i] in ['-j', '--jobs']:
+            if i + 1 < len(argumentos) and argumentos[i + 1].isdigit() and int(argumentos[i + 1]) > 0:
+                hilos = int(argumentos[i + 1])
+                i += 2
+            else:
+                print("Error: Se requiere un número de hilos después de -j/--jobs")
+                sys.exit(1)
+        else:
+            print(f"Error: Argumento desconocido '{argumentos[i]}'")
+            sys.exit(1)
+    
+    from lote import ejecutar_lote_cli
+    if not ejecutar_lote_cli(hilos):
+        sys.exit(1)
+
+
+def comando_serve(argumentos):
+    requerir_proyecto()
+    import demonio
+    if argumentos and argumentos[0] == '--stop':
+        demonio.detener_cli()
+    elif argumentos:
+        print(f"Error: Argumento desconocido '{argumentos[0]}'")
+        sys.exit(1)
+    else:
+        demonio.servir_cli()
+
+
+def comando_help(argumentos):
+    mostrar_ayuda()
+
+
+# Nombre del comando -> función que lo ejecuta
+COMANDOS = {
+    'new': comando_new,
+    'save': comando_save,
+    'log': comando_log,
+    'restore': comando_restore,
+    'status': comando_status,
+    'diff': comando_diff,
+    'cat': comando_cat,
+    'export': comando_export,
+    'import': comando_import,
+    'push': comando_push,
+    'pull': comando_pull,
+    'prune': comando_prune,
+    'batch': comando_batch,
+    'serve': comando_serve,
+    'help': comando_help,
+    '--help': comando_help,
+    '-h': comando_help,
+}
+
+
+def despachar(argv):
+    """Ejecuta el comando de argv (sin el nombre del programa)"""
+    if not argv:
+        mostrar_ayuda()
+        sys.exit(0)
+    
+    comando = argv[0].lower()
+    
+    try:
+        funcion = COMANDOS.get(comando)
+        if funcion is None:
+            print(f"Error: Comando desconocido '{comando}'")
+            print("Usa 'crx help' para ver los comandos disponibles")
+            sys.exit(1)
+        funcion(argv[1:])
+    
+    except KeyboardInterrupt:
+        print("\nOperación cancelada por el usuario")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error inesperado: {e}")
+        sys.exit(1)
@@ -0,0 +1,205 @@
+"""
+Exportación de versiones de Cronux-CRX a tar, tar.gz y zip
+Los archivos se escriben en streaming desde el almacenamiento de la
+versión, sin copias temporales, así que la salida puede ser stdout.
+La salida es determinista: entradas ordenadas, fechas fijas, sin
+usuario ni grupo, y solo el bit de ejecución se conserva de los permisos.
+Las carpetas vacías que guardó la versión se exportan como entradas de carpeta.
+"""
+
+import os
+import shutil
+
+from archivos import TAMANO_BLOQUE
+import perfil
+
+FORMATOS_EXPORTACION = ("tar", "tar.gz", "zip")
+
+# Extensión del archivo de salida -> formato
+EXTENSIONES = {
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+    ".zip": "zip",
+}
+
+# Fechas fijas: 1970 para tar, 1980 (la mínima que admite zip) para zip
+FECHA_TAR = 0
+FECHA_ZIP = (1980, 1, 1, 0, 0, 0)
+
+# En zip no hay enlaces duros: los contenidos repetidos de hasta este
+# tamaño se guardan en memoria para leerlos una sola vez; los mayores se
+# vuelven a copiar desde el archivo que se abrió la primera vez
+MAXIMO_REPETIDO_EN_MEMORIA = 8 * 1024 * 1024
+
+MODO_CARPETA = 0o755
+
+
+def formato_por_nombre(nombre):
+    """Deduce el formato de la extensión del archivo de salida (None si no se reconoce)"""
+    nombre = nombre.lower()
+    for extension, formato in sorted(EXTENSIONES.items(), key=lambda e: -len(e[0])):
+        if nombre.endswith(extension):
+            return formato
+    return None
+
+
+def _modo(st, modo=None):
+    """Permisos normalizados: 0755 si el archivo es ejecutable, 0644 si no
+
+    'modo' es el del manifiesto si lo guardó: en el almacén de objetos un
+    mismo contenido puede pertenecer a archivos con permisos distintos
+    """
+    if modo is None:
+        modo = st.st_mode
+    return 0o755 if modo & 0o111 else 0o644
+
+
+def escribir_tar(salida, entradas, comprimir=False):
+    """Escribe un tar (o tar.gz) con las entradas [(nombre, ruta, clave, modo)]
+
+    Una entrada con ruta None es una carpeta vacía. Las entradas con la misma clave de contenido se escriben como enlaces
+    duros a la primera, así cada contenido se lee una sola vez.
+    Devuelve (archivos, bytes leídos, entradas compartidas).
+    """
+    import tarfile
+
+    gz = None
+    if comprimir:
+        import gzip
+        # GzipFile con mtime=0 y sin nombre: la cabecera gzip también es determinista
+        gz = salida = gzip.GzipFile(filename="", mode="wb", fileobj=salida,
+                                    compresslevel=6, mtime=0)
+
+    archivos = leidos = compartidas = 0
+    primeras = {}
+    try:
+        with tarfile.open(fileobj=salida, mode="w|", format=tarfile.PAX_FORMAT,
+                          copybufsize=TAMANO_BLOQUE) as tar:
+            for nombre, ruta, clave, modo in entradas:
+                info = tarfile.TarInfo(nombre)
+                info.mtime = FECHA_TAR
+                info.uid = info.gid = 0
+                info.uname = info.gname = ""
+                if ruta is None:
+                    info.type = tarfile.DIRTYPE
+                    info.mode = MODO_CARPETA
+                    tar.addfile(info)
+                    continue
+                archivos += 1
+
+                # Un enlace duro comparte los permisos de su destino al extraerlo
+                if modo is not None:
+                    modo = _modo(None, modo)
+                if clave is not None and (clave, modo) in primeras:
+                    info.type = tarfile.LNKTYPE
+                    info.linkname, info.mode = primeras[clave, modo]
+                    tar.addfile(info)
+                    compartidas += 1
+                    continue
+
+                with open(ruta, "rb") as f:
+                    st = os.fstat(f.fileno())
+                    info.size = st.st_size
+                    info.mode = _modo(st, modo)
+                    with perfil.fase("write"):
+                        tar.addfile(info, f)
+                leidos += st.st_size
+                if clave is not None:
+                    primeras[clave, modo] = (nombre, info.mode)
+    finally:
+        if gz is not None:
+            gz.close()
+    perfil.contar("bytes", leidos)
+    return archivos, leidos, compartidas
+
+
+def escribir_zip(salida, entradas):
+    """Escribe un zip con las entradas [(nombre, ruta, clave, modo)]
+
+    Una entrada con ruta None es una carpeta vacía. Cada contenido repetido
+    se abre una sola vez en el almacenamiento de la versión.
+    Devuelve (archivos, bytes leídos, entradas compartidas).
+    """
+    import zipfile
+
+    entradas = list(entradas)
+    usos = {}
+    for _, _, clave, _ in entradas:
+        if clave is not None:
+            usos[clave] = usos.get(clave, 0) + 1
+    en_memoria = {}
+    # Contenidos repetidos demasiado grandes para la memoria: clave -> (archivo abierto, stat)
+    abiertos = {}
+
+    archivos = leidos = compartidas = 0
+    try:
+        with zipfile.ZipFile(salida, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for nombre, ruta, clave, modo in entradas:
+                if ruta is None:
+                    info = zipfile.ZipInfo(nombre + "/", date_time=FECHA_ZIP)
+                    info.create_system = 3
+                    info.external_attr = (0o40000 | MODO_CARPETA) << 16 | 0x10  # 0x10: carpeta en MS-DOS
+                    zf.writestr(info, b"")
+                    continue
+
+                archivos += 1
+                info = zipfile.ZipInfo(nombre, date_time=FECHA_ZIP)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.create_system = 3  # Unix, para que external_attr lleve los permisos
+
+                if clave in en_memoria:
+                    datos, st = en_memoria[clave]
+                    info.external_attr = (0o100000 | _modo(st, modo)) << 16
+                    with perfil.fase("write"):
+                        zf.writestr(info, datos)
+                    compartidas += 1
+                    usos[clave] -= 1
+                    if not usos[clave]:
+                        del en_memoria[clave]
+                    continue
+
+                if clave in abiertos:
+                    f, st = abiertos[clave]
+                    f.seek(0)
+                    compartidas += 1
+                else:
+                    f = open(ruta, "rb")
+                    st = os.fstat(f.fileno())
+                    leidos += st.st_size
+                info.external_attr = (0o100000 | _modo(st, modo)) << 16
+                info.file_size = st.st_size
+                usos_restantes = usos[clave] - 1 if clave is not None else 0
+                try:
+                    if usos_restantes and st.st_size <= MAXIMO_REPETIDO_EN_MEMORIA:
+                        datos = f.read()
+                        en_memoria[clave] = (datos, st)
+                        with perfil.fase("write"):
+                            zf.writestr(info, datos)
+                    else:
+                        with perfil.fase("write"), zf.open(info, "w", force_zip64=st.st_size >= zipfile.ZIP64_LIMIT) as destino:
+                            shutil.copyfileobj(f, destino, TAMANO_BLOQUE)
+                finally:
+                    if usos_restantes and st.st_size > MAXIMO_REPETIDO_EN_MEMORIA:
+                        abiertos[clave] = (f, st)
+                    else:
+                        abiertos.pop(clave, None)
+                        f.close()
+                if clave is not None:
+                    usos[clave] = usos_restantes
+    finally:
+        for f, _ in abiertos.values():
+            f.close()
+    perfil.contar("bytes", leidos)
+    return archivos, leidos, compartidas
+
+
+def escribir_archivo(salida, formato, entradas):
+    """Escribe las entradas en el formato pedido"""
+    if formato == "zip":
+        return escribir_zip(salida, entradas)
+    if formato in ("tar", "tar.gz"):
+        return escribir_tar(salida, entradas, comprimir=formato == "tar.gz")
+    raise ValueError(
+        f"Formato desconocido '{formato}' (disponibles: {', '.join(FORMATOS_EXPORTACION)})"
+    )
@@ -0,0 +1,56 @@
+import os
+import sys
+from funcion_verficar import *
+from cronux import abrir, CronuxError
+from exportar import FORMATOS_EXPORTACION, formato_por_nombre
+
+def exportar_version_cli(version, formato=None, salida="-"):
+    """Versión CLI que exporta una versión a un archivo o a stdout ('-')"""
+    # Con salida a stdout, los mensajes van a stderr para no romper el archivo
+    mensajes = sys.stderr if salida == "-" else sys.stdout
+    if not verificarCronux():
+        print("ERROR: No estas en un proyecto Cronux", file=mensajes)
+        return False
+    
+    formato = formato or (formato_por_nombre(salida) if salida != "-" else None) or "tar"
+    if formato not in FORMATOS_EXPORTACION:
+        print(f"ERROR: Formato desconocido '{formato}'", file=mensajes)
+        print(f"Disponibles: {', '.join(FORMATOS_EXPORTACION)}", file=mensajes)
+        return False
+    
+    if salida == "-":
+        if sys.stdout.isatty():
+            print("ERROR: No se escribe un archivo binario en la terminal", file=mensajes)
+            print("Usa -o <archivo> o redirige la salida", file=mensajes)
+            return False
+        try:
+            resultado = abrir().export(version, sys.stdout.buffer, formato)
+            sys.stdout.flush()
+        except CronuxError as e:
+            print(f"ERROR: {e}", file=mensajes)
+            return False
+        except BrokenPipeError:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return False
+        return True
+    
+    # A un archivo: se escribe junto al destino y se renombra al terminar
+    temporal = f"{salida}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, "wb") as f:
+            resultado = abrir().export(version, f, formato)
+        os.replace(temporal, salida)
+    except CronuxError as e:
+        print(f"ERROR: {e}")
+        return False
+    finally:
+        if os.path.exists(temporal):
+            os.unlink(temporal)
+    
+    print(f"EXITO: Version {resultado.version} exportada a {salida} ({resultado.format})")
+    print(f"Archivos: {resultado.files}")
+    if resultado.shared:
+        print(f"Contenidos repetidos leídos una sola vez: {resultado.shared}")
+    print(f"Tamaño: {os.path.getsize(salida) / 1024 / 1024:.1f} MB")
+    
+    return True
@@ -1,51 +1,43 @@
+import os
 from pathlib import Path
 import json
 
+from cronux import buscar_raiz, CARPETA_CRONUX
+
+def obtener_carpeta_actual():
+    """Carpeta desde la que se ejecuta el comando (donde 'new' crea el proyecto)"""
+    return Path(os.getcwd())
+
 def verificarCronux():
-    """Verifica si estamos en un proyecto Cronux"""
-    carpeta_cronux = Path.cwd() / ".cronux"
-    archivo_proyecto = carpeta_cronux / "proyecto.json"
-    return carpeta_cronux.exists() and archivo_proyecto.exists()
+    """Verifica si estamos en un proyecto Cronux (en su raíz o en una subcarpeta)"""
+    return buscar_raiz() is not None
+
+def obtener_raiz_proyecto():
+    """Raíz del proyecto actual; la carpeta actual si no hay proyecto"""
+    return buscar_raiz() or obtener_carpeta_actual()
 
 def obtener_ruta_cronux():
     """Obtiene la ruta de la carpeta .cronux"""
-    return Path.cwd() / ".cronux"
+    return obtener_raiz_proyecto() / CARPETA_CRONUX
 
 def obtener_ruta_proyecto_json():
     """Obtiene la ruta del archivo proyecto.json"""
     return obtener_ruta_cronux() / "proyecto.json"
 
+def obtener_algoritmo_hash():
+    """Obtiene el algoritmo de hash configurado en proyecto.json"""
+    try:
+        with open(obtener_ruta_proyecto_json(), "r") as f:
+            algoritmo = json.load(f).get("hash")
+    except (OSError, ValueError):
+        algoritmo = None
+    if algoritmo:
+        return algoritmo
+    # archivos (hashlib, mmap...) solo se importa si hace falta el valor por defecto
+    from archivos import ALGORITMO_POR_DEFECTO
+    return ALGORITMO_POR_DEFECTO
+
 def determinar_numero_version():
     """Determina el siguiente número de versión"""
-    carpeta_versiones = obtener_ruta_cronux() / "versiones"
-    
-    if not carpeta_versiones.exists():
-        return "1.0"
-    
-    versiones = list(carpeta_versiones.glob("version_*"))
-    
-    if not versiones:
-        return "1.0"
-    
-    # Extraer números de versión
-    numeros = []
-    for version_dir in versiones:
-        try:
-            numero = version_dir.name.replace("version_", "")
-            if "." in numero:
-                mayor, menor = numero.split(".")
-                numeros.append((int(mayor), int(menor)))
-            else:
-                numeros.append((int(numero), 0))
-        except ValueError:
-            continue
-    
-    if not numeros:
-        return "1.0"
-    
-    # Encontrar la versión más alta
-    numeros.sort()
-    ultimo_mayor, ultimo_menor = numeros[-1]
-    
-    # Incrementar versión menor
-    return f"{ultimo_mayor}.{ultimo_menor + 1}"
\ No newline at end of file
+    from cronux import abrir
+    return abrir().next_version()
@@ -0,0 +1,380 @@
+"""
+Fuentes de historial para crx import
+Convierten carpetas, tarballs o un flujo de git fast-export en versiones.
+Cada fuente es un generador que guarda el contenido en el almacén de
+objetos y produce (origen, fecha, mensaje, archivos) por versión, con
+'archivos' en el formato del manifiesto. Repository._importar le devuelve
+con send() la carpeta de la versión escrita.
+"""
+
+import os
+import stat
+import time
+import posixpath
+
+from almacen import leer_exacto
+
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+
+
+def _fecha(ns):
+    return time.strftime(FORMATO_FECHA, time.localtime(ns / 1e9))
+
+
+def _entrada(valor, tamano, modo, mtime):
+    return {"hash": valor, "tamano": tamano, "modo": modo, "mtime": mtime}
+
+
+def _oculta(relativa):
+    """Los ocultos del primer nivel (.git, .cronux...) no se guardan, como en save"""
+    return relativa.startswith(".")
+
+
+def _ruta_segura(nombre):
+    """Ruta relativa normalizada de un miembro de tar; None si sale de la carpeta"""
+    nombre = posixpath.normpath(nombre.replace("\\", "/").lstrip("/"))
+    if nombre in (".", "") or nombre == ".." or nombre.startswith("../"):
+        return None
+    return nombre
+
+
+# Carpetas
+
+def desde_carpeta(ruta, almacen, avisos):
+    """Una versión con el contenido de una carpeta; su fecha es la del archivo más reciente"""
+    from archivos import recorrer
+
+    archivos = {}
+    for relativa, origen, st in recorrer(ruta, avisos=avisos):
+        try:
+            # Al importar varias copias de un proyecto casi todo ya está en el almacén:
+            # primero se hashea y solo se copia lo que falta
+            valor, _ = almacen.guardar_archivo(origen, st.st_size, probablemente_nuevo=False)
+        except OSError as e:
+            avisos.append(f"No se pudo importar {os.path.join(ruta, relativa)}: {e}")
+            continue
+        archivos[relativa] = _entrada(valor, st.st_size, stat.S_IMODE(st.st_mode), st.st_mtime_ns)
+
+    fecha = max((e["mtime"] for e in archivos.values()), default=None)
+    yield (f"carpeta:{os.path.abspath(ruta)}", _fecha(fecha or time.time_ns()),
+           f"Importado de {os.path.basename(os.path.abspath(ruta))}", archivos)
+
+
+# Tarballs
+
+def desde_tar(ruta, almacen, avisos):
+    """Una versión con el contenido de un tar (comprimido o no), leído en una pasada
+
+    Si todo cuelga de una única carpeta (proyecto-1.0/...), se quita ese nivel
+    """
+    import tarfile
+
+    archivos = {}
+    # "r|*": modo flujo, sin seek; la compresión se detecta sola
+    with tarfile.open(ruta, "r|*") as tar:
+        for miembro in tar:
+            if miembro.isdir():
+                continue
+            relativa = _ruta_segura(miembro.name)
+            if relativa is None:
+                avisos.append(f"{ruta}: se omite '{miembro.name}' (ruta fuera del archivo)")
+                continue
+            mtime = int(miembro.mtime) * 10**9
+            if miembro.islnk():
+                # Enlace duro a un miembro anterior: mismo contenido, sin leer nada
+                destino = archivos.get(_ruta_segura(miembro.linkname))
+                if destino is not None:
+                    archivos[relativa] = _entrada(destino["hash"], destino["tamano"],
+                                                  miembro.mode & 0o7777, mtime)
+                    continue
+            if not miembro.isreg():
+                avisos.append(f"{ruta}: se omite '{miembro.name}' (no es un archivo normal)")
+                continue
+            valor, _ = almacen.guardar_flujo(tar.extractfile(miembro), miembro.size)
+            archivos[relativa] = _entrada(valor, miembro.size, miembro.mode & 0o7777, mtime)
+
+    primeras = {r.split("/")[0] for r in archivos}
+    if len(primeras) == 1 and all("/" in r for r in archivos):
+        corte = len(primeras.pop()) + 1
+        archivos = {r[corte:]: e for r, e in archivos.items()}
+    archivos = {r: e for r, e in archivos.items() if not _oculta(r)}
+
+    # Un tar determinista (crx export) lleva fecha 0: entonces vale la del archivo
+    fecha = max((e["mtime"] for e in archivos.values()), default=0) or os.stat(ruta).st_mtime_ns
+    nombre = os.path.basename(ruta)
+    yield f"tar:{os.path.abspath(ruta)}", _fecha(fecha), f"Importado de {nombre}", archivos
+
+
+def es_tar(ruta):
+    import tarfile
+    return os.path.isfile(ruta) and tarfile.is_tarfile(ruta)
+
+
+# git fast-export
+
+def _ruta_git(texto):
+    """Lee una ruta de fast-export (quizá entre comillas al estilo C); devuelve (ruta, resto)"""
+    if not texto.startswith(b'"'):
+        ruta, _, resto = texto.partition(b" ")
+        return ruta.decode("utf-8", "surrogateescape"), resto
+
+    escapes = {ord("n"): 10, ord("t"): 9, ord('"'): 34, ord("\\"): 92,
+               ord("a"): 7, ord("b"): 8, ord("f"): 12, ord("r"): 13, ord("v"): 11}
+    salida = bytearray()
+    i = 1
+    while i < len(texto):
+        c = texto[i]
+        if c == ord('"'):
+            return bytes(salida).decode("utf-8", "surrogateescape"), texto[i + 2:]
+        if c == ord("\\"):
+            siguiente = texto[i + 1]
+            if ord("0") <= siguiente <= ord("7"):
+                salida.append(int(texto[i + 1:i + 4], 8))
+                i += 4
+                continue
+            salida.append(escapes.get(siguiente, siguiente))
+            i += 2
+            continue
+        salida.append(c)
+        i += 1
+    raise ValueError(f"Ruta entre comillas sin cerrar: {texto!r}")
+
+
+class _LectorFastExport:
+    """Recorre un flujo de git fast-export y produce una versión por commit
+
+    Los commits sin --full-tree solo traen los cambios respecto a su primer
+    padre. Se conserva en memoria el árbol del último commit; si un commit
+    parte de otro, su árbol se lee del manifiesto de la versión ya escrita.
+    """
+
+    def __init__(self, flujo, almacen, avisos):
+        self.flujo = flujo
+        self.almacen = almacen
+        self.avisos = avisos
+        self.blobs = {}      # marca -> (hash, tamaño)
+        self.carpetas = {}   # marca de commit -> carpeta de su versión
+        self.ramas = {}      # ref -> marca de su último commit
+        self.actual = (None, {})
+        self.omitidas = set()
+
+    def _linea(self):
+        linea = self.flujo.readline()
+        if not linea:
+            return None
+        return linea[:-1] if linea.endswith(b"\n") else linea
+
+    def _datos(self, cabecera, guardar=False):
+        """Lee el bloque de un comando 'data'; lo guarda en el almacén o lo devuelve"""
+        argumento = cabecera[5:]
+        if argumento.startswith(b"<<"):
+            # Formato delimitado: termina en una línea con el delimitador
+            fin = argumento[2:]
+            partes = []
+            while True:
+                linea = self.flujo.readline()
+                if not linea or linea.rstrip(b"\n") == fin:
+                    break
+                partes.append(linea)
+            datos = b"".join(partes)
+            if guardar:
+                import io
+                valor, _ = self.almacen.guardar_flujo(io.BytesIO(datos), len(datos))
+                return valor, len(datos)
+            return datos
+
+        tamano = int(argumento)
+        if guardar:
+            resultado = self.almacen.guardar_flujo(self.flujo, tamano)[0], tamano
+        else:
+            resultado = leer_exacto(self.flujo, tamano)
+        # Tras los datos puede venir un salto de línea opcional
+        if self.flujo.peek(1)[:1] == b"\n":
+            self.flujo.read(1)
+        return resultado
+
+    def _arbol_de(self, marca):
+        """Árbol de un commit anterior (el último sigue en memoria)"""
+        if marca is None:
+            return {}
+        if self.actual[0] == marca:
+            return self.actual[1]
+        from manifiesto import leer, como_dict
+        carpeta = self.carpetas.get(marca)
+        if carpeta is None:
+            raise ValueError(f"El flujo usa el commit {marca.decode()} antes de definirlo")
+        # El árbol se modifica con los cambios del commit: hace falta un dict
+        return como_dict(leer(carpeta)["archivos"])
+
+    def _omitir(self, ruta, motivo):
+        if ruta not in self.omitidas:
+            self.omitidas.add(ruta)
+            self.avisos.append(f"Se omite {ruta} ({motivo})")
+
+    def _modificar(self, arbol, texto, fecha_ns):
+        """Aplica una línea 'M modo ref ruta'"""
+        modo, ref, resto = texto.split(b" ", 2)
+        ruta, _ = _ruta_git(resto)
+        if ref == b"inline":
+            valor, tamano = self._datos(self._linea(), guardar=True)
+        elif modo == b"160000":
+            self._omitir(ruta, "submódulo")
+            return
+        elif ref not in self.blobs:
+            self._omitir(ruta, f"contenido {ref.decode()} no incluido en el flujo")
+            return
+        else:
+            valor, tamano = self.blobs[ref]
+        if modo == b"120000":
+            self._omitir(ruta, "enlace simbólico")
+            return
+        if _oculta(ruta):
+            return
+        permisos = 0o755 if modo in (b"100755", b"755") else 0o644
+        anterior = arbol.get(ruta)
+        if anterior is not None and anterior["hash"] == valor and anterior["modo"] == permisos:
+            return
+        arbol[ruta] = _entrada(valor, tamano, permisos, fecha_ns)
+
+    def _commit(self, ref):
+        marca = original = None
+        fecha_ns = 0
+        padre = self.ramas.get(ref)
+        mensaje = b""
+        arbol = None
+
+        while True:
+            linea = self._linea()
+            if linea is None:
+                break
+            if linea.startswith(b"mark "):
+                marca = linea[5:]
+            elif linea.startswith(b"original-oid "):
+                original = linea[13:].decode()
+            elif linea.startswith(b"committer "):
+                # committer Nombre <correo> 1700000000 +0100
+                fecha_ns = int(linea.rsplit(b" ", 2)[1]) * 10**9
+            elif linea.startswith(b"data "):
+                mensaje = self._datos(linea)
+            elif linea.startswith(b"from "):
+                padre = linea[5:]
+            elif linea.startswith((b"author ", b"encoding ", b"merge ", b"gpgsig ")):
+                continue
+            elif linea[:2] in (b"M ", b"D ", b"C ", b"R ") or linea == b"deleteall":
+                if arbol is None:
+                    # El árbol del commit anterior se cambia en el sitio: su
+                    # versión ya está escrita y se puede volver a leer de disco
+                    arbol = self._arbol_de(padre)
+                    self.actual = (None, {})
+                self._operacion(arbol, linea, fecha_ns)
+            else:
+                # Línea vacía o comando siguiente: el commit ha terminado
+                self.pendiente = linea
+                break
+
+        if arbol is None:
+            arbol = self._arbol_de(padre)
+        marca = marca or f":commit-{len(self.carpetas)}".encode()
+        self.ramas[ref] = marca
+        titulo = mensaje.decode("utf-8", "replace").strip().split("\n")[0] or "Sin mensaje"
+        return marca, (f"git:{original or marca.decode()}", _fecha(fecha_ns or time.time_ns()),
+                       titulo, arbol)
+
+    def _operacion(self, arbol, linea, fecha_ns):
+        if linea == b"deleteall":
+            arbol.clear()
+        elif linea.startswith(b"M "):
+            self._modificar(arbol, linea[2:], fecha_ns)
+        elif linea.startswith(b"D "):
+            ruta, _ = _ruta_git(linea[2:])
+            if arbol.pop(ruta, None) is None:
+                for relativa in [r for r in arbol if r.startswith(ruta + "/")]:
+                    del arbol[relativa]
+        else:
+            origen, resto = _ruta_git(linea[2:])
+            destino, _ = _ruta_git(resto)
+            movidas = {r: e for r, e in arbol.items() if r == origen or r.startswith(origen + "/")}
+            for relativa, entrada in movidas.items():
+                if linea.startswith(b"R "):
+                    del arbol[relativa]
+                nueva = destino + relativa[len(origen):]
+                if not _oculta(nueva):
+                    arbol[nueva] = entrada
+
+    def versiones(self):
+        self.pendiente = None
+        while True:
+            linea, self.pendiente = self.pendiente, None
+            if linea is None:
+                linea = self._linea()
+                if linea is None:
+                    return
+            if linea.startswith(b"blob"):
+                marca = None
+                while True:
+                    linea = self._linea()
+                    if linea is None:
+                        raise ValueError("El flujo terminó dentro de un blob")
+                    if linea.startswith(b"mark "):
+                        marca = linea[5:]
+                    elif linea.startswith(b"data "):
+                        self.blobs[marca] = self._datos(linea, guardar=True)
+                        break
+            elif linea.startswith(b"commit "):
+                marca, version = self._commit(linea[7:])
+                carpeta = yield version
+                self.carpetas[marca] = carpeta
+                self.actual = (marca, version[3])
+            elif linea.startswith(b"reset "):
+                ref = linea[6:]
+                self.ramas.pop(ref, None)
+                siguiente = self._linea()
+                if siguiente is not None and siguiente.startswith(b"from "):
+                    self.ramas[ref] = siguiente[5:]
+                else:
+                    self.pendiente = siguiente
+            elif linea.startswith(b"tag "):
+                # Las etiquetas no son versiones: se salta hasta su mensaje
+                while True:
+                    linea = self._linea()
+                    if linea is None:
+                        return
+                    if linea.startswith(b"data "):
+                        self._datos(linea)
+                        break
+            elif linea == b"done":
+                return
+            # feature, option, progress, checkpoint y líneas vacías no cambian nada
+
+
+def desde_fast_export(flujo, almacen, avisos):
+    """Una versión por commit de un flujo de git fast-export (binario, con peek())"""
+    return _LectorFastExport(flujo, almacen, avisos).versiones()
+
+
+def desde_git(repositorio, ref, almacen, avisos):
+    """Una versión por commit alcanzable desde 'ref' en un repositorio git"""
+    import tempfile
+    import subprocess
+
+    orden = ["git", "-C", repositorio, "fast-export", "--show-original-ids",
+             "--signed-tags=strip", "--reencode=yes", "--end-of-options", ref]
+    # stderr va a un temporal: una tubería que nadie lee mientras se consume
+    # stdout se llenaría con muchos avisos y bloquearía a git y a este proceso
+    with tempfile.TemporaryFile() as errores:
+        try:
+            proceso = subprocess.Popen(orden, stdout=subprocess.PIPE, stderr=errores)
+        except FileNotFoundError:
+            raise ValueError("No se encontró el programa 'git'") from None
+
+        try:
+            yield from desde_fast_export(proceso.stdout, almacen, avisos)
+        finally:
+            proceso.stdout.close()
+            if proceso.poll() is None:
+                proceso.kill()
+            codigo = proceso.wait()
+            errores.seek(0)
+            error = errores.read().decode("utf-8", "replace").strip()
+    if codigo != 0:
+        raise ValueError(f"git fast-export falló: {error or f'código {codigo}'}")
@@ -0,0 +1,53 @@
+import sys
+from funcion_verficar import *
+from cronux import abrir, CronuxError
+
+# Con historiales largos solo se informa cada tantas versiones
+CADA_CUANTAS = 500
+
+def _progreso(numero, mensaje):
+    _progreso.total += 1
+    if _progreso.total % CADA_CUANTAS == 0:
+        print(f"  ... {_progreso.total} versiones importadas (última: {numero})")
+        sys.stdout.flush()
+
+def importar_historial_cli(rutas=None, git=None, ref="HEAD", fast_export=None):
+    """Versión CLI que importa carpetas, tarballs o historial de git como versiones"""
+    if not verificarCronux():
+        print("ERROR: No estas en un proyecto Cronux")
+        return False
+
+    repositorio = abrir()
+    _progreso.total = 0
+    try:
+        if git is not None:
+            print(f"Importando historial de git de {git} ({ref})...")
+            resultado = repositorio.import_git(git, ref, _progreso)
+        elif fast_export is not None:
+            if fast_export == "-":
+                resultado = repositorio.import_fast_export(sys.stdin.buffer, _progreso)
+            else:
+                with open(fast_export, "rb") as flujo:
+                    resultado = repositorio.import_fast_export(flujo, _progreso)
+        else:
+            resultado = repositorio.import_paths(rutas, _progreso)
+    except (CronuxError, OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return False
+
+    for aviso in resultado.warnings:
+        print(f"Advertencia: {aviso}")
+
+    if not resultado.versions:
+        print("INFO: No había nada que importar")
+        return True
+
+    primera, ultima = resultado.versions[0], resultado.versions[-1]
+    rango = primera if primera == ultima else f"{primera} a {ultima}"
+    print(f"EXITO: {len(resultado.versions)} versiones importadas ({rango})")
+    print(f"Archivos: {resultado.files}")
+    print(f"Leídos: {resultado.bytes_read / 1024 / 1024:.1f} MB, "
+          f"escritos: {resultado.bytes_written / 1024 / 1024:.1f} MB "
+          f"(el contenido repetido se guarda una sola vez)")
+
+    return True
@@ -0,0 +1,200 @@
+"""
+Índice de búsqueda de Cronux-CRX (crx log --grep, crx log -- <ruta>)
+En .cronux/indice.db (sqlite3) se guardan los mensajes de las versiones,
+en una tabla FTS5, y para cada ruta las versiones en las que su contenido
+cambió: buscar no lee ni un metadatos.json ni un manifiesto. Cada save,
+import o pull añade sus versiones al índice; si el catálogo cambió por
+otro camino (una versión borrada a mano, un crx antiguo), el índice se
+pone al día comparando conjuntos de versiones antes de la búsqueda.
+
+El índice es prescindible: se puede borrar y se reconstruye solo.
+"""
+
+import sqlite3
+
+NOMBRE_INDICE = "indice.db"
+
+ErrorIndice = sqlite3.Error
+
+# Si cambia el esquema, los índices anteriores se borran y se reconstruyen
+VERSION_ESQUEMA = 2
+
+ESQUEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS mensajes USING fts5(
+    mensaje,
+    version UNINDEXED,
+    fecha UNINDEXED,
+    archivos UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS cambios (
+    ruta TEXT,
+    version INTEGER,
+    PRIMARY KEY (ruta, version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS estado (clave TEXT PRIMARY KEY, valor TEXT);
+"""
+
+
+def disponible():
+    """Comprueba si el sqlite3 de este Python trae FTS5"""
+    if not hasattr(disponible, "resultado"):
+        try:
+            conexion = sqlite3.connect(":memory:")
+            conexion.execute("CREATE VIRTUAL TABLE prueba USING fts5(texto)")
+            conexion.close()
+            disponible.resultado = True
+        except sqlite3.Error:
+            disponible.resultado = False
+    return disponible.resultado
+
+
+def consulta(texto):
+    """Convierte los términos del usuario en una consulta FTS5
+
+    Cada término debe aparecer (Y lógico), sin distinguir mayúsculas ni
+    acentos; 'term*' busca por prefijo. Los operadores de FTS5 no se
+    interpretan: un mensaje con comillas o guiones no rompe la consulta.
+    """
+    partes = []
+    for termino in texto.split():
+        prefijo = termino.endswith("*")
+        termino = termino.rstrip("*")
+        if termino:
+            partes.append('"' + termino.replace('"', '""') + '"' + ("*" if prefijo else ""))
+    return " ".join(partes)
+
+
+def rowid(numero):
+    """Rowid de una versión: ordenar por rowid es ordenar por número de versión
+
+    Como en cronux.numero_de_carpeta, un número sin parte menor
+    (version_3) cuenta como 3.0
+    """
+    mayor, _, menor = numero.partition(".")
+    return (int(mayor) << 32) + int(menor or 0)
+
+
+def texto_clave(clave):
+    """Clave del catálogo (o None) tal como se guarda en el índice"""
+    return "" if clave is None else ":".join(str(parte) for parte in clave)
+
+
+def fila(numero, metadatos):
+    """Fila del índice para una versión"""
+    metadatos = metadatos or {}
+    return (rowid(numero), metadatos.get("mensaje", ""), numero,
+            metadatos.get("fecha"), metadatos.get("archivos_guardados"))
+
+
+def filas_cambios(numero, rutas):
+    """Filas del índice de rutas para las rutas que cambiaron en una versión"""
+    version = rowid(numero)
+    return [(ruta, version) for ruta in rutas]
+
+
+class Indice:
+    """Conexión al índice de un proyecto"""
+
+    def __init__(self, ruta):
+        # El lote reparte las peticiones de un proyecto en hilos distintos,
+        # pero nunca dos a la vez
+        self.conexion = sqlite3.connect(str(ruta), timeout=10, check_same_thread=False)
+        if self.conexion.execute("PRAGMA user_version").fetchone()[0] != VERSION_ESQUEMA:
+            self.conexion.executescript(
+                "DROP TABLE IF EXISTS mensajes; DROP TABLE IF EXISTS cambios; "
+                "DROP TABLE IF EXISTS estado;")
+            self.conexion.executescript(ESQUEMA)
+            self.conexion.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+        self.conexion.execute("CREATE TEMP TABLE IF NOT EXISTS buscadas (ruta TEXT PRIMARY KEY)")
+
+    def clave(self):
+        """Clave del catálogo con la que el índice estaba al día ('' si no hay versiones)"""
+        resultado = self.conexion.execute(
+            "SELECT valor FROM estado WHERE clave = 'catalogo'").fetchone()
+        return resultado[0] if resultado else ""
+
+    def versiones(self):
+        """Números de versión indexados"""
+        return {v for (v,) in self.conexion.execute("SELECT version FROM mensajes")}
+
+    def rutas(self):
+        """Todas las rutas que alguna vez cambiaron"""
+        return [r for (r,) in self.conexion.execute("SELECT DISTINCT ruta FROM cambios")]
+
+    def actualizar(self, nuevas, cambios, quitadas=(), clave=None):
+        """Añade filas de mensajes y de rutas, quita versiones y, si se indica, anota la clave del catálogo"""
+        with self.conexion:
+            quitadas = [(rowid(numero),) for numero in quitadas]
+            self.conexion.executemany("DELETE FROM mensajes WHERE rowid = ?", quitadas)
+            # Poco frecuente (versiones borradas a mano): recorrer la tabla es aceptable
+            self.conexion.executemany("DELETE FROM cambios WHERE version = ?", quitadas)
+            # Dos carpetas con el mismo número (version_3 y version_3.0) compartirían
+            # fila: el índice no sirve para ese proyecto y se busca sin él
+            numeros = {}
+            for nueva in nuevas:
+                if numeros.setdefault(nueva[0], nueva[2]) != nueva[2]:
+                    raise sqlite3.IntegrityError(f"Las versiones {numeros[nueva[0]]} y {nueva[2]} "
+                                                 "tienen el mismo número")
+            for version, numero in numeros.items():
+                existente = self.conexion.execute(
+                    "SELECT version FROM mensajes WHERE rowid = ?", (version,)).fetchone()
+                if existente is not None and existente[0] != numero:
+                    raise sqlite3.IntegrityError(f"Las versiones {existente[0]} y {numero} "
+                                                 "tienen el mismo número")
+            # Con el número de versión como rowid, indexar dos veces la
+            # misma versión (dos procesos a la vez) la reemplaza
+            self.conexion.executemany(
+                "INSERT OR REPLACE INTO mensajes (rowid, mensaje, version, fecha, archivos) "
+                "VALUES (?, ?, ?, ?, ?)", nuevas)
+            self.conexion.executemany("INSERT OR IGNORE INTO cambios VALUES (?, ?)", cambios)
+            if clave is not None:
+                self.conexion.execute(
+                    "INSERT OR REPLACE INTO estado VALUES ('catalogo', ?)", (clave,))
+
+    def buscar(self, texto=None, prefijos=None, exactas=None):
+        """[(version, fecha, mensaje, archivos)] de la más nueva a la más antigua
+
+        'texto': el mensaje contiene todos los términos. 'prefijos': cambió
+        esa ruta o algo dentro de ella ('' es cualquier ruta). 'exactas':
+        cambió alguna de esas rutas. Los filtros indicados se combinan.
+        """
+        condiciones, parametros = [], []
+        if texto is not None:
+            expresion = consulta(texto)
+            if not expresion:
+                return []
+            condiciones.append("mensajes MATCH ?")
+            parametros.append(expresion)
+
+        if prefijos is not None or exactas is not None:
+            subconsultas = []
+            for prefijo in prefijos or ():
+                if not prefijo:
+                    subconsultas.append("SELECT version FROM cambios")
+                    continue
+                # Lo que hay dentro de 'src' está entre 'src/' y 'src0' ('0' sigue a '/')
+                subconsultas.append("SELECT version FROM cambios "
+                                    "WHERE ruta = ? OR (ruta > ? AND ruta < ?)")
+                parametros.extend((prefijo, prefijo + "/", prefijo + "0"))
+            if exactas:
+                self.conexion.execute("DELETE FROM temp.buscadas")
+                self.conexion.executemany("INSERT OR IGNORE INTO temp.buscadas VALUES (?)",
+                                          ((ruta,) for ruta in exactas))
+                subconsultas.append("SELECT version FROM cambios "
+                                    "WHERE ruta IN (SELECT ruta FROM temp.buscadas)")
+            if not subconsultas:
+                return []
+            condiciones.append("rowid IN (" + " UNION ".join(subconsultas) + ")")
+
+        consulta_sql = "SELECT version, fecha, mensaje, archivos FROM mensajes"
+        if condiciones:
+            consulta_sql += " WHERE " + " AND ".join(condiciones)
+        # Se cierra la transacción de temp.buscadas: un servidor con la
+        # conexión abierta no debe bloquear los save de otros procesos
+        with self.conexion:
+            return self.conexion.execute(consulta_sql + " ORDER BY rowid DESC",
+                                         parametros).fetchall()
+
+    def cerrar(self):
+        self.conexion.close()
@@ -0,0 +1,166 @@
+"""
+Modo lote de Cronux-CRX (crx batch)
+Lee comandos en JSON lines por stdin y los ejecuta en un solo proceso
+con la API de cronux.py. Los comandos de un mismo repositorio se ejecutan
+en orden; los de repositorios distintos, en paralelo. Cada resultado se
+escribe en stdout como una línea JSON en cuanto termina.
+
+Entrada (una línea por comando):
+    {"id": 1, "repo": "proyectos/web", "command": "save", "args": {"message": "nocturno"}}
+
+Salida:
+    {"id": 1, "line": 1, "repo": "/ruta/proyectos/web", "command": "save", "ok": true, "result": {...}}
+    {"id": 2, "line": 2, ..., "ok": false, "error": "La version '9.9' no existe", "type": "VersionNotFoundError"}
+"""
+
+import os
+import sys
+import json
+import threading
+from collections import deque
+
+from cronux import Repository, abrir, buscar_raiz, MARGEN_PODA_S
+
+
+def _a_json(valor):
+    """Convierte los resultados de la API en tipos serializables"""
+    if hasattr(valor, "_asdict"):
+        return {k: _a_json(v) for k, v in valor._asdict().items()}
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(v) for v in valor]
+    if isinstance(valor, os.PathLike):
+        return os.fspath(valor)
+    return valor
+
+
+def _comando_init(ruta, name, hash_algorithm=None, shared_store=None):
+    Repository.init(ruta, name, hash_algorithm, shared_store=shared_store)
+    return abrir(ruta).status()
+
+
+def _comando_import(ruta, paths=None, git=None, ref="HEAD"):
+    if git is not None:
+        return abrir(ruta).import_git(git, ref)
+    return abrir(ruta).import_paths(paths or [])
+
+
+# Comando -> (función(ruta, **args), argumentos admitidos, argumentos obligatorios)
+COMANDOS_LOTE = {
+    "init": (_comando_init, ("name", "hash_algorithm", "shared_store"), ("name",)),
+    "save": (lambda ruta, message=None: abrir(ruta).save(message), ("message",), ()),
+    "log": (lambda ruta, grep=None, paths=None: abrir(ruta).log(grep, paths),
+            ("grep", "paths"), ()),
+    "status": (lambda ruta: abrir(ruta).status(), (), ()),
+    "diff": (lambda ruta, version=None, other=None: abrir(ruta).diff(version, other),
+             ("version", "other"), ()),
+    "restore": (lambda ruta, version, paths=None, into=None: abrir(ruta).restore(version, paths, into),
+                ("version", "paths", "into"), ("version",)),
+    "import": (_comando_import, ("paths", "git", "ref"), ()),
+    "push": (lambda ruta, destination: abrir(ruta).push(destination), ("destination",), ("destination",)),
+    "pull": (lambda ruta, source: abrir(ruta).pull(source), ("source",), ("source",)),
+    "prune": (lambda ruta, grace=MARGEN_PODA_S: abrir(ruta).prune(grace), ("grace",), ()),
+}
+
+
+class _Lote:
+    """Reparte los comandos en colas por repositorio y escribe los resultados"""
+
+    def __init__(self, pool, salida):
+        self.pool = pool
+        self.salida = salida
+        self.cerrojo = threading.Lock()
+        self.colas = {}
+        self.activos = set()
+        self.fallos = 0
+
+    def escribir(self, respuesta):
+        linea = json.dumps(respuesta, ensure_ascii=False) + "\n"
+        with self.cerrojo:
+            if not respuesta["ok"]:
+                self.fallos += 1
+            self.salida.write(linea)
+            self.salida.flush()
+
+    def encolar(self, ruta, peticion):
+        with self.cerrojo:
+            self.colas.setdefault(ruta, deque()).append(peticion)
+            if ruta in self.activos:
+                return
+            self.activos.add(ruta)
+        self.pool.submit(self._vaciar, ruta)
+
+    def _vaciar(self, ruta):
+        """Ejecuta en orden los comandos pendientes de un repositorio"""
+        while True:
+            with self.cerrojo:
+                cola = self.colas[ruta]
+                if not cola:
+                    self.activos.discard(ruta)
+                    del self.colas[ruta]
+                    return
+                peticion = cola.popleft()
+            self.escribir(_ejecutar(ruta, peticion))
+
+
+def _ejecutar(ruta, peticion):
+    """Ejecuta un comando y arma su línea de respuesta"""
+    comando = peticion["command"]
+    respuesta = {"id": peticion.get("id"), "line": peticion["line"], "repo": ruta, "command": comando}
+    try:
+        funcion = COMANDOS_LOTE[comando][0]
+        resultado = funcion(ruta, **peticion.get("args", {}))
+        respuesta.update(ok=True, result=_a_json(resultado))
+    except Exception as e:
+        respuesta.update(ok=False, error=str(e), type=type(e).__name__)
+    return respuesta
+
+
+def _leer_peticion(texto, numero):
+    """Valida una línea de entrada; devuelve (peticion, error)"""
+    try:
+        peticion = json.loads(texto)
+    except ValueError as e:
+        return None, f"JSON inválido: {e}"
+    if not isinstance(peticion, dict):
+        return None, "Cada línea debe ser un objeto JSON"
+    if peticion.get("command") not in COMANDOS_LOTE:
+        return None, (f"Comando desconocido '{peticion.get('command')}' "
+                      f"(disponibles: {', '.join(COMANDOS_LOTE)})")
+    argumentos = peticion.get("args", {})
+    if not isinstance(argumentos, dict):
+        return None, "'args' debe ser un objeto JSON"
+    _, admitidos, obligatorios = COMANDOS_LOTE[peticion["command"]]
+    for nombre in argumentos:
+        if nombre not in admitidos:
+            return None, (f"Argumento desconocido '{nombre}' para {peticion['command']} "
+                          f"(admitidos: {', '.join(admitidos) or 'ninguno'})")
+    for nombre in obligatorios:
+        if nombre not in argumentos:
+            return None, f"Falta el argumento '{nombre}' para {peticion['command']}"
+    peticion["line"] = numero
+    return peticion, None
+
+
+def ejecutar_lote_cli(hilos=None, entrada=None, salida=None):
+    """Ejecuta los comandos de la entrada; devuelve True si todos terminaron bien"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    entrada = entrada or sys.stdin
+    salida = salida or sys.stdout
+    hilos = hilos or min(32, (os.cpu_count() or 1) + 4)
+
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        lote = _Lote(pool, salida)
+        for numero, texto in enumerate(entrada, 1):
+            if not texto.strip():
+                continue
+            peticion, error = _leer_peticion(texto, numero)
+            if error:
+                lote.escribir({"line": numero, "ok": False, "error": error, "type": "ValueError"})
+                continue
+            # La misma carpeta escrita de dos formas comparte cola y caché; sin
+            # 'repo' vale el proyecto que contiene la carpeta actual
+            ruta = os.path.abspath(peticion.get("repo") or buscar_raiz() or ".")
+            lote.encolar(ruta, peticion)
+
+    return lote.fallos == 0
@@ -0,0 +1,215 @@
+"""
+Manifiestos binarios de Cronux-CRX
+El manifiesto de una versión (ruta -> hash, tamaño, modo, mtime) se guarda
+en .manifiesto.crx en lugar de JSON. Con un millón de archivos, cargar el
+JSON cuesta segundos y cientos de MB; el binario se abre con mmap y una
+consulta solo decodifica el bloque de 64 entradas que la contiene.
+
+    CRXMAN1\\n
+    <longitud cabecera> <entradas> <bytes de hash> <posición del índice>
+    <cabecera JSON: algoritmo, almacen, guardado_ns...>
+    bloques, con las entradas ordenadas por ruta:
+        <n> <n registros fijos: hash, tamaño, modo, mtime>
+        <n rutas: bytes compartidos con la anterior, sufijo>
+    índice: <posición del bloque> <primera ruta> por bloque
+
+Los manifiestos .manifiesto.json de versiones anteriores se siguen leyendo.
+"""
+
+import os
+import json
+import mmap
+import struct
+from bisect import bisect_right
+from collections.abc import Mapping
+
+NOMBRE_BINARIO = ".manifiesto.crx"
+NOMBRE_JSON = ".manifiesto.json"
+
+MAGIA = b"CRXMAN1\n"
+CABECERA = struct.Struct("<IIIQ")
+NUMERO = struct.Struct("<H")
+RUTA = struct.Struct("<HH")
+INDICE = struct.Struct("<QH")
+
+ENTRADAS_POR_BLOQUE = 64
+
+# Por debajo de este tamaño se lee el archivo entero: cada mmap ocupa un
+# descriptor mientras vive y un manifiesto pequeño se lee en una llamada
+UMBRAL_MMAP = 256 * 1024
+
+
+def _registro(bytes_hash):
+    return struct.Struct(f"<{bytes_hash}sQIq")
+
+
+def _codificar(manifiesto):
+    """Bytes del manifiesto binario; ValueError si alguna entrada no cabe en él"""
+    cabecera = json.dumps({k: v for k, v in manifiesto.items() if k != "archivos"}).encode("utf-8")
+    archivos = manifiesto["archivos"]
+    rutas = sorted(archivos)
+    bytes_hash = len(archivos[rutas[0]]["hash"]) // 2 if rutas else 0
+    registro = _registro(bytes_hash)
+
+    partes = [MAGIA, b"", cabecera]
+    posicion = len(MAGIA) + CABECERA.size + len(cabecera)
+    indice = []
+    try:
+        for inicio in range(0, len(rutas), ENTRADAS_POR_BLOQUE):
+            bloque = rutas[inicio:inicio + ENTRADAS_POR_BLOQUE]
+            registros, nombres = [], []
+            anterior = b""
+            for ruta in bloque:
+                entrada = archivos[ruta]
+                valor = bytes.fromhex(entrada["hash"])
+                if len(valor) != bytes_hash:
+                    raise ValueError(f"Hash de longitud distinta en {ruta}")
+                registros.append(registro.pack(valor, entrada["tamano"], entrada["modo"],
+                                               entrada["mtime"]))
+                codificada = ruta.encode("utf-8", "surrogateescape")
+                compartido = 0
+                limite = min(len(anterior), len(codificada))
+                while compartido < limite and anterior[compartido] == codificada[compartido]:
+                    compartido += 1
+                nombres.append(RUTA.pack(compartido, len(codificada) - compartido))
+                nombres.append(codificada[compartido:])
+                anterior = codificada
+            primera = bloque[0].encode("utf-8", "surrogateescape")
+            indice.append(INDICE.pack(posicion, len(primera)) + primera)
+            datos = NUMERO.pack(len(bloque)) + b"".join(registros) + b"".join(nombres)
+            partes.append(datos)
+            posicion += len(datos)
+    except (KeyError, TypeError, struct.error) as e:
+        raise ValueError(f"Entrada de manifiesto no representable: {e}")
+
+    partes[1] = CABECERA.pack(len(cabecera), len(rutas), bytes_hash, posicion)
+    partes.extend(indice)
+    return b"".join(partes)
+
+
+def escribir(carpeta, manifiesto):
+    """Escribe el manifiesto en la carpeta de una versión
+
+    Si alguna entrada no tiene modo y mtime o los hash no son hexadecimales
+    de longitud fija, se escribe en JSON como antes
+    """
+    try:
+        datos = _codificar(manifiesto)
+        nombre = NOMBRE_BINARIO
+    except ValueError:
+        archivos = manifiesto["archivos"]
+        if not isinstance(archivos, dict):
+            manifiesto = {**manifiesto, "archivos": dict(archivos.items())}
+        datos = json.dumps(manifiesto).encode("utf-8")
+        nombre = NOMBRE_JSON
+    with open(os.path.join(carpeta, nombre), "wb") as f:
+        f.write(datos)
+
+
+def como_dict(archivos):
+    """Los archivos de un manifiesto como dict, para consultas en cualquier orden
+
+    Un Manifiesto responde rápido a consultas en orden de ruta; si van a
+    llegar desordenadas (un recorrido del disco), sale más a cuenta
+    decodificarlo entero una vez
+    """
+    return archivos if isinstance(archivos, dict) else dict(archivos.items())
+
+
+def existe(carpeta):
+    """Indica si la versión guardó manifiesto (binario o JSON)"""
+    return (os.path.exists(os.path.join(carpeta, NOMBRE_BINARIO))
+            or os.path.exists(os.path.join(carpeta, NOMBRE_JSON)))
+
+
+def leer(carpeta):
+    """Manifiesto de una versión: la cabecera con 'archivos' (un Manifiesto o un dict)
+
+    FileNotFoundError si la versión no guardó manifiesto
+    """
+    try:
+        archivos = Manifiesto(os.path.join(carpeta, NOMBRE_BINARIO))
+    except FileNotFoundError:
+        with open(os.path.join(carpeta, NOMBRE_JSON), "r") as f:
+            return json.load(f)
+    return {**archivos.cabecera, "archivos": archivos}
+
+
+class Manifiesto(Mapping):
+    """Archivos de un manifiesto binario, de solo lectura y ordenados por ruta
+
+    Al abrirlo solo se lee el índice de bloques. Una consulta busca el
+    bloque por bisección y lo decodifica (el último queda en memoria);
+    recorrerlo entero decodifica los bloques en orden.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as f:
+            tamano = os.fstat(f.fileno()).st_size
+            if tamano >= UMBRAL_MMAP:
+                self._datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._datos = f.read()
+        datos = self._datos
+        if datos[:len(MAGIA)] != MAGIA:
+            raise ValueError(f"{ruta} no es un manifiesto de Cronux-CRX")
+        longitud, self._entradas, bytes_hash, posicion = CABECERA.unpack_from(datos, len(MAGIA))
+        inicio = len(MAGIA) + CABECERA.size
+        self.cabecera = json.loads(datos[inicio:inicio + longitud])
+        self._registro = _registro(bytes_hash)
+
+        self._posiciones, self._primeras = [], []
+        while posicion < len(datos):
+            bloque, largo = INDICE.unpack_from(datos, posicion)
+            posicion += INDICE.size
+            self._posiciones.append(bloque)
+            self._primeras.append(datos[posicion:posicion + largo].decode("utf-8", "surrogateescape"))
+            posicion += largo
+        self._cache = (None, None)
+
+    def _bloque(self, numero):
+        """Entradas del bloque 'numero' como dict ruta -> entrada"""
+        if self._cache[0] == numero:
+            return self._cache[1]
+        datos = self._datos
+        posicion = self._posiciones[numero]
+        (n,) = NUMERO.unpack_from(datos, posicion)
+        posicion += NUMERO.size
+        fin = posicion + n * self._registro.size
+        registros = self._registro.iter_unpack(datos[posicion:fin])
+        posicion = fin
+
+        entradas = {}
+        anterior = b""
+        for valor, tamano, modo, mtime in registros:
+            compartido, largo = RUTA.unpack_from(datos, posicion)
+            posicion += RUTA.size
+            ruta = anterior[:compartido] + datos[posicion:posicion + largo]
+            posicion += largo
+            anterior = ruta
+            entradas[ruta.decode("utf-8", "surrogateescape")] = {
+                "hash": valor.hex(), "tamano": tamano, "modo": modo, "mtime": mtime}
+        self._cache = (numero, entradas)
+        return entradas
+
+    def __getitem__(self, ruta):
+        numero = bisect_right(self._primeras, ruta) - 1
+        if numero < 0:
+            raise KeyError(ruta)
+        return self._bloque(numero)[ruta]
+
+    def __len__(self):
+        return self._entradas
+
+    def __iter__(self):
+        for numero in range(len(self._posiciones)):
+            yield from self._bloque(numero)
+
+    def items(self):
+        """Pares (ruta, entrada) en orden, decodificando cada bloque una vez"""
+        for numero in range(len(self._posiciones)):
+            yield from self._bloque(numero).items()
+
+    def values(self):
+        for numero in range(len(self._posiciones)):
+            yield from self._bloque(numero).values()
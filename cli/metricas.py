@@ -0,0 +1,219 @@
+"""
+Exportación de métricas de Cronux-CRX para monitorización
+Cada comando puede añadir un registro en JSON lines y actualizar un
+textfile OpenMetrics para el textfile collector de node_exporter.
+
+Se activa con --metrics/--metrics-textfile o con las variables de entorno
+CRONUX_METRICS y CRONUX_METRICS_TEXTFILE. Desactivado no cuesta nada:
+no se recogen fases ni se escribe ningún archivo.
+"""
+
+import os
+import sys
+import time
+
+ACTIVO = False
+
+_ruta_jsonl = None
+_ruta_textfile = None
+_valores = {}
+
+PREFIJO = "cronux"
+
+# Métrica OpenMetrics -> (tipo, ayuda)
+_DESCRIPCIONES = {
+    "last_run_timestamp_seconds": ("gauge", "Momento de la última ejecución del comando"),
+    "last_exit_code": ("gauge", "Código de salida de la última ejecución"),
+    "duration_seconds": ("gauge", "Tiempo de pared de la última ejecución"),
+    "cpu_seconds": ("gauge", "Tiempo de CPU de la última ejecución"),
+    "phase_duration_seconds": ("gauge", "Tiempo de pared por fase en la última ejecución"),
+    "files": ("gauge", "Archivos procesados en la última ejecución"),
+    "bytes_processed": ("gauge", "Bytes leídos de los archivos del proyecto"),
+    "bytes_written": ("gauge", "Bytes escritos en el repositorio"),
+    "dedup_ratio": ("gauge", "Bytes procesados / bytes escritos"),
+    "repository_size_bytes": ("gauge", "Tamaño de la carpeta .cronux"),
+}
+
+# Contador de perfil -> métrica OpenMetrics
+_CONTADORES = {
+    "archivos": "files",
+    "bytes": "bytes_processed",
+    "bytes_escritos": "bytes_written",
+}
+
+
+def configurar(ruta_jsonl=None, ruta_textfile=None):
+    """Activa las métricas si hay alguna ruta (opción o entorno)"""
+    global ACTIVO, _ruta_jsonl, _ruta_textfile
+    _ruta_jsonl = ruta_jsonl or os.environ.get("CRONUX_METRICS") or None
+    _ruta_textfile = ruta_textfile or os.environ.get("CRONUX_METRICS_TEXTFILE") or None
+    ACTIVO = bool(_ruta_jsonl or _ruta_textfile)
+    return ACTIVO
+
+
+def registrar(nombre, valor):
+    """Guarda un valor propio del comando (por ejemplo la versión creada)"""
+    if ACTIVO:
+        _valores[nombre] = valor
+
+
+def registrar_tamano_repositorio(carpeta_cronux):
+    """Calcula el tamaño de .cronux; solo recorre el disco si las métricas están activas"""
+    if not ACTIVO:
+        return
+    total = 0
+    pendientes = [str(carpeta_cronux)]
+    while pendientes:
+        try:
+            with os.scandir(pendientes.pop()) as entradas:
+                for entrada in entradas:
+                    if entrada.is_dir(follow_symlinks=False):
+                        pendientes.append(entrada.path)
+                    elif entrada.is_file(follow_symlinks=False):
+                        total += entrada.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    _valores["tamano_repositorio"] = total
+
+
+def _repositorio():
+    """Raíz del proyecto actual (la carpeta actual si no hay proyecto)"""
+    from funcion_verficar import obtener_raiz_proyecto
+    return str(obtener_raiz_proyecto())
+
+
+def construir_registro(comando, codigo_salida, datos):
+    """Arma el registro estructurado de una ejecución"""
+    import socket
+    contadores = datos["contadores"] if datos else {}
+    registro = {
+        "timestamp": time.time(),
+        "host": socket.gethostname(),
+        "comando": comando,
+        "repositorio": _repositorio(),
+        "codigo_salida": codigo_salida,
+        "duracion": datos["total"] if datos else None,
+        "fases": datos["fases"] if datos else {},
+        "contadores": contadores,
+        "valores": dict(_valores)
+    }
+    procesados = contadores.get("bytes")
+    escritos = contadores.get("bytes_escritos")
+    if procesados and escritos:
+        registro["valores"]["ratio_dedup"] = procesados / escritos
+    return registro
+
+
+def _escribir_jsonl(ruta, registro):
+    """Añade una línea; con O_APPEND y una sola escritura no se mezclan procesos"""
+    import json
+    linea = (json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, linea)
+    finally:
+        os.close(fd)
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(**etiquetas):
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in sorted(etiquetas.items())) + "}"
+
+
+def _muestras(registro):
+    """Convierte un registro en muestras (nombre, etiquetas, valor)"""
+    base = {"command": registro["comando"], "repo": registro["repositorio"]}
+    muestras = [
+        ("last_run_timestamp_seconds", base, registro["timestamp"]),
+        ("last_exit_code", base, registro["codigo_salida"]),
+    ]
+    if registro["duracion"]:
+        muestras.append(("duration_seconds", base, registro["duracion"]["pared"]))
+        muestras.append(("cpu_seconds", base, registro["duracion"]["cpu"]))
+    for fase, d in registro["fases"].items():
+        muestras.append(("phase_duration_seconds", {**base, "phase": fase}, d["pared"]))
+    for contador, metrica in _CONTADORES.items():
+        if contador in registro["contadores"]:
+            muestras.append((metrica, base, registro["contadores"][contador]))
+    if "ratio_dedup" in registro["valores"]:
+        muestras.append(("dedup_ratio", base, registro["valores"]["ratio_dedup"]))
+    if "tamano_repositorio" in registro["valores"]:
+        muestras.append(("repository_size_bytes", {"repo": registro["repositorio"]},
+                         registro["valores"]["tamano_repositorio"]))
+    return [(f"{PREFIJO}_{nombre}", _etiquetas(**etiquetas), valor)
+            for nombre, etiquetas, valor in muestras]
+
+
+_LINEA_MUESTRA = r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)$'
+
+
+def _escribir_textfile(ruta, registro):
+    """Fusiona las muestras nuevas con las del archivo y lo reemplaza de forma atómica"""
+    import re
+    from pathlib import Path
+    ruta = Path(ruta)
+    linea_muestra = re.compile(_LINEA_MUESTRA)
+    nuevas = {(nombre, etiquetas): valor for nombre, etiquetas, valor in _muestras(registro)}
+    repo = f'repo="{_escapar(registro["repositorio"])}"'
+    comando = f'command="{_escapar(registro["comando"])}"'
+
+    bloqueo = None
+    try:
+        import fcntl
+        bloqueo = open(str(ruta) + ".lock", "w")
+        fcntl.flock(bloqueo, fcntl.LOCK_EX)
+    except ImportError:
+        pass
+
+    try:
+        existentes = {}
+        if ruta.exists():
+            for linea in ruta.read_text(encoding="utf-8").splitlines():
+                coincidencia = linea_muestra.match(linea)
+                if not coincidencia:
+                    continue
+                nombre, etiquetas, valor = coincidencia.groups()
+                etiquetas = etiquetas or ""
+                # Las fases de la ejecución anterior del mismo comando y repositorio
+                # se descartan aunque esta vez no aparezcan
+                if (nombre == f"{PREFIJO}_phase_duration_seconds"
+                        and repo in etiquetas and comando in etiquetas):
+                    continue
+                existentes[(nombre, etiquetas)] = valor
+        existentes.update(nuevas)
+
+        lineas = []
+        for metrica, (tipo, ayuda) in _DESCRIPCIONES.items():
+            nombre = f"{PREFIJO}_{metrica}"
+            muestras = sorted((k, v) for k, v in existentes.items() if k[0] == nombre)
+            if not muestras:
+                continue
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            lineas.extend(f"{nombre}{etiquetas} {valor}" for (_, etiquetas), valor in muestras)
+        lineas.append("# EOF")
+
+        temporal = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+        temporal.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+        os.replace(temporal, ruta)
+    finally:
+        if bloqueo is not None:
+            bloqueo.close()
+
+
+def escribir(comando, codigo_salida, datos):
+    """Escribe el registro de la ejecución en los destinos configurados"""
+    if not ACTIVO:
+        return
+    try:
+        registro = construir_registro(comando, codigo_salida, datos)
+        if _ruta_jsonl:
+            _escribir_jsonl(_ruta_jsonl, registro)
+        if _ruta_textfile:
+            _escribir_textfile(_ruta_textfile, registro)
+    except Exception as e:
+        # Las métricas nunca deben hacer fallar el comando
+        print(f"Advertencia: No se pudieron escribir las métricas: {e}", file=sys.stderr)
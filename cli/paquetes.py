@@ -0,0 +1,75 @@
+"""
+Paquetes de objetos de Cronux-CRX
+Las primeras versiones de crx push / crx pull enviaban los objetos en
+paquetes que el mismo proceso desempaquetaba en el destino. Formato:
+
+    CRXPACK1\\n
+    <hash> <tamaño>\\n<contenido>      (una vez por objeto)
+
+Ahora cada objeto se copia una sola vez, directamente al almacén del
+destino; este módulo solo termina los paquetes que dejó a medias un envío
+interrumpido de aquellas versiones.
+"""
+
+import os
+import time
+
+CARPETA_PAQUETES = "paquetes"
+CABECERA = b"CRXPACK1\n"
+
+# Un .tmp modificado hace menos de esto puede ser el envío en curso de otro proceso
+MARGEN_TEMPORALES_S = 3600
+
+
+def desempaquetar(ruta, almacen, avisos):
+    """Guarda en el almacén los objetos de un paquete y lo borra
+
+    Cada contenido se vuelve a hashear; un objeto dañado por el camino se
+    anota en 'avisos'. Devuelve (objetos nuevos, bytes escritos).
+    """
+    nuevos = escritos = 0
+    with open(ruta, "rb") as f:
+        if f.readline() != CABECERA:
+            raise ValueError(f"{ruta} no es un paquete de Cronux-CRX")
+        while True:
+            linea = f.readline()
+            if not linea:
+                break
+            esperado, tamano = linea.decode("ascii").split()
+            tamano = int(tamano)
+            # Se guarda con el hash de lo recibido: un contenido dañado nunca
+            # ocupa el nombre del objeto esperado
+            valor, escrito = almacen.guardar_flujo(f, tamano)
+            if valor != esperado:
+                avisos.append(f"El objeto {esperado} llegó dañado")
+                continue
+            if escrito:
+                nuevos += 1
+                escritos += tamano
+    os.unlink(ruta)
+    return nuevos, escritos
+
+
+def recuperar(carpeta, almacen, avisos, margen_s=MARGEN_TEMPORALES_S):
+    """Termina un envío interrumpido: desempaqueta los .pack y borra los .tmp abandonados
+
+    Solo se borran los .tmp que no han cambiado en 'margen_s' segundos
+    """
+    try:
+        nombres = sorted(os.listdir(carpeta))
+    except FileNotFoundError:
+        return 0
+    limite = time.time() - margen_s
+    recuperados = 0
+    for nombre in nombres:
+        ruta = os.path.join(carpeta, nombre)
+        if nombre.endswith(".tmp"):
+            try:
+                if os.stat(ruta).st_mtime < limite:
+                    os.unlink(ruta)
+            except FileNotFoundError:
+                # Su envío lo acaba de completar o descartar
+                pass
+        elif nombre.endswith(".pack"):
+            recuperados += desempaquetar(ruta, almacen, avisos)[0]
+    return recuperados
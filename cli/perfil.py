@@ -0,0 +1,176 @@
+"""
+Perfilado de Cronux-CRX (crx --profile)
+Registra tiempo de pared y de CPU por fase y contadores de trabajo.
+Desactivado, cada llamada cuesta una comprobación de un booleano.
+"""
+
+import os
+import sys
+import time
+from _thread import get_ident
+
+ACTIVO = False
+
+_fases = {}        # nombre -> [pared, cpu, llamadas]
+_contadores = {}   # nombre -> valor
+_eventos = []      # eventos para la traza JSON
+_traza = False
+_mostrar = False
+_profiler = None
+_ruta_prof = None
+_ruta_traza = None
+_inicio = None
+
+
+class _Fase:
+    """Mide una fase; se usa como 'with perfil.fase("hash"):'"""
+    __slots__ = ("nombre", "pared", "cpu")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.pared = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        pared = time.perf_counter() - self.pared
+        cpu = time.process_time() - self.cpu
+        datos = _fases.get(self.nombre)
+        if datos is None:
+            datos = _fases[self.nombre] = [0.0, 0.0, 0]
+        datos[0] += pared
+        datos[1] += cpu
+        datos[2] += 1
+        if _traza:
+            _eventos.append((self.nombre, self.pared, pared, get_ident()))
+        return False
+
+
+class _FaseNula:
+    """Contexto vacío que se usa cuando el perfilado está desactivado"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULA = _FaseNula()
+
+
+def fase(nombre):
+    """Devuelve el contexto que mide la fase indicada"""
+    return _Fase(nombre) if ACTIVO else _NULA
+
+
+def contar(nombre, cantidad=1):
+    """Suma una cantidad a un contador"""
+    if ACTIVO:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+def iniciar(ruta_prof=None, ruta_traza=None, mostrar=True):
+    """Activa el perfilado (y opcionalmente cProfile y la traza JSON)
+
+    Con mostrar=False solo se recogen los datos (lo usan las métricas)
+    """
+    global ACTIVO, _traza, _mostrar, _profiler, _ruta_prof, _ruta_traza, _inicio
+    ACTIVO = True
+    # Cada medición empieza de cero aunque el proceso ya haya medido otra
+    _fases.clear()
+    _contadores.clear()
+    del _eventos[:]
+    _mostrar = mostrar
+    _traza = ruta_traza is not None
+    _ruta_prof = ruta_prof
+    _ruta_traza = ruta_traza
+    _inicio = (time.perf_counter(), time.process_time())
+
+    if ruta_prof:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def resumen():
+    """Devuelve las fases y contadores registrados como diccionario"""
+    pared = time.perf_counter() - _inicio[0] if _inicio else 0.0
+    cpu = time.process_time() - _inicio[1] if _inicio else 0.0
+    return {
+        "total": {"pared": pared, "cpu": cpu},
+        "fases": {
+            nombre: {"pared": d[0], "cpu": d[1], "llamadas": d[2]}
+            for nombre, d in _fases.items()
+        },
+        "contadores": dict(_contadores)
+    }
+
+
+def _formatear_contador(nombre, valor):
+    if nombre.startswith("bytes"):
+        return f"{valor} ({valor / 1024 / 1024:.1f} MB)"
+    return str(valor)
+
+
+def imprimir_resumen(datos, salida=sys.stderr):
+    """Imprime la tabla de fases y contadores"""
+    print("\nPERFIL DE EJECUCIÓN", file=salida)
+    print("=" * 50, file=salida)
+    print(f"{'Fase':<12} {'Pared (s)':>10} {'CPU (s)':>10} {'Llamadas':>10}", file=salida)
+    print("-" * 50, file=salida)
+    fases = sorted(datos["fases"].items(), key=lambda x: x[1]["pared"], reverse=True)
+    for nombre, d in fases:
+        print(f"{nombre:<12} {d['pared']:>10.3f} {d['cpu']:>10.3f} {d['llamadas']:>10}", file=salida)
+    print("-" * 50, file=salida)
+    total = datos["total"]
+    print(f"{'total':<12} {total['pared']:>10.3f} {total['cpu']:>10.3f}", file=salida)
+
+    if datos["contadores"]:
+        print("\nContadores:", file=salida)
+        for nombre, valor in sorted(datos["contadores"].items()):
+            print(f"  {nombre}: {_formatear_contador(nombre, valor)}", file=salida)
+
+
+def _escribir_traza(ruta):
+    """Escribe la traza en formato Trace Event (chrome://tracing, Perfetto, speedscope)"""
+    import json
+    pid = os.getpid()
+    origen = _inicio[0]
+    eventos = [
+        {
+            "name": nombre, "cat": "cronux", "ph": "X", "pid": pid, "tid": tid,
+            "ts": (inicio - origen) * 1e6, "dur": duracion * 1e6
+        }
+        for nombre, inicio, duracion, tid in _eventos
+    ]
+    with open(ruta, "w") as f:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f)
+
+
+def finalizar():
+    """Desactiva el perfilado, imprime el resumen y escribe los archivos pedidos
+
+    Devuelve los datos recogidos (o None si no estaba activo)
+    """
+    global ACTIVO
+    if not ACTIVO:
+        return None
+    if _profiler is not None:
+        _profiler.disable()
+    datos = resumen()
+    ACTIVO = False
+
+    if _mostrar:
+        imprimir_resumen(datos)
+    if _ruta_prof:
+        _profiler.dump_stats(_ruta_prof)
+        print(f"cProfile guardado en: {_ruta_prof}", file=sys.stderr)
+    if _ruta_traza:
+        _escribir_traza(_ruta_traza)
+        print(f"Traza JSON guardada en: {_ruta_traza}", file=sys.stderr)
+
+    return datos
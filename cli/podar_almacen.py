@@ -0,0 +1,24 @@
+from funcion_verficar import *
+from cronux import abrir, CronuxError
+
+def podar_cli(inmediato=False):
+    """Versión CLI de prune: borra los objetos que ya no usa ninguna versión"""
+    if not verificarCronux():
+        print("ERROR: No estas en un proyecto Cronux")
+        return False
+
+    repositorio = abrir()
+    try:
+        resultado = repositorio.prune(0) if inmediato else repositorio.prune()
+    except (CronuxError, OSError, ValueError) as e:
+        # Ante cualquier duda no se borra nada
+        print(f"ERROR: No se pudo podar el almacén: {e}")
+        return False
+
+    donde = "del almacén compartido" if resultado.shared else "del proyecto"
+    if not resultado.objects:
+        print(f"INFO: No hay objetos sin usar {donde}")
+    else:
+        print(f"EXITO: {resultado.objects} objetos sin usar borrados {donde}")
+    print(f"Espacio liberado: {resultado.bytes / 1024 / 1024:.1f} MB")
+    return True
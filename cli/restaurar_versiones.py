@@ -1,77 +1,87 @@
-from pathlib import Path
+import os
 from funcion_verficar import * 
-import json
-import shutil
+from cronux import abrir, normalizar_version, VersionNotFoundError, CronuxError
+import metricas
 
-def restaurar_version_cli(version_elegida):
-    """Versión CLI que recibe la versión como parámetro"""
+# Rutas que se listan antes de pedir confirmación en una restauración parcial
+MAXIMO_RUTAS_LISTADAS = 20
+
+def restaurar_version_cli(version_elegida, rutas=None, confirmar=True, destino=None):
+    """Versión CLI que recibe la versión (y opcionalmente las rutas) como parámetro
+
+    Con 'destino' los archivos se escriben en esa carpeta y el directorio
+    de trabajo no se toca, así que no se pide confirmación
+    """
     if not verificarCronux():
         print("ERROR: No estas en un proyecto Cronux")
         return False
     
     # Limpiar la 'v' si viene incluida
-    if version_elegida.startswith('v'):
-        version_elegida = version_elegida[1:]
+    version_elegida = normalizar_version(version_elegida)
     
-    # Verificar que la versión existe
-    carpeta_version = obtener_ruta_cronux() / "versiones" / f"version_{version_elegida}"
+    # Las rutas son relativas a la carpeta actual, que puede ser una subcarpeta
+    pedidas = rutas
+    if rutas is not None:
+        rutas = [os.path.abspath(ruta) for ruta in rutas]
     
-    if not carpeta_version.exists():
+    # Verificar que la versión existe
+    repositorio = abrir()
+    try:
+        info = repositorio.version(version_elegida)
+    except VersionNotFoundError:
         print(f"ERROR: La version '{version_elegida}' no existe")
         print("Usa 'cronux log' para ver las versiones disponibles")
         return False
     
-    # Leer metadatos si existen
-    metadatos_file = carpeta_version / "metadatos.json"
-    if metadatos_file.exists():
-        try:
-            with open(metadatos_file, "r") as f:
-                metadatos = json.load(f)
-            print(f"Restaurando version {version_elegida}:")
-            print(f"Fecha: {metadatos['fecha']}")
-            print(f"Mensaje: {metadatos['mensaje']}")
-        except Exception as e:
-            print(f"Advertencia: Error leyendo metadatos: {e}")
+    # Mostrar metadatos si existen
+    if info.error:
+        print(f"Advertencia: Error leyendo metadatos: {info.error}")
+    elif info.date is not None:
+        print(f"Restaurando version {version_elegida}:")
+        print(f"Fecha: {info.date}")
+        print(f"Mensaje: {info.message}")
+    
+    if destino is not None:
+        pregunta = None
+    elif rutas is not None:
+        elegidos = repositorio.files(version_elegida, rutas)
+        if not elegidos:
+            print(f"ERROR: Ninguna ruta de la version {version_elegida} coincide con: {' '.join(pedidas)}")
+            return False
+        print(f"Archivos a restaurar ({len(elegidos)}):")
+        for ruta in elegidos[:MAXIMO_RUTAS_LISTADAS]:
+            print(f"  {ruta}")
+        if len(elegidos) > MAXIMO_RUTAS_LISTADAS:
+            print(f"  ... y {len(elegidos) - MAXIMO_RUTAS_LISTADAS} más")
+        pregunta = f"¿Confirmas restaurar {len(elegidos)} archivo(s) de la version {version_elegida}? (s/N): "
+    else:
+        pregunta = f"¿Confirmas restaurar la version {version_elegida}? (s/N): "
     
     # Confirmar restauración
-    respuesta = input(f"¿Confirmas restaurar la version {version_elegida}? (s/N): ")
-    if respuesta.lower() not in ['s', 'si', 'sí', 'y', 'yes']:
-        print("Operación cancelada")
-        return False
+    if confirmar and pregunta:
+        respuesta = input(pregunta)
+        if respuesta.lower() not in ['s', 'si', 'sí', 'y', 'yes']:
+            print("Operación cancelada")
+            return False
     
-    # Limpiar directorio actual (excepto .cronux)
-    directorio_actual = Path.cwd()
-    archivos_eliminados = 0
+    try:
+        resultado = repositorio.restore(version_elegida, rutas, destino)
+    except (CronuxError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return False
+    for aviso in resultado.warnings:
+        print(f"Advertencia: {aviso}")
     
-    for item in directorio_actual.iterdir():
-        if item.name != ".cronux" and not item.name.startswith('.'):
-            try:
-                if item.is_file():
-                    item.unlink()
-                    archivos_eliminados += 1
-                elif item.is_dir():
-                    shutil.rmtree(item)
-                    archivos_eliminados += 1
-            except Exception as e:
-                print(f"Advertencia: No se pudo eliminar {item.name}: {e}")
+    metricas.registrar("version", version_elegida)
     
-    # Restaurar archivos de la versión
-    archivos_restaurados = 0
-    for item in carpeta_version.iterdir():
-        if item.name != "metadatos.json":
-            destino = directorio_actual / item.name
-            try:
-                if item.is_file():
-                    shutil.copy2(item, destino)
-                    archivos_restaurados += 1
-                elif item.is_dir():
-                    shutil.copytree(item, destino)
-                    archivos_restaurados += 1
-            except Exception as e:
-                print(f"Error restaurando {item.name}: {e}")
+    if destino is not None:
+        print(f"EXITO: Version {version_elegida} restaurada en {destino}")
+        print(f"Archivos escritos: {resultado.restored}")
+        return True
     
     print(f"EXITO: Version {version_elegida} restaurada")
-    print(f"Archivos eliminados: {archivos_eliminados}")
-    print(f"Archivos restaurados: {archivos_restaurados}")
+    if rutas is None:
+        print(f"Archivos eliminados: {resultado.deleted}")
+    print(f"Archivos restaurados: {resultado.restored}")
     
-    return True
\ No newline at end of file
+    return True
@@ -0,0 +1,40 @@
+from funcion_verficar import *
+from cronux import abrir, CronuxError
+
+def _mostrar(resultado, accion, ruta):
+    for aviso in resultado.warnings:
+        print(f"Advertencia: {aviso}")
+    if not resultado.versions:
+        print(f"INFO: No hay versiones nuevas que {accion}; ya estaba al dia")
+        return
+    primera, ultima = resultado.versions[0], resultado.versions[-1]
+    rango = primera if primera == ultima else f"{primera} a {ultima}"
+    print(f"EXITO: {len(resultado.versions)} versiones sincronizadas con {ruta} ({rango})")
+    print(f"Objetos transferidos: {resultado.objects} "
+          f"({resultado.bytes / 1024 / 1024:.1f} MB)")
+
+def enviar_cli(destino):
+    """Versión CLI de push: envía las versiones que faltan en el destino"""
+    if not verificarCronux():
+        print("ERROR: No estas en un proyecto Cronux")
+        return False
+    try:
+        resultado = abrir().push(destino)
+    except (CronuxError, OSError) as e:
+        print(f"ERROR: {e}")
+        return False
+    _mostrar(resultado, "enviar", destino)
+    return True
+
+def traer_cli(origen):
+    """Versión CLI de pull: trae las versiones que faltan aquí"""
+    if not verificarCronux():
+        print("ERROR: No estas en un proyecto Cronux")
+        return False
+    try:
+        resultado = abrir().pull(origen)
+    except (CronuxError, OSError) as e:
+        print(f"ERROR: {e}")
+        return False
+    _mostrar(resultado, "traer", origen)
+    return True
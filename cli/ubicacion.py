@@ -0,0 +1,138 @@
+"""
+Ubicación del proyecto de Cronux-CRX
+Solo importa os: el cliente de 'crx serve' busca el proyecto y su socket
+antes de cargar nada más (cronux, pathlib, hashlib...)
+
+La raíz encontrada se recuerda por inodo de la carpeta de partida en el
+proceso y, entre ejecuciones, en ~/.cache/cronux/raices (o $XDG_CACHE_HOME):
+una línea "dispositivo inodo raíz" por carpeta. Cada respuesta recordada se
+comprueba antes de usarla; crear un proyecto olvida todas, porque el nuevo
+podría estar más cerca que la raíz recordada.
+"""
+
+import os
+
+CARPETA_CRONUX = ".cronux"
+
+# Líneas de la caché entre ejecuciones a partir de las cuales se compacta
+MAXIMO_RAICES_GUARDADAS = 512
+
+# Carpeta de partida (dispositivo, inodo) -> raíz del proyecto que la contiene
+_raices = {}
+_cache = {"leida": False, "lineas": 0}
+
+
+def es_proyecto(ruta):
+    return os.path.exists(os.path.join(ruta, CARPETA_CRONUX, "proyecto.json"))
+
+
+def _ruta_cache():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cronux", "raices")
+
+
+def _leer_cache():
+    """Añade a _raices las raíces que recordaron ejecuciones anteriores (una vez por proceso)"""
+    _cache["leida"] = True
+    try:
+        with open(_ruta_cache(), "rb") as f:
+            lineas = f.read().decode("utf-8", "surrogateescape").splitlines()
+    except OSError:
+        return
+    _cache["lineas"] = len(lineas)
+    # Las líneas posteriores son más recientes y prevalecen
+    for linea in lineas:
+        partes = linea.split(" ", 2)
+        if len(partes) == 3 and partes[0].isdigit() and partes[1].isdigit():
+            _recordar((int(partes[0]), int(partes[1])), partes[2])
+
+
+def _recordar(clave, raiz):
+    # Al final del diccionario quedan las más recientes (las que sobreviven al compactar)
+    _raices.pop(clave, None)
+    _raices[clave] = raiz
+
+
+def _guardar_en_cache(clave, raiz):
+    """Recuerda la raíz para las próximas ejecuciones; un fallo solo pierde la caché"""
+    if "\n" in raiz:
+        return
+    ruta = _ruta_cache()
+    linea = f"{clave[0]} {clave[1]} {raiz}\n"
+    try:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        if _cache["lineas"] >= MAXIMO_RAICES_GUARDADAS:
+            # Se conservan las más recientes; se reemplaza de forma atómica
+            recientes = list(_raices.items())[-(MAXIMO_RAICES_GUARDADAS // 2):]
+            texto = "".join(f"{d} {i} {r}\n" for (d, i), r in recientes if "\n" not in r)
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, "wb") as f:
+                f.write(texto.encode("utf-8", "surrogateescape"))
+            os.replace(temporal, ruta)
+            _cache["lineas"] = len(recientes)
+            return
+        # Una sola escritura con O_APPEND: dos procesos no mezclan sus líneas
+        fd = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        try:
+            os.write(fd, linea.encode("utf-8", "surrogateescape"))
+        finally:
+            os.close(fd)
+        _cache["lineas"] += 1
+    except OSError:
+        pass
+
+
+def olvidar():
+    """Descarta las raíces recordadas (en el proceso y entre ejecuciones)"""
+    _raices.clear()
+    _cache.update(leida=True, lineas=0)
+    try:
+        os.unlink(_ruta_cache())
+    except OSError:
+        pass
+
+
+def _recordada(clave, desde):
+    raiz = _raices.get(clave)
+    # La carpeta pudo moverse fuera del proyecto, o el proyecto desaparecer
+    if (raiz is not None and (desde == raiz or desde.startswith(raiz + os.sep))
+            and es_proyecto(raiz)):
+        return raiz
+    return None
+
+
+def buscar(desde=None):
+    """Raíz (str) del proyecto que contiene 'desde' (por defecto la carpeta actual); None si no hay
+
+    Ver cronux.buscar_raiz
+    """
+    forzada = os.environ.get("CRONUX_DIR")
+    if forzada:
+        raiz = os.path.abspath(forzada)
+        if os.path.basename(raiz) == CARPETA_CRONUX:
+            raiz = os.path.dirname(raiz)
+        return raiz if es_proyecto(raiz) else None
+
+    desde = os.path.abspath(desde) if desde else os.getcwd()
+    try:
+        st = os.stat(desde)
+    except OSError:
+        return None
+    clave = (st.st_dev, st.st_ino)
+    raiz = _recordada(clave, desde)
+    if raiz is None and not _cache["leida"]:
+        _leer_cache()
+        raiz = _recordada(clave, desde)
+    if raiz is not None:
+        return raiz
+
+    actual = desde
+    while not es_proyecto(actual):
+        padre = os.path.dirname(actual)
+        if padre == actual:
+            _raices.pop(clave, None)
+            return None
+        actual = padre
+    _recordar(clave, actual)
+    _guardar_en_cache(clave, actual)
+    return actual
@@ -0,0 +1,46 @@
+import os
+import sys
+from funcion_verficar import *
+from cronux import abrir, CronuxError
+
+def interpretar_rango(texto):
+    """Convierte 'offset:len' en (offset, len); 'offset:' llega hasta el final"""
+    inicio, separador, longitud = texto.partition(":")
+    if not separador:
+        raise ValueError(f"Rango inválido '{texto}' (formato offset:len)")
+    try:
+        inicio = int(inicio) if inicio else 0
+        longitud = int(longitud) if longitud else None
+    except ValueError:
+        raise ValueError(f"Rango inválido '{texto}' (formato offset:len)") from None
+    if inicio < 0 or (longitud is not None and longitud < 0):
+        raise ValueError(f"Rango inválido '{texto}': no admite valores negativos")
+    return inicio, longitud
+
+def ver_archivo_cli(version, ruta, rango=None):
+    """Versión CLI que vuelca un archivo de una versión en stdout"""
+    # stdout queda reservado para el contenido: los errores van a stderr
+    if not verificarCronux():
+        print("ERROR: No estas en un proyecto Cronux", file=sys.stderr)
+        return False
+    
+    inicio, longitud = 0, None
+    if rango is not None:
+        try:
+            inicio, longitud = interpretar_rango(rango)
+        except ValueError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return False
+    
+    try:
+        # La ruta es relativa a la carpeta actual, que puede ser una subcarpeta
+        abrir().cat(version, os.path.abspath(ruta), sys.stdout.buffer, inicio, longitud)
+        sys.stdout.flush()
+    except CronuxError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return False
+    except BrokenPipeError:
+        # El lector (p. ej. 'head') cerró la tubería: no es un error
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    
+    return True
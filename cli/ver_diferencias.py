@@ -0,0 +1,32 @@
+import sys
+from funcion_verficar import *
+from cronux import abrir, VersionNotFoundError
+
+def ver_diferencias_cli(version=None, otra=None):
+    """Versión CLI para mostrar los cambios respecto a una versión"""
+    if not verificarCronux():
+        print("ERROR: No estas en un proyecto Cronux")
+        return False
+    
+    try:
+        diferencias = abrir().diff(version, otra)
+    except VersionNotFoundError as e:
+        print(f"ERROR: {e}")
+        print("Usa 'cronux log' para ver las versiones disponibles")
+        return False
+    
+    origen = f"version {diferencias.base}" if diferencias.base else "sin versiones"
+    destino = f"version {diferencias.target}" if diferencias.target else "directorio de trabajo"
+    
+    if diferencias.clean:
+        print(f"Sin cambios entre {origen} y {destino}")
+        return True
+    
+    lineas = [f"CAMBIOS ({origen} -> {destino}):"]
+    lineas.extend(f"  A {ruta}" for ruta in diferencias.added)
+    lineas.extend(f"  M {ruta}" for ruta in diferencias.modified)
+    lineas.extend(f"  D {ruta}" for ruta in diferencias.deleted)
+    lineas.append(f"{len(diferencias.added)} nuevos, {len(diferencias.modified)} modificados, "
+                  f"{len(diferencias.deleted)} eliminados")
+    sys.stdout.write("\n".join(lineas) + "\n")
+    return True
@@ -1,62 +1,52 @@
-from pathlib import Path
-import json
+import os
+import sys
 from funcion_verficar import *
+from cronux import abrir
 
-def ver_historial_cli():
-    """Versión CLI para mostrar historial"""
+def ver_historial_cli(buscar=None, rutas=None):
+    """Versión CLI para mostrar historial
+
+    Con 'buscar', solo las versiones cuyo mensaje lo contiene; con 'rutas',
+    solo las que cambiaron alguna de ellas
+    """
     if not verificarCronux():
         print("ERROR: No estas en un proyecto Cronux")
         return False
     
-    carpeta_versiones = obtener_ruta_cronux() / "versiones"
-
-    if not carpeta_versiones.exists():
-        print("INFO: No hay versiones guardadas")
-        return False
-    
-    versiones = list(carpeta_versiones.glob("version_*"))
+    # Las rutas son relativas a la carpeta actual, que puede ser una subcarpeta
+    pedidas = rutas
+    if rutas is not None:
+        rutas = [os.path.abspath(ruta) for ruta in rutas]
+    versiones = abrir().log(grep=buscar, paths=rutas)
     
     if not versiones:
-        print("INFO: No hay versiones guardadas")
+        if buscar is not None and rutas is not None:
+            print(f"INFO: Ninguna version con '{buscar}' en el mensaje cambió {', '.join(pedidas)}")
+        elif rutas is not None:
+            print(f"INFO: Ninguna version cambió {', '.join(pedidas)}")
+        elif buscar is not None:
+            print(f"INFO: Ninguna version contiene '{buscar}' en el mensaje")
+        else:
+            print("INFO: No hay versiones guardadas")
         return False
 
-    print("HISTORIAL DE VERSIONES:")
-    print("=" * 50)
-    
-    # Ordenar versiones
-    versiones_ordenadas = []
-    for version_dir in versiones:
-        try:
-            numero = version_dir.name.replace("version_", "")
-            if "." in numero:
-                mayor, menor = numero.split(".")
-                versiones_ordenadas.append((int(mayor), int(menor), version_dir))
-            else:
-                versiones_ordenadas.append((int(numero), 0, version_dir))
-        except ValueError:
-            continue
-    
-    versiones_ordenadas.sort(reverse=True)
+    # Con miles de versiones, un único write es mucho más rápido que un print por línea
+    lineas = ["HISTORIAL DE VERSIONES:", "=" * 50]
     
-    for mayor, menor, version_dir in versiones_ordenadas:
-        metadatos_file = version_dir / "metadatos.json"
-        
-        if metadatos_file.exists():
-            try:
-                with open(metadatos_file, "r") as f:
-                    metadatos = json.load(f)
-                
-                print(f"Versión: {metadatos['version']}")
-                print(f"Fecha: {metadatos['fecha']}")
-                print(f"Mensaje: {metadatos['mensaje']}")
-                print(f"Archivos: {metadatos.get('archivos_guardados', 'N/A')}")
-                print("-" * 30)
-                
-            except Exception as e:
-                print(f"Error leyendo metadatos de {version_dir.name}: {e}")
+    # De la más reciente a la más antigua
+    for version in versiones:
+        if version.error:
+            lineas.append(f"Error leyendo metadatos de {version.path.name}: {version.error}")
+        elif version.date is not None:
+            lineas.append(f"Versión: {version.number}")
+            lineas.append(f"Fecha: {version.date}")
+            lineas.append(f"Mensaje: {version.message}")
+            lineas.append(f"Archivos: {version.files if version.files is not None else 'N/A'}")
+            lineas.append("-" * 30)
         else:
-            print(f"Versión: {version_dir.name.replace('version_', '')}")
-            print("Metadatos no disponibles")
-            print("-" * 30)
+            lineas.append(f"Versión: {version.number}")
+            lineas.append("Metadatos no disponibles")
+            lineas.append("-" * 30)
     
-    return True
\ No newline at end of file
+    sys.stdout.write("\n".join(lineas) + "\n")
+    return True
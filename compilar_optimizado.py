@@ -2,16 +2,100 @@
 """
 Script de compilación optimizado para Cronux-CRX
 Genera un solo instalador con CLI embebido
+
+La compilación es un grafo de etapas (ver definir_etapas): las que no
+dependen entre sí (CLI, icono, estructura del .deb) se ejecutan en
+paralelo. --only <etapa,...> ejecuta solo esas etapas y --from <etapa> esa
+y las que dependen de ella; lo que necesiten de las demás se toma de la
+compilación anterior. Al final se muestra el tiempo de cada etapa y la
+ruta crítica.
+
+Las etapas caras (CLI, recurso embebido, instalador) se guardan en
+.cache_compilacion/ con una clave calculada a partir de sus entradas:
+fuentes, assets, versión de PyInstaller y de Python, y opciones. Si nada
+cambió, la etapa se reutiliza en vez de recompilarse. Con --sin-cache se
+recompila todo.
+
+El CLI se congela con uno de los perfiles de PERFILES_CLI: el .deb lleva
+el de --perfil-cli (por defecto "rapido", una carpeta que arranca sin
+descomprimirse); el instalador siempre embebe el "portable". Con
+--solo-cli solo se genera el .deb del CLI (crx en /usr/bin, sin GUI).
+Cada compilación deja en dist/tamanos.json el tamaño de los artefactos y
+lo compara con la anterior o con --base-tamanos.
 """
 
 import os
 import sys
 import subprocess
 import shutil
-import base64
+import json
+import zlib
+import hashlib
 import tempfile
+import time
+import platform
+import argparse
+import threading
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import NamedTuple, Callable, Optional
 from pathlib import Path
 
+# Carpeta del recurso con el CLI comprimido dentro del instalador (ver gui/cronux_gui.py)
+CARPETA_CLI_EMBEBIDO = "cli_embebido"
+BLOQUE_CLI = 1024 * 1024
+
+# Caché de compilación: .cache_compilacion/<etapa>/<clave>/ con el artefacto y etapa.json
+CARPETA_CACHE = Path(".cache_compilacion")
+ENTRADAS_CACHE_POR_ETAPA = 3
+USAR_CACHE = True
+
+# Etapa -> "caché" si ejecutar_etapa reutilizó su artefacto, para el resumen final
+ESTADOS_CACHE = {}
+
+# PyInstaller comparte su caché entre procesos y --clean la borra: aunque
+# las etapas vayan en paralelo, se lanza un PyInstaller cada vez
+CANDADO_PYINSTALLER = threading.Lock()
+# Hilo -> segundos esperando el candado, para no atribuirlos a la etapa
+ESPERAS_PYINSTALLER = {}
+
+# Módulos de la biblioteca estándar que el CLI no importa nunca
+# (comprobado con grep sobre cli/; cProfile, sqlite3, tarfile... sí se usan)
+MODULOS_EXCLUIDOS = [
+    "tkinter", "unittest", "doctest", "pdb", "pydoc", "pydoc_data",
+    "lib2to3", "idlelib", "turtle", "turtledemo", "ensurepip", "venv",
+    "distutils", "xmlrpc", "curses", "ftplib", "imaplib", "poplib",
+    "smtplib", "nntplib", "telnetlib", "mailbox"
+]
+
+# Perfiles del CLI congelado:
+#   portable: un solo archivo; se descomprime en un directorio temporal en
+#       cada ejecución (cientos de ms). Es el que embebe el instalador.
+#   rapido: carpeta (onedir) instalada en /opt, sin los módulos que no se
+#       usan y con bytecode -OO (el CLI no lee docstrings ni usa assert)
+PERFILES_CLI = {
+    "portable": {"onefile": True, "excluir": [], "optimizar": 0},
+    "rapido": {"onefile": False, "excluir": MODULOS_EXCLUIDOS, "optimizar": 2},
+}
+PERFIL_CLI_DEB = "rapido"
+
+# Compresión de los .deb (dpkg-deb -Z, -z): xz da los paquetes más pequeños;
+# zstd descomprime más rápido pero pide dpkg >= 1.21.18 a quien instala
+COMPRESIONES_DEB = ("xz", "gzip", "zstd", "none")
+COMPRESION_DEB = "xz"
+NIVEL_DEB = None
+
+# Informe de tamaños de esta compilación; el de la anterior se guarda en la caché
+INFORME_TAMANOS = Path("dist/tamanos.json")
+ARTEFACTOS_MEDIDOS = ("cli", "recurso", "instalador", "cli_deb", "deb", "deb_cli")
+BASE_TAMANOS = None
+TOLERANCIA_TAMANOS = 0.05
+
+# Etapas de --solo-cli: el .deb del CLI sin instalador gráfico
+ETAPAS_SOLO_CLI = {"limpieza", "cli_deb", "deb_cli", "tamanos", "limpieza_final"}
+# Nivel de optimización del bytecode (-O/-OO) que sustituye al del perfil
+OPTIMIZAR_BYTECODE = None
+
 def detectar_sistema():
     """Detecta el sistema operativo"""
     if sys.platform.startswith('win'):
@@ -23,6 +107,289 @@ def detectar_sistema():
     else:
         return 'unknown'
 
+class Etapa(NamedTuple):
+    """Nodo del grafo de compilación"""
+    nombre: str
+    dependencias: tuple
+    # Recibe los artefactos de las etapas ya hechas; None o False es un fallo
+    ejecutar: Callable
+    # Artefacto de una compilación anterior, para --only y --from
+    anterior: Optional[Callable] = None
+    # Sistemas en los que tiene sentido (vacío: todos)
+    sistemas: tuple = ()
+    # Etapas que, si se ejecutan, deben terminar antes (sin usar su resultado)
+    despues: tuple = ()
+
+class Registro(NamedTuple):
+    """Cuándo empezó y terminó una etapa (segundos desde el inicio) y cómo acabó"""
+    inicio: float
+    fin: float
+    estado: str
+    # Parte de la duración que pasó esperando a que PyInstaller quedara libre
+    espera: float = 0.0
+
+# Estados de las etapas que llegaron a ejecutarse
+EJECUTADAS = ("ok", "caché", "error")
+
+def seleccionar_etapas(etapas, solo=None, desde=None):
+    """Nombres de las etapas a ejecutar según --only y --from
+
+    ValueError si alguna etapa no existe
+    """
+    nombres = [etapa.nombre for etapa in etapas]
+    pedidas = (solo or []) + ([desde] if desde else [])
+    desconocidas = [nombre for nombre in pedidas if nombre not in nombres]
+    if desconocidas:
+        raise ValueError(f"Etapas desconocidas: {', '.join(desconocidas)} "
+                         f"(disponibles: {', '.join(nombres)})")
+    if solo:
+        return set(solo)
+    if desde:
+        # La etapa y todo lo que va detrás (las etapas están en orden topológico)
+        seleccion = {desde}
+        for etapa in etapas:
+            if seleccion.intersection(etapa.dependencias + etapa.despues):
+                seleccion.add(etapa.nombre)
+        return seleccion
+    return set(nombres)
+
+def ejecutar_grafo(etapas, seleccion):
+    """Ejecuta las etapas seleccionadas, en paralelo si sus dependencias lo permiten
+
+    Las etapas vienen en orden topológico. Si una falla no se lanzan más
+    (las que están en marcha terminan). Devuelve (artefactos por etapa,
+    registros por etapa, si todo fue bien)
+    """
+    sistema = detectar_sistema()
+    artefactos, registros = {}, {}
+    pendientes = []
+    for etapa in etapas:
+        if etapa.sistemas and sistema not in etapa.sistemas:
+            artefactos[etapa.nombre] = None
+            registros[etapa.nombre] = Registro(0.0, 0.0, "no aplica")
+        elif etapa.nombre in seleccion:
+            pendientes.append(etapa)
+
+    # Lo que las etapas elegidas necesitan de las que no se van a ejecutar
+    por_nombre = {etapa.nombre: etapa for etapa in etapas}
+    for etapa in pendientes:
+        for dependencia in etapa.dependencias:
+            if dependencia in seleccion or dependencia in artefactos:
+                continue
+            anterior = por_nombre[dependencia].anterior
+            artefacto = anterior() if anterior else True
+            if not artefacto:
+                print(f"❌ La etapa '{etapa.nombre}' necesita el resultado de "
+                      f"'{dependencia}' y no hay uno anterior: usa --from {dependencia}")
+                return artefactos, registros, False
+            artefactos[dependencia] = artefacto
+            registros[dependencia] = Registro(0.0, 0.0, "anterior")
+
+    inicio = time.perf_counter()
+
+    def cronometrada(etapa, disponibles):
+        comienzo = time.perf_counter() - inicio
+        ESPERAS_PYINSTALLER.pop(threading.get_ident(), None)
+        try:
+            artefacto = etapa.ejecutar(disponibles)
+        except Exception as e:
+            print(f"❌ Error en la etapa {etapa.nombre}: {e}")
+            artefacto = None
+        espera = ESPERAS_PYINSTALLER.pop(threading.get_ident(), 0.0)
+        return artefacto, comienzo, time.perf_counter() - inicio, espera
+
+    correcto = True
+    en_curso = {}
+    # Las etapas pasan casi todo el tiempo esperando a PyInstaller o a
+    # dpkg-deb: con hilos basta
+    with ThreadPoolExecutor(max_workers=max(len(pendientes), 1)) as ejecutor:
+        while pendientes or en_curso:
+            if correcto:
+                sin_terminar = {e.nombre for e in pendientes} | {e.nombre for e in en_curso.values()}
+                for etapa in [e for e in pendientes
+                              if all(d in artefactos for d in e.dependencias)
+                              and not sin_terminar.intersection(e.despues)]:
+                    pendientes.remove(etapa)
+                    futuro = ejecutor.submit(cronometrada, etapa, dict(artefactos))
+                    en_curso[futuro] = etapa
+            if not en_curso:
+                break
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                etapa = en_curso.pop(futuro)
+                artefacto, comienzo, fin, espera = futuro.result()
+                if artefacto:
+                    artefactos[etapa.nombre] = artefacto
+                    estado = ESTADOS_CACHE.get(etapa.nombre, "ok")
+                else:
+                    correcto = False
+                    estado = "error"
+                registros[etapa.nombre] = Registro(comienzo, fin, estado, espera)
+
+    for etapa in pendientes:
+        registros[etapa.nombre] = Registro(0.0, 0.0, "omitida")
+    return artefactos, registros, correcto
+
+def ruta_critica(etapas, registros):
+    """(etapas, segundos) de la cadena de dependencias más larga entre las ejecutadas"""
+    acumulado, previa = {}, {}
+    for etapa in etapas:
+        registro = registros.get(etapa.nombre)
+        if registro is None or registro.estado not in EJECUTADAS:
+            continue
+        anteriores = [d for d in etapa.dependencias + etapa.despues if d in acumulado]
+        mayor = max(anteriores, key=acumulado.get, default=None)
+        acumulado[etapa.nombre] = (registro.fin - registro.inicio) + acumulado.get(mayor, 0.0)
+        previa[etapa.nombre] = mayor
+    if not acumulado:
+        return [], 0.0
+    final = max(acumulado, key=acumulado.get)
+    cadena = []
+    nombre = final
+    while nombre:
+        cadena.append(nombre)
+        nombre = previa[nombre]
+    return cadena[::-1], acumulado[final]
+
+def mostrar_resumen(etapas, registros):
+    """Muestra el tiempo de reloj de cada etapa y la ruta crítica"""
+    if not registros:
+        return
+    print("\n⏱️  Tiempo por etapa:")
+    print(f"   {'etapa':<16} {'inicio':>8} {'duración':>9}  estado")
+    for etapa in etapas:
+        registro = registros.get(etapa.nombre)
+        if registro is None:
+            continue
+        if registro.estado in EJECUTADAS:
+            espera = f" ({registro.espera:.2f}s esperando PyInstaller)" if registro.espera >= 0.01 else ""
+            print(f"   {etapa.nombre:<16} {registro.inicio:>7.2f}s "
+                  f"{registro.fin - registro.inicio:>8.2f}s  {registro.estado}{espera}")
+        else:
+            print(f"   {etapa.nombre:<16} {'-':>8} {'-':>9}  {registro.estado}")
+
+    ejecutadas = [r for r in registros.values() if r.estado in EJECUTADAS]
+    if ejecutadas:
+        reloj = max(r.fin for r in ejecutadas)
+        suma = sum(r.fin - r.inicio for r in ejecutadas)
+        print(f"   Total: {reloj:.2f} s de reloj ({suma:.2f} s sumando etapas)")
+        cadena, segundos = ruta_critica(etapas, registros)
+        print(f"   Ruta crítica: {' → '.join(cadena)} ({segundos:.2f} s)")
+
+def version_paquete(nombre, comando=None):
+    """Versión instalada de un paquete, o la que informa su comando"""
+    try:
+        return importlib.metadata.version(nombre)
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    if comando:
+        try:
+            result = subprocess.run(comando, capture_output=True, text=True)
+            if result.returncode == 0:
+                return result.stdout.strip()
+        except OSError:
+            pass
+    return "desconocida"
+
+def archivos_de_entrada(entradas):
+    """Archivos de las entradas de una etapa, en orden estable
+
+    Las carpetas se recorren enteras (sin bytecode); una entrada que no
+    existe también cuenta, para que crearla cambie la clave
+    """
+    for entrada in entradas:
+        entrada = Path(entrada)
+        if entrada.is_dir():
+            for ruta in sorted(entrada.rglob("*")):
+                if ruta.is_file() and "__pycache__" not in ruta.parts and ruta.suffix != ".pyc":
+                    yield ruta
+        else:
+            yield entrada
+
+def clave_etapa(etapa, entradas, parametros):
+    """Hash de todo lo que determina el resultado de una etapa"""
+    clave = hashlib.sha256()
+    contexto = {
+        "etapa": etapa,
+        "python": sys.version,
+        "plataforma": f"{sys.platform}-{platform.machine()}",
+        "parametros": [str(p) for p in parametros]
+    }
+    clave.update(json.dumps(contexto, sort_keys=True).encode("utf-8"))
+    for ruta in archivos_de_entrada(entradas):
+        clave.update(ruta.as_posix().encode("utf-8") + b"\0")
+        if ruta.is_file():
+            with open(ruta, 'rb') as f:
+                for bloque in iter(lambda: f.read(BLOQUE_CLI), b""):
+                    clave.update(bloque)
+        else:
+            clave.update(b"\0ausente")
+        clave.update(b"\0")
+    return clave.hexdigest()[:32]
+
+def copiar_artefacto(origen, destino):
+    """Copia un archivo o carpeta (la .app de macOS) reemplazando el destino"""
+    if destino.is_dir() and not destino.is_symlink():
+        shutil.rmtree(destino)
+    elif destino.exists() or destino.is_symlink():
+        destino.unlink()
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    if origen.is_dir():
+        shutil.copytree(origen, destino, symlinks=True)
+    else:
+        shutil.copy2(origen, destino)
+
+def guardar_en_cache(etapa, clave, artefacto):
+    """Guarda el artefacto de una etapa y descarta las entradas más antiguas"""
+    carpeta_etapa = CARPETA_CACHE / etapa
+    try:
+        carpeta_etapa.mkdir(parents=True, exist_ok=True)
+        # Se prepara aparte y se mueve: una compilación interrumpida no deja
+        # una entrada a medias
+        temporal = Path(tempfile.mkdtemp(prefix=".tmp", dir=carpeta_etapa))
+        copiar_artefacto(artefacto, temporal / artefacto.name)
+        with open(temporal / "etapa.json", 'w', encoding='utf-8') as f:
+            json.dump({"artefacto": artefacto.as_posix(), "clave": clave,
+                       "creado": time.time()}, f, indent=2)
+        carpeta = carpeta_etapa / clave
+        if carpeta.exists():
+            shutil.rmtree(carpeta)
+        os.replace(temporal, carpeta)
+        
+        anteriores = sorted((c for c in carpeta_etapa.iterdir()
+                             if c.is_dir() and not c.name.startswith(".tmp")),
+                            key=lambda c: c.stat().st_mtime, reverse=True)
+        for vieja in anteriores[ENTRADAS_CACHE_POR_ETAPA:]:
+            shutil.rmtree(vieja, ignore_errors=True)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar {etapa} en la caché: {e}")
+
+def ejecutar_etapa(etapa, entradas, parametros, producir):
+    """Ejecuta una etapa o, si sus entradas no cambiaron, reutiliza su artefacto
+
+    'producir' compila la etapa y devuelve la ruta (relativa) del artefacto,
+    o None si falló. Devuelve la ruta del artefacto en su sitio habitual.
+    """
+    clave = clave_etapa(etapa, entradas, parametros)
+    carpeta = CARPETA_CACHE / etapa / clave
+    if USAR_CACHE and (carpeta / "etapa.json").exists():
+        try:
+            with open(carpeta / "etapa.json", 'r', encoding='utf-8') as f:
+                artefacto = Path(json.load(f)["artefacto"])
+            copiar_artefacto(carpeta / artefacto.name, artefacto)
+            # La fecha de la carpeta marca las entradas usadas hace poco
+            os.utime(carpeta)
+            ESTADOS_CACHE[etapa] = "caché"
+            print(f"♻️  {etapa}: sin cambios, reutilizado de la caché ({clave[:12]})")
+            return artefacto
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Caché de {etapa} inservible, se recompila: {e}")
+
+    artefacto = producir()
+    if artefacto:
+        guardar_en_cache(etapa, clave, Path(artefacto))
+    return artefacto
+
 def limpiar_archivos():
     """Limpia archivos de compilaciones anteriores"""
     print("🧹 Limpiando archivos anteriores...")
@@ -44,91 +411,209 @@ def limpiar_archivos():
         except:
             pass
 
+def nombre_ejecutable_cli(sistema):
+    """Nombre del ejecutable del CLI según el sistema"""
+    return "crx.exe" if sistema == 'windows' else "crx"
+
+def comando_cli(sistema, perfil, distpath, workpath):
+    """Comando de PyInstaller que congela el CLI con un perfil de PERFILES_CLI"""
+    opciones = PERFILES_CLI[perfil]
+    optimizar = opciones["optimizar"] if OPTIMIZAR_BYTECODE is None else OPTIMIZAR_BYTECODE
+    if optimizar:
+        # PyInstaller compila el bytecode con el nivel del intérprete que lo ejecuta
+        cmd = [sys.executable, "-" + "O" * optimizar, "-m", "PyInstaller"]
+    else:
+        cmd = ["pyinstaller"]
+    cmd += [
+        "--onefile" if opciones["onefile"] else "--onedir",
+        "--name", "crx",
+        "--distpath", str(distpath),
+        "--workpath", str(workpath),
+        "--specpath", str(workpath),
+        "--noconfirm",
+        "--clean",
+        "cli/cronux_cli.py"
+    ]
+    for modulo in opciones["excluir"]:
+        cmd.extend(["--exclude-module", modulo])
+
+    # Configuraciones específicas por sistema
+    if sistema == 'windows':
+        cmd.append("--console")
+    else:
+        cmd.append("--strip")
+    return cmd
+
+def ejecutar_pyinstaller(cmd):
+    """Ejecuta PyInstaller sin solaparse con otra etapa que también lo use"""
+    inicio = time.perf_counter()
+    with CANDADO_PYINSTALLER:
+        hilo = threading.get_ident()
+        ESPERAS_PYINSTALLER[hilo] = ESPERAS_PYINSTALLER.get(hilo, 0.0) + time.perf_counter() - inicio
+        return subprocess.run(cmd, capture_output=True, text=True)
+
 def compilar_cli_temporal():
     """Compila el CLI temporalmente para embeber"""
     sistema = detectar_sistema()
     print(f"🔨 Compilando CLI temporal para embeber...")
-    
+
     # Crear directorio temporal
     temp_dir = Path("temp_cli")
     temp_dir.mkdir(exist_ok=True)
-    
+
     # Nombre del ejecutable según el sistema
-    if sistema == 'windows':
-        exe_name = "crx.exe"
-    else:
-        exe_name = "crx"
-    
+    exe_name = nombre_ejecutable_cli(sistema)
+
     try:
-        cmd = [
-            "pyinstaller", 
-            "--onefile", 
-            "--name", "crx",
-            "--distpath", str(temp_dir),
-            "--workpath", str(temp_dir / "build"),
-            "--specpath", str(temp_dir),
-            "--clean",
-            "cli/cronux_cli.py"
-        ]
-        
-        # Configuraciones específicas por sistema
-        if sistema == 'windows':
-            cmd.append("--console")
-        else:
-            cmd.append("--strip")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            exe_path = temp_dir / exe_name
-            if exe_path.exists():
-                size = exe_path.stat().st_size / 1024 / 1024
-                print(f"✅ CLI temporal compilado: {exe_name} ({size:.1f} MB)")
-                return exe_path
+        # El instalador embebe un solo archivo: siempre el perfil portable
+        cmd = comando_cli(sistema, "portable", temp_dir, temp_dir / "build")
+
+        def compilar():
+            result = ejecutar_pyinstaller(cmd)
+
+            if result.returncode == 0:
+                exe_path = temp_dir / exe_name
+                if exe_path.exists():
+                    size = exe_path.stat().st_size / 1024 / 1024
+                    print(f"✅ CLI temporal compilado: {exe_name} ({size:.1f} MB)")
+                    return exe_path
+                else:
+                    print(f"❌ No se encontró {exe_name}")
+                    return None
             else:
-                print(f"❌ No se encontró {exe_name}")
+                print(f"❌ Error compilando CLI: {result.stderr}")
                 return None
-        else:
-            print(f"❌ Error compilando CLI: {result.stderr}")
-            return None
-            
+
+        pyinstaller = version_paquete("pyinstaller", ["pyinstaller", "--version"])
+        return ejecutar_etapa("cli", ["cli"], cmd + [f"pyinstaller={pyinstaller}"], compilar)
+
     except Exception as e:
         print(f"❌ Error: {e}")
         return None
 
-def embeber_cli_en_gui(cli_path):
-    """Embebe el CLI compilado en el GUI"""
-    print("📦 Embebiendo CLI en GUI...")
+def ruta_cli_perfil(sistema, perfil):
+    """Dónde deja compilar_cli_perfil el CLI: el ejecutable (onefile) o su carpeta (onedir)"""
+    carpeta = Path("dist") / f"crx-{perfil}"
+    if PERFILES_CLI[perfil]["onefile"]:
+        return carpeta / nombre_ejecutable_cli(sistema)
+    return carpeta / "crx"
+
+def compilar_cli_perfil(perfil):
+    """Compila el CLI con un perfil en dist/crx-<perfil>/ (lo usa el .deb)"""
+    sistema = detectar_sistema()
+    print(f"🔨 Compilando CLI con el perfil '{perfil}'...")
+
+    try:
+        artefacto = ruta_cli_perfil(sistema, perfil)
+        cmd = comando_cli(sistema, perfil, artefacto.parent, Path("temp_cli") / f"build-{perfil}")
+
+        def compilar():
+            result = ejecutar_pyinstaller(cmd)
+
+            if result.returncode == 0 and artefacto.exists():
+                if artefacto.is_dir():
+                    size = sum(f.stat().st_size for f in artefacto.rglob("*") if f.is_file())
+                else:
+                    size = artefacto.stat().st_size
+                print(f"✅ CLI '{perfil}' compilado: {artefacto} ({size / 1024 / 1024:.1f} MB)")
+                return artefacto
+            else:
+                print(f"❌ Error compilando CLI '{perfil}': {result.stderr}")
+                return None
+
+        pyinstaller = version_paquete("pyinstaller", ["pyinstaller", "--version"])
+        return ejecutar_etapa(f"cli_{perfil}", ["cli"], cmd + [f"pyinstaller={pyinstaller}"],
+                              compilar)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None
+
+def compilar_zipapp():
+    """Empaqueta el CLI como un único archivo ejecutable con python -m zipapp"""
+    import zipapp
+    import py_compile
+    
+    print("📦 Empaquetando CLI como zipapp...")
     
     try:
-        # Leer el CLI compilado
-        with open(cli_path, 'rb') as f:
-            cli_data = f.read()
+        temp_dir = Path("temp_zipapp")
+        if temp_dir.exists():
+            shutil.rmtree(temp_dir)
+        temp_dir.mkdir()
         
-        # Codificar en base64
-        cli_base64 = base64.b64encode(cli_data).decode('utf-8')
+        for modulo in Path("cli").glob("*.py"):
+            destino = temp_dir / modulo.name
+            shutil.copy2(modulo, destino)
+            # zipimport no puede escribir cachés: se incluye el bytecode ya compilado
+            # (hash sin comprobar, así no depende de las fechas dentro del zip)
+            py_compile.compile(
+                str(destino), cfile=str(destino.with_suffix(".pyc")), doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH
+            )
         
-        # Crear directorio temporal para GUI modificado
-        temp_gui_dir = Path("temp_gui")
-        temp_gui_dir.mkdir(exist_ok=True)
+        Path("dist").mkdir(exist_ok=True)
+        pyz_path = Path("dist") / "crx.pyz"
+        zipapp.create_archive(
+            temp_dir, target=pyz_path,
+            interpreter="/usr/bin/env python3",
+            main="cronux_cli:main",
+            compressed=True
+        )
+        shutil.rmtree(temp_dir)
         
-        # Leer el GUI original
-        with open("gui/cronux_gui.py", 'r', encoding='utf-8') as f:
-            gui_content = f.read()
+        size = pyz_path.stat().st_size / 1024
+        print(f"✅ Zipapp creado: {pyz_path} ({size:.1f} KB)")
+        print(f"   Uso: python3 {pyz_path} status  (o ./{pyz_path} status)")
+        return pyz_path
         
-        # Reemplazar la línea EMBEDDED_CLI_DATA
-        gui_content = gui_content.replace(
-            "EMBEDDED_CLI_DATA = None",
-            f'EMBEDDED_CLI_DATA = """{cli_base64}"""'
-        )
+    except Exception as e:
+        print(f"❌ Error creando zipapp: {e}")
+        return None
+
+def embeber_cli_en_gui(cli_path):
+    """Prepara el CLI compilado como recurso comprimido del instalador, con su digest
+
+    El CLI se comprime por bloques sin cargarlo entero en memoria; el
+    instalador lo descomprime igual y solo si no tiene ya una copia con
+    ese mismo digest
+    """
+    print("📦 Embebiendo CLI en GUI...")
+    recurso_dir = Path("temp_gui") / CARPETA_CLI_EMBEBIDO
+    # Mismo CLI, mismo recurso: comprimir al nivel 9 no sale gratis
+    return ejecutar_etapa("recurso", [cli_path], ["zlib-9"],
+                          lambda: comprimir_cli(cli_path, recurso_dir))
+
+def comprimir_cli(cli_path, recurso_dir):
+    """Escribe crx.z y crx.json en recurso_dir; devuelve la carpeta o None"""
+    try:
+        if recurso_dir.exists():
+            shutil.rmtree(recurso_dir)
+        recurso_dir.mkdir(parents=True, exist_ok=True)
+        
+        digest = hashlib.sha256()
+        compresor = zlib.compressobj(9)
+        tamano = 0
+        with open(cli_path, 'rb') as origen, open(recurso_dir / "crx.z", 'wb') as destino:
+            for bloque in iter(lambda: origen.read(BLOQUE_CLI), b""):
+                digest.update(bloque)
+                tamano += len(bloque)
+                destino.write(compresor.compress(bloque))
+            destino.write(compresor.flush())
         
-        # Escribir GUI modificado
-        gui_path = temp_gui_dir / "cronux_gui_embedded.py"
-        with open(gui_path, 'w', encoding='utf-8') as f:
-            f.write(gui_content)
+        info = {
+            "archivo": "crx.z",
+            "compresion": "zlib",
+            "sha256": digest.hexdigest(),
+            "tamano": tamano
+        }
+        with open(recurso_dir / "crx.json", 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=2)
         
-        print(f"✅ CLI embebido en GUI ({len(cli_base64)/1024:.1f} KB)")
-        return gui_path
+        comprimido = (recurso_dir / "crx.z").stat().st_size
+        print(f"✅ CLI embebido como recurso ({comprimido/1024:.1f} KB, "
+              f"{tamano/1024:.1f} KB sin comprimir)")
+        return recurso_dir
         
     except Exception as e:
         print(f"❌ Error embebiendo CLI: {e}")
@@ -157,15 +642,11 @@ def crear_icono_windows():
         print(f"⚠️  Error creando .ico: {e}")
         return False
 
-def compilar_instalador_final(gui_path):
-    """Compila el instalador final con CLI embebido"""
+def compilar_instalador_final(recurso_cli):
+    """Compila el instalador final con el CLI como recurso comprimido"""
     sistema = detectar_sistema()
     print(f"🖥️ Compilando instalador final para {sistema}...")
     
-    # Crear icono .ico para Windows si es necesario
-    if sistema == 'windows':
-        crear_icono_windows()
-    
     try:
         # Nombre del instalador según el sistema
         if sistema == 'windows':
@@ -182,7 +663,8 @@ def compilar_instalador_final(gui_path):
             "--name", "CronuxCRX_Installer",
             "--distpath", "dist",
             "--clean",
-            str(gui_path)
+            "--add-data", f"{recurso_cli}:{CARPETA_CLI_EMBEBIDO}",
+            "gui/cronux_gui.py"
         ]
         
         # Agregar assets si existe la carpeta
@@ -203,37 +685,51 @@ def compilar_instalador_final(gui_path):
                 cmd.extend(["--version-file", "version_info.txt"])
         elif sistema == 'linux':
             cmd.append("--strip")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            installer_path = Path("dist") / installer_name
-            if installer_path.exists():
-                size = installer_path.stat().st_size / 1024 / 1024
-                print(f"✅ Instalador compilado: {installer_name} ({size:.1f} MB)")
-                return installer_path
+
+        # La GUI tampoco importa ninguno (solo PyQt5 y módulos básicos)
+        for modulo in MODULOS_EXCLUIDOS:
+            cmd.extend(["--exclude-module", modulo])
+
+        def compilar():
+            result = ejecutar_pyinstaller(cmd)
+
+            if result.returncode == 0:
+                installer_path = Path("dist") / installer_name
+                if installer_path.exists():
+                    size = installer_path.stat().st_size / 1024 / 1024
+                    print(f"✅ Instalador compilado: {installer_name} ({size:.1f} MB)")
+                    return installer_path
+                else:
+                    print(f"❌ No se encontró {installer_name}")
+                    return None
             else:
-                print(f"❌ No se encontró {installer_name}")
+                print(f"❌ Error compilando instalador: {result.stderr}")
                 return None
-        else:
-            print(f"❌ Error compilando instalador: {result.stderr}")
-            return None
+        
+        # Solo el estilo de la GUI cambió: el CLI y su recurso salen de la
+        # caché y esta clave cambia por gui/cronux_gui.py
+        entradas = ["gui/cronux_gui.py", "assets", "version_info.txt", recurso_cli]
+        parametros = cmd + [
+            f"pyinstaller={version_paquete('pyinstaller', ['pyinstaller', '--version'])}",
+            f"pyqt5={version_paquete('PyQt5')}"
+        ]
+        return ejecutar_etapa("instalador", entradas, parametros, compilar)
             
     except Exception as e:
         print(f"❌ Error compilando instalador: {e}")
         return None
 
-def crear_paquete_deb(installer_path):
-    """Crea paquete .deb para Linux"""
-    if detectar_sistema() != 'linux':
-        return None
-    
-    print("📦 Creando paquete .deb para Linux...")
+def preparar_estructura_deb():
+    """Prepara la estructura del paquete .deb (todo menos el instalador)
+
+    No depende del instalador: la compilación la hace mientras PyInstaller trabaja
+    """
+    print("📦 Preparando estructura del paquete .deb...")
     
     try:
         # Crear estructura de paquete .deb
         deb_dir = Path("dist/cronux-crx_1.0.0_amd64")
-        deb_dir.mkdir(exist_ok=True)
+        deb_dir.mkdir(parents=True, exist_ok=True)
         
         # DEBIAN directory
         debian_dir = deb_dir / "DEBIAN"
@@ -266,6 +762,11 @@ chmod +x /opt/cronux-crx/CronuxCRX_Installer
 # Crear enlace simbólico
 ln -sf /opt/cronux-crx/CronuxCRX_Installer /usr/local/bin/cronux-installer
 
+# CLI congelado (perfil de --perfil-cli), listo sin pasar por el instalador
+if [ -x /opt/cronux-crx/cli/crx ]; then
+    ln -sf /opt/cronux-crx/cli/crx /usr/local/bin/crx
+fi
+
 echo "Cronux-CRX Installer instalado correctamente"
 echo "Ejecuta: cronux-installer"
 """
@@ -281,6 +782,10 @@ set -e
 
 # Remover enlace simbólico
 rm -f /usr/local/bin/cronux-installer
+# Solo si el enlace es nuestro (el instalador también puede poner un crx ahí)
+if [ "$(readlink /usr/local/bin/crx)" = "/opt/cronux-crx/cli/crx" ]; then
+    rm -f /usr/local/bin/crx
+fi
 
 echo "Cronux-CRX Installer desinstalado"
 """
@@ -290,11 +795,6 @@ echo "Cronux-CRX Installer desinstalado"
             f.write(prerm_content)
         prerm_path.chmod(0o755)
         
-        # Copiar el instalador
-        opt_dir = deb_dir / "opt/cronux-crx"
-        opt_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(installer_path, opt_dir / "CronuxCRX_Installer")
-        
         # Crear .desktop file
         applications_dir = deb_dir / "usr/share/applications"
         applications_dir.mkdir(parents=True, exist_ok=True)
@@ -312,24 +812,184 @@ Categories=Development;Utility;
         with open(applications_dir / "cronux-crx.desktop", 'w') as f:
             f.write(desktop_content)
         
-        # Crear el paquete .deb
-        deb_file = Path("dist/cronux-crx_1.0.0_amd64.deb")
-        result = subprocess.run([
-            "dpkg-deb", "--build", str(deb_dir), str(deb_file)
-        ], capture_output=True, text=True)
+        return deb_dir
         
-        if result.returncode == 0 and deb_file.exists():
-            size = deb_file.stat().st_size / 1024 / 1024
-            print(f"✅ Paquete .deb creado: {deb_file.name} ({size:.1f} MB)")
-            return deb_file
-        else:
-            print(f"❌ Error creando .deb: {result.stderr}")
-            return None
+    except Exception as e:
+        print(f"❌ Error preparando paquete .deb: {e}")
+        return None
+
+def empaquetar_deb(deb_dir, installer_path, cli_path=None):
+    """Copia el instalador (y el CLI congelado, si se da) en la estructura preparada y genera el .deb"""
+    print("📦 Creando paquete .deb para Linux...")
+
+    try:
+        # Copiar el instalador
+        opt_dir = deb_dir / "opt/cronux-crx"
+        opt_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(installer_path, opt_dir / "CronuxCRX_Installer")
+
+        # El CLI va en /opt/cronux-crx/cli/crx sea carpeta (onedir) o un solo archivo
+        if cli_path:
+            cli_dir = opt_dir / "cli"
+            if cli_dir.exists():
+                shutil.rmtree(cli_dir)
+            if Path(cli_path).is_dir():
+                shutil.copytree(cli_path, cli_dir, symlinks=True)
+            else:
+                cli_dir.mkdir()
+                shutil.copy2(cli_path, cli_dir / "crx")
+        
+        # Crear el paquete .deb
+        return construir_deb(deb_dir, Path("dist/cronux-crx_1.0.0_amd64.deb"))
             
     except Exception as e:
         print(f"❌ Error creando paquete .deb: {e}")
         return None
 
+def construir_deb(deb_dir, deb_file):
+    """Genera el .deb con la compresión elegida (--compresion-deb, --nivel-deb)"""
+    cmd = ["dpkg-deb", f"-Z{COMPRESION_DEB}"]
+    if NIVEL_DEB is not None and COMPRESION_DEB != "none":
+        cmd.append(f"-z{NIVEL_DEB}")
+    cmd += ["--build", str(deb_dir), str(deb_file)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode == 0 and deb_file.exists():
+        size = deb_file.stat().st_size / 1024 / 1024
+        print(f"✅ Paquete .deb creado: {deb_file.name} ({size:.1f} MB, {COMPRESION_DEB})")
+        return deb_file
+    else:
+        print(f"❌ Error creando .deb: {result.stderr}")
+        return None
+
+def crear_paquete_deb_cli(cli_path):
+    """Crea un .deb solo con el CLI (crx en /usr/bin), para equipos sin entorno gráfico
+
+    El CLI congelado no necesita Python ni PyQt5, así que el paquete no
+    tiene dependencias. Usa rutas propias (/opt/cronux-crx-cli) para poder
+    instalarse junto a cronux-crx
+    """
+    print("📦 Creando paquete .deb solo con el CLI...")
+
+    try:
+        deb_dir = Path("dist/cronux-crx-cli_1.0.0_amd64")
+        if deb_dir.exists():
+            shutil.rmtree(deb_dir)
+        debian_dir = deb_dir / "DEBIAN"
+        debian_dir.mkdir(parents=True)
+        bin_dir = deb_dir / "usr/bin"
+        bin_dir.mkdir(parents=True)
+
+        cli_path = Path(cli_path)
+        if cli_path.is_dir():
+            # onedir: la carpeta en /opt y el enlace dentro del propio paquete
+            opt_dir = deb_dir / "opt/cronux-crx-cli"
+            opt_dir.parent.mkdir(parents=True)
+            shutil.copytree(cli_path, opt_dir, symlinks=True)
+            (bin_dir / "crx").symlink_to("/opt/cronux-crx-cli/crx")
+        else:
+            shutil.copy2(cli_path, bin_dir / "crx")
+
+        instalado = tamano_en_disco(deb_dir) // 1024 + 1
+        control_content = f"""Package: cronux-crx-cli
+Version: 1.0.0
+Section: utils
+Priority: optional
+Architecture: amd64
+Installed-Size: {instalado}
+Maintainer: Cronux Team <cronux@example.com>
+Description: Cronux-CRX - Sistema de Control de Versiones Local (solo CLI)
+ El comando crx de Cronux-CRX sin el instalador gráfico, para servidores
+ y equipos sin entorno de escritorio.
+"""
+
+        with open(debian_dir / "control", 'w') as f:
+            f.write(control_content)
+
+        return construir_deb(deb_dir, Path("dist/cronux-crx-cli_1.0.0_amd64.deb"))
+
+    except Exception as e:
+        print(f"❌ Error creando paquete .deb del CLI: {e}")
+        return None
+
+def tamano_en_disco(ruta):
+    """Bytes de un archivo o de todos los archivos de una carpeta (sin contar enlaces)"""
+    ruta = Path(ruta)
+    if ruta.is_dir():
+        return sum(f.stat().st_size for f in ruta.rglob("*") if f.is_file() and not f.is_symlink())
+    return ruta.stat().st_size
+
+def informe_tamanos(artefactos):
+    """Escribe dist/tamanos.json y lo compara con --base-tamanos o con la compilación anterior
+
+    Solo con --base-tamanos falla si algún artefacto crece más que la tolerancia
+    """
+    tamanos = {}
+    for etapa in ARTEFACTOS_MEDIDOS:
+        ruta = artefactos.get(etapa)
+        if ruta and ruta is not True and Path(ruta).exists():
+            # El CLI del .deb se compara siempre con el del mismo perfil
+            nombre = f"cli_{PERFIL_CLI_DEB}" if etapa == "cli_deb" else etapa
+            tamanos[nombre] = tamano_en_disco(ruta)
+
+    informe = {
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "sistema": detectar_sistema(),
+        "compresion_deb": COMPRESION_DEB,
+        "tamanos": tamanos
+    }
+    INFORME_TAMANOS.parent.mkdir(exist_ok=True)
+    with open(INFORME_TAMANOS, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2)
+
+    ruta_base = Path(BASE_TAMANOS) if BASE_TAMANOS else CARPETA_CACHE / "tamanos.json"
+    try:
+        with open(ruta_base, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+    except (OSError, ValueError):
+        base = {}
+    anteriores = base.get("tamanos", {})
+
+    print(f"\n📏 Tamaños ({INFORME_TAMANOS}, base: {ruta_base if anteriores else 'ninguna'}):")
+    if anteriores and base.get("compresion_deb") != COMPRESION_DEB:
+        print(f"⚠️  La base usó compresión {base.get('compresion_deb')}: los .deb no son comparables")
+    print(f"   {'artefacto':<16} {'tamaño':>10} {'base':>10} {'diferencia':>11}")
+    regresiones = []
+    for nombre, tamano in tamanos.items():
+        anterior = anteriores.get(nombre)
+        if anterior:
+            cambio = (tamano - anterior) / anterior
+            marca = "  ▲" if cambio > TOLERANCIA_TAMANOS else ""
+            if marca:
+                regresiones.append(nombre)
+            print(f"   {nombre:<16} {tamano / 1024 / 1024:>7.2f} MB {anterior / 1024 / 1024:>7.2f} MB "
+                  f"{cambio:>+10.1%}{marca}")
+        else:
+            print(f"   {nombre:<16} {tamano / 1024 / 1024:>7.2f} MB {'-':>10} {'-':>11}")
+
+    if not BASE_TAMANOS:
+        # La próxima compilación se compara con esta; lo que no se midió ahora se conserva
+        try:
+            CARPETA_CACHE.mkdir(exist_ok=True)
+            with open(ruta_base, 'w', encoding='utf-8') as f:
+                json.dump({**informe, "tamanos": {**anteriores, **tamanos}}, f, indent=2)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el informe de tamaños: {e}")
+    elif regresiones:
+        print(f"❌ Crecen más de un {TOLERANCIA_TAMANOS:.0%}: {', '.join(regresiones)}")
+        return None
+    return INFORME_TAMANOS
+
+def crear_paquete_deb(installer_path, cli_path=None):
+    """Crea paquete .deb para Linux"""
+    if detectar_sistema() != 'linux':
+        return None
+
+    deb_dir = preparar_estructura_deb()
+    if not deb_dir:
+        return None
+    return empaquetar_deb(deb_dir, installer_path, cli_path)
+
 def limpiar_archivos_temporales():
     """Limpia archivos temporales"""
     print("🧹 Limpiando archivos temporales...")
@@ -442,16 +1102,151 @@ def mostrar_instrucciones_optimizadas(installer_path, deb_path=None):
    Puedes moverlo a cualquier ubicación y seguirá funcionando.
 """)
 
-def main():
+def existente(ruta):
+    """La ruta si existe (artefacto de una compilación anterior), si no None"""
+    ruta = Path(ruta)
+    return ruta if ruta.exists() else None
+
+def ultimo_de_cache(etapa):
+    """Devuelve a su sitio el artefacto de 'etapa' usado más recientemente en la caché
+
+    Devuelve su ruta, o None si la caché no tiene ninguno
+    """
+    carpeta_etapa = CARPETA_CACHE / etapa
+    try:
+        # ejecutar_etapa actualiza la fecha de la entrada que reutiliza
+        entradas = sorted((c for c in carpeta_etapa.iterdir()
+                           if c.is_dir() and not c.name.startswith(".tmp")),
+                          key=lambda c: c.stat().st_mtime, reverse=True)
+    except FileNotFoundError:
+        return None
+    for carpeta in entradas:
+        try:
+            with open(carpeta / "etapa.json", 'r', encoding='utf-8') as f:
+                artefacto = Path(json.load(f)["artefacto"])
+            copiar_artefacto(carpeta / artefacto.name, artefacto)
+        except (OSError, ValueError, KeyError):
+            continue
+        print(f"♻️  {etapa}: se usa el de la última compilación ({carpeta.name[:12]})")
+        return artefacto
+    return None
+
+def anterior_de(etapa, ruta):
+    """Artefacto de una compilación anterior: en su sitio o, si ya se borró, de la caché
+
+    limpieza_final borra temp_cli/ y temp_gui/ al acabar cada compilación:
+    --only y --from los recuperan de .cache_compilacion
+    """
+    return existente(ruta) or ultimo_de_cache(etapa)
+
+def definir_etapas(sistema):
+    """Grafo de la compilación, en orden topológico"""
+    exe_cli = nombre_ejecutable_cli(sistema)
+    instalador = {"windows": "CronuxCRX_Installer.exe",
+                  "linux": "CronuxCRX_Installer"}.get(sistema, "CronuxCRX_Installer.app")
+    etapas = [
+        # La caché de etapas no se limpia
+        Etapa("limpieza", (), lambda a: limpiar_archivos() or True),
+        Etapa("icono", ("limpieza",), lambda a: crear_icono_windows() or True,
+              sistemas=("windows",)),
+        Etapa("cli", ("limpieza",), lambda a: compilar_cli_temporal(),
+              anterior=lambda: anterior_de("cli", Path("temp_cli") / exe_cli)),
+        Etapa("cli_deb", ("limpieza",), lambda a: compilar_cli_perfil(PERFIL_CLI_DEB),
+              anterior=lambda: anterior_de(f"cli_{PERFIL_CLI_DEB}",
+                                           ruta_cli_perfil(sistema, PERFIL_CLI_DEB)),
+              sistemas=("linux",)),
+        Etapa("deb_base", ("limpieza",), lambda a: preparar_estructura_deb(),
+              anterior=lambda: existente("dist/cronux-crx_1.0.0_amd64/DEBIAN/control")
+              and Path("dist/cronux-crx_1.0.0_amd64"),
+              sistemas=("linux",)),
+        Etapa("recurso", ("cli",), lambda a: embeber_cli_en_gui(a["cli"]),
+              anterior=lambda: (existente(Path("temp_gui") / CARPETA_CLI_EMBEBIDO / "crx.json")
+                                and Path("temp_gui") / CARPETA_CLI_EMBEBIDO)
+              or ultimo_de_cache("recurso")),
+        Etapa("instalador", ("recurso", "icono"),
+              lambda a: compilar_instalador_final(a["recurso"]),
+              anterior=lambda: anterior_de("instalador", Path("dist") / instalador)),
+        Etapa("deb", ("instalador", "deb_base", "cli_deb"),
+              lambda a: empaquetar_deb(a["deb_base"], a["instalador"], a["cli_deb"]),
+              anterior=lambda: existente("dist/cronux-crx_1.0.0_amd64.deb"),
+              sistemas=("linux",)),
+        Etapa("deb_cli", ("cli_deb",), lambda a: crear_paquete_deb_cli(a["cli_deb"]),
+              anterior=lambda: existente("dist/cronux-crx-cli_1.0.0_amd64.deb"),
+              sistemas=("linux",)),
+        Etapa("tamanos", (), lambda a: informe_tamanos({**anteriores(), **a}),
+              despues=ARTEFACTOS_MEDIDOS),
+        Etapa("limpieza_final", (), lambda a: limpiar_archivos_temporales() or True,
+              despues=ARTEFACTOS_MEDIDOS + ("icono", "deb_base", "tamanos")),
+    ]
+
+    def anteriores():
+        # Con --only tamanos se mide lo que dejó la compilación anterior
+        return {etapa.nombre: etapa.anterior() for etapa in etapas
+                if etapa.nombre in ARTEFACTOS_MEDIDOS and etapa.anterior
+                and not (etapa.sistemas and sistema not in etapa.sistemas)}
+
+    return etapas
+
+def main(argv=None):
     """Función principal"""
+    global USAR_CACHE, PERFIL_CLI_DEB, OPTIMIZAR_BYTECODE
+    global COMPRESION_DEB, NIVEL_DEB, BASE_TAMANOS, TOLERANCIA_TAMANOS
+    
+    parser = argparse.ArgumentParser(description="Compila el instalador de Cronux-CRX")
+    parser.add_argument("--only", help="Etapas a ejecutar, separadas por comas")
+    parser.add_argument("--from", dest="desde", help="Ejecuta esta etapa y las que dependen de ella")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="Recompila todas las etapas aunque estén en la caché")
+    parser.add_argument("--perfil-cli", choices=sorted(PERFILES_CLI), default=PERFIL_CLI_DEB,
+                        help="Perfil del CLI que lleva el .deb")
+    parser.add_argument("--optimizar", type=int, choices=(0, 1, 2), default=None,
+                        help="Nivel de optimización del bytecode (por defecto el del perfil)")
+    parser.add_argument("--solo-cli", action="store_true",
+                        help="Solo el .deb del CLI (crx en /usr/bin), sin instalador gráfico")
+    parser.add_argument("--compresion-deb", choices=COMPRESIONES_DEB, default=COMPRESION_DEB,
+                        help="Compresión de los .deb (dpkg-deb -Z)")
+    parser.add_argument("--nivel-deb", type=int, default=None,
+                        help="Nivel de compresión de los .deb (dpkg-deb -z)")
+    parser.add_argument("--base-tamanos", default=None,
+                        help="Informe de tamaños con el que comparar; falla si algo crece de más")
+    parser.add_argument("--tolerancia-tamanos", type=float, default=TOLERANCIA_TAMANOS,
+                        help="Crecimiento máximo frente a la base (0.05 = 5%%)")
+    # Solo el CLI en un archivo .pyz (no necesita PyInstaller ni PyQt5)
+    parser.add_argument("--zipapp", action="store_true", help="Empaqueta el CLI como zipapp")
+    args = parser.parse_args(argv)
+    
+    if args.zipapp:
+        return bool(compilar_zipapp())
+    USAR_CACHE = not args.sin_cache
+    PERFIL_CLI_DEB = args.perfil_cli
+    OPTIMIZAR_BYTECODE = args.optimizar
+    COMPRESION_DEB = args.compresion_deb
+    NIVEL_DEB = args.nivel_deb
+    BASE_TAMANOS = args.base_tamanos
+    TOLERANCIA_TAMANOS = args.tolerancia_tamanos
+    
     sistema = detectar_sistema()
+    etapas = definir_etapas(sistema)
+    try:
+        solo = [nombre.strip() for nombre in args.only.split(",") if nombre.strip()] if args.only else None
+        seleccion = seleccionar_etapas(etapas, solo, args.desde)
+        if args.solo_cli:
+            if sistema != 'linux':
+                raise ValueError("--solo-cli genera un .deb: solo está disponible en Linux")
+            seleccion &= ETAPAS_SOLO_CLI
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
     
     print(f"""
 🎯 CRONUX-CRX OPTIMIZED COMPILER
 ================================
 Sistema detectado: {sistema.upper()}
 Python: {sys.version.split()[0]}
-Modo: Instalador único con CLI embebido
+Modo: {'Solo CLI (.deb sin instalador gráfico)' if args.solo_cli else 'Instalador único con CLI embebido'}
+Caché de etapas: {CARPETA_CACHE if USAR_CACHE else 'desactivada (--sin-cache)'}
+Perfil del CLI para el .deb: {PERFIL_CLI_DEB} (compresión {COMPRESION_DEB})
+Etapas: {', '.join(e.nombre for e in etapas if e.nombre in seleccion)}
 """)
     
     # Verificar que existe el CLI y GUI
@@ -463,45 +1258,29 @@ Modo: Instalador único con CLI embebido
         print("❌ No se encuentra gui/cronux_gui.py")
         return False
     
-    # Verificar PyQt5
-    try:
-        import PyQt5
-        print("✅ PyQt5 detectado")
-    except ImportError:
-        print("❌ PyQt5 no disponible")
-        print("💡 Instala con: pip install PyQt5")
-        return False
-    
-    # Proceso de compilación optimizado
-    limpiar_archivos()
-    
-    # 1. Compilar CLI temporal
-    cli_path = compilar_cli_temporal()
-    if not cli_path:
-        return False
-    
-    # 2. Embeber CLI en GUI
-    gui_embedded_path = embeber_cli_en_gui(cli_path)
-    if not gui_embedded_path:
-        return False
-    
-    # 3. Compilar instalador final
-    installer_path = compilar_instalador_final(gui_embedded_path)
-    if not installer_path:
-        return False
-    
-    # 4. Crear paquete .deb para Linux
-    deb_path = None
-    if sistema == 'linux':
-        deb_path = crear_paquete_deb(installer_path)
+    # Verificar PyQt5 (solo lo necesita el instalador)
+    if "instalador" in seleccion:
+        try:
+            import PyQt5
+            print("✅ PyQt5 detectado")
+        except ImportError:
+            print("❌ PyQt5 no disponible")
+            print("💡 Instala con: pip install PyQt5")
+            return False
     
-    # 5. Limpiar archivos temporales
-    limpiar_archivos_temporales()
+    artefactos, registros, correcto = ejecutar_grafo(etapas, seleccion)
     
-    # 6. Mostrar instrucciones
-    mostrar_instrucciones_optimizadas(installer_path, deb_path)
+    if correcto and "instalador" in seleccion:
+        mostrar_instrucciones_optimizadas(artefactos["instalador"], artefactos.get("deb"))
+    if correcto and "deb_cli" in seleccion and artefactos.get("deb_cli"):
+        print(f"""
+🖥️ SOLO CLI (servidores sin entorno gráfico):
+   sudo dpkg -i {artefactos['deb_cli']}
+   crx help
+""")
+    mostrar_resumen(etapas, registros)
     
-    return True
+    return correcto
 
 if __name__ == "__main__":
     try:
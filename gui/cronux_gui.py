@@ -10,7 +10,9 @@ import threading
 import subprocess
 import shutil
 import tempfile
-import base64
+import json
+import zlib
+import hashlib
 import platform
 from pathlib import Path
 
@@ -26,8 +28,43 @@ except ImportError:
     PYQT5_AVAILABLE = False
     print("⚠️  PyQt5 no está instalado. Instala con: pip install PyQt5")
 
-# CLI embebido como base64 (se generará automáticamente durante la compilación)
-EMBEDDED_CLI_DATA = None
+# CLI embebido: recurso comprimido con su digest, que compilar_optimizado.py
+# añade al instalador en esta carpeta
+CARPETA_CLI_EMBEBIDO = "cli_embebido"
+BLOQUE_EXTRACCION = 1024 * 1024
+
+
+def embedded_cli_resource():
+    """(ruta del CLI comprimido, datos del digest) si el instalador lo incluye, o None"""
+    if not getattr(sys, 'frozen', False):
+        return None
+    carpeta = Path(sys._MEIPASS) / CARPETA_CLI_EMBEBIDO
+    try:
+        with open(carpeta / "crx.json", 'r', encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return carpeta / info["archivo"], info
+
+
+def cli_cache_dir():
+    """Carpeta de caché del usuario para el CLI extraído (no la /tmp compartida)"""
+    if sys.platform.startswith('win'):
+        base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    elif sys.platform == 'darwin':
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cronux-crx" / "instalador"
+
+
+def sha256_of_file(path):
+    """Digest SHA-256 de un archivo, leído por bloques"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(BLOQUE_EXTRACCION), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
 
 
 class InstallWorker(QThread):
@@ -466,7 +503,7 @@ class CronuxGUI(QMainWindow):
     def get_cli_executable_path(self):
         """Obtiene la ruta del ejecutable CLI (embebido o externo)"""
         # Primero intentar extraer el CLI embebido
-        if EMBEDDED_CLI_DATA:
+        if embedded_cli_resource():
             return self.extract_embedded_cli()
         
         # Fallback: buscar en el directorio actual o dist
@@ -476,28 +513,51 @@ class CronuxGUI(QMainWindow):
         return None
     
     def extract_embedded_cli(self):
-        """Extrae el CLI embebido a un archivo temporal"""
-        if not EMBEDDED_CLI_DATA:
+        """Extrae el CLI embebido a la caché del usuario
+
+        Si ya hay una copia con el mismo digest se usa tal cual; si no, se
+        descomprime por bloques a un temporal, se comprueba el digest y se
+        renombra. El binario nunca está entero en memoria.
+        """
+        recurso = embedded_cli_resource()
+        if not recurso:
             return None
+        payload, info = recurso
         
         try:
-            # Crear archivo temporal
-            temp_dir = Path(tempfile.gettempdir()) / "cronux_installer"
-            temp_dir.mkdir(exist_ok=True)
-            
-            if platform.system() == "Windows":
-                cli_path = temp_dir / "crx.exe"
-            else:
-                cli_path = temp_dir / "crx"
+            nombre = "crx.exe" if platform.system() == "Windows" else "crx"
+            carpeta = cli_cache_dir() / info["sha256"][:16]
+            cli_path = carpeta / nombre
             
-            # Decodificar y escribir el CLI
-            cli_data = base64.b64decode(EMBEDDED_CLI_DATA)
-            with open(cli_path, 'wb') as f:
-                f.write(cli_data)
+            # La copia se vuelve a hashear: el digest del nombre no basta para fiarse
+            if (cli_path.exists() and cli_path.stat().st_size == info["tamano"]
+                    and sha256_of_file(cli_path) == info["sha256"]):
+                return cli_path
             
-            # Hacer ejecutable en Unix
-            if platform.system() != "Windows":
-                cli_path.chmod(0o755)
+            carpeta.mkdir(parents=True, exist_ok=True)
+            temporal = carpeta / f".{nombre}.{os.getpid()}.tmp"
+            digest = hashlib.sha256()
+            descompresor = zlib.decompressobj()
+            try:
+                with open(payload, 'rb') as origen, open(temporal, 'wb') as destino:
+                    for bloque in iter(lambda: origen.read(BLOQUE_EXTRACCION), b""):
+                        datos = descompresor.decompress(bloque)
+                        digest.update(datos)
+                        destino.write(datos)
+                    datos = descompresor.flush()
+                    digest.update(datos)
+                    destino.write(datos)
+                
+                if digest.hexdigest() != info["sha256"]:
+                    raise ValueError("el CLI embebido está dañado (digest distinto)")
+                
+                # Hacer ejecutable en Unix
+                if platform.system() != "Windows":
+                    temporal.chmod(0o755)
+                os.replace(temporal, cli_path)
+            finally:
+                if temporal.exists():
+                    temporal.unlink()
             
             return cli_path
             
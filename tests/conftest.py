@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Los módulos del CLI se importan por nombre, como en cronux_cli.py;
+# compilar_optimizado.py está en la raíz
+sys.path.insert(0, str(RAIZ / "cli"))
+sys.path.insert(0, str(RAIZ))
+
+
+@pytest.fixture(autouse=True)
+def cache_de_raices(tmp_path_factory, monkeypatch):
+    """La caché de raíces de ubicacion (también la de los subprocesos) no sale de la carpeta temporal"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.delenv("CRONUX_DIR", raising=False)
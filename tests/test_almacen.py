@@ -0,0 +1,69 @@
+import shutil
+import zlib
+
+from cronux import Repository
+
+# Dos contenidos distintos con el mismo crc32
+A = b"contenido-849592\n"
+B = b"contenido-1200020\n"
+
+
+def nuevo(carpeta, algoritmo):
+    carpeta.mkdir()
+    return Repository.init(carpeta, carpeta.name, algoritmo)
+
+
+def test_colision_crc32():
+    assert A != B and zlib.crc32(A) == zlib.crc32(B)
+
+
+def test_crc32_no_mezcla_objetos_que_colisionan(tmp_path):
+    repo = nuevo(tmp_path / "p", "crc32")
+    (repo.root / "a.txt").write_bytes(A)
+    (repo.root / "b.txt").write_bytes(B)
+    repo.save("colision")
+
+    (repo.root / "a.txt").unlink()
+    (repo.root / "b.txt").unlink()
+    repo.restore("1.0")
+
+    assert (repo.root / "a.txt").read_bytes() == A
+    assert (repo.root / "b.txt").read_bytes() == B
+
+
+def test_crc32_push_conserva_contenidos(tmp_path):
+    repo = nuevo(tmp_path / "p", "crc32")
+    (repo.root / "a.txt").write_bytes(A)
+    (repo.root / "b.txt").write_bytes(B)
+    repo.save("colision")
+
+    repo.push(str(tmp_path / "espejo"))
+    copia = nuevo(tmp_path / "copia", "crc32")
+    copia.pull(str(tmp_path / "espejo"))
+    copia.restore("1.0")
+
+    assert (copia.root / "a.txt").read_bytes() == A
+    assert (copia.root / "b.txt").read_bytes() == B
+
+
+def test_carpetas_vacias_se_guardan_y_restauran(tmp_path):
+    repo = nuevo(tmp_path / "p", "sha256")
+    (repo.root / "vacia").mkdir()
+    (repo.root / "datos" / "sub" / "hoja").mkdir(parents=True)
+    (repo.root / "datos" / "a.txt").write_bytes(A)
+    repo.save("carpetas")
+
+    for nombre in ("vacia", "datos"):
+        shutil.rmtree(repo.root / nombre)
+    repo.restore("1.0")
+    assert (repo.root / "vacia").is_dir()
+    assert (repo.root / "datos" / "sub" / "hoja").is_dir()
+    assert (repo.root / "datos" / "a.txt").read_bytes() == A
+
+    repo.restore("1.0", into=tmp_path / "fuera")
+    assert (tmp_path / "fuera" / "vacia").is_dir()
+    assert (tmp_path / "fuera" / "datos" / "sub" / "hoja").is_dir()
+
+    shutil.rmtree(repo.root / "vacia")
+    repo.restore("1.0", paths=["vacia"])
+    assert (repo.root / "vacia").is_dir()
@@ -0,0 +1,107 @@
+import os
+import shutil
+
+import pytest
+
+from cronux import Repository
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    return tmp_path / "almacen"
+
+
+def nuevo(carpeta, almacen, **archivos):
+    carpeta.mkdir()
+    repo = Repository.init(carpeta, carpeta.name, shared_store=str(almacen))
+    for nombre, contenido in archivos.items():
+        (carpeta / nombre).write_text(contenido)
+    return repo
+
+
+def objetos(almacen):
+    carpeta = almacen / "objetos"
+    return sorted(p for p in carpeta.rglob("*")
+                  if p.is_file() and p.relative_to(carpeta).parts[0] != "tmp")
+
+
+def borrar_version(repo, numero):
+    shutil.rmtree(repo.cronux_dir / "versiones" / f"version_{numero}")
+
+
+def test_los_proyectos_comparten_el_contenido(tmp_path, almacen):
+    comun = "comun " * 1000
+    a = nuevo(tmp_path / "a", almacen, comun=comun, propio="a")
+    b = nuevo(tmp_path / "b", almacen, comun=comun, propio="b")
+    a.save("uno")
+    b.save("uno")
+
+    assert len(objetos(almacen)) == 3
+    assert not (a.cronux_dir / "objetos").exists()
+    assert a.status().object_store == almacen
+
+
+def test_prune_conserva_lo_que_usa_otro_proyecto(tmp_path, almacen):
+    a = nuevo(tmp_path / "a", almacen, comun="comun", solo_a="solo de a")
+    b = nuevo(tmp_path / "b", almacen, comun="comun")
+    a.save("uno")
+    b.save("uno")
+    (a.root / "solo_a").unlink()
+    a.save("dos")
+    antes = objetos(almacen)
+
+    borrar_version(a, "1.0")
+    resultado = a.prune(grace=0)
+
+    assert (resultado.objects, resultado.shared) == (1, True)
+    assert len(objetos(almacen)) == len(antes) - 1
+    (b.root / "comun").unlink()
+    b.restore("1.0")
+    assert (b.root / "comun").read_text() == "comun"
+
+
+def test_prune_respeta_el_margen(tmp_path, almacen):
+    a = nuevo(tmp_path / "a", almacen, x="x")
+    a.save("uno")
+    borrar_version(a, "1.0")
+
+    assert a.prune().objects == 0
+    assert len(objetos(almacen)) == 1
+
+    viejo = 1_000_000_000
+    for ruta in objetos(almacen):
+        os.utime(ruta, (viejo, viejo))
+    assert a.prune().objects == 1
+    assert objetos(almacen) == []
+
+
+def test_reutilizar_un_objeto_renueva_su_margen(tmp_path, almacen):
+    a = nuevo(tmp_path / "a", almacen, x="mismo")
+    a.save("uno")
+    viejo = 1_000_000_000
+    for ruta in objetos(almacen):
+        os.utime(ruta, (viejo, viejo))
+    borrar_version(a, "1.0")
+
+    # Otro proyecto guarda el mismo contenido mientras nadie lo referencia
+    b = nuevo(tmp_path / "b", almacen, y="mismo")
+    b.save("uno")
+    borrar_version(b, "1.0")
+
+    assert a.prune().objects == 0
+
+
+def test_prune_de_un_proyecto_propio(tmp_path):
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    repo = Repository.init(raiz, "p")
+    (raiz / "a").write_text("a")
+    repo.save("uno")
+    (raiz / "a").write_text("b")
+    repo.save("dos")
+    borrar_version(repo, "1.0")
+
+    resultado = repo.prune(grace=0)
+    assert (resultado.objects, resultado.shared) == (1, False)
+    repo.restore("1.1")
+    assert (raiz / "a").read_text() == "b"
@@ -0,0 +1,70 @@
+import pytest
+
+import cronux
+from cronux import (Repository, NotARepositoryError, RepositoryExistsError,
+                    VersionNotFoundError)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    return Repository.init(raiz, "p", author="ana")
+
+
+def test_guardar_listar_y_comparar(repo):
+    (repo.root / "a.txt").write_text("uno")
+    (repo.root / "src").mkdir()
+    (repo.root / "src" / "b.py").write_text("print()")
+    primera = repo.save("primera")
+    assert (primera.version, primera.message, primera.files) == ("1.0", "primera", 2)
+    assert repo.next_version() == "1.1"
+
+    (repo.root / "a.txt").write_text("dos!")
+    (repo.root / "c.txt").write_text("nuevo")
+    (repo.root / "src" / "b.py").unlink()
+    cambios = repo.diff()
+    assert (cambios.base, cambios.target) == ("1.0", None)
+    assert (cambios.added, cambios.modified, cambios.deleted) == (["c.txt"], ["a.txt"], ["src/b.py"])
+    assert not cambios.clean
+
+    repo.save("segunda")
+    assert repo.diff().clean
+    entre = repo.diff("1.0", "1.1")
+    assert (entre.added, entre.modified, entre.deleted) == (["c.txt"], ["a.txt"], ["src/b.py"])
+
+    assert [(v.number, v.message) for v in repo.log()] == [("1.1", "segunda"), ("1.0", "primera")]
+    assert repo.version("v1.0").files == 2
+    assert repo.files("1.0") == ["a.txt", "src/b.py"]
+    assert repo.files("1.0", ["src"]) == ["src/b.py"]
+
+    estado = repo.status()
+    assert (estado.name, estado.author, estado.versions, estado.last_version) == ("p", "ana", 2, "1.1")
+
+
+def test_errores_tipados(repo, tmp_path):
+    with pytest.raises(RepositoryExistsError):
+        Repository.init(repo.root, "otra vez")
+    with pytest.raises(NotARepositoryError):
+        Repository(tmp_path)
+    with pytest.raises(VersionNotFoundError):
+        repo.restore("7.0")
+    assert issubclass(VersionNotFoundError, cronux.CronuxError)
+
+
+def test_abrir_desde_una_subcarpeta(repo, monkeypatch):
+    (repo.root / "a" / "b").mkdir(parents=True)
+    monkeypatch.chdir(repo.root / "a" / "b")
+    abierto = cronux.abrir()
+    assert abierto.root == repo.root
+    # Se reutiliza el mismo objeto (y sus cachés)
+    assert cronux.abrir(repo.root) is abierto
+
+
+def test_un_objeto_sigue_a_los_cambios_de_otro(repo):
+    otro = Repository(repo.root)
+    (repo.root / "a.txt").write_text("uno")
+    assert otro.log() == []
+    repo.save("desde el primero")
+    assert [v.message for v in otro.log()] == ["desde el primero"]
+    assert otro.next_version() == "1.1"
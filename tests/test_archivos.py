@@ -0,0 +1,194 @@
+import contextlib
+import hashlib
+import io
+import os
+import threading
+import zlib
+
+import pytest
+
+import archivos
+import perfil
+from cronux import Repository
+
+
+def _carpeta(ruta):
+    ruta.mkdir()
+    return ruta
+
+
+@pytest.mark.parametrize("algoritmo", sorted(archivos.ALGORITMOS_HASH))
+def test_hash_en_arbol_igual_con_y_sin_mmap(tmp_path, monkeypatch, algoritmo):
+    monkeypatch.setattr(archivos, "TAMANO_HOJA", 4096)
+    monkeypatch.setattr(archivos, "UMBRAL_ARBOL", 8192)
+    ruta = tmp_path / "grande.bin"
+    ruta.write_bytes(os.urandom(3 * 4096 + 100))
+
+    con_mmap = archivos.hashear_archivo(ruta, algoritmo, usar_mmap=True)
+    sin_mmap = archivos.hashear_archivo(ruta, algoritmo, usar_mmap=False)
+    flujo = archivos.nuevo_hash_contenido(algoritmo, ruta.stat().st_size)
+    flujo.update(ruta.read_bytes())
+
+    assert con_mmap == sin_mmap == flujo.hexdigest()
+
+
+def test_sin_mmap_no_mapea_archivos_grandes(tmp_path, monkeypatch):
+    monkeypatch.setattr(archivos, "TAMANO_HOJA", 4096)
+    monkeypatch.setattr(archivos, "UMBRAL_ARBOL", 8192)
+    ruta = tmp_path / "grande.bin"
+    ruta.write_bytes(os.urandom(3 * 4096))
+
+    def prohibido(*_):
+        raise AssertionError("usar_mmap=False no debe mapear el archivo")
+
+    monkeypatch.setattr(archivos, "_mapear", prohibido)
+    archivos.hashear_archivo(ruta, usar_mmap=False)
+
+
+def _leer_todo(fd, partes):
+    while True:
+        datos = os.read(fd, 65536)
+        if not datos:
+            break
+        partes.append(datos)
+
+
+@pytest.mark.parametrize("con_sendfile", [True, False])
+def test_volcar_espera_a_un_destino_no_bloqueante(tmp_path, monkeypatch, con_sendfile):
+    if not con_sendfile:
+        monkeypatch.delattr(os, "sendfile", raising=False)
+    contenido = os.urandom(1024 * 1024 + 17)
+    ruta = tmp_path / "origen.bin"
+    ruta.write_bytes(contenido)
+
+    lectura, escritura = os.pipe()
+    os.set_blocking(escritura, False)
+    partes = []
+    lector = threading.Thread(target=_leer_todo, args=(lectura, partes))
+    lector.start()
+    try:
+        # FileIO sin buffer devuelve None cuando la tubería está llena
+        with open(ruta, "rb") as origen, open(escritura, "wb", buffering=0) as destino:
+            escritos = archivos.volcar(origen, destino)
+    finally:
+        lector.join()
+        os.close(lectura)
+
+    assert escritos == len(contenido)
+    assert b"".join(partes) == contenido
+
+
+class _DestinoLleno:
+    def __init__(self, resultado):
+        self.resultado = resultado
+
+    def write(self, datos):
+        return self.resultado
+
+
+@pytest.mark.parametrize("resultado, error", [(None, BlockingIOError), (0, OSError)])
+def test_volcar_no_se_queda_en_bucle_si_no_se_escribe_nada(tmp_path, resultado, error):
+    ruta = tmp_path / "origen.bin"
+    ruta.write_bytes(b"x" * 100)
+    with open(ruta, "rb") as origen, pytest.raises(error):
+        archivos.volcar(origen, _DestinoLleno(resultado))
+
+
+def test_restaurar_rutas_no_anida_fases(tmp_path, monkeypatch):
+    repo = Repository.init(_carpeta(tmp_path / "p"), "p")
+    (repo.root / "a.txt").write_bytes(os.urandom(5000))
+    repo.save("uno")
+
+    abiertas = []
+    anidadas = []
+    fase_original = perfil.fase
+
+    @contextlib.contextmanager
+    def fase(nombre):
+        if abiertas:
+            anidadas.append((abiertas[-1], nombre))
+        abiertas.append(nombre)
+        try:
+            with fase_original(nombre):
+                yield
+        finally:
+            abiertas.pop()
+
+    monkeypatch.setattr(perfil, "fase", fase)
+    perfil.iniciar(mostrar=False)
+    try:
+        repo.restore("1.0", paths=["a.txt"])
+    finally:
+        datos = perfil.finalizar()
+
+    assert anidadas == []
+    assert datos["fases"]["write"]["llamadas"] >= 1
+
+
+@pytest.mark.parametrize("tamano", [0, 100, 3 * 4096 + 5, 5 * 4096])
+def test_copiar_archivo_copia_y_hashea_por_cada_ruta(tmp_path, monkeypatch, tamano):
+    # Con estos umbrales 100 va por buffer, 3*4096+5 por mmap y 5*4096 por árbol
+    monkeypatch.setattr(archivos, "UMBRAL_MMAP", 4096)
+    monkeypatch.setattr(archivos, "TAMANO_HOJA", 4096)
+    monkeypatch.setattr(archivos, "UMBRAL_ARBOL", 4 * 4096)
+    origen = tmp_path / "origen.bin"
+    origen.write_bytes(os.urandom(tamano))
+    os.chmod(origen, 0o640)
+    destino = tmp_path / "destino.bin"
+
+    valor = archivos.copiar_archivo(origen, destino)
+
+    assert destino.read_bytes() == origen.read_bytes()
+    assert valor == archivos.hashear_archivo(origen, usar_mmap=False)
+    assert destino.stat().st_mode & 0o777 == 0o640
+    assert destino.stat().st_mtime_ns == origen.stat().st_mtime_ns
+
+
+def test_volcar_copia_un_rango(tmp_path):
+    ruta = tmp_path / "origen.bin"
+    ruta.write_bytes(bytes(range(256)) * 10)
+    destino = io.BytesIO()
+    with open(ruta, "rb") as origen:
+        assert archivos.volcar(origen, destino, 250, 20) == 20
+        assert archivos.volcar(origen, destino, 2555, 100) == 5
+    assert destino.getvalue() == (bytes(range(250, 256)) + bytes(range(14))
+                                  + bytes(range(251, 256)))
+
+
+def test_algoritmos_coinciden_con_sus_referencias(tmp_path):
+    datos = os.urandom(10000)
+    ruta = tmp_path / "a.bin"
+    ruta.write_bytes(datos)
+
+    assert archivos.hashear_archivo(ruta, "sha256") == hashlib.sha256(datos).hexdigest()
+    assert (archivos.hashear_archivo(ruta, "blake2b")
+            == hashlib.blake2b(datos, digest_size=32).hexdigest())
+    assert archivos.hashear_archivo(ruta, "crc32") == f"{zlib.crc32(datos):08x}"
+
+
+def test_algoritmo_desconocido():
+    with pytest.raises(ValueError, match="desconocido"):
+        archivos.nuevo_hash("md4")
+
+
+def test_algoritmo_objetos_solo_admite_criptograficos():
+    assert archivos.algoritmo_objetos("blake2b") == "blake2b"
+    assert archivos.algoritmo_objetos("crc32") == archivos.ALGORITMO_POR_DEFECTO
+
+
+@pytest.mark.parametrize("algoritmo", sorted(archivos.ALGORITMOS_HASH))
+def test_proyecto_guarda_y_restaura_con_cada_algoritmo(tmp_path, algoritmo):
+    repo = Repository.init(_carpeta(tmp_path / "p"), "p", algoritmo)
+    (repo.root / "a.txt").write_bytes(b"uno")
+    repo.save("uno")
+    (repo.root / "a.txt").write_bytes(b"dos")
+
+    assert Repository(repo.root).hash_algorithm == algoritmo
+    assert repo.diff().modified == ["a.txt"]
+    repo.restore("1.0")
+    assert (repo.root / "a.txt").read_bytes() == b"uno"
+
+
+def test_proyecto_con_algoritmo_desconocido(tmp_path):
+    with pytest.raises(ValueError, match="desconocido"):
+        Repository.init(_carpeta(tmp_path / "p"), "p", "md4")
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+from pathlib import Path
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+
+def importados(*argumentos, carpeta=None):
+    proceso = subprocess.run([sys.executable, "-X", "importtime", str(CLI), *argumentos],
+                             cwd=carpeta, capture_output=True, text=True)
+    return {linea.rsplit("|", 1)[-1].strip() for linea in proceso.stderr.splitlines()}
+
+
+def test_help_no_carga_los_modulos_de_los_comandos(tmp_path):
+    modulos = importados("help", carpeta=tmp_path)
+    assert "despachador" in modulos
+    assert not modulos & {"cronux", "perfil", "hashlib", "shutil", "datetime", "pathlib", "json"}
+
+
+def test_status_no_carga_los_modulos_de_guardado(tmp_path):
+    subprocess.run([sys.executable, str(CLI), "new", "p"], cwd=tmp_path, check=True,
+                   capture_output=True)
+    modulos = importados("status", carpeta=tmp_path)
+    assert "cronux" in modulos
+    assert not modulos & {"archivos", "almacen", "hashlib", "shutil", "sqlite3"}
@@ -0,0 +1,48 @@
+from benchmarks import escenarios
+from benchmarks.generar_arbol import generar_arbol
+
+
+def _contenido(raiz):
+    return {str(r.relative_to(raiz)): r.read_bytes() for r in sorted(raiz.rglob("*")) if r.is_file()}
+
+
+def test_arbol_sintetico_determinista(tmp_path):
+    resumen = generar_arbol(tmp_path / "a", semilla=7, escala=0.01)
+    generar_arbol(tmp_path / "b", semilla=7, escala=0.01)
+    generar_arbol(tmp_path / "c", semilla=8, escala=0.01)
+
+    a = _contenido(tmp_path / "a")
+    assert a == _contenido(tmp_path / "b")
+    assert a != _contenido(tmp_path / "c")
+    assert resumen == {"archivos": len(a), "bytes": sum(len(d) for d in a.values())}
+
+
+def _resultados(**medianas):
+    return {
+        "parametros": {"escala": 1.0},
+        "escenarios": {nombre: {"mediana": m} for nombre, m in medianas.items()}
+    }
+
+
+def test_comparar_detecta_regresiones(capsys):
+    base = _resultados(primer_guardado=1.0, log_muchas_versiones=0.5)
+    actual = _resultados(primer_guardado=1.05, log_muchas_versiones=0.6, status_muchas_versiones=0.1)
+
+    assert escenarios.comparar(actual, base, 0.10) == ["log_muchas_versiones"]
+    salida = capsys.readouterr().out
+    assert "REGRESIÓN" in salida and "nuevo" in salida
+
+
+def test_suite_mide_escenarios_reducidos(tmp_path, capsys):
+    args = escenarios.argparse.Namespace(
+        escenarios="guardado_edicion_pequena,restaurar_lejana,log_grep_muchas_versiones",
+        semilla=42, escala=0.005, repeticiones=2, historial=3, versiones=30,
+        crx=None, directorio=str(tmp_path)
+    )
+    resultados = escenarios.ejecutar(args)
+
+    assert list(resultados["escenarios"]) == args.escenarios.split(",")
+    for datos in resultados["escenarios"].values():
+        assert len(datos["muestras"]) == 2
+        assert datos["minimo"] <= datos["mediana"] <= datos["maximo"]
+    assert resultados["parametros"]["versiones"] == 30
@@ -0,0 +1,70 @@
+import io
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cronux import Repository, PathNotFoundError
+from ver_archivo import interpretar_rango
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+CONTENIDO = os.urandom(3 * 1024 * 1024 + 11)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    raiz = tmp_path / "p"
+    (raiz / "datos").mkdir(parents=True)
+    repo = Repository.init(raiz, "p")
+    (raiz / "datos" / "grande.bin").write_bytes(CONTENIDO)
+    repo.save("uno")
+    (raiz / "datos" / "grande.bin").write_bytes(b"otro")
+    return repo
+
+
+def test_cat_completo_y_por_rangos(repo):
+    salida = io.BytesIO()
+    assert repo.cat("1.0", "datos/grande.bin", salida) == len(CONTENIDO)
+    assert salida.getvalue() == CONTENIDO
+
+    for inicio, longitud in [(0, 10), (1024 * 1024 - 3, 7), (len(CONTENIDO) - 5, 100),
+                             (len(CONTENIDO) + 1, 10), (5, None)]:
+        salida = io.BytesIO()
+        repo.cat("1.0", "datos/grande.bin", salida, inicio, longitud)
+        fin = None if longitud is None else inicio + longitud
+        assert salida.getvalue() == CONTENIDO[inicio:fin]
+
+
+def test_cat_a_un_descriptor(repo, tmp_path):
+    ruta = tmp_path / "copia.bin"
+    with open(ruta, "wb") as f:
+        repo.cat("1.0", "datos/grande.bin", f.fileno(), 100, 1000)
+    assert ruta.read_bytes() == CONTENIDO[100:1100]
+
+
+@pytest.mark.parametrize("ruta", ["no/existe", "metadatos.json", "datos"])
+def test_cat_de_algo_que_no_es_un_archivo_de_la_version(repo, ruta):
+    with pytest.raises(PathNotFoundError):
+        repo.cat("1.0", ruta, io.BytesIO())
+
+
+def test_interpretar_rango():
+    assert interpretar_rango("10:20") == (10, 20)
+    assert interpretar_rango("100:") == (100, None)
+    assert interpretar_rango(":5") == (0, 5)
+    for invalido in ("10", "a:b", "-1:5"):
+        with pytest.raises(ValueError):
+            interpretar_rango(invalido)
+
+
+def test_crx_cat_escribe_en_stdout(repo):
+    proceso = subprocess.run([sys.executable, str(CLI), "cat", "1.0", "grande.bin", "--range", "7:9"],
+                             cwd=repo.root / "datos", capture_output=True, check=True)
+    assert proceso.stdout == CONTENIDO[7:16]
+
+    proceso = subprocess.run([sys.executable, str(CLI), "cat", "1.0", "nada"], cwd=repo.root,
+                             capture_output=True, text=True)
+    assert proceso.returncode == 1
+    assert proceso.stdout == "" and "nada" in proceso.stderr
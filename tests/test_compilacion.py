@@ -0,0 +1,601 @@
+import shutil
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import compilar_optimizado as compilacion
+
+
+@pytest.fixture
+def en_carpeta(tmp_path, monkeypatch):
+    """Compilación en una carpeta vacía, con su propia caché"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(compilacion, "CARPETA_CACHE", Path(".cache_compilacion"))
+    monkeypatch.setattr(compilacion, "ESTADOS_CACHE", {})
+    monkeypatch.setattr(compilacion, "USAR_CACHE", True)
+    return tmp_path
+
+
+def etapa(etapas, nombre):
+    return next(e for e in etapas if e.nombre == nombre)
+
+
+def test_anterior_sale_de_la_cache_tras_limpieza_final(en_carpeta):
+    recurso = Path("temp_gui") / compilacion.CARPETA_CLI_EMBEBIDO
+    recurso.mkdir(parents=True)
+    (recurso / "crx.json").write_text("{}")
+    (recurso / "crx.z").write_bytes(b"z")
+    compilacion.guardar_en_cache("recurso", "clave", recurso)
+    compilacion.limpiar_archivos_temporales()
+    assert not recurso.exists()
+
+    etapas = compilacion.definir_etapas("linux")
+    assert etapa(etapas, "recurso").anterior() == recurso
+    assert (recurso / "crx.z").read_bytes() == b"z"
+
+
+def test_anterior_usa_la_entrada_mas_reciente(en_carpeta):
+    import os
+    cli = Path("temp_cli") / "crx"
+    cli.parent.mkdir()
+    for numero, clave in enumerate(("vieja", "nueva")):
+        cli.write_text(clave)
+        compilacion.guardar_en_cache("cli", clave, cli)
+        fecha = 1_000_000 + numero
+        os.utime(compilacion.CARPETA_CACHE / "cli" / clave, (fecha, fecha))
+    cli.unlink()
+
+    assert etapa(compilacion.definir_etapas("linux"), "cli").anterior() == cli
+    assert cli.read_text() == "nueva"
+
+
+def test_anterior_sin_cache_ni_artefacto(en_carpeta):
+    assert etapa(compilacion.definir_etapas("linux"), "instalador").anterior() is None
+
+
+def test_zipapp_ejecuta_el_cli(en_carpeta):
+    shutil.copytree(Path(compilacion.__file__).parent / "cli", "cli",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    pyz = compilacion.compilar_zipapp()
+    assert pyz == Path("dist") / "crx.pyz"
+    assert not Path("temp_zipapp").exists()
+
+    with zipfile.ZipFile(pyz) as zf:
+        nombres = set(zf.namelist())
+    assert {"__main__.py", "cronux_cli.py", "cronux_cli.pyc"} <= nombres
+
+    proyecto = en_carpeta / "proyecto"
+    proyecto.mkdir()
+    (proyecto / "a.txt").write_text("hola")
+    for argumentos in (["new", "p"], ["save", "-m", "uno"]):
+        subprocess.run([sys.executable, str(en_carpeta / pyz), *argumentos],
+                       cwd=proyecto, check=True, capture_output=True)
+    salida = subprocess.run([sys.executable, str(en_carpeta / pyz), "log"], cwd=proyecto,
+                            check=True, capture_output=True, text=True).stdout
+    assert "uno" in salida
+
+
+def cli_falso(ruta, tamano):
+    """Un 'binario' de varios bloques que no se comprime del todo"""
+    import random
+    aleatorio = random.Random(tamano)
+    datos = bytes(aleatorio.getrandbits(8) for _ in range(tamano // 2)) + b"crx" * (tamano // 6)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_bytes(datos)
+    return datos
+
+
+def test_recurso_del_cli_comprimido_con_digest(en_carpeta, monkeypatch):
+    import hashlib
+    import json
+    import zlib
+    monkeypatch.setattr(compilacion, "BLOQUE_CLI", 4096)
+    cli = Path("temp_cli") / "crx"
+    datos = cli_falso(cli, 50_000)
+
+    recurso = compilacion.embeber_cli_en_gui(cli)
+    assert recurso == Path("temp_gui") / compilacion.CARPETA_CLI_EMBEBIDO
+    assert sorted(p.name for p in recurso.iterdir()) == ["crx.json", "crx.z"]
+    info = json.loads((recurso / "crx.json").read_text())
+    assert info == {"archivo": "crx.z", "compresion": "zlib",
+                    "sha256": hashlib.sha256(datos).hexdigest(), "tamano": len(datos)}
+    comprimido = (recurso / "crx.z").read_bytes()
+    assert zlib.decompress(comprimido) == datos
+    assert len(comprimido) < len(datos)
+    # Ya no se genera un .py con el binario en base64
+    assert not list(en_carpeta.rglob("*.py"))
+
+
+def test_recurso_del_cli_sale_de_la_cache(en_carpeta, monkeypatch):
+    cli = Path("temp_cli") / "crx"
+    cli_falso(cli, 10_000)
+    recurso = compilacion.embeber_cli_en_gui(cli)
+    original = (recurso / "crx.z").read_bytes()
+    shutil.rmtree(recurso)
+
+    monkeypatch.setattr(compilacion, "comprimir_cli",
+                        lambda *a: pytest.fail("se volvió a comprimir el mismo CLI"))
+    assert compilacion.embeber_cli_en_gui(cli) == recurso
+    assert compilacion.ESTADOS_CACHE["recurso"] == "caché"
+    assert (recurso / "crx.z").read_bytes() == original
+
+
+def test_comprimir_cli_inexistente(en_carpeta):
+    assert compilacion.comprimir_cli(Path("no-existe"), Path("temp_gui") / "r") is None
+
+
+def test_el_instalador_extrae_el_cli_una_vez(en_carpeta, monkeypatch):
+    pytest.importorskip("PyQt5")
+    monkeypatch.syspath_prepend(str(Path(compilacion.__file__).parent / "gui"))
+    import cronux_gui
+
+    cli = Path("temp_cli") / "crx"
+    datos = cli_falso(cli, 30_000)
+    recurso = compilacion.comprimir_cli(cli, Path("meipass") / compilacion.CARPETA_CLI_EMBEBIDO)
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "_MEIPASS", str(recurso.parent), raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(en_carpeta / "cache"))
+    monkeypatch.setattr(cronux_gui, "BLOQUE_EXTRACCION", 1000)
+
+    extraido = cronux_gui.CronuxGUI.extract_embedded_cli(None)
+    assert extraido.read_bytes() == datos
+    assert not [p for p in extraido.parent.iterdir() if p.name.endswith(".tmp")]
+
+    # Una copia dañada se vuelve a extraer
+    extraido.write_bytes(b"x" * len(datos))
+    assert cronux_gui.CronuxGUI.extract_embedded_cli(None).read_bytes() == datos
+
+    # Con la copia intacta no se descomprime nada
+    monkeypatch.setattr(cronux_gui.zlib, "decompressobj",
+                        lambda: pytest.fail("se volvió a extraer"))
+    assert cronux_gui.CronuxGUI.extract_embedded_cli(None) == extraido
+
+
+def test_clave_de_etapa_sigue_a_sus_entradas(en_carpeta):
+    fuentes = Path("cli")
+    (fuentes / "__pycache__").mkdir(parents=True)
+    (fuentes / "a.py").write_text("a")
+    clave = compilacion.clave_etapa("cli", [fuentes, "assets/icono.png"], ["--onefile"])
+    assert clave == compilacion.clave_etapa("cli", [fuentes, "assets/icono.png"], ["--onefile"])
+
+    # El bytecode no cuenta
+    (fuentes / "__pycache__" / "a.cpython.pyc").write_bytes(b"x")
+    (fuentes / "b.pyc").write_bytes(b"x")
+    assert compilacion.clave_etapa("cli", [fuentes, "assets/icono.png"], ["--onefile"]) == clave
+
+    otras = [
+        compilacion.clave_etapa("instalador", [fuentes, "assets/icono.png"], ["--onefile"]),
+        compilacion.clave_etapa("cli", [fuentes, "assets/icono.png"], ["--onedir"]),
+    ]
+    Path("assets").mkdir()
+    Path("assets/icono.png").write_bytes(b"")
+    otras.append(compilacion.clave_etapa("cli", [fuentes, "assets/icono.png"], ["--onefile"]))
+    (fuentes / "a.py").write_text("b")
+    otras.append(compilacion.clave_etapa("cli", [fuentes, "assets/icono.png"], ["--onefile"]))
+    (fuentes / "a.py").rename(fuentes / "c.py")
+    otras.append(compilacion.clave_etapa("cli", [fuentes, "assets/icono.png"], ["--onefile"]))
+    assert len({clave, *otras}) == 1 + len(otras)
+
+
+def test_etapa_sin_cambios_reutiliza_el_artefacto(en_carpeta, capsys):
+    Path("fuente.txt").write_text("uno")
+    producidas = []
+
+    def producir():
+        producidas.append(1)
+        Path("dist").mkdir(exist_ok=True)
+        Path("dist/artefacto").write_text(f"compilado {len(producidas)}")
+        return Path("dist/artefacto")
+
+    assert compilacion.ejecutar_etapa("cli", ["fuente.txt"], [], producir) == Path("dist/artefacto")
+    assert "cli" not in compilacion.ESTADOS_CACHE
+    shutil.rmtree("dist")
+
+    assert compilacion.ejecutar_etapa("cli", ["fuente.txt"], [], producir) == Path("dist/artefacto")
+    assert len(producidas) == 1
+    assert Path("dist/artefacto").read_text() == "compilado 1"
+    assert compilacion.ESTADOS_CACHE["cli"] == "caché"
+    assert "reutilizado de la caché" in capsys.readouterr().out
+
+    # Una entrada cambia la clave; --sin-cache no la consulta
+    Path("fuente.txt").write_text("dos")
+    compilacion.ejecutar_etapa("cli", ["fuente.txt"], [], producir)
+    assert len(producidas) == 2
+    compilacion.USAR_CACHE = False
+    compilacion.ejecutar_etapa("cli", ["fuente.txt"], [], producir)
+    assert len(producidas) == 3
+
+
+def test_una_etapa_fallida_no_entra_en_la_cache(en_carpeta):
+    assert compilacion.ejecutar_etapa("cli", [], [], lambda: None) is None
+    assert not (compilacion.CARPETA_CACHE / "cli").exists()
+
+
+def test_entrada_de_cache_danada_se_recompila(en_carpeta):
+    artefacto = Path("dist/crx")
+    artefacto.parent.mkdir()
+    artefacto.write_text("bueno")
+    clave = compilacion.clave_etapa("cli", [], [])
+    compilacion.guardar_en_cache("cli", clave, artefacto)
+    (compilacion.CARPETA_CACHE / "cli" / clave / "etapa.json").write_text("{")
+
+    def producir():
+        artefacto.write_text("nuevo")
+        return artefacto
+    assert compilacion.ejecutar_etapa("cli", [], [], producir) == artefacto
+    assert artefacto.read_text() == "nuevo"
+    assert "cli" not in compilacion.ESTADOS_CACHE
+
+
+def test_la_cache_guarda_carpetas_y_solo_las_entradas_recientes(en_carpeta):
+    import os
+    app = Path("dist/Cronux.app")
+    (app / "Contents").mkdir(parents=True)
+    (app / "Contents" / "Info.plist").write_text("plist")
+    for numero in range(compilacion.ENTRADAS_CACHE_POR_ETAPA + 2):
+        compilacion.guardar_en_cache("instalador", f"clave{numero}", app)
+        fecha = 1_000_000 + numero
+        os.utime(compilacion.CARPETA_CACHE / "instalador" / f"clave{numero}", (fecha, fecha))
+
+    guardadas = sorted(c.name for c in (compilacion.CARPETA_CACHE / "instalador").iterdir())
+    assert len(guardadas) == compilacion.ENTRADAS_CACHE_POR_ETAPA
+    assert "clave0" not in guardadas and "clave1" not in guardadas
+    ultima = compilacion.CARPETA_CACHE / "instalador" / guardadas[-1]
+    assert (ultima / "Cronux.app" / "Contents" / "Info.plist").read_text() == "plist"
+
+
+def grafo(ejecutar, **anteriores):
+    """limpieza → (a, b en paralelo) → c, y d detrás de todo sin depender de nada"""
+    def etapa_(nombre, dependencias, despues=(), sistemas=()):
+        return compilacion.Etapa(nombre, dependencias, lambda a: ejecutar(nombre, a),
+                                 anterior=anteriores.get(nombre), sistemas=sistemas, despues=despues)
+    return [
+        etapa_("limpieza", ()),
+        etapa_("a", ("limpieza",)),
+        etapa_("b", ("limpieza",)),
+        etapa_("otro_sistema", ("limpieza",), sistemas=("plan9",)),
+        etapa_("c", ("a", "b")),
+        etapa_("d", (), despues=("c",)),
+    ]
+
+
+def test_seleccion_de_etapas():
+    etapas = grafo(lambda nombre, a: True)
+    todas = {e.nombre for e in etapas}
+    assert compilacion.seleccionar_etapas(etapas) == todas
+    assert compilacion.seleccionar_etapas(etapas, solo=["b", "d"]) == {"b", "d"}
+    # --from sigue las dependencias y también las etapas que van 'despues'
+    assert compilacion.seleccionar_etapas(etapas, desde="a") == {"a", "c", "d"}
+    assert compilacion.seleccionar_etapas(etapas, desde="c") == {"c", "d"}
+    assert compilacion.seleccionar_etapas(etapas, desde="limpieza") == todas
+    with pytest.raises(ValueError, match="Etapas desconocidas: x, y"):
+        compilacion.seleccionar_etapas(etapas, solo=["a", "x"], desde="y")
+
+
+def test_el_grafo_respeta_dependencias_y_paraleliza():
+    import threading
+    # a y b solo pasan la barrera si se ejecutan a la vez
+    barrera = threading.Barrier(2, timeout=10)
+    orden = []
+    candado = threading.Lock()
+
+    def ejecutar(nombre, disponibles):
+        if nombre in ("a", "b"):
+            barrera.wait()
+        with candado:
+            orden.append((nombre, sorted(disponibles)))
+        return f"artefacto {nombre}"
+
+    etapas = grafo(ejecutar)
+    artefactos, registros, correcto = compilacion.ejecutar_grafo(
+        etapas, compilacion.seleccionar_etapas(etapas))
+    assert correcto
+    nombres = [nombre for nombre, _ in orden]
+    assert nombres[0] == "limpieza" and set(nombres[1:3]) == {"a", "b"}
+    assert nombres[3:] == ["c", "d"]
+    assert dict(orden)["c"] == ["a", "b", "limpieza", "otro_sistema"]
+    assert artefactos["c"] == "artefacto c" and artefactos["otro_sistema"] is None
+    assert registros["otro_sistema"].estado == "no aplica"
+    assert all(registros[n].estado == "ok" for n in nombres)
+    assert registros["c"].inicio >= max(registros["a"].fin, registros["b"].fin)
+
+
+def test_el_grafo_se_detiene_al_fallar_una_etapa(capsys):
+    def ejecutar(nombre, disponibles):
+        if nombre == "b":
+            raise RuntimeError("sin PyInstaller")
+        return True
+
+    etapas = grafo(ejecutar)
+    artefactos, registros, correcto = compilacion.ejecutar_grafo(
+        etapas, compilacion.seleccionar_etapas(etapas))
+    assert not correcto
+    assert registros["b"].estado == "error"
+    assert registros["a"].estado == "ok"
+    assert registros["c"].estado == registros["d"].estado == "omitida"
+    assert "Error en la etapa b: sin PyInstaller" in capsys.readouterr().out
+
+
+def test_only_usa_los_artefactos_anteriores(capsys):
+    recibidos = {}
+
+    def ejecutar(nombre, disponibles):
+        recibidos[nombre] = dict(disponibles)
+        return True
+
+    etapas = grafo(ejecutar, a=lambda: "a de antes", b=lambda: "b de antes")
+    _, registros, correcto = compilacion.ejecutar_grafo(etapas, {"c"})
+    assert correcto
+    assert set(recibidos) == {"c"}
+    assert recibidos["c"]["a"] == "a de antes" and recibidos["c"]["b"] == "b de antes"
+    assert registros["a"].estado == "anterior"
+
+    # Sin artefacto anterior no se ejecuta nada
+    recibidos.clear()
+    etapas = grafo(ejecutar, a=lambda: None, b=lambda: "b de antes")
+    _, _, correcto = compilacion.ejecutar_grafo(etapas, {"c"})
+    assert not correcto and not recibidos
+    assert "usa --from a" in capsys.readouterr().out
+
+
+def test_ruta_critica_y_resumen(capsys):
+    etapas = grafo(lambda nombre, a: True)
+    registros = {
+        "limpieza": compilacion.Registro(0.0, 1.0, "ok"),
+        "a": compilacion.Registro(1.0, 2.0, "caché"),
+        "b": compilacion.Registro(1.0, 5.0, "ok", espera=2.0),
+        "otro_sistema": compilacion.Registro(0.0, 0.0, "no aplica"),
+        "c": compilacion.Registro(5.0, 6.0, "ok"),
+        "d": compilacion.Registro(6.0, 6.5, "ok"),
+    }
+    cadena, segundos = compilacion.ruta_critica(etapas, registros)
+    assert cadena == ["limpieza", "b", "c", "d"]
+    assert segundos == pytest.approx(6.5)
+    assert compilacion.ruta_critica(etapas, {}) == ([], 0.0)
+
+    compilacion.mostrar_resumen(etapas, registros)
+    salida = capsys.readouterr().out
+    assert "Total: 6.50 s de reloj (7.50 s sumando etapas)" in salida
+    assert "Ruta crítica: limpieza → b → c → d (6.50 s)" in salida
+    assert "(2.00s esperando PyInstaller)" in salida
+    assert "no aplica" in salida and "caché" in salida
+
+
+def test_main_rechaza_etapas_desconocidas(en_carpeta, capsys):
+    assert compilacion.main(["--only", "cli,noexiste"]) is False
+    assert "Etapas desconocidas: noexiste" in capsys.readouterr().out
+
+
+BENCH_ARRANQUE = Path(compilacion.__file__).parent / "benchmarks" / "bench_arranque_binario.py"
+
+
+def test_comando_de_cada_perfil(monkeypatch):
+    portable = compilacion.comando_cli("linux", "portable", Path("d"), Path("w"))
+    assert portable[0] == "pyinstaller"
+    assert "--onefile" in portable and "--exclude-module" not in portable
+    assert portable[-1] == "--strip"
+
+    rapido = compilacion.comando_cli("linux", "rapido", Path("d"), Path("w"))
+    assert rapido[:4] == [sys.executable, "-OO", "-m", "PyInstaller"]
+    assert "--onedir" in rapido
+    excluidos = [rapido[i + 1] for i, opcion in enumerate(rapido) if opcion == "--exclude-module"]
+    assert excluidos == compilacion.MODULOS_EXCLUIDOS
+
+    assert compilacion.comando_cli("windows", "rapido", Path("d"), Path("w"))[-1] == "--console"
+    # --optimizar sustituye al nivel del perfil
+    monkeypatch.setattr(compilacion, "OPTIMIZAR_BYTECODE", 1)
+    assert compilacion.comando_cli("linux", "portable", Path("d"), Path("w"))[1] == "-O"
+    monkeypatch.setattr(compilacion, "OPTIMIZAR_BYTECODE", 0)
+    assert compilacion.comando_cli("linux", "rapido", Path("d"), Path("w"))[0] == "pyinstaller"
+
+
+def test_el_cli_no_importa_los_modulos_excluidos():
+    import ast
+    importados = set()
+    for fuente in (Path(compilacion.__file__).parent / "cli").glob("*.py"):
+        for nodo in ast.walk(ast.parse(fuente.read_text(encoding="utf-8"))):
+            if isinstance(nodo, ast.Import):
+                importados.update(alias.name.split(".")[0] for alias in nodo.names)
+            elif isinstance(nodo, ast.ImportFrom) and nodo.module and not nodo.level:
+                importados.add(nodo.module.split(".")[0])
+    assert importados
+    assert not importados.intersection(compilacion.MODULOS_EXCLUIDOS)
+
+
+def test_cli_onedir_del_perfil_rapido(en_carpeta, monkeypatch):
+    Path("cli").mkdir()
+    Path("cli/cronux_cli.py").write_text("print('crx')")
+    lanzados = []
+
+    def pyinstaller(cmd):
+        lanzados.append(cmd)
+        # onedir: dist/crx-rapido/crx/ con el ejecutable y _internal/
+        carpeta = Path(cmd[cmd.index("--distpath") + 1]) / "crx"
+        (carpeta / "_internal").mkdir(parents=True)
+        (carpeta / "crx").write_bytes(b"elf")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(compilacion, "ejecutar_pyinstaller", pyinstaller)
+    monkeypatch.setattr(compilacion, "detectar_sistema", lambda: "linux")
+    esperado = Path("dist") / "crx-rapido" / "crx"
+    assert compilacion.ruta_cli_perfil("linux", "rapido") == esperado
+    assert compilacion.ruta_cli_perfil("linux", "portable") == Path("dist") / "crx-portable" / "crx"
+
+    assert compilacion.compilar_cli_perfil("rapido") == esperado
+    assert (esperado / "crx").read_bytes() == b"elf"
+    shutil.rmtree("dist")
+    # Mismas fuentes y mismo comando: la carpeta sale de la caché
+    assert compilacion.compilar_cli_perfil("rapido") == esperado
+    assert len(lanzados) == 1 and (esperado / "_internal").is_dir()
+
+
+def test_el_deb_instala_el_cli_onedir_en_opt(en_carpeta, monkeypatch):
+    monkeypatch.setattr(compilacion, "construir_deb", lambda deb_dir, deb_file: deb_file)
+    cli = Path("dist/crx-rapido/crx")
+    (cli / "_internal").mkdir(parents=True)
+    (cli / "crx").write_bytes(b"elf")
+    instalador = Path("dist/CronuxCRX_Installer")
+    instalador.write_bytes(b"gui")
+
+    deb_dir = compilacion.preparar_estructura_deb()
+    assert compilacion.empaquetar_deb(deb_dir, instalador, cli) == Path(
+        "dist/cronux-crx_1.0.0_amd64.deb")
+    opt = deb_dir / "opt" / "cronux-crx"
+    assert (opt / "cli" / "crx").read_bytes() == b"elf"
+    assert (opt / "cli" / "_internal").is_dir()
+    assert "/opt/cronux-crx/cli/crx /usr/local/bin/crx" in (deb_dir / "DEBIAN" / "postinst").read_text()
+
+
+def test_benchmark_de_arranque_reducido(tmp_path):
+    falso = tmp_path / "crx"
+    falso.write_text("#!/bin/sh\nexit 0\n")
+    falso.chmod(0o755)
+    salida = subprocess.run([sys.executable, str(BENCH_ARRANQUE), f"falso={falso}",
+                             "--repeticiones", "1"],
+                            capture_output=True, text=True, timeout=120)
+    assert salida.returncode == 0, salida.stderr
+    perfiles = [l.split()[0] for l in salida.stdout.splitlines()[3:] if l.strip()]
+    assert perfiles == ["fuentes", "falso"]
+
+
+def test_binarios_compilados_por_perfil(tmp_path, monkeypatch):
+    sys.path.insert(0, str(BENCH_ARRANQUE.parent))
+    try:
+        import bench_arranque_binario as bench
+    finally:
+        sys.path.remove(str(BENCH_ARRANQUE.parent))
+    monkeypatch.setattr(bench, "RAIZ", tmp_path)
+    onefile = tmp_path / "dist" / "crx-portable" / "crx"
+    onedir = tmp_path / "dist" / "crx-rapido" / "crx" / "crx"
+    (onedir.parent / "_internal").mkdir(parents=True)
+    onefile.parent.mkdir(parents=True)
+    for ejecutable in (onefile, onedir):
+        ejecutable.write_bytes(b"elf")
+    (onedir.parent / "_internal" / "libpython.so").write_bytes(b"so")
+    (tmp_path / "dist" / "crx-vacio").mkdir()
+
+    assert bench.binarios_compilados() == {"portable": onefile, "rapido": onedir}
+    assert bench.archivos_de(onefile) == [onefile]
+    assert sorted(bench.archivos_de(onedir)) == [onedir.parent / "_internal" / "libpython.so", onedir]
+
+
+def cli_de_perfil(onedir):
+    if onedir:
+        cli = Path("dist/crx-rapido/crx")
+        (cli / "_internal").mkdir(parents=True)
+        (cli / "crx").write_bytes(b"elf" * 100)
+        (cli / "_internal" / "libpython.so").write_bytes(b"so" * 1000)
+        return cli
+    cli = Path("dist/crx-portable/crx")
+    cli.parent.mkdir(parents=True)
+    cli.write_bytes(b"elf" * 1000)
+    return cli
+
+
+@pytest.mark.parametrize("onedir", [False, True])
+def test_deb_solo_cli(en_carpeta, monkeypatch, onedir):
+    construidos = []
+    monkeypatch.setattr(compilacion, "construir_deb",
+                        lambda deb_dir, deb_file: construidos.append(deb_dir) or deb_file)
+    cli = cli_de_perfil(onedir)
+
+    deb = compilacion.crear_paquete_deb_cli(cli)
+    assert deb == Path("dist/cronux-crx-cli_1.0.0_amd64.deb")
+    deb_dir = construidos[0]
+    control = (deb_dir / "DEBIAN" / "control").read_text()
+    assert "Package: cronux-crx-cli" in control
+    # Ni Python ni PyQt5: el CLI congelado no depende de nada
+    assert "Depends" not in control
+    instalado = int(next(l for l in control.splitlines() if l.startswith("Installed-Size:")).split()[1])
+    assert instalado == compilacion.tamano_en_disco(cli) // 1024 + 1
+
+    crx = deb_dir / "usr" / "bin" / "crx"
+    if onedir:
+        assert crx.is_symlink() and str(crx.readlink()) == "/opt/cronux-crx-cli/crx"
+        assert (deb_dir / "opt" / "cronux-crx-cli" / "_internal" / "libpython.so").exists()
+    else:
+        assert crx.read_bytes() == cli.read_bytes()
+        assert not (deb_dir / "opt").exists()
+
+
+@pytest.mark.parametrize("compresion, nivel, esperadas", [
+    ("xz", None, ["-Zxz"]),
+    ("zstd", 19, ["-Zzstd", "-z19"]),
+    ("none", 9, ["-Znone"]),
+])
+def test_compresion_de_dpkg_deb(en_carpeta, monkeypatch, compresion, nivel, esperadas):
+    comandos = []
+
+    def run(cmd, **opciones):
+        comandos.append(cmd)
+        Path(cmd[-1]).write_bytes(b"deb")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(compilacion.subprocess, "run", run)
+    monkeypatch.setattr(compilacion, "COMPRESION_DEB", compresion)
+    monkeypatch.setattr(compilacion, "NIVEL_DEB", nivel)
+    deb = Path("paquete.deb")
+    assert compilacion.construir_deb(Path("carpeta"), deb) == deb
+    assert comandos == [["dpkg-deb", *esperadas, "--build", "carpeta", "paquete.deb"]]
+
+
+@pytest.mark.skipif(shutil.which("dpkg-deb") is None, reason="sin dpkg-deb")
+def test_deb_solo_cli_con_dpkg_deb(en_carpeta, monkeypatch):
+    monkeypatch.setattr(compilacion, "COMPRESION_DEB", "gzip")
+    deb = compilacion.crear_paquete_deb_cli(cli_de_perfil(onedir=True))
+    assert deb and deb.exists()
+    contenido = subprocess.run(["dpkg-deb", "-c", str(deb)], capture_output=True, text=True,
+                               check=True).stdout
+    assert "./usr/bin/crx -> /opt/cronux-crx-cli/crx" in contenido
+    assert "./opt/cronux-crx-cli/_internal/libpython.so" in contenido
+    campos = subprocess.run(["dpkg-deb", "-f", str(deb), "Package"], capture_output=True,
+                            text=True, check=True).stdout
+    assert campos.strip() == "cronux-crx-cli"
+
+
+def test_informe_de_tamanos(en_carpeta, monkeypatch, capsys):
+    import json
+    monkeypatch.setattr(compilacion, "INFORME_TAMANOS", Path("dist/tamanos.json"))
+    monkeypatch.setattr(compilacion, "BASE_TAMANOS", None)
+    cli = cli_de_perfil(onedir=True)
+    deb = Path("dist/cronux-crx-cli_1.0.0_amd64.deb")
+    deb.write_bytes(b"d" * 1000)
+
+    artefactos = {"cli_deb": cli, "deb_cli": deb, "deb": None, "recurso": True}
+    assert compilacion.informe_tamanos(artefactos) == compilacion.INFORME_TAMANOS
+    informe = json.loads(compilacion.INFORME_TAMANOS.read_text())
+    assert informe["tamanos"] == {"cli_rapido": compilacion.tamano_en_disco(cli), "deb_cli": 1000}
+    assert "base: ninguna" in capsys.readouterr().out
+
+    # La siguiente compilación se compara con esta
+    deb.write_bytes(b"d" * 1200)
+    assert compilacion.informe_tamanos(artefactos)
+    salida = capsys.readouterr().out
+    assert "+20.0%  ▲" in salida and "+0.0%" in salida
+
+    # Con --base-tamanos, crecer más que la tolerancia es un fallo
+    base = Path("base.json")
+    base.write_text(json.dumps({"compresion_deb": "gzip", "tamanos": {"deb_cli": 1000}}))
+    monkeypatch.setattr(compilacion, "BASE_TAMANOS", str(base))
+    assert compilacion.informe_tamanos(artefactos) is None
+    salida = capsys.readouterr().out
+    assert "Crecen más de un 5%: deb_cli" in salida
+    assert "La base usó compresión gzip" in salida
+    monkeypatch.setattr(compilacion, "TOLERANCIA_TAMANOS", 0.25)
+    assert compilacion.informe_tamanos(artefactos) == compilacion.INFORME_TAMANOS
+
+
+def test_solo_cli(en_carpeta, monkeypatch, capsys):
+    etapas = compilacion.definir_etapas("linux")
+    seleccion = compilacion.seleccionar_etapas(etapas) & compilacion.ETAPAS_SOLO_CLI
+    assert seleccion == compilacion.ETAPAS_SOLO_CLI
+    # Ninguna etapa de --solo-cli necesita el instalador gráfico
+    por_nombre = {e.nombre: e for e in etapas}
+    assert all(set(por_nombre[n].dependencias) <= seleccion for n in seleccion)
+
+    monkeypatch.setattr(compilacion, "detectar_sistema", lambda: "macos")
+    assert compilacion.main(["--solo-cli"]) is False
+    assert "solo está disponible en Linux" in capsys.readouterr().out
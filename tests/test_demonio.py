@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import socket
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cronux import Repository
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="sin sockets Unix")
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    repo = Repository.init(raiz, "p")
+    (raiz / "a.txt").write_text("a\n")
+    repo.save("uno")
+    proceso = subprocess.Popen([sys.executable, str(CLI), "serve"], cwd=raiz,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    ruta = raiz / ".cronux" / "crx.sock"
+    for _ in range(200):
+        if ruta.exists():
+            break
+        time.sleep(0.05)
+    else:
+        proceso.kill()
+        pytest.fail("crx serve no creó su socket")
+    yield raiz, ruta
+    subprocess.run([sys.executable, str(CLI), "serve", "--stop"], cwd=raiz,
+                   stdout=subprocess.DEVNULL)
+    proceso.wait(10)
+
+
+def pedir(ruta, datos):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexion:
+        conexion.settimeout(10)
+        conexion.connect(str(ruta))
+        conexion.sendall(datos + b"\n")
+        respuesta = b""
+        while not respuesta.endswith(b"\n"):
+            parte = conexion.recv(65536)
+            if not parte:
+                break
+            respuesta += parte
+    return json.loads(respuesta)
+
+
+@pytest.mark.parametrize("peticion", [b"[]", b'"x"', b"1", b"null",
+                                      b'{"argv": "log"}', b'{"argv": [1]}'])
+def test_peticion_que_no_es_un_objeto_no_detiene_el_servidor(servidor, peticion):
+    raiz, ruta = servidor
+    assert pedir(ruta, peticion) == {"reintentar_local": True}
+
+    respuesta = pedir(ruta, json.dumps({"argv": ["log"], "raiz": str(raiz)}).encode())
+    assert respuesta["codigo"] == 0
+    assert "1.0" in respuesta["salida"]
+
+
+def test_el_cliente_recibe_la_respuesta_del_servidor(servidor):
+    raiz, _ = servidor
+    salida = subprocess.run([sys.executable, str(CLI), "log"], cwd=raiz,
+                            capture_output=True, text=True, check=True).stdout
+    assert "1.0" in salida
+
+
+def test_el_socket_solo_es_del_usuario(servidor):
+    import stat
+    _, ruta = servidor
+    assert stat.S_IMODE(os.stat(ruta).st_mode) == 0o600
+
+
+def test_el_cliente_no_importa_cronux_si_responde_el_servidor(servidor):
+    raiz, _ = servidor
+    proceso = subprocess.run([sys.executable, "-X", "importtime", str(CLI), "status"], cwd=raiz,
+                             capture_output=True, text=True, check=True)
+    importados = {linea.rsplit("|", 1)[-1].strip() for linea in proceso.stderr.splitlines()}
+    assert "demonio" in importados
+    assert not importados & {"cronux", "despachador", "pathlib", "perfil"}
+    assert "Nombre: p" in proceso.stdout
+
+
+def test_el_servidor_ve_las_versiones_nuevas(servidor):
+    raiz, ruta = servidor
+    (raiz / "b.txt").write_text("b\n")
+    subprocess.run([sys.executable, str(CLI), "save", "-m", "dos"], cwd=raiz,
+                   capture_output=True, check=True)
+
+    respuesta = pedir(ruta, json.dumps({"argv": ["log", "--grep", "dos"], "raiz": str(raiz)}).encode())
+    assert "1.1" in respuesta["salida"] and "1.0" not in respuesta["salida"]
+
+    # Desde una subcarpeta la ruta viaja absoluta al servidor
+    (raiz / "sub").mkdir()
+    reenviado = subprocess.run([sys.executable, str(CLI), "log", "--", "../b.txt"], cwd=raiz / "sub",
+                               capture_output=True, text=True, check=True).stdout
+    assert "1.1" in reenviado and "1.0" not in reenviado
+
+
+@pytest.mark.parametrize("peticion", [{"argv": ["save", "-m", "x"]}, {"argv": ["log"], "raiz": "/otro"}])
+def test_solo_atiende_lectura_de_su_proyecto(servidor, peticion):
+    raiz, ruta = servidor
+    peticion.setdefault("raiz", str(raiz))
+    assert pedir(ruta, json.dumps(peticion).encode()) == {"reintentar_local": True}
+    assert len(Repository(raiz).log()) == 1
+
+
+def test_sin_servidor_el_cliente_ejecuta_en_el_proceso(tmp_path, monkeypatch):
+    import demonio
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    Repository.init(raiz, "p")
+    monkeypatch.chdir(raiz)
+    assert demonio.reenviar(["status"]) is None
+    # Socket huérfano de un servidor que ya no existe
+    (raiz / ".cronux" / "crx.sock").touch()
+    assert demonio.reenviar(["status"]) is None
+    assert demonio.reenviar(["save"]) is None
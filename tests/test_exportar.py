@@ -0,0 +1,150 @@
+import builtins
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import exportar
+from cronux import Repository
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+
+@pytest.fixture
+def repo(tmp_path):
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    repo = Repository.init(raiz, "p")
+    (raiz / "vacia").mkdir()
+    (raiz / "src" / "sin_nada").mkdir(parents=True)
+    (raiz / "src" / "a.py").write_text("a = 1\n")
+    (raiz / "z.txt").write_text("z\n")
+    repo.save("uno")
+    return repo
+
+
+def exportar_a_bytes(repo, formato):
+    salida = io.BytesIO()
+    resultado = repo.export("1.0", salida, formato)
+    return resultado, salida.getvalue()
+
+
+@pytest.mark.parametrize("formato", ["tar", "tar.gz"])
+def test_tar_incluye_carpetas_vacias(repo, formato):
+    resultado, datos = exportar_a_bytes(repo, formato)
+    with tarfile.open(fileobj=io.BytesIO(datos)) as tar:
+        miembros = {m.name: m for m in tar.getmembers()}
+    assert list(miembros) == ["src/a.py", "src/sin_nada", "vacia", "z.txt"]
+    assert miembros["vacia"].isdir() and miembros["src/sin_nada"].isdir()
+    assert miembros["vacia"].mode == 0o755
+    assert resultado.files == 2
+
+
+def test_zip_incluye_carpetas_vacias(repo, tmp_path):
+    resultado, datos = exportar_a_bytes(repo, "zip")
+    with zipfile.ZipFile(io.BytesIO(datos)) as zf:
+        assert zf.namelist() == ["src/a.py", "src/sin_nada/", "vacia/", "z.txt"]
+        assert zf.getinfo("vacia/").is_dir()
+        zf.extractall(tmp_path / "extraido")
+    assert (tmp_path / "extraido" / "src" / "sin_nada").is_dir()
+    assert resultado.files == 2
+
+
+def test_zip_abre_una_vez_los_repetidos_grandes(tmp_path, monkeypatch):
+    monkeypatch.setattr(exportar, "MAXIMO_REPETIDO_EN_MEMORIA", 1024)
+    grande = os.urandom(4096)
+    rutas = []
+    for nombre in ("a.bin", "b.bin", "c.bin"):
+        rutas.append(tmp_path / nombre)
+        rutas[-1].write_bytes(grande)
+    # Las tres entradas apuntan al mismo contenido del almacén
+    entradas = [(ruta.name, rutas[0], "clave", None) for ruta in rutas]
+
+    abiertos = []
+
+    def contar_aperturas(ruta, *args, **kwargs):
+        abiertos.append(ruta)
+        return builtins.open(ruta, *args, **kwargs)
+
+    monkeypatch.setattr(exportar, "open", contar_aperturas, raising=False)
+    salida = io.BytesIO()
+    archivos, leidos, compartidas = exportar.escribir_zip(salida, entradas)
+
+    assert abiertos == [rutas[0]]
+    assert (archivos, leidos, compartidas) == (3, len(grande), 2)
+    with zipfile.ZipFile(salida) as zf:
+        assert [zf.read(n) for n in ("a.bin", "b.bin", "c.bin")] == [grande] * 3
+
+
+@pytest.fixture
+def repetidos(tmp_path):
+    raiz = tmp_path / "r"
+    (raiz / "bin").mkdir(parents=True)
+    repo = Repository.init(raiz, "r")
+    for nombre in ("uno.txt", "dos.txt", "bin/tres.txt"):
+        (raiz / nombre).write_text("mismo contenido\n")
+    (raiz / "bin" / "script.sh").write_text("#!/bin/sh\n")
+    os.chmod(raiz / "bin" / "script.sh", 0o700)
+    os.chmod(raiz / "dos.txt", 0o600)
+    repo.save("uno")
+    return repo
+
+
+@pytest.mark.parametrize("formato", ["tar", "tar.gz", "zip"])
+def test_salida_determinista(repetidos, formato):
+    _, primera = exportar_a_bytes(repetidos, formato)
+    for ruta in repetidos.root.rglob("*.txt"):
+        os.utime(ruta, (1, 1))
+    _, segunda = exportar_a_bytes(repetidos, formato)
+    assert primera == segunda
+
+
+def test_tar_enlaza_contenidos_repetidos_y_normaliza_permisos(repetidos, tmp_path):
+    resultado, datos = exportar_a_bytes(repetidos, "tar")
+    assert (resultado.files, resultado.shared) == (4, 2)
+    assert resultado.bytes_read == len("mismo contenido\n") + len("#!/bin/sh\n")
+
+    with tarfile.open(fileobj=io.BytesIO(datos)) as tar:
+        miembros = {m.name: m for m in tar.getmembers()}
+        assert miembros["dos.txt"].islnk() and miembros["uno.txt"].islnk()
+        assert miembros["bin/tres.txt"].isfile()
+        assert miembros["bin/script.sh"].mode == 0o755
+        assert miembros["bin/tres.txt"].mode == 0o644
+        assert {(m.uid, m.gid, m.uname, m.mtime) for m in miembros.values()} == {(0, 0, "", 0)}
+        tar.extractall(tmp_path / "extraido")
+    assert (tmp_path / "extraido" / "dos.txt").read_text() == "mismo contenido\n"
+
+
+def test_zip_lee_una_vez_los_repetidos(repetidos):
+    resultado, datos = exportar_a_bytes(repetidos, "zip")
+    assert (resultado.files, resultado.shared) == (4, 2)
+    with zipfile.ZipFile(io.BytesIO(datos)) as zf:
+        assert zf.read("dos.txt") == zf.read("uno.txt") == b"mismo contenido\n"
+        assert zf.getinfo("bin/script.sh").external_attr >> 16 == 0o100755
+        assert zf.getinfo("uno.txt").date_time == exportar.FECHA_ZIP
+
+
+def test_formato_por_nombre():
+    assert exportar.formato_por_nombre("v1.TGZ") == "tar.gz"
+    assert exportar.formato_por_nombre("v1.tar.gz") == "tar.gz"
+    assert exportar.formato_por_nombre("v1.zip") == "zip"
+    assert exportar.formato_por_nombre("v1.rar") is None
+    with pytest.raises(ValueError):
+        exportar.escribir_archivo(io.BytesIO(), "rar", [])
+
+
+def test_crx_export_a_stdout_y_a_archivo(repetidos, tmp_path):
+    proceso = subprocess.run([sys.executable, str(CLI), "export", "1.0"], cwd=repetidos.root,
+                             capture_output=True, check=True)
+    with tarfile.open(fileobj=io.BytesIO(proceso.stdout)) as tar:
+        assert "bin/script.sh" in tar.getnames()
+
+    destino = tmp_path / "v1.zip"
+    subprocess.run([sys.executable, str(CLI), "export", "1.0", "-o", str(destino)],
+                   cwd=repetidos.root, capture_output=True, check=True)
+    assert zipfile.is_zipfile(destino)
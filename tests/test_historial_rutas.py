@@ -0,0 +1,114 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import indice
+from cronux import Repository
+
+pytestmark = pytest.mark.skipif(not indice.disponible(), reason="sqlite3 sin FTS5")
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+# Contenido de cada versión: None borra el archivo
+CAMBIOS = [
+    {"config/prod.yaml": "a: 1", "config/dev.yaml": "a: 0", "src/app.py": "1", "leeme.md": "hola"},
+    {"config/prod.yaml": "a: 2"},
+    {"src/app.py": "2", "src/util/fechas.py": "f"},
+    {"leeme.md": None},
+    {"config/dev.yaml": "a: 3", "src/util/fechas.py": "g"},
+]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    repo = Repository.init(raiz, "p")
+    for n, archivos in enumerate(CAMBIOS):
+        for relativa, contenido in archivos.items():
+            ruta = raiz / relativa
+            if contenido is None:
+                ruta.unlink()
+            else:
+                ruta.parent.mkdir(parents=True, exist_ok=True)
+                ruta.write_text(contenido)
+        repo.save(f"cambio {n}")
+    return repo
+
+
+def sin_indice(repo, monkeypatch, **filtros):
+    """Resultado de log recorriendo los manifiestos uno a uno"""
+    with monkeypatch.context() as m:
+        m.setattr(Repository, "_abrir_indice", lambda self: None)
+        return Repository(repo.root).log(**filtros)
+
+
+def numeros(versiones):
+    return [v.number for v in versiones]
+
+
+@pytest.mark.parametrize("rutas, esperadas", [
+    (["config/prod.yaml"], ["1.1", "1.0"]),
+    (["config"], ["1.4", "1.1", "1.0"]),
+    (["src/util"], ["1.4", "1.2"]),
+    (["*.py"], ["1.4", "1.2", "1.0"]),
+    (["config/*.yaml"], ["1.4", "1.1", "1.0"]),
+    (["leeme.md"], ["1.3", "1.0"]),
+    (["config/prod.yaml", "src/app.py"], ["1.2", "1.1", "1.0"]),
+    (["confi"], []),
+    (["."], ["1.4", "1.3", "1.2", "1.1", "1.0"]),
+])
+def test_rutas_igual_que_sin_indice(repo, monkeypatch, rutas, esperadas):
+    absolutas = [str(repo.root / r) for r in rutas]
+    assert numeros(repo.log(paths=absolutas)) == esperadas
+    assert repo.log(paths=absolutas) == sin_indice(repo, monkeypatch, paths=absolutas)
+
+
+def test_rutas_y_grep_se_combinan(repo, monkeypatch):
+    filtros = {"grep": "cambio", "paths": [str(repo.root / "src")]}
+    assert numeros(repo.log(**filtros)) == ["1.4", "1.2", "1.0"]
+    assert repo.log(**filtros) == sin_indice(repo, monkeypatch, **filtros)
+    assert repo.log(grep="otro", paths=[str(repo.root / "src")]) == []
+
+
+def test_la_busqueda_no_lee_manifiestos(repo, monkeypatch):
+    repo.log(paths=[str(repo.root / "config")])
+    # Con el índice al día, una búsqueda por ruta no abre ningún manifiesto
+    monkeypatch.setattr(Repository, "_entradas_de",
+                        lambda self, carpeta: pytest.fail(f"se leyó {carpeta}"))
+    assert numeros(repo.log(paths=[str(repo.root / "config/prod.yaml")])) == ["1.1", "1.0"]
+
+
+def test_borrar_una_version_intermedia(repo, monkeypatch):
+    repo.log(paths=[str(repo.root / "config")])
+    shutil.rmtree(repo.cronux_dir / "versiones" / "version_1.1")
+
+    otro = Repository(repo.root)
+    # Sin la 1.1, la 1.2 es la que cambia prod.yaml respecto a la 1.0
+    assert numeros(otro.log(paths=[str(repo.root / "config/prod.yaml")])) == ["1.2", "1.0"]
+    for ruta in ("config", "src", "leeme.md"):
+        filtros = {"paths": [str(repo.root / ruta)]}
+        assert otro.log(**filtros) == sin_indice(repo, monkeypatch, **filtros)
+
+
+def test_un_save_nuevo_entra_en_el_indice(repo):
+    ruta = repo.root / "config" / "prod.yaml"
+    repo.log(paths=[str(ruta)])
+    ruta.write_text("a: 9")
+    repo.save("otra vez prod")
+    assert numeros(repo.log(paths=[str(ruta)])) == ["1.5", "1.1", "1.0"]
+
+
+def test_crx_log_con_rutas(repo):
+    salida = subprocess.run([sys.executable, str(CLI), "log", "--", "prod.yaml"],
+                            cwd=repo.root / "config", capture_output=True, text=True)
+    assert salida.returncode == 0, salida.stderr
+    assert [l for l in salida.stdout.splitlines() if l.startswith("Versión:")] == [
+        "Versión: 1.1", "Versión: 1.0"]
+
+    nada = subprocess.run([sys.executable, str(CLI), "log", "--", "no-existe.txt"],
+                          cwd=repo.root, capture_output=True, text=True)
+    assert "Ninguna version cambió no-existe.txt" in nada.stdout
@@ -0,0 +1,100 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from cronux import Repository
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git no está instalado")
+
+
+def git(carpeta, *argumentos):
+    subprocess.run(["git", "-c", "user.name=Prueba", "-c", "user.email=prueba@example.com",
+                    *argumentos], cwd=carpeta, check=True, stdout=subprocess.DEVNULL)
+
+
+def commit(carpeta, mensaje, archivos):
+    for ruta, contenido in archivos.items():
+        destino = carpeta / ruta
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_text(contenido)
+    git(carpeta, "add", "-A")
+    git(carpeta, "commit", "-q", "-m", mensaje)
+
+
+@pytest.fixture
+def importado(tmp_path):
+    origen = tmp_path / "git"
+    origen.mkdir()
+    git(origen, "init", "-q")
+    commit(origen, "primero", {"a b.txt": "uno\n", "c.txt": "c\n"})
+    commit(origen, "segundo", {"a b.txt": "dos\n", "e/f.txt": "f\n"})
+    commit(origen, "tercero", {"e/f.txt": "f2\n"})
+
+    (tmp_path / "p").mkdir()
+    repo = Repository.init(tmp_path / "p", "p")
+    assert repo.import_git(str(origen)).versions == ["1.0", "1.1", "1.2"]
+    return repo
+
+
+def numeros(versiones):
+    return [v.number for v in versiones]
+
+
+def test_log_por_ruta_tras_importar_git(importado):
+    assert numeros(importado.log(paths=["a b.txt"])) == ["1.1", "1.0"]
+    assert numeros(importado.log(paths=["e"])) == ["1.2", "1.1"]
+    assert numeros(importado.log(paths=["c.txt"])) == ["1.0"]
+
+
+def test_log_por_ruta_igual_sin_indice(importado):
+    (importado.cronux_dir / "indice.db").unlink()
+    recien = Repository(importado.root)
+    assert numeros(recien.log(paths=["a b.txt"])) == ["1.1", "1.0"]
+    assert numeros(recien.log(paths=["e"])) == ["1.2", "1.1"]
+
+
+GIT_RUIDOSO = """#!{python}
+import sys
+# Más avisos de los que caben en el buffer de una tubería
+sys.stderr.write("aviso\\n" * 100000)
+sys.stderr.flush()
+sys.stdout.write("blob\\nmark :1\\ndata 5\\nhola\\n\\n"
+                 "commit refs/heads/master\\nmark :2\\n"
+                 "committer A <a@example.com> 1700000000 +0000\\ndata 4\\nuno\\n"
+                 "M 100644 :1 a.txt\\n\\n")
+"""
+
+
+def test_import_git_con_muchos_avisos_no_se_bloquea(tmp_path, monkeypatch):
+    import sys
+    import threading
+
+    binarios = tmp_path / "bin"
+    binarios.mkdir()
+    falso = binarios / "git"
+    falso.write_text(GIT_RUIDOSO.format(python=sys.executable))
+    falso.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{binarios}{os.pathsep}{os.environ['PATH']}")
+
+    (tmp_path / "p").mkdir()
+    repo = Repository.init(tmp_path / "p", "p")
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(repo.import_git(str(tmp_path))),
+                            daemon=True)
+    hilo.start()
+    hilo.join(30)
+    assert not hilo.is_alive(), "git fast-export y crx import se bloquearon"
+    assert resultado[0].versions == ["1.0"]
+
+
+def test_import_git_informa_del_error(tmp_path):
+    origen = tmp_path / "git"
+    origen.mkdir()
+    git(origen, "init", "-q")
+    commit(origen, "primero", {"a.txt": "a\n"})
+    (tmp_path / "p").mkdir()
+    repo = Repository.init(tmp_path / "p", "p")
+    with pytest.raises(ValueError, match="git fast-export falló: .*no-existe"):
+        repo.import_git(str(origen), "no-existe")
@@ -0,0 +1,85 @@
+import io
+import tarfile
+
+import pytest
+
+from cronux import Repository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "p").mkdir()
+    return Repository.init(tmp_path / "p", "p")
+
+
+def carpeta(ruta, archivos):
+    for relativa, contenido in archivos.items():
+        destino = ruta / relativa
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_text(contenido)
+    return ruta
+
+
+def agregar(tar, nombre, datos=b"", **campos):
+    info = tarfile.TarInfo(nombre)
+    info.size = len(datos)
+    for campo, valor in campos.items():
+        setattr(info, campo, valor)
+    tar.addfile(info, io.BytesIO(datos) if datos else None)
+
+
+def test_carpetas_en_orden_y_sin_repetir_contenido(repo, tmp_path):
+    comun = "x" * 10000
+    v1 = carpeta(tmp_path / "v1", {"a.txt": comun, "b.txt": "uno", ".git/HEAD": "ref"})
+    v2 = carpeta(tmp_path / "v2", {"a.txt": comun, "b.txt": "dos", "c/d.txt": "d"})
+
+    resultado = repo.import_paths([str(v1), str(v2)])
+
+    assert resultado.versions == ["1.0", "1.1"]
+    assert resultado.files == 5
+    assert resultado.bytes_written < resultado.bytes_read
+    assert repo.files("1.0") == ["a.txt", "b.txt"]
+    assert repo.files("1.1") == ["a.txt", "b.txt", "c/d.txt"]
+    assert [v.message for v in repo.log()] == ["Importado de v2", "Importado de v1"]
+    assert repo.diff("1.0", "1.1").modified == ["b.txt"]
+
+
+def test_tar_quita_la_carpeta_comun_y_las_rutas_peligrosas(repo, tmp_path):
+    ruta = tmp_path / "proyecto-1.0.tar.gz"
+    with tarfile.open(ruta, "w:gz") as tar:
+        agregar(tar, "proyecto-1.0/", type=tarfile.DIRTYPE)
+        agregar(tar, "proyecto-1.0/a.txt", b"a", mode=0o755, mtime=1_000_000)
+        agregar(tar, "proyecto-1.0/enlace", type=tarfile.LNKTYPE, linkname="proyecto-1.0/a.txt")
+        agregar(tar, "proyecto-1.0/../../fuera.txt", b"mal")
+
+    resultado = repo.import_paths([str(ruta)])
+
+    assert repo.files("1.0") == ["a.txt", "enlace"]
+    assert any("fuera.txt" in aviso for aviso in resultado.warnings)
+    salida = io.BytesIO()
+    repo.cat("1.0", "enlace", salida)
+    assert salida.getvalue() == b"a"
+    repo.restore("1.0", into=tmp_path / "restaurado")
+    assert (tmp_path / "restaurado" / "a.txt").stat().st_mode & 0o777 == 0o755
+
+
+def test_lo_exportado_se_vuelve_a_importar(repo, tmp_path):
+    carpeta(repo.root, {"a.txt": "a", "src/b.py": "b", "src/c.py": "b"})
+    repo.save("origen")
+    ruta = tmp_path / "v.tar"
+    with open(ruta, "wb") as f:
+        repo.export("1.0", f)
+
+    repo.import_paths([str(ruta)])
+    assert repo.files("1.1") == repo.files("1.0")
+    assert repo.diff("1.0", "1.1").clean
+
+
+def test_rutas_invalidas_antes_de_escribir_nada(repo, tmp_path):
+    valida = carpeta(tmp_path / "v1", {"a.txt": "a"})
+    (tmp_path / "nota.txt").write_text("no es un tar")
+    with pytest.raises(FileNotFoundError):
+        repo.import_paths([str(valida), str(tmp_path / "falta")])
+    with pytest.raises(ValueError):
+        repo.import_paths([str(valida), str(tmp_path / "nota.txt")])
+    assert repo.log() == []
@@ -0,0 +1,96 @@
+import shutil
+
+import pytest
+
+import indice
+from cronux import Repository
+
+pytestmark = pytest.mark.skipif(not indice.disponible(), reason="sqlite3 sin FTS5")
+
+MENSAJES = [
+    "Primera versión del parser",
+    "Arreglo del PARSER con acentos: función",
+    'Mensaje con "comillas" y guiones -- raros',
+    "Cambio la configuración",
+    "Borro el leeme",
+]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    raiz = tmp_path / "p"
+    (raiz / "src" / "parser").mkdir(parents=True)
+    repo = Repository.init(raiz, "p")
+    cambios = [
+        {"src/parser/a.py": "1", "config.json": "{}", "leeme.md": "hola"},
+        {"src/parser/a.py": "2", "src/parser/b.py": "b"},
+        {"src/util.py": "u"},
+        {"config.json": '{"x": 1}'},
+        {"leeme.md": None},
+    ]
+    for mensaje, archivos in zip(MENSAJES, cambios):
+        for relativa, contenido in archivos.items():
+            if contenido is None:
+                (raiz / relativa).unlink()
+            else:
+                (raiz / relativa).write_text(contenido)
+        repo.save(mensaje)
+    return repo
+
+
+def sin_indice(repo, monkeypatch, **filtros):
+    """Resultado de log con la búsqueda sin índice"""
+    with monkeypatch.context() as m:
+        m.setattr(Repository, "_abrir_indice", lambda self: None)
+        return Repository(repo.root).log(**filtros)
+
+
+def numeros(versiones):
+    return [v.number for v in versiones]
+
+
+@pytest.mark.parametrize("grep", ["parser", "PARSER funcion", "pars*", "configuracion",
+                                  '"comillas"', "--", "parser --", "acentos:",
+                                  "guiones-raros", "parser inexistente", "*"])
+def test_grep_igual_que_sin_indice(repo, monkeypatch, grep):
+    con_indice = repo.log(grep=grep)
+    assert (repo.cronux_dir / indice.NOMBRE_INDICE).exists()
+    assert con_indice == sin_indice(repo, monkeypatch, grep=grep)
+
+
+def test_grep_encuentra_lo_esperado(repo):
+    assert numeros(repo.log(grep="parser")) == ["1.1", "1.0"]
+    assert numeros(repo.log(grep="función arreglo")) == ["1.1"]
+    assert numeros(repo.log(grep="config*")) == ["1.3"]
+
+
+def test_el_indice_se_reconstruye_y_sigue_al_catalogo(repo, monkeypatch):
+    (repo.cronux_dir / indice.NOMBRE_INDICE).unlink()
+    otro = Repository(repo.root)
+    assert numeros(otro.log(grep="parser")) == ["1.1", "1.0"]
+
+    # Una versión borrada a mano desaparece de los resultados
+    shutil.rmtree(repo.cronux_dir / "versiones" / "version_1.1")
+    assert numeros(otro.log(grep="parser")) == ["1.0"]
+    assert otro.log(grep="parser") == sin_indice(repo, monkeypatch, grep="parser")
+
+
+def test_version_sin_parte_menor(repo, monkeypatch):
+    versiones = repo.cronux_dir / "versiones"
+    shutil.copytree(versiones / "version_1.3", versiones / "version_3")
+
+    otro = Repository(repo.root)
+    assert numeros(otro.log(grep="configuracion")) == ["3", "1.3"]
+    assert numeros(otro.log(paths=["config.json"])) == ["1.3", "1.0"]
+    for filtros in ({"grep": "configuracion"}, {"paths": ["config.json"]}):
+        assert otro.log(**filtros) == sin_indice(repo, monkeypatch, **filtros)
+
+
+def test_dos_carpetas_con_el_mismo_numero(repo, monkeypatch):
+    versiones = repo.cronux_dir / "versiones"
+    shutil.copytree(versiones / "version_1.3", versiones / "version_1.03")
+
+    otro = Repository(repo.root)
+    # El índice no puede distinguirlas: la búsqueda se hace sin él
+    assert otro.log(grep="configuracion") == sin_indice(repo, monkeypatch, grep="configuracion")
+    assert len(otro.log(grep="configuracion")) == 2
@@ -0,0 +1,75 @@
+import io
+import json
+
+from cronux import Repository
+from lote import ejecutar_lote_cli
+
+
+def lote(*peticiones, hilos=4):
+    entrada = io.StringIO("".join(
+        (p if isinstance(p, str) else json.dumps(p)) + "\n" for p in peticiones))
+    salida = io.StringIO()
+    correcto = ejecutar_lote_cli(hilos, entrada, salida)
+    respuestas = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+    return correcto, sorted(respuestas, key=lambda r: r["line"])
+
+
+def test_init_crea_carpetas_anidadas(tmp_path):
+    ruta = tmp_path / "no" / "existe" / "aun"
+    correcto, respuestas = lote({"id": "a", "repo": str(ruta), "command": "init",
+                                 "args": {"name": "anidado"}})
+    assert correcto, respuestas
+    assert respuestas[0]["result"]["name"] == "anidado"
+    assert Repository(ruta).status().name == "anidado"
+
+
+def test_comandos_de_un_repositorio_en_orden(tmp_path):
+    repos = [tmp_path / f"r{i}" for i in range(3)]
+    peticiones = []
+    for ruta in repos:
+        peticiones.append({"repo": str(ruta), "command": "init", "args": {"name": ruta.name}})
+        for i in range(3):
+            peticiones.append({"repo": str(ruta), "command": "save", "args": {"message": f"m{i}"}})
+        peticiones.append({"repo": str(ruta), "command": "log"})
+
+    correcto, respuestas = lote(*peticiones)
+
+    assert correcto
+    assert [r["line"] for r in respuestas] == list(range(1, len(peticiones) + 1))
+    for ruta in repos:
+        propias = [r for r in respuestas if r["repo"] == str(ruta)]
+        guardados = [r["result"]["version"] for r in propias if r["command"] == "save"]
+        assert guardados == ["1.0", "1.1", "1.2"]
+        historial = propias[-1]["result"]
+        assert [v["message"] for v in historial] == ["m2", "m1", "m0"]
+
+
+def test_errores_por_linea_sin_cortar_el_lote(tmp_path):
+    ruta = tmp_path / "r"
+    correcto, respuestas = lote(
+        {"repo": str(ruta), "command": "init", "args": {"name": "r"}},
+        "no es json",
+        {"repo": str(ruta), "command": "volar"},
+        {"repo": str(ruta), "command": "save", "args": {"mensaje": "x"}},
+        {"repo": str(ruta), "command": "restore"},
+        {"id": 7, "repo": str(ruta), "command": "restore", "args": {"version": "9.9"}},
+        {"repo": str(ruta), "command": "status"},
+    )
+
+    assert not correcto
+    assert [r["ok"] for r in respuestas] == [True, False, False, False, False, False, True]
+    assert "JSON inválido" in respuestas[1]["error"]
+    assert "Comando desconocido" in respuestas[2]["error"]
+    assert "Argumento desconocido" in respuestas[3]["error"]
+    assert "Falta el argumento 'version'" in respuestas[4]["error"]
+    assert respuestas[5]["id"] == 7 and respuestas[5]["type"] == "VersionNotFoundError"
+
+
+def test_sin_repo_usa_el_proyecto_de_la_carpeta_actual(tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    Repository.init(tmp_path, "actual")
+    monkeypatch.chdir(tmp_path / "sub")
+    correcto, respuestas = lote({"command": "status"})
+    assert correcto
+    assert respuestas[0]["repo"] == str(tmp_path)
+    assert respuestas[0]["result"]["name"] == "actual"
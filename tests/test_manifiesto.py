@@ -0,0 +1,143 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import manifiesto
+from cronux import Repository
+
+BENCH = Path(__file__).resolve().parent.parent / "benchmarks" / "bench_manifiesto.py"
+
+
+def archivos_de_prueba(n):
+    """Rutas que comparten prefijos largos y otras que no, con un nombre no UTF-8"""
+    archivos = {}
+    for i in range(n):
+        ruta = f"src/modulo{i % 7}/sub{i % 3}/archivo_{i:04d}.py"
+        archivos[ruta] = {"hash": f"{i:064x}", "tamano": i * 10, "modo": 0o644,
+                          "mtime": 1_700_000_000_000_000_000 + i}
+    archivos["README"] = {"hash": "f" * 64, "tamano": 0, "modo": 0o755, "mtime": -1}
+    archivos["ñandú/ación.txt"] = {"hash": "e" * 64, "tamano": 1, "modo": 0o600, "mtime": 5}
+    archivos["raro\udcff.bin"] = {"hash": "d" * 64, "tamano": 2, "modo": 0o644, "mtime": 6}
+    return archivos
+
+
+def guardado(carpeta, archivos, **cabecera):
+    manifiesto.escribir(carpeta, {"algoritmo": "sha256", **cabecera, "archivos": archivos})
+    return manifiesto.leer(carpeta)
+
+
+def test_ida_y_vuelta(tmp_path):
+    archivos = archivos_de_prueba(3 * manifiesto.ENTRADAS_POR_BLOQUE + 5)
+    leido = guardado(tmp_path, archivos, almacen="objetos")
+
+    assert (tmp_path / manifiesto.NOMBRE_BINARIO).exists()
+    assert not (tmp_path / manifiesto.NOMBRE_JSON).exists()
+    assert leido["algoritmo"] == "sha256" and leido["almacen"] == "objetos"
+    binario = leido["archivos"]
+    assert isinstance(binario, manifiesto.Manifiesto)
+    assert len(binario) == len(archivos)
+    assert list(binario) == sorted(archivos)
+    assert dict(binario.items()) == archivos
+    assert list(binario.values()) == [archivos[r] for r in sorted(archivos)]
+    assert manifiesto.como_dict(binario) == archivos
+
+
+def test_consulta_por_biseccion(tmp_path):
+    archivos = archivos_de_prueba(5 * manifiesto.ENTRADAS_POR_BLOQUE)
+    binario = guardado(tmp_path, archivos)["archivos"]
+
+    # En orden inverso: cada consulta cae en un bloque distinto del anterior
+    for ruta in sorted(archivos, reverse=True):
+        assert binario[ruta] == archivos[ruta]
+    for falta in ("", "AAA", "src/modulo0/sub0/archivo_0000.pyc", "src/modulo9", "zzz"):
+        assert falta not in binario
+        with pytest.raises(KeyError):
+            binario[falta]
+
+
+def test_solo_decodifica_el_bloque_consultado(tmp_path, monkeypatch):
+    archivos = archivos_de_prueba(4 * manifiesto.ENTRADAS_POR_BLOQUE)
+    binario = guardado(tmp_path, archivos)["archivos"]
+    decodificados = []
+    original = manifiesto.Manifiesto._bloque
+    monkeypatch.setattr(manifiesto.Manifiesto, "_bloque",
+                        lambda self, numero: decodificados.append(numero) or original(self, numero))
+
+    ultima = sorted(archivos)[-1]
+    assert binario[ultima] == archivos[ultima]
+    assert binario[ultima] == archivos[ultima]
+    ultimo_bloque = -(-len(archivos) // manifiesto.ENTRADAS_POR_BLOQUE) - 1
+    assert set(decodificados) == {ultimo_bloque}
+
+
+def test_manifiesto_grande_con_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifiesto, "UMBRAL_MMAP", 0)
+    archivos = archivos_de_prueba(2 * manifiesto.ENTRADAS_POR_BLOQUE)
+    binario = guardado(tmp_path, archivos)["archivos"]
+    assert not isinstance(binario._datos, bytes)
+    assert dict(binario.items()) == archivos
+
+
+def test_vacio(tmp_path):
+    leido = guardado(tmp_path, {})
+    assert (tmp_path / manifiesto.NOMBRE_BINARIO).exists()
+    assert len(leido["archivos"]) == 0 and list(leido["archivos"]) == []
+    assert "a" not in leido["archivos"]
+
+
+@pytest.mark.parametrize("entrada", [
+    {"hash": "a" * 64, "tamano": 1, "modo": 0o644},
+    {"hash": "no es hexadecimal", "tamano": 1, "modo": 0o644, "mtime": 0},
+    {"hash": "a" * 40, "tamano": 1, "modo": 0o644, "mtime": 0},
+])
+def test_sin_representacion_binaria_se_guarda_en_json(tmp_path, entrada):
+    archivos = archivos_de_prueba(3)
+    archivos["otro"] = entrada
+    leido = guardado(tmp_path, archivos)
+
+    assert not (tmp_path / manifiesto.NOMBRE_BINARIO).exists()
+    assert json.loads((tmp_path / manifiesto.NOMBRE_JSON).read_text())["archivos"]["otro"] == entrada
+    assert leido["archivos"] == archivos
+    assert manifiesto.existe(tmp_path)
+
+
+def test_sin_manifiesto(tmp_path):
+    assert not manifiesto.existe(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        manifiesto.leer(tmp_path)
+
+
+def test_no_es_un_manifiesto(tmp_path):
+    (tmp_path / manifiesto.NOMBRE_BINARIO).write_bytes(b"otra cosa" * 10)
+    with pytest.raises(ValueError):
+        manifiesto.leer(tmp_path)
+
+
+def test_las_versiones_guardan_manifiesto_binario(tmp_path):
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    (raiz / "a.txt").write_text("a")
+    (raiz / "sub").mkdir()
+    (raiz / "sub" / "b.txt").write_text("bb")
+    repo = Repository.init(raiz, "p")
+    repo.save("uno")
+
+    carpeta = repo.cronux_dir / "versiones" / "version_1.0"
+    archivos = manifiesto.leer(carpeta)["archivos"]
+    assert isinstance(archivos, manifiesto.Manifiesto)
+    assert list(archivos) == ["a.txt", "sub/b.txt"]
+    assert archivos["sub/b.txt"]["tamano"] == 2
+
+
+def test_benchmark_reducido(tmp_path):
+    salida = subprocess.run([sys.executable, str(BENCH), "--entradas", "500",
+                             "--repeticiones", "1", "--directorio", str(tmp_path)],
+                            capture_output=True, text=True, timeout=120)
+    assert salida.returncode == 0, salida.stderr
+    filas = [l.split()[:2] for l in salida.stdout.splitlines()
+             if l.startswith(("consulta", "recorrido"))]
+    assert filas == [["consulta", "json"], ["consulta", "binario"],
+                     ["recorrido", "json"], ["recorrido", "binario"]]
@@ -0,0 +1,50 @@
+import os
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+
+def crx(carpeta, *argumentos, entorno=None):
+    return subprocess.run([sys.executable, str(CLI), *argumentos], cwd=carpeta,
+                          capture_output=True, text=True, env={**os.environ, **(entorno or {})})
+
+
+def test_registro_jsonl_y_textfile(tmp_path):
+    proyecto = tmp_path / "p"
+    proyecto.mkdir()
+    (proyecto / "a.txt").write_text("hola")
+    crx(proyecto, "new", "p")
+    jsonl = tmp_path / "metricas.jsonl"
+    textfile = tmp_path / "cronux.prom"
+    opciones = ["--metrics", str(jsonl), "--metrics-textfile", str(textfile)]
+
+    assert crx(proyecto, *opciones, "save", "-m", "uno").returncode == 0
+    assert crx(proyecto, *opciones, "restore", "9.9", "--yes").returncode != 0
+    # También se activa por el entorno
+    crx(proyecto, "status", entorno={"CRONUX_METRICS": str(jsonl)})
+
+    registros = [json.loads(linea) for linea in jsonl.read_text().splitlines()]
+    assert [r["comando"] for r in registros] == ["save", "restore", "status"]
+    guardado, restaurado, _ = registros
+    assert guardado["codigo_salida"] == 0 and restaurado["codigo_salida"] != 0
+    assert guardado["repositorio"] == str(proyecto)
+    assert guardado["contadores"]["archivos"] == 1
+    assert guardado["duracion"]["pared"] > 0
+
+    texto = textfile.read_text()
+    assert texto.endswith("# EOF\n")
+    assert "# TYPE cronux_last_exit_code gauge" in texto
+    assert f'cronux_last_exit_code{{command="save",repo="{proyecto}"}} 0' in texto
+    assert 'command="restore"' in texto
+    assert "cronux_repository_size_bytes" in texto
+
+
+def test_sin_metricas_no_se_escribe_nada(tmp_path):
+    proyecto = tmp_path / "p"
+    proyecto.mkdir()
+    crx(proyecto, "new", "p")
+    crx(proyecto, "status")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["p"]
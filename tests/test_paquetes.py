@@ -0,0 +1,48 @@
+import os
+import time
+
+from almacen import Almacen
+from paquetes import MARGEN_TEMPORALES_S, recuperar
+
+
+def test_recuperar_respeta_temporales_recientes(tmp_path):
+    carpeta = tmp_path / "paquetes"
+    carpeta.mkdir()
+    abandonado = carpeta / "100-0.tmp"
+    en_curso = carpeta / "200-0.tmp"
+    abandonado.write_bytes(b"CRXPACK1\n")
+    en_curso.write_bytes(b"CRXPACK1\n")
+    antes = time.time() - MARGEN_TEMPORALES_S - 60
+    os.utime(abandonado, (antes, antes))
+
+    assert recuperar(carpeta, Almacen(tmp_path, "sha256"), []) == 0
+    assert not abandonado.exists()
+    assert en_curso.exists()
+
+
+def test_push_copia_objetos_sin_paquetes_e_informa_de_lo_recuperado(tmp_path):
+    import hashlib
+    from cronux import Repository
+    from paquetes import CABECERA, CARPETA_PAQUETES
+
+    (tmp_path / "p").mkdir()
+    repo = Repository.init(tmp_path / "p", "p")
+    (repo.root / "a.txt").write_bytes(b"a\n")
+    repo.save("uno")
+    resultado = repo.push(str(tmp_path / "espejo"))
+    carpeta = tmp_path / "espejo" / ".cronux" / CARPETA_PAQUETES
+    assert resultado.objects == 1 and resultado.recovered == 0
+    assert not carpeta.exists()
+
+    # Paquete completo que dejó un envío interrumpido
+    huerfano = b"huerfano\n"
+    carpeta.mkdir()
+    (carpeta / "1-0.pack").write_bytes(
+        CABECERA + f"{hashlib.sha256(huerfano).hexdigest()} {len(huerfano)}\n".encode() + huerfano)
+    (repo.root / "b.txt").write_bytes(b"b\n")
+    repo.save("dos")
+    resultado = repo.push(str(tmp_path / "espejo"))
+    assert resultado.versions == ["1.1"]
+    assert resultado.recovered == 1
+    assert any("interrumpido" in aviso for aviso in resultado.warnings)
+    assert list(carpeta.iterdir()) == []
@@ -0,0 +1,65 @@
+import json
+import pstats
+import subprocess
+import sys
+from pathlib import Path
+
+import perfil
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+
+def crx(carpeta, *argumentos):
+    return subprocess.run([sys.executable, str(CLI), *argumentos], cwd=carpeta,
+                          capture_output=True, text=True, check=True)
+
+
+def test_fases_y_contadores():
+    perfil.iniciar(mostrar=False)
+    try:
+        for _ in range(3):
+            with perfil.fase("hash"):
+                pass
+        perfil.contar("bytes", 10)
+        perfil.contar("bytes", 5)
+    finally:
+        datos = perfil.finalizar()
+
+    assert datos["fases"]["hash"]["llamadas"] == 3
+    assert datos["contadores"] == {"bytes": 15}
+    assert datos["total"]["pared"] >= datos["fases"]["hash"]["pared"]
+
+
+def test_desactivado_no_registra():
+    assert not perfil.ACTIVO
+    with perfil.fase("nunca"):
+        perfil.contar("nunca")
+    assert perfil.finalizar() is None
+
+
+def test_profile_en_la_linea_de_comandos(tmp_path):
+    (tmp_path / "a.txt").write_text("hola")
+    crx(tmp_path, "new", "p")
+    prof = tmp_path / "save.prof"
+    traza = tmp_path / "save.json"
+
+    resultado = crx(tmp_path, "--profile", "--profile-out", str(prof),
+                    "--profile-trace", str(traza), "save", "-m", "uno")
+
+    assert "PERFIL DE EJECUCIÓN" in resultado.stderr
+    assert "archivos: 1" in resultado.stderr
+    assert pstats.Stats(str(prof)).total_calls > 0
+    eventos = json.loads(traza.read_text())["traceEvents"]
+    assert eventos and {e["ph"] for e in eventos} == {"X"}
+    # Sin --profile la salida no cambia
+    assert "PERFIL" not in crx(tmp_path, "status").stderr
+
+
+def test_cada_medicion_empieza_de_cero():
+    for _ in range(2):
+        perfil.iniciar(mostrar=False)
+        with perfil.fase("hash"):
+            perfil.contar("archivos")
+        datos = perfil.finalizar()
+    assert datos["fases"]["hash"]["llamadas"] == 1
+    assert datos["contadores"] == {"archivos": 1}
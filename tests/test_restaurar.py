@@ -0,0 +1,116 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cronux import Repository, PathNotFoundError
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+
+@pytest.fixture
+def repo(tmp_path):
+    raiz = tmp_path / "p"
+    raiz.mkdir()
+    repo = Repository.init(raiz, "p")
+    for relativa, texto in {"config.json": "{}", "leeme.md": "hola",
+                            "src/mod/a.py": "a = 1", "src/b.py": "b = 2",
+                            "docs/guia.md": "guia", "datos/enorme.bin": "x" * 5000}.items():
+        ruta = raiz / relativa
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_text(texto)
+    repo.save("base")
+    return repo
+
+
+def borrar_objetos_salvo(repo, conservar):
+    """Quita del almacén los objetos de los demás archivos: leerlos fallaría"""
+    manifiesto = repo._leer_manifiesto(repo._carpeta_version("1.0")[1])["archivos"]
+    necesarios = {manifiesto[r]["hash"] for r in conservar}
+    for relativa, entrada in manifiesto.items():
+        if entrada["hash"] not in necesarios:
+            ruta = repo._almacen().ruta(entrada["hash"])
+            if os.path.exists(ruta):
+                os.unlink(ruta)
+
+
+def test_restaurar_rutas_sin_tocar_el_resto(repo):
+    raiz = repo.root
+    (raiz / "config.json").unlink()
+    (raiz / "leeme.md").write_text("cambiado")
+    (raiz / "nuevo.txt").write_text("sin guardar")
+    borrar_objetos_salvo(repo, ["config.json"])
+
+    resultado = repo.restore("1.0", paths=["config.json"])
+
+    assert (resultado.restored, resultado.deleted, resultado.warnings) == (1, 0, [])
+    assert (raiz / "config.json").read_text() == "{}"
+    assert (raiz / "leeme.md").read_text() == "cambiado"
+    assert (raiz / "nuevo.txt").exists()
+
+
+def test_restaurar_con_globs_y_carpetas(repo):
+    raiz = repo.root
+    for relativa in ("leeme.md", "docs/guia.md", "src/mod/a.py", "src/b.py"):
+        (raiz / relativa).write_text("roto")
+
+    resultado = repo.restore("1.0", paths=["*.md", "src/mod", "falta/*"])
+
+    assert resultado.restored == 3
+    assert resultado.warnings == ["Ninguna ruta coincide con 'falta/*'"]
+    assert (raiz / "leeme.md").read_text() == "hola"
+    assert (raiz / "docs" / "guia.md").read_text() == "guia"
+    assert (raiz / "src" / "mod" / "a.py").read_text() == "a = 1"
+    assert (raiz / "src" / "b.py").read_text() == "roto"
+
+
+def test_ruta_que_no_esta_en_la_version(repo):
+    with pytest.raises(PathNotFoundError):
+        repo.restore("1.0", paths=["nada/*"])
+
+
+def test_restore_de_rutas_sin_confirmacion(repo):
+    (repo.root / "config.json").unlink()
+    # Las rutas son relativas a la carpeta actual
+    subprocess.run([sys.executable, str(CLI), "restore", "1.0", "--yes", "--", "../config.json"],
+                   cwd=repo.root / "src", stdin=subprocess.DEVNULL, capture_output=True, check=True)
+    assert (repo.root / "config.json").read_text() == "{}"
+
+
+def test_sparse_en_otra_carpeta_solo_lee_lo_elegido(repo, tmp_path):
+    (repo.root / "leeme.md").write_text("en curso")
+    borrar_objetos_salvo(repo, ["src/mod/a.py", "src/b.py"])
+    destino = tmp_path / "ci" / "build"
+
+    resultado = repo.restore("1.0", paths=["src"], into=destino)
+
+    assert (resultado.restored, resultado.warnings) == (2, [])
+    assert sorted(str(r.relative_to(destino)) for r in destino.rglob("*") if r.is_file()) == [
+        "src/b.py", "src/mod/a.py"]
+    assert (repo.root / "leeme.md").read_text() == "en curso"
+
+
+def test_into_sin_rutas_escribe_toda_la_version(repo, tmp_path):
+    (repo.root / "vacia").mkdir()
+    repo.save("con carpeta vacía")
+    resultado = repo.restore("1.1", into=tmp_path / "copia")
+    assert resultado.restored == 6
+    assert (tmp_path / "copia" / "vacia").is_dir()
+    assert (tmp_path / "copia" / "datos" / "enorme.bin").read_text() == "x" * 5000
+
+
+@pytest.mark.parametrize("dentro", [".", ".cronux", ".cronux/versiones"])
+def test_into_no_puede_ser_el_proyecto(repo, dentro):
+    with pytest.raises(ValueError):
+        repo.restore("1.0", paths=["src"], into=repo.root / dentro)
+
+
+def test_crx_restore_sparse_into(repo, tmp_path):
+    subprocess.run([sys.executable, str(CLI), "restore", "1.0", "--sparse", "src/mod", "docs",
+                    "--into", str(tmp_path / "salida")],
+                   cwd=repo.root, stdin=subprocess.DEVNULL, capture_output=True, check=True)
+    assert (tmp_path / "salida" / "src" / "mod" / "a.py").exists()
+    assert (tmp_path / "salida" / "docs" / "guia.md").exists()
+    assert not (tmp_path / "salida" / "src" / "b.py").exists()
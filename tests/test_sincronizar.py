@@ -0,0 +1,74 @@
+import io
+
+import pytest
+
+from cronux import Repository, CronuxError, NotARepositoryError
+
+
+def nuevo(carpeta, algoritmo=None):
+    carpeta.mkdir()
+    return Repository.init(carpeta, carpeta.name, algoritmo)
+
+
+def guardar(repo, mensaje, **archivos):
+    for nombre, contenido in archivos.items():
+        (repo.root / nombre).write_text(contenido)
+    return repo.save(mensaje).version
+
+
+def test_push_solo_envia_lo_que_falta(tmp_path):
+    repo = nuevo(tmp_path / "p")
+    comun = "x" * 5000
+    guardar(repo, "uno", a=comun, b="b1")
+    guardar(repo, "dos", b="b2")
+    espejo = tmp_path / "espejo"
+
+    primero = repo.push(str(espejo))
+    assert primero.versions == ["1.0", "1.1"]
+    assert primero.objects == 3
+    assert not (espejo / "a").exists()
+
+    guardar(repo, "tres", c=comun)
+    segundo = repo.push(str(espejo))
+    # c tiene el mismo contenido que a: no viaja ningún objeto nuevo
+    assert (segundo.versions, segundo.objects, segundo.bytes) == (["1.2"], 0, 0)
+    assert repo.push(str(espejo)).versions == []
+    assert [v.message for v in Repository(espejo).log()] == ["tres", "dos", "uno"]
+
+
+def test_pull_trae_las_versiones_sin_tocar_el_trabajo(tmp_path):
+    origen = nuevo(tmp_path / "origen")
+    guardar(origen, "uno", a="a1")
+    guardar(origen, "dos", a="a2")
+    origen.push(str(tmp_path / "espejo"))
+
+    copia = nuevo(tmp_path / "copia")
+    resultado = copia.pull(str(tmp_path / "espejo"))
+
+    assert resultado.versions == ["1.0", "1.1"]
+    assert not (copia.root / "a").exists()
+    salida = io.BytesIO()
+    copia.cat("1.0", "a", salida)
+    assert salida.getvalue() == b"a1"
+    assert [v.message for v in copia.log(grep="dos")] == ["dos"]
+
+
+def test_historiales_separados(tmp_path):
+    origen = nuevo(tmp_path / "origen")
+    guardar(origen, "uno", a="a")
+    otro = nuevo(tmp_path / "otro")
+    guardar(otro, "otro uno", a="b")
+    with pytest.raises(CronuxError, match="separado"):
+        origen.push(str(otro.root))
+
+
+def test_destinos_incompatibles(tmp_path):
+    origen = nuevo(tmp_path / "origen")
+    guardar(origen, "uno", a="a")
+    (tmp_path / "ocupada").mkdir()
+    (tmp_path / "ocupada" / "algo").write_text("x")
+    with pytest.raises(NotARepositoryError):
+        origen.push(str(tmp_path / "ocupada"))
+    blake = nuevo(tmp_path / "blake", "blake2b")
+    with pytest.raises(CronuxError, match="hash"):
+        origen.push(str(blake.root))
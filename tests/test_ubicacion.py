@@ -0,0 +1,129 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ubicacion
+from cronux import Repository, buscar_raiz
+
+CLI = Path(__file__).resolve().parent.parent / "cli" / "cronux_cli.py"
+
+
+@pytest.fixture
+def proceso_nuevo(monkeypatch):
+    """Vacía lo recordado en memoria, como al arrancar otro proceso"""
+    def reiniciar():
+        monkeypatch.setattr(ubicacion, "_raices", {})
+        monkeypatch.setattr(ubicacion, "_cache", {"leida": False, "lineas": 0})
+    reiniciar()
+    return reiniciar
+
+
+@pytest.fixture
+def proyecto(tmp_path):
+    raiz = tmp_path / "p"
+    (raiz / "a" / "b" / "c").mkdir(parents=True)
+    Repository.init(raiz, "p")
+    return raiz
+
+
+def contar_comprobaciones(monkeypatch):
+    llamadas = []
+    original = ubicacion.es_proyecto
+
+    def es_proyecto(ruta):
+        llamadas.append(ruta)
+        return original(ruta)
+
+    monkeypatch.setattr(ubicacion, "es_proyecto", es_proyecto)
+    return llamadas
+
+
+def test_raiz_desde_subcarpetas(proyecto, tmp_path, proceso_nuevo):
+    assert buscar_raiz(proyecto / "a" / "b" / "c") == proyecto
+    assert buscar_raiz(proyecto) == proyecto
+    assert buscar_raiz(tmp_path) is None
+
+
+def test_cronux_dir_fija_el_proyecto(proyecto, tmp_path, monkeypatch, proceso_nuevo):
+    for valor in (proyecto, proyecto / ".cronux"):
+        monkeypatch.setenv("CRONUX_DIR", str(valor))
+        assert buscar_raiz(tmp_path) == proyecto
+    monkeypatch.setenv("CRONUX_DIR", str(tmp_path))
+    assert buscar_raiz(proyecto) is None
+
+
+def test_la_raiz_se_recuerda_entre_ejecuciones(proyecto, monkeypatch, proceso_nuevo):
+    profunda = proyecto / "a" / "b" / "c"
+    assert ubicacion.buscar(profunda) == str(proyecto)
+
+    proceso_nuevo()
+    llamadas = contar_comprobaciones(monkeypatch)
+    assert ubicacion.buscar(profunda) == str(proyecto)
+    # Solo se comprueba la raíz recordada, sin subir por a, b y c
+    assert llamadas == [str(proyecto)]
+
+
+def test_la_cache_se_comparte_con_el_cli(proyecto, monkeypatch, proceso_nuevo):
+    subprocess.run([sys.executable, str(CLI), "status"], cwd=proyecto / "a" / "b",
+                   capture_output=True, check=True)
+    st = os.stat(proyecto / "a" / "b")
+    assert f"{st.st_dev} {st.st_ino} {proyecto}\n" in Path(ubicacion._ruta_cache()).read_text()
+
+    llamadas = contar_comprobaciones(monkeypatch)
+    assert ubicacion.buscar(proyecto / "a" / "b") == str(proyecto)
+    assert len(llamadas) == 1
+
+
+def test_un_proyecto_nuevo_mas_cerca_gana(proyecto, proceso_nuevo):
+    profunda = proyecto / "a" / "b" / "c"
+    assert buscar_raiz(profunda) == proyecto
+    Repository.init(proyecto / "a", "interior")
+
+    proceso_nuevo()
+    assert buscar_raiz(profunda) == proyecto / "a"
+
+
+def test_respuestas_recordadas_que_ya_no_valen(proyecto, tmp_path, proceso_nuevo):
+    profunda = proyecto / "a" / "b"
+    assert buscar_raiz(profunda) == proyecto
+
+    # La carpeta se mueve a otro proyecto (mismo inodo)
+    otro = tmp_path / "otro"
+    otro.mkdir()
+    Repository.init(otro, "otro")
+    shutil.move(str(profunda), str(otro / "b"))
+    proceso_nuevo()
+    assert buscar_raiz(otro / "b") == otro
+
+    # El proyecto desaparece
+    shutil.rmtree(otro / ".cronux")
+    proceso_nuevo()
+    assert buscar_raiz(otro / "b") is None
+
+
+def test_la_cache_se_compacta(proyecto, tmp_path, monkeypatch, proceso_nuevo):
+    monkeypatch.setattr(ubicacion, "MAXIMO_RAICES_GUARDADAS", 4)
+    carpetas = [proyecto / f"d{i}" for i in range(7)]
+    for carpeta in carpetas:
+        carpeta.mkdir()
+        assert ubicacion.buscar(carpeta) == str(proyecto)
+
+    lineas = Path(ubicacion._ruta_cache()).read_text().splitlines()
+    assert 0 < len(lineas) <= 4
+    st = os.stat(carpetas[-1])
+    assert lineas[-1] == f"{st.st_dev} {st.st_ino} {proyecto}"
+
+
+def test_new_crea_el_proyecto_en_la_carpeta_actual(proyecto):
+    interior = proyecto / "a"
+    salida = subprocess.run([sys.executable, str(CLI), "new", "interior"], cwd=interior,
+                            capture_output=True, text=True, check=True).stdout
+    assert f"Ubicación: {interior}" in salida
+    assert Repository(interior).status().name == "interior"
+    repetido = subprocess.run([sys.executable, str(CLI), "new", "otra vez"], cwd=interior,
+                              capture_output=True, text=True)
+    assert "Ya existe" in repetido.stdout